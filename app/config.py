@@ -69,6 +69,9 @@ class VATSIMConfig:
     transceivers_api_url: str
     timeout: int = 60
     polling_interval: int = 60
+    conditional_fetch: bool = True  # Send If-None-Match / If-Modified-Since and skip unchanged snapshots
+    json_decoder: str = "auto"  # "auto", "orjson", "msgspec" or "json"
+    http2: bool = True  # Negotiate HTTP/2 when the h2 package is installed
     
     @classmethod
     def from_env(cls):
@@ -77,7 +80,10 @@ class VATSIMConfig:
             api_url=os.getenv("VATSIM_API_URL", "https://data.vatsim.net/v3/vatsim-data.json"),
             transceivers_api_url=os.getenv("VATSIM_TRANSCEIVERS_API_URL", "https://data.vatsim.net/v3/transceivers-data.json"),
             timeout=int(os.getenv("VATSIM_API_TIMEOUT", "30")),
-            polling_interval=int(os.getenv("VATSIM_POLLING_INTERVAL", "60"))
+            polling_interval=int(os.getenv("VATSIM_POLLING_INTERVAL", "60")),
+            conditional_fetch=os.getenv("VATSIM_CONDITIONAL_FETCH", "true").lower() == "true",
+            json_decoder=os.getenv("VATSIM_JSON_DECODER", "auto").lower(),
+            http2=os.getenv("VATSIM_HTTP2", "true").lower() == "true"
         )
 
 
@@ -133,6 +139,10 @@ class FlightSummaryConfig:
     retention_hours: int = 24
     summary_interval_minutes: int = 60  # Minutes between summary processing (default: 1 hour)
     enabled: bool = True
+    archive_batch_size: int = 1000  # Completed flights archived/deleted per set-based statement
+    incremental_completion: bool = True  # Track last-seen flights in memory instead of scanning flight_summaries
+    finalization_enabled: bool = True  # Write summaries from ingest state once a disconnected flight stays away
+    finalization_grace_minutes: int = 10  # Minutes a disconnected flight must stay away before finalization
     
     @classmethod
     def from_env(cls):
@@ -141,7 +151,11 @@ class FlightSummaryConfig:
             completion_hours=int(os.getenv("FLIGHT_COMPLETION_HOURS", "14")),
             retention_hours=int(os.getenv("FLIGHT_RETENTION_HOURS", "24")),
             summary_interval_minutes=int(os.getenv("FLIGHT_SUMMARY_INTERVAL", "60")),  # Now in minutes
-            enabled=os.getenv("FLIGHT_SUMMARY_ENABLED", "true").lower() == "true"
+            enabled=os.getenv("FLIGHT_SUMMARY_ENABLED", "true").lower() == "true",
+            archive_batch_size=int(os.getenv("FLIGHT_ARCHIVE_BATCH_SIZE", "1000")),
+            incremental_completion=os.getenv("FLIGHT_COMPLETION_TRACKER_ENABLED", "true").lower() == "true",
+            finalization_enabled=os.getenv("FLIGHT_FINALIZATION_ENABLED", "true").lower() == "true",
+            finalization_grace_minutes=int(os.getenv("FLIGHT_FINALIZATION_GRACE_MINUTES", "10"))
         )
 
 @dataclass
@@ -211,6 +225,8 @@ class ControllerSummaryConfig:
     completion_minutes: int = 30
     retention_hours: int = 168
     summary_interval_minutes: int = 60
+    max_concurrency: int = 4  # Parallel summary workers, capped to half the database pool
+    reconnection_threshold_minutes: int = 5  # Logons within this gap of the last update share a session
     
     @classmethod
     def from_env(cls):
@@ -219,7 +235,9 @@ class ControllerSummaryConfig:
             enabled=os.getenv("CONTROLLER_SUMMARY_ENABLED", "true").lower() == "true",
             completion_minutes=int(os.getenv("CONTROLLER_COMPLETION_MINUTES", "30")),
             retention_hours=int(os.getenv("CONTROLLER_RETENTION_HOURS", "168")),
-            summary_interval_minutes=int(os.getenv("CONTROLLER_SUMMARY_INTERVAL", "60"))
+            summary_interval_minutes=int(os.getenv("CONTROLLER_SUMMARY_INTERVAL", "60")),
+            max_concurrency=int(os.getenv("CONTROLLER_SUMMARY_CONCURRENCY", "4")),
+            reconnection_threshold_minutes=int(os.getenv("CONTROLLER_RECONNECTION_THRESHOLD_MINUTES", "5"))
         )
 
 
@@ -241,6 +259,89 @@ class DetectionConfig:
         )
 
 
+@dataclass
+class IngestConfig:
+    """Configuration for per-poll ingestion writes."""
+    write_mode: str = "copy"  # "copy" (asyncpg COPY) or "orm" (session.add_all)
+    single_transaction: bool = True  # Write flights, controllers and transceivers in one transaction
+    
+    @classmethod
+    def from_env(cls):
+        """Load ingest configuration from environment variables."""
+        return cls(
+            write_mode=os.getenv("INGEST_WRITE_MODE", "copy").lower(),
+            single_transaction=os.getenv("INGEST_SINGLE_TRANSACTION", "true").lower() == "true"
+        )
+
+
+@dataclass
+class PartitionConfig:
+    """Configuration for time-partitioned tables and their maintenance task."""
+    enabled: bool = True  # Expire old partitions (future partitions are always created)
+    maintenance_interval_minutes: int = 60  # Minutes between maintenance runs
+    premake_days: int = 3  # Future daily partitions created ahead of time
+    transceiver_retention_days: int = 30  # Days of transceiver partitions kept (0 keeps everything)
+    expiry_action: str = "detach"  # "detach" (keep the table) or "drop" expired partitions
+    
+    @classmethod
+    def from_env(cls):
+        """Load partition configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("PARTITION_MAINTENANCE_ENABLED", "true").lower() == "true",
+            maintenance_interval_minutes=int(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "60")),
+            premake_days=int(os.getenv("PARTITION_PREMAKE_DAYS", "3")),
+            transceiver_retention_days=int(os.getenv("TRANSCEIVER_RETENTION_DAYS", "30")),
+            expiry_action=os.getenv("PARTITION_EXPIRY_ACTION", "detach").lower()
+        )
+
+
+@dataclass
+class FrequencyIntervalConfig:
+    """Configuration for frequency intervals folded from transceivers at ingest."""
+    enabled: bool = True  # Fold each poll's transceivers into frequency_intervals
+    max_gap_seconds: int = 180  # An observation later than this after the previous one starts a new interval
+    retention_days: int = 30  # Closed intervals deleted by partition maintenance after this many days (0 keeps all)
+    
+    @classmethod
+    def from_env(cls):
+        """Load frequency interval configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("FREQUENCY_INTERVALS_ENABLED", "true").lower() == "true",
+            max_gap_seconds=int(os.getenv("FREQUENCY_INTERVAL_MAX_GAP_SECONDS", "180")),
+            retention_days=int(os.getenv("FREQUENCY_INTERVAL_RETENTION_DAYS", "30"))
+        )
+
+
+@dataclass
+class EventConfig:
+    """Configuration for the snapshot diff stage and its event stream."""
+    enabled: bool = True  # Diff every poll against the previous one and emit events
+    persist: bool = True  # Store the events in the events table
+    retention_days: int = 30  # Events deleted by partition maintenance after this many days (0 keeps all)
+    
+    @classmethod
+    def from_env(cls):
+        """Load event configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("SNAPSHOT_EVENTS_ENABLED", "true").lower() == "true",
+            persist=os.getenv("SNAPSHOT_EVENTS_PERSIST", "true").lower() == "true",
+            retention_days=int(os.getenv("EVENT_RETENTION_DAYS", "30"))
+        )
+
+
+@dataclass
+class LiveStateConfig:
+    """Configuration for the in-process live-state snapshot served by read endpoints."""
+    enabled: bool = True  # Publish a snapshot after every poll and serve read endpoints from it
+    max_age_seconds: int = 0  # Older snapshots fall back to the database; 0 means twice the polling interval
+    
+    @classmethod
+    def from_env(cls):
+        """Load live-state configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("LIVE_STATE_CACHE_ENABLED", "true").lower() == "true",
+            max_age_seconds=int(os.getenv("LIVE_STATE_MAX_AGE", "0"))
+        )
 
 
 @dataclass
@@ -259,6 +360,11 @@ class AppConfig:
     controller_callsign_filter: ControllerCallsignFilterConfig
     controller_summary: ControllerSummaryConfig = field(default_factory=ControllerSummaryConfig)
     detection: DetectionConfig = field(default_factory=DetectionConfig)
+    ingest: IngestConfig = field(default_factory=IngestConfig)
+    partitioning: PartitionConfig = field(default_factory=PartitionConfig)
+    live_state: LiveStateConfig = field(default_factory=LiveStateConfig)
+    frequency_intervals: FrequencyIntervalConfig = field(default_factory=FrequencyIntervalConfig)
+    events: EventConfig = field(default_factory=EventConfig)
     environment: str = "development"
     
     @classmethod
@@ -278,6 +384,11 @@ class AppConfig:
             controller_callsign_filter=ControllerCallsignFilterConfig.from_env(),
             controller_summary=ControllerSummaryConfig.from_env(),
             detection=DetectionConfig.from_env(),
+            ingest=IngestConfig.from_env(),
+            partitioning=PartitionConfig.from_env(),
+            live_state=LiveStateConfig.from_env(),
+            frequency_intervals=FrequencyIntervalConfig.from_env(),
+            events=EventConfig.from_env(),
             environment=os.getenv("ENVIRONMENT", "development")
         )
 
@@ -296,8 +407,47 @@ def validate_config(config: AppConfig) -> None:
     if config.vatsim.polling_interval <= 0:
         raise ValueError("VATSIM polling interval must be positive")
     
+    if config.vatsim.json_decoder not in ("auto", "orjson", "msgspec", "json"):
+        raise ValueError("VATSIM_JSON_DECODER must be 'auto', 'orjson', 'msgspec' or 'json'")
+    
     if config.api.port < 1 or config.api.port > 65535:
         raise ValueError("API port must be between 1 and 65535")
+    
+    if config.ingest.write_mode not in ("copy", "orm"):
+        raise ValueError("INGEST_WRITE_MODE must be 'copy' or 'orm'")
+    
+    if config.flight_summary.archive_batch_size < 1:
+        raise ValueError("FLIGHT_ARCHIVE_BATCH_SIZE must be at least 1")
+    
+    if config.flight_summary.finalization_grace_minutes < 0:
+        raise ValueError("FLIGHT_FINALIZATION_GRACE_MINUTES must not be negative")
+    
+    if config.partitioning.expiry_action not in ("detach", "drop"):
+        raise ValueError("PARTITION_EXPIRY_ACTION must be 'detach' or 'drop'")
+    
+    if config.partitioning.premake_days < 0 or config.partitioning.transceiver_retention_days < 0:
+        raise ValueError("PARTITION_PREMAKE_DAYS and TRANSCEIVER_RETENTION_DAYS must not be negative")
+    
+    if config.partitioning.maintenance_interval_minutes < 1:
+        raise ValueError("PARTITION_MAINTENANCE_INTERVAL must be at least 1")
+    
+    if config.live_state.max_age_seconds < 0:
+        raise ValueError("LIVE_STATE_MAX_AGE must not be negative")
+    
+    if config.frequency_intervals.max_gap_seconds < 1:
+        raise ValueError("FREQUENCY_INTERVAL_MAX_GAP_SECONDS must be at least 1")
+    
+    if config.frequency_intervals.retention_days < 0:
+        raise ValueError("FREQUENCY_INTERVAL_RETENTION_DAYS must not be negative")
+    
+    if config.events.retention_days < 0:
+        raise ValueError("EVENT_RETENTION_DAYS must not be negative")
+    
+    if config.controller_summary.max_concurrency < 1:
+        raise ValueError("CONTROLLER_SUMMARY_CONCURRENCY must be at least 1")
+    
+    if config.controller_summary.reconnection_threshold_minutes < 0:
+        raise ValueError("CONTROLLER_RECONNECTION_THRESHOLD_MINUTES must not be negative")
 
 
 # Global configuration instance
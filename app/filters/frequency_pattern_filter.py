@@ -9,7 +9,7 @@ places (e.g., 122.800 MHz) for practical filtering.
 
 import os
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -170,7 +170,7 @@ class FrequencyPatternFilter:
         for transceiver in transceivers:
             try:
                 # Validate transceiver has required structure
-                if not isinstance(transceiver, dict):
+                if not isinstance(transceiver, Mapping):
                     logger.error(f"Invalid transceiver data type: {type(transceiver)}")
                     continue
                 
@@ -12,9 +12,13 @@ Status: Sprint 1, Task 1.4 - Geographic Boundary Filter
 """
 
 import os
+import time
 import logging
-from typing import Dict, List, Any, Optional
+from itertools import compress
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+import numpy as np
+import shapely
 from shapely.geometry import Polygon
 
 # Import our geographic utilities
@@ -45,6 +49,7 @@ class GeographicBoundaryFilter:
         """Initialize geographic boundary filter with configuration."""
         self.config = self._get_filter_config()
         self.polygon = None
+        self.polygon_bounds: Optional[Tuple[float, float, float, float]] = None
         self.is_initialized = False
         self._setup_logging()
         
@@ -98,6 +103,10 @@ class GeographicBoundaryFilter:
                 logger.error(error_msg)
                 raise RuntimeError(error_msg)
             
+            # Prepare once so every batch contains_xy call reuses the spatial index
+            shapely.prepare(self.polygon)
+            self.polygon_bounds = self.polygon.bounds
+            
             self.is_initialized = True
             logger.info(f"✅ Loaded boundary polygon from {self.config.boundary_data_path}")
             logger.info(f"📊 Polygon points: {len(self.polygon.exterior.coords)}")
@@ -154,7 +163,7 @@ class GeographicBoundaryFilter:
         self.stats['flights_excluded'] = 0
         self.stats['flights_no_position'] = 0
         
-        filtered_flights = [flight for flight in flights if self._is_flight_in_boundary(flight)]
+        filtered_flights = self._filter_by_position(flights, 'latitude', 'longitude', 'flights')
         
         # Log filtering results
         if len(flights) != len(filtered_flights):
@@ -197,6 +206,60 @@ class GeographicBoundaryFilter:
             self.stats['transceivers_no_position'] += 1
             return True
     
+    def _coordinates_to_array(self, values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert raw coordinate values to a float array plus a missing/invalid mask"""
+        try:
+            coordinates = np.array(values, dtype=float)  # None becomes NaN
+            invalid = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+        except (ValueError, TypeError):
+            # Unparseable strings somewhere in the list - convert one by one
+            coordinates = np.full(len(values), np.nan)
+            invalid = np.zeros(len(values), dtype=bool)
+            for index, value in enumerate(values):
+                try:
+                    coordinates[index] = float(value)
+                except (ValueError, TypeError):
+                    invalid[index] = True
+        return coordinates, invalid
+    
+    def _filter_by_position(self, items: List[Dict], lat_key: str, lon_key: str, stat_prefix: str) -> List[Dict]:
+        """
+        Vectorized boundary check for a list of positioned entities.
+        
+        Same outcome as calling the per-item _is_*_in_boundary checks: items
+        without a usable position are kept and counted as no_position, items
+        outside the valid lat/lon range or the polygon are excluded.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Geographic boundary filter is enabled but not initialized")
+        
+        start_time = time.perf_counter()
+        
+        lats, lat_invalid = self._coordinates_to_array([item.get(lat_key) for item in items])
+        lons, lon_invalid = self._coordinates_to_array([item.get(lon_key) for item in items])
+        no_position = lat_invalid | lon_invalid
+        
+        # Bounding box prefilter (NaN and out-of-range values fail these comparisons)
+        min_lon, min_lat, max_lon, max_lat = self.polygon_bounds or self.polygon.bounds
+        candidates = np.flatnonzero(
+            ~no_position
+            & (lats >= max(min_lat, -90)) & (lats <= min(max_lat, 90))
+            & (lons >= max(min_lon, -180)) & (lons <= min(max_lon, 180))
+        )
+        
+        inside = np.zeros(len(items), dtype=bool)
+        if len(candidates) > 0:
+            inside[candidates] = shapely.contains_xy(self.polygon, lons[candidates], lats[candidates])
+        
+        included = int(inside.sum())
+        missing = int(no_position.sum())
+        self.stats[f'{stat_prefix}_included'] = included
+        self.stats[f'{stat_prefix}_no_position'] = missing
+        self.stats[f'{stat_prefix}_excluded'] = len(items) - included - missing
+        self.stats['processing_time_ms'] = (time.perf_counter() - start_time) * 1000
+        
+        return list(compress(items, inside | no_position))
+    
     def _is_controller_in_boundary(self, controller_data: Dict[str, Any]) -> bool:
         """Check if a controller is within the geographic boundary"""
         # If filter is disabled, allow everything through
@@ -224,7 +287,7 @@ class GeographicBoundaryFilter:
         self.stats['transceivers_excluded'] = 0
         self.stats['transceivers_no_position'] = 0
         
-        filtered_transceivers = [t for t in transceivers if self._is_transceiver_in_boundary(t)]
+        filtered_transceivers = self._filter_by_position(transceivers, 'position_lat', 'position_lon', 'transceivers')
         
         # Log filtering results
         if len(transceivers) != len(filtered_transceivers):
@@ -308,6 +371,7 @@ class GeographicBoundaryFilter:
         logger.info("Reloading boundary data...")
         self.is_initialized = False
         self.polygon = None
+        self.polygon_bounds = None
         
         if self.config.enabled:
             self._load_boundary_data()
@@ -24,9 +24,9 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy import text, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
@@ -36,6 +36,7 @@ from app.utils.error_handling import handle_service_errors, log_operation
 
 from app.services.vatsim_service import get_vatsim_service
 from app.services.data_service import get_data_service
+from app.services.live_state import get_live_state_cache, etag_matches
 from app.database import get_database_session
 from app.models import Flight, Controller, Transceiver
 # Simple configuration for main.py
@@ -120,7 +121,7 @@ async def lifespan(app: FastAPI):
             required_tables = [
                 'flights', 'controllers', 'transceivers', 'flight_summaries', 
                 'flights_archive', 'flight_sector_occupancy', 'controller_summaries', 
-                'controllers_archive'
+                'controllers_archive', 'flights_latest'
             ]
             
             # Get existing tables with explicit error handling
@@ -607,7 +608,7 @@ async def get_database_status():
             required_tables = [
                 'flights', 'controllers', 'transceivers', 'flight_summaries', 
                 'flights_archive', 'flight_sector_occupancy', 'controller_summaries', 
-                'controllers_archive'
+                'controllers_archive', 'flights_latest'
             ]
             
             existing_tables_result = await session.execute(text("""
@@ -800,28 +801,53 @@ async def get_cleanup_status():
 
 # Flight Data Endpoints
 
-# Flight Data Endpoints
+def _serve_live_state(request: Request, resource: str) -> Optional[Response]:
+    """
+    Serve a resource from the live-state snapshot published by the ingest loop.
+    
+    Returns the pre-serialized JSON (or 304 Not Modified when If-None-Match
+    matches the ETag), or None when there is no fresh snapshot (or the
+    snapshot lacks the resource) and the caller should query the database.
+    """
+    snapshot = get_live_state_cache().get_fresh()
+    if snapshot is None or resource not in snapshot.resources:
+        return None
+    
+    live = snapshot.resources[resource]
+    headers = {
+        "ETag": live.etag,
+        "Cache-Control": "no-cache",
+        "X-Live-State-Version": str(snapshot.version)
+    }
+    if etag_matches(request.headers.get("if-none-match"), live.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=live.body, media_type="application/json", headers=headers)
 
 @app.get("/api/flights")
 @handle_service_errors
 @log_operation("get_all_flights")
-async def get_all_flights():
+async def get_all_flights(request: Request):
     """Get all active flights with current position and flight plan data"""
+    live_response = _serve_live_state(request, "flights")
+    if live_response is not None:
+        return live_response
+    
     try:
         async with get_database_session() as session:
             # Get recent flights (last 30 minutes)
             recent_cutoff = datetime.now(timezone.utc) - timedelta(minutes=30)
             
+            # flights_latest holds one row per callsign, upserted on every poll
             flights_result = await session.execute(
                 text("""
-                    SELECT DISTINCT ON (callsign) 
+                    SELECT 
                         callsign, cid, name, server, pilot_rating,
                         latitude, longitude, altitude, groundspeed, heading, transponder,
                         departure, arrival, aircraft_type, flight_rules, planned_altitude,
                         last_updated
-                    FROM flights 
+                    FROM flights_latest 
                     WHERE last_updated >= :cutoff
-                    ORDER BY callsign, last_updated DESC
+                    ORDER BY callsign
                 """),
                 {"cutoff": recent_cutoff}
             )
@@ -1342,8 +1368,12 @@ async def get_memory_flights():
 @app.get("/api/controllers")
 @handle_service_errors
 @log_operation("get_all_controllers")
-async def get_all_controllers():
+async def get_all_controllers(request: Request):
     """Get all active ATC positions"""
+    live_response = _serve_live_state(request, "controllers")
+    if live_response is not None:
+        return live_response
+    
     try:
         async with get_database_session() as session:
             # Get recent ATC positions (last 30 minutes)
@@ -1390,9 +1420,9 @@ async def get_all_controllers():
 @app.get("/api/atc-positions")
 @handle_service_errors
 @log_operation("get_atc_positions")
-async def get_atc_positions():
+async def get_atc_positions(request: Request):
     """Alternative endpoint for ATC positions (legacy compatibility)"""
-    return await get_all_controllers()
+    return await get_all_controllers(request)
 
 @app.get("/api/atc-positions/by-controller-id")
 @handle_service_errors
@@ -1667,8 +1697,12 @@ async def trigger_performance_optimization():
 @app.get("/api/transceivers")
 @handle_service_errors
 @log_operation("get_transceivers")
-async def get_transceivers():
+async def get_transceivers(request: Request):
     """Get radio frequency and position data"""
+    live_response = _serve_live_state(request, "transceivers")
+    if live_response is not None:
+        return live_response
+    
     try:
         async with get_database_session() as session:
             # Get recent transceivers (last 5 minutes for fresh data)
@@ -2165,7 +2199,7 @@ async def startup_health_check():
             required_tables = [
                 'flights', 'controllers', 'transceivers', 'flight_summaries', 
                 'flights_archive', 'flight_sector_occupancy', 'controller_summaries', 
-                'controllers_archive'
+                'controllers_archive', 'flights_latest'
             ]
             
             # Query existing tables
@@ -43,8 +43,9 @@ OPTIMIZATIONS:
 - LZ4 compression on large TEXT fields (documented in class docstrings)
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, TIMESTAMP, BigInteger, CheckConstraint, Index, event, DECIMAL, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Float, Text, TIMESTAMP, BigInteger, Boolean, CheckConstraint, Computed, Index, UniqueConstraint, event, DECIMAL, JSON
+from sqlalchemy.dialects.postgresql import JSONB, TSTZRANGE
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import validates, declarative_base
 from datetime import datetime, timezone
 
@@ -75,6 +76,7 @@ class Controller(Base, TimestampMixin):
     server = Column(String(50), nullable=True, index=True)  # From API "server"
     last_updated = Column(TIMESTAMP(timezone=True), nullable=True, index=True)  # From API "last_updated"
     logon_time = Column(TIMESTAMP(timezone=True), nullable=True)  # From API "logon_time"
+    controller_session_id = Column(Integer, nullable=True)  # controller_sessions id, assigned at ingest
     
     # Constraints
     __table_args__ = (
@@ -87,6 +89,7 @@ class Controller(Base, TimestampMixin):
         Index('idx_controllers_facility_server', 'facility', 'server'),
         Index('idx_controllers_last_updated', 'last_updated'),
         Index('idx_controllers_rating_last_updated', 'rating', 'last_updated'),
+        Index('idx_controllers_controller_session_id', 'controller_session_id'),
         
         # ATC Detection Performance Indexes
         Index('idx_controllers_callsign_facility', 'callsign', 'facility'),
@@ -97,6 +100,51 @@ class Controller(Base, TimestampMixin):
     
     # Validation handled by database constraints - no Python validators needed
 
+class ControllerSession(Base):
+    """Registry of controller sessions, reconnections within the threshold merged into one id
+    
+    The id is assigned at ingest and stored on controllers, controllers_archive
+    and controller_summaries; summarised_at marks sessions already summarised.
+    """
+    __tablename__ = "controller_sessions"
+    
+    controller_session_id = Column(Integer, primary_key=True, autoincrement=True)
+    callsign = Column(String(50), nullable=False)
+    cid = Column(Integer, nullable=True)
+    session_start_time = Column(TIMESTAMP(timezone=True), nullable=True)  # Logon time of the first connection
+    last_logon_time = Column(TIMESTAMP(timezone=True), nullable=True)  # Logon time of the latest connection
+    last_seen = Column(TIMESTAMP(timezone=True), nullable=False)  # Latest API last_updated
+    summarised_at = Column(TIMESTAMP(timezone=True), nullable=True)  # When the summary was written
+    created_at = Column(TIMESTAMP(timezone=True), default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint('callsign', 'cid', 'session_start_time',
+                         name='uq_controller_sessions_start', postgresql_nulls_not_distinct=True),
+        Index('idx_controller_sessions_open', 'last_seen', postgresql_where=text('summarised_at IS NULL')),
+    )
+
+class FlightSession(Base):
+    """Registry of flight identities, one compact id per (callsign, departure, arrival, cid, deptime)
+    
+    The id is assigned at ingest and stored on flights, transceivers (entity_id),
+    flight_sector_occupancy, flights_archive and flight_summaries.
+    """
+    __tablename__ = "flight_sessions"
+    
+    flight_session_id = Column(Integer, primary_key=True, autoincrement=True)
+    callsign = Column(String(50), nullable=False)
+    departure = Column(String(10), nullable=True)
+    arrival = Column(String(10), nullable=True)
+    cid = Column(Integer, nullable=True)
+    deptime = Column(String(10), nullable=True)
+    logon_time = Column(TIMESTAMP(timezone=True), nullable=True)  # Logon time when first seen
+    created_at = Column(TIMESTAMP(timezone=True), default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint('callsign', 'departure', 'arrival', 'cid', 'deptime',
+                         name='uq_flight_sessions_key', postgresql_nulls_not_distinct=True),
+    )
+
 class Flight(Base, TimestampMixin):
     """Flight model representing active flights - OPTIMIZED FOR STORAGE
     
@@ -105,7 +153,8 @@ class Flight(Base, TimestampMixin):
     """
     __tablename__ = "flights"
     
-    id = Column(Integer, primary_key=True, index=True)
+    # Range partitioned by day on last_updated, so the partition key is part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     callsign = Column(String(50), nullable=False, index=True)
     aircraft_type = Column(String(20), nullable=True)
     
@@ -138,7 +187,7 @@ class Flight(Base, TimestampMixin):
     assigned_transponder = Column(String(10), nullable=True)  # Assigned transponder from flight_plan.assigned_transponder
     
     # Timestamps
-    last_updated = Column(TIMESTAMP(timezone=True), default=func.now(), index=True)
+    last_updated = Column(TIMESTAMP(timezone=True), default=func.now(), primary_key=True, nullable=False, index=True)
     
     # VATSIM API fields - 1:1 mapping with API field names (simplified)
     cid = Column(Integer, nullable=True, index=True)  # VATSIM user ID
@@ -151,6 +200,7 @@ class Flight(Base, TimestampMixin):
     qnh_mb = Column(Integer, nullable=True)  # QNH pressure in millibars from VATSIM API
     logon_time = Column(TIMESTAMP(timezone=True), nullable=True)  # When pilot connected
     last_updated_api = Column(TIMESTAMP(timezone=True), nullable=True)  # API last_updated timestamp
+    flight_session_id = Column(Integer, nullable=True)  # flight_sessions id, assigned at ingest
     
     # Constraints
     __table_args__ = (
@@ -173,65 +223,135 @@ class Flight(Base, TimestampMixin):
         # ATC Detection Performance Indexes
         Index('idx_flights_callsign_departure_arrival', 'callsign', 'departure', 'arrival'),
         Index('idx_flights_callsign_logon', 'callsign', 'logon_time'),
+        Index('idx_flights_flight_session_id', 'flight_session_id', 'last_updated'),
         
         # Additional indexes that exist in database but not in original models.py
         Index('idx_flights_altitude', 'altitude'),
         Index('idx_flights_flight_rules', 'flight_rules'),
         Index('idx_flights_planned_altitude', 'planned_altitude'),
+        {'postgresql_partition_by': 'RANGE (last_updated)'}
     )
     
     # Validation handled by database constraints - no Python validators needed
 
+class FlightLatest(Base):
+    """Latest position of each callsign, upserted in bulk on every poll
+    
+    One row per callsign, so /api/flights and stale sector cleanup read it directly
+    instead of running DISTINCT ON (callsign) over the flights position history.
+    """
+    __tablename__ = "flights_latest"
+    
+    callsign = Column(String(50), primary_key=True)
+    cid = Column(Integer, nullable=True)
+    name = Column(String(100), nullable=True)
+    server = Column(String(50), nullable=True)
+    pilot_rating = Column(Integer, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    altitude = Column(Integer, nullable=True)
+    groundspeed = Column(Integer, nullable=True)
+    heading = Column(Integer, nullable=True)
+    transponder = Column(String(10), nullable=True)
+    departure = Column(String(10), nullable=True)
+    arrival = Column(String(10), nullable=True)
+    aircraft_type = Column(String(20), nullable=True)
+    flight_rules = Column(String(10), nullable=True)
+    planned_altitude = Column(String(10), nullable=True)
+    logon_time = Column(TIMESTAMP(timezone=True), nullable=True)
+    last_updated = Column(TIMESTAMP(timezone=True), default=func.now(), nullable=False)  # Poll that last saw the callsign
+    
+    __table_args__ = (
+        Index('idx_flights_latest_last_updated', 'last_updated'),
+    )
+
 class Transceiver(Base):
     """Transceiver model for storing radio frequency and position data from VATSIM transceivers API"""
     __tablename__ = "transceivers"
     
-    id = Column(Integer, primary_key=True)
-    callsign = Column(String(50), nullable=False, index=True)
+    # Range partitioned by day on timestamp (LIST sub-partitioned by entity_type), so the
+    # partition key is part of the primary key. Partitions are managed by PartitionManager.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    callsign = Column(String(50), nullable=False)
     transceiver_id = Column(Integer, nullable=False)  # ID from VATSIM API
-    frequency = Column(BigInteger, nullable=False, index=True)  # Frequency in Hz
+    frequency = Column(BigInteger, nullable=False)  # Frequency in Hz
     position_lat = Column(Float, nullable=True)
     position_lon = Column(Float, nullable=True)
     height_msl = Column(Float, nullable=True)  # Height above mean sea level in meters from VATSIM API
     height_agl = Column(Float, nullable=True)  # Height above ground level in meters from VATSIM API
-    entity_type = Column(String(20), nullable=False, index=True)  # 'flight' or 'atc'
-    entity_id = Column(Integer, nullable=True, index=True)  # Foreign key to flights.id or controllers.id
-    timestamp = Column(TIMESTAMP(timezone=True), default=func.now(), nullable=False, index=True)
+    entity_type = Column(String(20), nullable=False)  # 'flight' or 'atc' (LIST sub-partition key)
+    entity_id = Column(Integer, nullable=True)  # flight_sessions.flight_session_id for flight transceivers
+    timestamp = Column(TIMESTAMP(timezone=True), default=func.now(), primary_key=True, nullable=False)
     updated_at = Column(TIMESTAMP(timezone=True), default=func.now(), onupdate=func.now(), nullable=False)
     
     # Constraints
     __table_args__ = (
         CheckConstraint('frequency >= 0', name='valid_frequency'),
         CheckConstraint('entity_type IN (\'flight\', \'atc\')', name='valid_entity_type'),
-        Index('idx_transceivers_callsign', 'callsign'),
-        Index('idx_transceivers_callsign_timestamp', 'callsign', 'timestamp'),
-        Index('idx_transceivers_entity', 'entity_type', 'entity_id'),
-        Index('idx_transceivers_frequency', 'frequency'),
-        
-        # ATC Detection Performance Indexes
-        Index('idx_transceivers_entity_type_callsign', 'entity_type', 'callsign'),
-        Index('idx_transceivers_entity_type_timestamp', 'entity_type', 'timestamp'),
-        # Simplified ATC detection index - focus on most common query patterns
-        Index('idx_transceivers_atc_detection', 'entity_type', 'callsign', 'timestamp'),
         
-        # NEW: High-performance ATC detection index for loading ALL controllers
-        Index('idx_transceivers_atc_simple', 'entity_type', 'timestamp', 'callsign'),
-        
-        # Performance-optimized index for controller flight counting queries
-        # Note: WHERE clause cannot be specified in SQLAlchemy Index definition
-        # This will be created by the database schema (init.sql)
-        # The database creates this as: WHERE entity_type = 'flight' for optimized flight frequency queries
-        Index('idx_transceivers_flight_frequency_callsign', 'entity_type', 'frequency', 'callsign'),
-        
-        # Additional indexes that exist in database but not in original models.py
-        # Note: WHERE clauses and complex index structures are handled by init.sql
-        # These are simplified versions for SQLAlchemy compatibility
-        Index('idx_transceivers_atc_join', 'callsign', 'entity_type', 'timestamp'),
-        Index('idx_transceivers_atc_performance', 'entity_type', 'callsign', 'timestamp', 'frequency', 'position_lat', 'position_lon'),
+        # Partition pruning resolves entity_type and the day, so indexes only cover
+        # what remains within a daily sub-partition (see init.sql)
+        Index('idx_transceivers_callsign_timestamp', 'callsign', 'timestamp'),
+        Index('idx_transceivers_timestamp', 'timestamp'),
+        Index('idx_transceivers_frequency_callsign', 'frequency', 'callsign'),
+        Index('idx_transceivers_entity_id_timestamp', 'entity_id', 'timestamp'),
+        {'postgresql_partition_by': 'RANGE ("timestamp")'}
     )
     
     # Validation handled by database constraints - no Python validators needed
 
+class FrequencyInterval(Base):
+    """Consecutive observations of one (callsign, frequency) folded into a time interval at ingest"""
+    __tablename__ = "frequency_intervals"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    entity_type = Column(String(20), nullable=False)  # 'flight' or 'atc'
+    callsign = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=True)  # flight_sessions.flight_session_id for flight intervals
+    frequency = Column(BigInteger, nullable=False)  # Frequency in Hz
+    interval_start = Column(TIMESTAMP(timezone=True), nullable=False)
+    interval_end = Column(TIMESTAMP(timezone=True), nullable=False)
+    active_during = Column(TSTZRANGE, Computed("tstzrange(interval_start, interval_end, '[]')", persisted=True))
+    position_lat = Column(Float, nullable=True)  # Last observed position
+    position_lon = Column(Float, nullable=True)
+    observations = Column(Integer, nullable=False, default=1)  # Polls folded into the interval
+    is_open = Column(Boolean, nullable=False, default=True)  # Still being extended by ingest
+    created_at = Column(TIMESTAMP(timezone=True), default=func.now(), nullable=True)
+    
+    # Constraints
+    __table_args__ = (
+        CheckConstraint('entity_type IN (\'flight\', \'atc\')', name='valid_interval_entity_type'),
+        CheckConstraint('interval_end >= interval_start', name='valid_interval_range'),
+        
+        # GiST (btree_gist) index for frequency + overlapping time range joins
+        Index('idx_frequency_intervals_frequency_active', 'frequency', 'active_during', postgresql_using='gist'),
+        Index('idx_frequency_intervals_callsign_start', 'entity_type', 'callsign', 'interval_start'),
+        Index('idx_frequency_intervals_entity_id', 'entity_id'),
+        Index('idx_frequency_intervals_open', 'is_open', postgresql_where=text('is_open')),
+    )
+
+class Event(Base):
+    """Typed change between two consecutive polls, emitted by SnapshotDiffEngine"""
+    __tablename__ = "events"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String(40), nullable=False)  # pilot_connected, flight_plan_changed, transceiver_retuned, ...
+    entity_type = Column(String(20), nullable=False)  # 'flight' or 'atc'
+    callsign = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=True)  # flight_session_id or controller_session_id
+    occurred_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    details = Column(JSONB, nullable=True)  # Event-specific before/after values
+    created_at = Column(TIMESTAMP(timezone=True), default=func.now(), nullable=True)
+    
+    # Constraints
+    __table_args__ = (
+        CheckConstraint('entity_type IN (\'flight\', \'atc\')', name='valid_event_entity_type'),
+        
+        Index('idx_events_occurred_at', 'occurred_at'),
+        Index('idx_events_type_occurred_at', 'event_type', 'occurred_at'),
+        Index('idx_events_callsign_occurred_at', 'callsign', 'occurred_at'),
+    )
+
 class FlightSectorOccupancy(Base):
     """Flight sector occupancy model for tracking aircraft entry/exit from Australian airspace sectors"""
     __tablename__ = "flight_sector_occupancy"
@@ -248,6 +368,7 @@ class FlightSectorOccupancy(Base):
     exit_lon = Column(DECIMAL(11,8), nullable=True)  # Exit longitude - matches database exactly
     entry_altitude = Column(Integer, nullable=True)  # Entry altitude in feet
     exit_altitude = Column(Integer, nullable=True)  # Exit altitude in feet
+    flight_session_id = Column(Integer, nullable=True)  # flight_sessions id of the flight
     created_at = Column(TIMESTAMP(timezone=True), default=func.now())  # Only created_at - matches database exactly
     
     # Constraints - only what exists in database
@@ -261,6 +382,7 @@ class FlightSectorOccupancy(Base):
         Index('idx_flight_sector_occupancy_callsign', 'callsign'),
         Index('idx_flight_sector_occupancy_sector_name', 'sector_name'),
         Index('idx_flight_sector_occupancy_entry_timestamp', 'entry_timestamp'),
+        Index('idx_flight_sector_occupancy_flight_session_id', 'flight_session_id'),
     )
 
 class FlightSummary(Base, TimestampMixin):
@@ -297,6 +419,8 @@ class FlightSummary(Base, TimestampMixin):
     total_enroute_time_minutes = Column(Integer, nullable=True)  # Total enroute time
     sector_breakdown = Column(JSON, nullable=True)  # JSON sector breakdown
     completion_time = Column(TIMESTAMP(timezone=True), nullable=True)  # When flight completed
+    flight_session_id = Column(Integer, nullable=True)  # flight_sessions id of the summarised flight
+    archive_pending = Column(Boolean, nullable=False, default=False)  # Finalized on disconnect, flights rows not archived yet
     
     # Constraints
     __table_args__ = (
@@ -312,6 +436,7 @@ class FlightSummary(Base, TimestampMixin):
         Index('idx_flight_summaries_completion_time', 'completion_time'),
         Index('idx_flight_summaries_primary_sector', 'primary_enroute_sector'),
         Index('idx_flight_summaries_cid', 'cid'),
+        Index('idx_flight_summaries_flight_session_id', 'flight_session_id'),
         
         # Additional index that exists in database but not in original models.py
         Index('idx_flight_summaries_airborne_controller_time', 'airborne_controller_time_percentage'),
@@ -329,6 +454,7 @@ class ControllerSummary(Base, TimestampMixin):
     callsign = Column(String(50), nullable=False, index=True)  # Controller callsign
     cid = Column(Integer, nullable=True, index=True)  # Controller ID from VATSIM
     name = Column(String(100), nullable=True)  # Controller name
+    controller_session_id = Column(Integer, nullable=True)  # controller_sessions id of the summarised session
     session_start_time = Column(TIMESTAMP(timezone=True), nullable=False, index=True)  # Session start
     session_end_time = Column(TIMESTAMP(timezone=True), nullable=True, index=True)  # Session end
     session_duration_minutes = Column(Integer, nullable=True, default=0)  # Session duration
@@ -356,6 +482,7 @@ class ControllerSummary(Base, TimestampMixin):
         Index('idx_controller_summaries_duration_aircraft', 'session_duration_minutes', 'total_aircraft_handled'),
         Index('idx_controller_summaries_rating_facility', 'rating', 'facility'),
         Index('idx_controller_summaries_aircraft_count', 'total_aircraft_handled'),
+        Index('idx_controller_summaries_controller_session_id', 'controller_session_id'),
         
         # Additional indexes that exist in database but not in original models.py
         # Note: JSONB indexes are handled by init.sql with GIN for optimal JSON query performance
@@ -384,6 +511,7 @@ class ControllersArchive(Base, TimestampMixin):
     server = Column(String(50), nullable=True)  # Network server
     last_updated = Column(TIMESTAMP(timezone=True), nullable=True)  # Last update
     logon_time = Column(TIMESTAMP(timezone=True), nullable=True)  # Logon time
+    controller_session_id = Column(Integer, nullable=True)  # controller_sessions id
     archived_at = Column(TIMESTAMP(timezone=True), default=func.now())  # When archived
     
     # Constraints
@@ -398,6 +526,7 @@ class ControllersArchive(Base, TimestampMixin):
         # Additional indexes that exist in database but not in original models.py
         Index('idx_controllers_archive_logon_time', 'logon_time'),
         Index('idx_controllers_archive_last_updated', 'last_updated'),
+        Index('idx_controllers_archive_controller_session_id', 'controller_session_id'),
     )
 
 class FlightsArchive(Base, TimestampMixin):
@@ -408,7 +537,8 @@ class FlightsArchive(Base, TimestampMixin):
     """
     __tablename__ = "flights_archive"
     
-    id = Column(Integer, primary_key=True)  # Keep original ID for reference
+    # Range partitioned by day on last_updated, so the partition key is part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     callsign = Column(String(50), nullable=False, index=True)  # Flight callsign
     aircraft_type = Column(String(20), nullable=True)  # Aircraft type
     departure = Column(String(10), nullable=True)  # Departure airport
@@ -430,7 +560,7 @@ class FlightsArchive(Base, TimestampMixin):
     altitude = Column(Integer, nullable=True)  # Current altitude
     groundspeed = Column(Integer, nullable=True)  # Ground speed
     heading = Column(Integer, nullable=True)  # Current heading
-    last_updated = Column(TIMESTAMP(timezone=True), nullable=True)  # Last update
+    last_updated = Column(TIMESTAMP(timezone=True), default=func.now(), primary_key=True, nullable=False)  # Last update (partition key)
     controller_callsigns = Column(JSON, nullable=True)  # JSON array of ATC callsigns
     controller_time_percentage = Column(Float, nullable=True)  # Percentage of time on ATC
     time_online_minutes = Column(Integer, nullable=True)  # Total time online
@@ -439,6 +569,7 @@ class FlightsArchive(Base, TimestampMixin):
     total_enroute_time_minutes = Column(Integer, nullable=True)  # Total enroute time
     sector_breakdown = Column(JSON, nullable=True)  # JSON sector breakdown
     completion_time = Column(TIMESTAMP(timezone=True), nullable=True)  # When flight completed
+    flight_session_id = Column(Integer, nullable=True)  # flight_sessions id of the archived flight
     
     # Constraints
     __table_args__ = (
@@ -449,6 +580,7 @@ class FlightsArchive(Base, TimestampMixin):
         CheckConstraint('total_enroute_sectors >= 0', name='valid_total_sectors'),
         CheckConstraint('total_enroute_time_minutes >= 0', name='valid_enroute_time'),
         Index('idx_flights_archive_callsign', 'callsign'),
+        Index('idx_flights_archive_flight_session_id', 'flight_session_id'),
         Index('idx_flights_archive_logon_time', 'logon_time'),
         Index('idx_flights_archive_last_updated', 'last_updated'),
         Index('idx_flights_archive_deptime', 'deptime'),
@@ -458,6 +590,7 @@ class FlightsArchive(Base, TimestampMixin):
         # Additional indexes that exist in database but not in original models.py
         # Note: JSONB indexes are handled by init.sql with GIN for optimal JSON query performance
         Index('idx_flights_archive_controller_time', 'controller_time_percentage'),
+        {'postgresql_partition_by': 'RANGE (last_updated)'}
     )
 
 # Event listeners for automatic timestamp updates
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Entity Records for VATSIM Data Collection System
+
+Parsed VATSIM flights, controllers and transceivers are held in compact
+__slots__ records instead of dictionaries. VATSIMService creates one record
+per entity when it parses the feed, and that same object flows through the
+filters, the live-state snapshot and the bulk writer, so a poll no longer
+copies every entity into a new dictionary at each stage.
+
+Records are Mappings over their table columns: code written against row
+dictionaries (record.get("callsign"), record["altitude"], model(**record))
+works unchanged, iterating a record yields exactly the columns written to
+the database, and a few read-only aliases keep the field names of the parsed
+API shape (FlightRecord.last_updated, .pilot_name, .position).
+
+INPUTS:
+- VATSIM API v3 pilots, controllers and transceivers entries
+
+OUTPUTS:
+- FlightRecord, ControllerRecord and TransceiverRecord instances
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, ClassVar, Dict, FrozenSet, Iterator, Optional, Tuple
+
+
+class EntityRecord(Mapping):
+    """
+    Base for slot records: a Mapping over COLUMNS plus read-only ALIASES.
+
+    Subclasses are slotted dataclasses; _init_columns() must be called on
+    each of them to build the key lookup and the tuple getter.
+    """
+    __slots__ = ()
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = ()
+    ALIASES: ClassVar[Tuple[str, ...]] = ()
+    _READABLE: ClassVar[FrozenSet[str]] = frozenset()
+    _as_tuple: ClassVar[Any] = None
+
+    @classmethod
+    def _init_columns(cls) -> None:
+        """Derive the key lookup and tuple getter from COLUMNS and ALIASES."""
+        cls._READABLE = frozenset(cls.COLUMNS + cls.ALIASES)
+        cls._as_tuple = attrgetter(*cls.COLUMNS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._READABLE:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.COLUMNS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.COLUMNS)
+
+    def __len__(self) -> int:
+        return len(self.COLUMNS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._READABLE
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of a column or alias, like dict.get."""
+        return getattr(self, key) if key in self._READABLE else default
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Column values in COLUMNS order, as written by COPY."""
+        return self._as_tuple(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary of the columns."""
+        return dict(zip(self.COLUMNS, self._as_tuple(self)))
+
+
+@dataclass(slots=True, eq=False)
+class FlightRecord(EntityRecord):
+    """
+    One pilot of a VATSIM snapshot, shaped as a flights table row.
+
+    flight_session_id is filled in at write time by FlightSessionRegistry.
+    """
+    callsign: str = ""
+    name: Optional[str] = ""
+    aircraft_type: Optional[str] = ""
+    departure: Optional[str] = ""
+    arrival: Optional[str] = ""
+    route: Optional[str] = ""
+    altitude: Optional[int] = 0
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    groundspeed: Optional[int] = None
+    heading: Optional[int] = None
+    cid: Optional[int] = None
+    server: Optional[str] = ""
+    pilot_rating: Optional[int] = None
+    military_rating: Optional[int] = None
+    transponder: Optional[str] = ""
+    logon_time: Optional[datetime] = None
+    last_updated_api: Optional[datetime] = None
+    flight_rules: Optional[str] = ""
+    aircraft_faa: Optional[str] = ""
+    alternate: Optional[str] = ""
+    cruise_tas: Optional[str] = ""
+    planned_altitude: Optional[str] = ""
+    deptime: Optional[str] = ""
+    enroute_time: Optional[str] = ""
+    fuel_time: Optional[str] = ""
+    remarks: Optional[str] = ""
+    flight_session_id: Optional[int] = None
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "callsign", "name", "aircraft_type", "departure", "arrival", "route", "altitude",
+        "latitude", "longitude", "groundspeed", "heading", "cid", "server", "pilot_rating",
+        "military_rating", "transponder", "logon_time", "last_updated_api", "flight_rules",
+        "aircraft_faa", "alternate", "cruise_tas", "planned_altitude", "deptime",
+        "enroute_time", "fuel_time", "remarks", "flight_session_id"
+    )
+    ALIASES: ClassVar[Tuple[str, ...]] = ("last_updated", "pilot_name", "aircraft_short", "position")
+
+    @property
+    def last_updated(self) -> Optional[datetime]:
+        """API last_updated timestamp (stored as last_updated_api)."""
+        return self.last_updated_api
+
+    @property
+    def pilot_name(self) -> str:
+        """Pilot name as returned by the API."""
+        return self.name or ""
+
+    @property
+    def aircraft_short(self) -> Optional[str]:
+        """flight_plan.aircraft_short, from which aircraft_type is taken."""
+        return self.aircraft_type or None
+
+    @property
+    def position(self) -> Optional[Dict[str, float]]:
+        """{"lat", "lng"} of the flight, or None without coordinates."""
+        if self.latitude and self.longitude:
+            return {"lat": float(self.latitude), "lng": float(self.longitude)}
+        return None
+
+    @classmethod
+    def from_mapping(cls, flight: Mapping) -> "FlightRecord":
+        """Build a record from a parsed flight dictionary (last_updated becomes last_updated_api)."""
+        return cls(
+            callsign=flight.get("callsign", ""),
+            name=flight.get("name", ""),
+            aircraft_type=flight.get("aircraft_type", ""),
+            departure=flight.get("departure", ""),
+            arrival=flight.get("arrival", ""),
+            route=flight.get("route", ""),
+            altitude=flight.get("altitude", 0),
+            latitude=flight.get("latitude"),
+            longitude=flight.get("longitude"),
+            groundspeed=flight.get("groundspeed"),
+            heading=flight.get("heading"),
+            cid=flight.get("cid"),
+            server=flight.get("server", ""),
+            pilot_rating=flight.get("pilot_rating"),
+            military_rating=flight.get("military_rating"),
+            transponder=flight.get("transponder", ""),
+            logon_time=flight.get("logon_time"),
+            last_updated_api=flight.get("last_updated"),
+            flight_rules=flight.get("flight_rules", ""),
+            aircraft_faa=flight.get("aircraft_faa", ""),
+            alternate=flight.get("alternate", ""),
+            cruise_tas=flight.get("cruise_tas", ""),
+            planned_altitude=flight.get("planned_altitude", ""),
+            deptime=flight.get("deptime", ""),
+            enroute_time=flight.get("enroute_time", ""),
+            fuel_time=flight.get("fuel_time", ""),
+            remarks=flight.get("remarks", ""),
+            flight_session_id=flight.get("flight_session_id")
+        )
+
+
+@dataclass(slots=True, eq=False)
+class ControllerRecord(EntityRecord):
+    """
+    One controller of a VATSIM snapshot, shaped as a controllers table row.
+
+    controller_session_id is filled in at write time by ControllerSessionRegistry.
+    """
+    callsign: str = ""
+    frequency: Optional[str] = ""
+    cid: Optional[int] = None
+    name: Optional[str] = ""
+    rating: Optional[int] = None
+    facility: Optional[int] = None
+    visual_range: Optional[int] = None
+    text_atis: Any = None
+    server: Optional[str] = ""
+    last_updated: Any = None
+    logon_time: Any = None
+    controller_session_id: Optional[int] = None
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "callsign", "frequency", "cid", "name", "rating", "facility", "visual_range",
+        "text_atis", "server", "last_updated", "logon_time", "controller_session_id"
+    )
+
+    @classmethod
+    def from_mapping(cls, controller: Mapping) -> "ControllerRecord":
+        """Build a record from a parsed controller dictionary."""
+        return cls(
+            callsign=controller.get("callsign", ""),
+            frequency=controller.get("frequency", ""),
+            cid=controller.get("cid"),
+            name=controller.get("name", ""),
+            rating=controller.get("rating"),
+            facility=controller.get("facility"),
+            visual_range=controller.get("visual_range"),
+            text_atis=controller.get("text_atis"),
+            server=controller.get("server", ""),
+            last_updated=controller.get("last_updated"),
+            logon_time=controller.get("logon_time"),
+            controller_session_id=controller.get("controller_session_id")
+        )
+
+
+@dataclass(slots=True, eq=False)
+class TransceiverRecord(EntityRecord):
+    """One transceiver of a VATSIM snapshot, shaped as a transceivers table row."""
+    callsign: str = ""
+    transceiver_id: Optional[int] = 0
+    frequency: Optional[int] = 0
+    position_lat: Optional[float] = None
+    position_lon: Optional[float] = None
+    height_msl: Optional[float] = None
+    height_agl: Optional[float] = None
+    entity_type: str = "flight"
+    entity_id: Optional[int] = None
+    timestamp: Optional[datetime] = None
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "callsign", "transceiver_id", "frequency", "position_lat", "position_lon",
+        "height_msl", "height_agl", "entity_type", "entity_id", "timestamp"
+    )
+
+    @classmethod
+    def from_mapping(cls, transceiver: Mapping) -> "TransceiverRecord":
+        """Build a record from a parsed transceiver dictionary."""
+        return cls(
+            callsign=transceiver.get("callsign", ""),
+            transceiver_id=transceiver.get("transceiver_id", 0),
+            frequency=transceiver.get("frequency", 0),
+            position_lat=transceiver.get("position_lat"),
+            position_lon=transceiver.get("position_lon"),
+            height_msl=transceiver.get("height_msl"),
+            height_agl=transceiver.get("height_agl"),
+            entity_type=transceiver.get("entity_type", "flight"),
+            entity_id=transceiver.get("entity_id"),
+            timestamp=transceiver.get("timestamp")
+        )
+
+
+for _record_type in (FlightRecord, ControllerRecord, TransceiverRecord):
+    _record_type._init_columns()
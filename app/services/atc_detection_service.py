@@ -8,25 +8,51 @@ CTE logic for accurate ATC interaction tracking.
 """
 
 import logging
+from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from sqlalchemy import text
 from app.database import get_database_session
 from app.utils.geographic_utils import is_within_proximity
+from app.utils.atc_matching import FREQUENCY_TOLERANCE_HZ, filter_interval_contacts, find_frequency_matches
+from app.utils.ttl_cache import TTLCache
 from app.services.controller_type_detector import ControllerTypeDetector
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class ATCDetectionContext:
+    """Per-flight lookups shared by every step of one ATC detection."""
+    callsign: str
+    departure: str
+    arrival: str
+    logon_time: datetime
+    completion_time: Optional[datetime]
+    total_records: int
+    
+    @property
+    def key(self) -> Tuple:
+        return (self.callsign, self.departure, self.arrival, self.logon_time)
+    
+    @property
+    def window_end(self) -> datetime:
+        """End of the flight's time window: completion for completed flights, now for active ones."""
+        return self.completion_time or datetime.now(timezone.utc)
+
+
 class ATCDetectionService:
     """Service for detecting ATC interactions with flights."""
     
-    def __init__(self, time_window_seconds: int = None):
+    def __init__(self, time_window_seconds: int = None, interval_detection: Optional[bool] = None):
         """
         Initialize ATC detection service.
         
         Args:
             time_window_seconds: Time window for frequency matching (default: from environment or 180s)
+            interval_detection: Batch detection joins frequency_intervals instead of transceivers
+                (default: from FREQUENCY_INTERVAL_DETECTION or True)
         """
         import os
         
@@ -36,9 +62,20 @@ class ATCDetectionService:
         # Load VATSIM polling interval for accurate time calculations
         self.vatsim_polling_interval_seconds = int(os.getenv("VATSIM_POLLING_INTERVAL", "60"))
         
+        # Frequency intervals folded at ingest replace raw transceiver rows in batch detection
+        if interval_detection is None:
+            interval_detection = os.getenv("FREQUENCY_INTERVAL_DETECTION", "true").lower() == "true"
+        self.interval_detection = interval_detection
+        
         # Initialize controller type detector for dynamic proximity ranges
         self.controller_type_detector = ControllerTypeDetector()
         
+        # Completed flights' detection contexts never change, so reruns reuse them
+        self.context_cache = TTLCache(
+            maxsize=int(os.getenv("ATC_DETECTION_CONTEXT_CACHE_SIZE", "2048")),
+            ttl_seconds=float(os.getenv("ATC_DETECTION_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+        )
+        
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"ATC Detection Service initialized: time_window={self.time_window_seconds}s, VATSIM_polling={self.vatsim_polling_interval_seconds}s, dynamic proximity ranges enabled")
         
@@ -76,14 +113,17 @@ class ATCDetectionService:
         try:
             self.logger.debug(f"Detecting ATC interactions for flight {flight_callsign}")
             
+            # Completion time and record count, looked up once for the whole detection
+            context = await self._get_detection_context(flight_callsign, departure, arrival, logon_time)
+            
             # Get flight transceivers
-            flight_transceivers = await self._get_flight_transceivers(flight_callsign, departure, arrival, logon_time)
+            flight_transceivers = await self._get_flight_transceivers(flight_callsign, departure, arrival, logon_time, context)
             if not flight_transceivers:
                 self.logger.debug(f"No transceiver data found for flight {flight_callsign}")
                 return self._create_empty_atc_data()
             
             # Get ATC transceivers - ✅ Loads only for this flight's time period
-            atc_transceivers = await self._get_atc_transceivers_for_flight(flight_callsign, departure, arrival, logon_time)
+            atc_transceivers = await self._get_atc_transceivers_for_flight(flight_callsign, departure, arrival, logon_time, context)
             if not atc_transceivers:
                 self.logger.debug(f"No ATC transceiver data found for flight {flight_callsign}")
                 return self._create_empty_atc_data()
@@ -92,7 +132,7 @@ class ATCDetectionService:
             frequency_matches = await self._find_frequency_matches(flight_transceivers, atc_transceivers, departure, arrival, logon_time)
             
             # Calculate ATC interaction metrics
-            atc_data = await self._calculate_atc_metrics(flight_callsign, departure, arrival, logon_time, frequency_matches)
+            atc_data = self._build_atc_metrics(frequency_matches, context.total_records)
             
             self.logger.debug(f"ATC detection completed for {flight_callsign}: {len(atc_data.get('controller_callsigns', {}))} controllers")
             return atc_data
@@ -128,21 +168,295 @@ class ATCDetectionService:
             self.logger.error(f"Error in ATC detection with timeout for flight {flight_callsign}: {e}")
             return self._create_empty_atc_data()
     
-    async def _get_flight_transceivers(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime) -> List[Dict[str, Any]]:
+    async def detect_many(self, flights: List[Dict[str, Any]], timeout_seconds: float = 120.0) -> List[Dict[str, Any]]:
+        """
+        Detect ATC interactions for many flights in one pass.
+        
+        Loads flight and ATC transceivers for the union of all flight time windows
+        once, partitions them by callsign in memory and runs the matching engine
+        per flight. Produces the same result as calling
+        detect_flight_atc_interactions for each flight.
+        
+        When every flight carries a flight_session_id, completion times, record
+        counts and flight transceivers are looked up by that id (transceivers
+        through entity_id) instead of by callsign and the flight's key columns.
+        With interval detection enabled such batches join frequency_intervals
+        instead of raw transceiver rows.
+        
+        Args:
+            flights: Dicts with callsign, departure, arrival, logon_time and optionally flight_session_id
+            timeout_seconds: Maximum time for the whole batch
+            
+        Returns:
+            List of ATC interaction data, in the same order as flights
+        """
+        if not flights:
+            return []
+        
+        try:
+            import asyncio
+            return await asyncio.wait_for(self._detect_many_internal(flights), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Batch ATC detection timed out after {timeout_seconds} seconds for {len(flights)} flights")
+        except Exception as e:
+            self.logger.error(f"Error in batch ATC detection for {len(flights)} flights: {e}")
+        return [self._create_empty_atc_data() for _ in flights]
+    
+    async def _detect_many_internal(self, flights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Internal batch detection (called with timeout wrapper)."""
+        from bisect import bisect_left, bisect_right
+        
+        current_time = datetime.now(timezone.utc)
+        by_session = all(flight.get("flight_session_id") is not None for flight in flights)
+        if by_session:
+            flight_keys = [flight["flight_session_id"] for flight in flights]
+        else:
+            flight_keys = [(flight["callsign"], flight["departure"], flight["arrival"], flight["logon_time"]) for flight in flights]
+        callsigns = sorted({flight["callsign"] for flight in flights})
+        
+        async with get_database_session() as session:
+            if by_session:
+                flight_session_ids = sorted(set(flight_keys))
+                completion_times = await self._get_session_completion_times(session, flight_session_ids)
+                record_counts = await self._get_session_record_counts(session, flight_session_ids)
+            else:
+                completion_times = await self._get_completion_times(session, callsigns)
+                record_counts = await self._get_flight_record_counts(session, callsigns)
+            
+            # Per-flight time window: logon to completion (or now for active flights)
+            windows = []
+            for flight, flight_key in zip(flights, flight_keys):
+                completion_time = completion_times.get(flight_key)
+                windows.append((flight["logon_time"], completion_time or current_time))
+                if completion_time is not None:
+                    context_key = (flight["callsign"], flight["departure"], flight["arrival"], flight["logon_time"])
+                    self.context_cache.set(context_key, ATCDetectionContext(*context_key, completion_time, record_counts.get(flight_key, 0)))
+            union_start = min(start for start, _ in windows)
+            union_end = max(end for _, end in windows)
+            
+            if by_session and self.interval_detection:
+                return await self._detect_many_from_intervals(session, flights, flight_keys, windows, record_counts)
+            
+            self.logger.info(f"Loading transceivers for batch ATC detection of {len(flights)} flights: {union_start} to {union_end}")
+            
+            if by_session:
+                # Flight transceivers carry their flight_session_id in entity_id
+                flight_result = await session.execute(text("""
+                    SELECT t.entity_id, t.callsign, t.frequency, t.timestamp, t.position_lat, t.position_lon
+                    FROM transceivers t
+                    WHERE t.entity_type = 'flight'
+                    AND t.entity_id = ANY(:flight_session_ids)
+                    AND t.timestamp >= :window_start
+                    AND t.timestamp <= :window_end
+                    ORDER BY t.entity_id, t.timestamp
+                """), {"flight_session_ids": flight_session_ids, "window_start": union_start, "window_end": union_end})
+            else:
+                flight_result = await session.execute(text("""
+                    SELECT t.callsign, t.frequency, t.timestamp, t.position_lat, t.position_lon
+                    FROM transceivers t
+                    WHERE t.entity_type = 'flight'
+                    AND t.callsign = ANY(:callsigns)
+                    AND t.timestamp >= :window_start
+                    AND t.timestamp <= :window_end
+                    ORDER BY t.callsign, t.timestamp
+                """), {"callsigns": callsigns, "window_start": union_start, "window_end": union_end})
+            flight_rows = flight_result.fetchall()
+            
+            # Controllers active since the earliest logon, with their latest update so
+            # each flight only sees controllers active since its own logon
+            controller_result = await session.execute(text("""
+                SELECT callsign, MAX(last_updated) AS last_updated
+                FROM controllers
+                WHERE facility != 0
+                AND last_updated >= :window_start
+                GROUP BY callsign
+            """), {"window_start": union_start})
+            controller_last_seen = {row.callsign: row.last_updated for row in controller_result.fetchall()}
+            
+            atc_result = await session.execute(text("""
+                SELECT t.callsign, t.frequency, t.timestamp, t.position_lat, t.position_lon
+                FROM transceivers t
+                WHERE t.entity_type = 'atc'
+                AND t.callsign = ANY(:controller_callsigns)
+                AND t.timestamp >= :window_start
+                AND t.timestamp <= :window_end
+                ORDER BY t.timestamp
+            """), {"controller_callsigns": list(controller_last_seen), "window_start": union_start, "window_end": union_end})
+            atc_rows = atc_result.fetchall()
+        
+        # Partition flight transceivers by flight session or callsign (rows arrive ordered by it, then timestamp)
+        flight_transceivers_by_key = {}
+        for row in flight_rows:
+            row_key = row.entity_id if by_session else row.callsign
+            flight_transceivers_by_key.setdefault(row_key, []).append(self._transceiver_from_row(row))
+        atc_transceivers = [self._transceiver_from_row(row) for row in atc_rows]
+        atc_timestamps = [transceiver["timestamp"] for transceiver in atc_transceivers]
+        
+        results = []
+        for flight, flight_key, (window_start, window_end) in zip(flights, flight_keys, windows):
+            callsign_transceivers = flight_transceivers_by_key.get(flight_key if by_session else flight["callsign"], [])
+            flight_timestamps = [transceiver["timestamp"] for transceiver in callsign_transceivers]
+            flight_transceivers = callsign_transceivers[
+                bisect_left(flight_timestamps, window_start):bisect_right(flight_timestamps, window_end)
+            ]
+            if not flight_transceivers:
+                results.append(self._create_empty_atc_data())
+                continue
+            
+            flight_atc_transceivers = [
+                transceiver for transceiver in atc_transceivers[
+                    bisect_left(atc_timestamps, window_start):bisect_right(atc_timestamps, window_end)
+                ]
+                if controller_last_seen[transceiver["callsign"]] >= flight["logon_time"]
+            ]
+            if not flight_atc_transceivers:
+                results.append(self._create_empty_atc_data())
+                continue
+            
+            frequency_matches = await self._find_frequency_matches(
+                flight_transceivers, flight_atc_transceivers, flight["departure"], flight["arrival"], flight["logon_time"]
+            )
+            results.append(self._build_atc_metrics(frequency_matches, record_counts.get(flight_key, 0)))
+        
+        self.logger.info(f"Batch ATC detection completed for {len(flights)} flights: {len(flight_rows)} flight and {len(atc_rows)} ATC transceivers loaded once")
+        return results
+    
+    async def _detect_many_from_intervals(self, session, flights: List[Dict[str, Any]], flight_session_ids: List[int],
+                                          windows: List[Tuple[datetime, datetime]],
+                                          record_counts: Dict[int, int]) -> List[Dict[str, Any]]:
+        """Batch detection as an overlap join of flight and ATC frequency intervals."""
+        union_start = min(start for start, _ in windows)
+        union_end = max(end for _, end in windows)
+        
+        controller_result = await session.execute(text("""
+            SELECT callsign, MAX(last_updated) AS last_updated
+            FROM controllers
+            WHERE facility != 0
+            AND last_updated >= :window_start
+            GROUP BY callsign
+        """), {"window_start": union_start})
+        controller_last_seen = {row.callsign: row.last_updated for row in controller_result.fetchall()}
+        
+        # ATC intervals widened by the time window on both sides, so an overlap means some pair of
+        # observations was within the window; the contact is the overlap clipped to that widening
+        contact_result = await session.execute(text("""
+            SELECT f.entity_id, f.callsign AS flight_callsign, a.callsign AS atc_callsign,
+                   f.frequency, a.frequency AS atc_frequency,
+                   GREATEST(f.interval_start, a.interval_start - make_interval(secs => :time_window)) AS contact_start,
+                   LEAST(f.interval_end, a.interval_end + make_interval(secs => :time_window)) AS contact_end,
+                   f.position_lat AS flight_lat, f.position_lon AS flight_lon,
+                   a.position_lat AS atc_lat, a.position_lon AS atc_lon
+            FROM frequency_intervals f
+            JOIN frequency_intervals a
+              ON a.entity_type = 'atc'
+             AND a.frequency BETWEEN f.frequency - :tolerance AND f.frequency + :tolerance
+             AND a.active_during && tstzrange(
+                    f.interval_start - make_interval(secs => :time_window),
+                    f.interval_end + make_interval(secs => :time_window), '[]')
+            WHERE f.entity_type = 'flight'
+            AND f.entity_id = ANY(:flight_session_ids)
+            AND f.active_during && tstzrange(:window_start, :window_end, '[]')
+            AND a.callsign = ANY(:controller_callsigns)
+            ORDER BY f.entity_id, contact_start
+        """), {
+            "flight_session_ids": sorted(set(flight_session_ids)),
+            "controller_callsigns": list(controller_last_seen),
+            "window_start": union_start,
+            "window_end": union_end,
+            "time_window": float(self.time_window_seconds),
+            "tolerance": FREQUENCY_TOLERANCE_HZ
+        })
+        contact_rows = contact_result.fetchall()
+        
+        contacts_by_session: Dict[int, List[Dict[str, Any]]] = {}
+        for row in contact_rows:
+            contacts_by_session.setdefault(row.entity_id, []).append(dict(row._mapping))
+        
+        results = []
+        for flight, flight_session_id, (window_start, window_end) in zip(flights, flight_session_ids, windows):
+            contacts = []
+            for contact in contacts_by_session.get(flight_session_id, []):
+                if controller_last_seen[contact["atc_callsign"]] < flight["logon_time"]:
+                    continue
+                contact_start = max(contact["contact_start"], window_start)
+                contact_end = min(contact["contact_end"], window_end)
+                if contact_start <= contact_end:
+                    contacts.append({**contact, "contact_start": contact_start, "contact_end": contact_end})
+            contacts = filter_interval_contacts(contacts, self._get_proximity_threshold)
+            results.append(self._build_interval_atc_metrics(contacts, record_counts.get(flight_session_id, 0)))
+        
+        self.logger.info(f"Batch ATC detection completed for {len(flights)} flights: {len(contact_rows)} frequency interval contacts loaded once")
+        return results
+    
+    async def _get_completion_times(self, session, callsigns: List[str]) -> Dict[Tuple, datetime]:
+        """Get the latest summary completion time per (callsign, departure, arrival, logon_time)."""
+        result = await session.execute(text("""
+            SELECT DISTINCT ON (callsign, departure, arrival, logon_time)
+                   callsign, departure, arrival, logon_time, completion_time
+            FROM flight_summaries
+            WHERE callsign = ANY(:callsigns)
+            AND completion_time IS NOT NULL
+            ORDER BY callsign, departure, arrival, logon_time, created_at DESC
+        """), {"callsigns": callsigns})
+        return {
+            (row.callsign, row.departure, row.arrival, row.logon_time): row.completion_time
+            for row in result.fetchall()
+        }
+    
+    async def _get_flight_record_counts(self, session, callsigns: List[str]) -> Dict[Tuple, int]:
+        """Get flight record counts per (callsign, departure, arrival, logon_time)."""
+        result = await session.execute(text("""
+            SELECT callsign, departure, arrival, logon_time, COUNT(*) AS record_count
+            FROM flights
+            WHERE callsign = ANY(:callsigns)
+            GROUP BY callsign, departure, arrival, logon_time
+        """), {"callsigns": callsigns})
+        return {
+            (row.callsign, row.departure, row.arrival, row.logon_time): row.record_count
+            for row in result.fetchall()
+        }
+    
+    async def _get_session_completion_times(self, session, flight_session_ids: List[int]) -> Dict[int, datetime]:
+        """Get the latest summary completion time per flight_session_id."""
+        result = await session.execute(text("""
+            SELECT DISTINCT ON (flight_session_id) flight_session_id, completion_time
+            FROM flight_summaries
+            WHERE flight_session_id = ANY(:flight_session_ids)
+            AND completion_time IS NOT NULL
+            ORDER BY flight_session_id, created_at DESC
+        """), {"flight_session_ids": flight_session_ids})
+        return {row.flight_session_id: row.completion_time for row in result.fetchall()}
+    
+    async def _get_session_record_counts(self, session, flight_session_ids: List[int]) -> Dict[int, int]:
+        """Get flight record counts per flight_session_id."""
+        result = await session.execute(text("""
+            SELECT flight_session_id, COUNT(*) AS record_count
+            FROM flights
+            WHERE flight_session_id = ANY(:flight_session_ids)
+            GROUP BY flight_session_id
+        """), {"flight_session_ids": flight_session_ids})
+        return {row.flight_session_id: row.record_count for row in result.fetchall()}
+    
+    def _transceiver_from_row(self, row) -> Dict[str, Any]:
+        """Convert a transceiver query row to the dict shape used for matching."""
+        return {
+            "callsign": row.callsign,
+            "frequency": row.frequency,
+            "frequency_mhz": row.frequency / 1000000.0,  # Convert Hz to MHz
+            "timestamp": row.timestamp,
+            "position_lat": row.position_lat,
+            "position_lon": row.position_lon
+        }
+    
+    async def _get_flight_transceivers(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime, context: Optional[ATCDetectionContext] = None) -> List[Dict[str, Any]]:
         """Get transceiver data for a specific flight across ALL sessions."""
         try:
-            from datetime import timezone
+            if context is None:
+                context = await self._get_detection_context(flight_callsign, departure, arrival, logon_time)
             
-            # ✅ FIX: Calculate the full flight time window
+            # ✅ FIX: Calculate the full flight time window (completion time for completed flights)
             flight_start = logon_time
-            current_time = datetime.now(timezone.utc)
-            
-            # Get completion time for completed flights
-            completion_time = await self._get_flight_completion_time(flight_callsign, departure, arrival, logon_time)
-            if completion_time:
-                flight_end = completion_time
-            else:
-                flight_end = current_time
+            flight_end = context.window_end
             
             self.logger.info(f"Loading flight transceivers for {flight_callsign}: {flight_start} to {flight_end}")
             
@@ -181,21 +495,15 @@ class ATCDetectionService:
             self.logger.error(f"Error getting flight transceivers: {e}")
             return []
     
-    async def _get_atc_transceivers_for_flight(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime) -> List[Dict[str, Any]]:
+    async def _get_atc_transceivers_for_flight(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime, context: Optional[ATCDetectionContext] = None) -> List[Dict[str, Any]]:
         """Get ATC transceiver data for a specific flight's time period only."""
         try:
-            from datetime import timezone
+            if context is None:
+                context = await self._get_detection_context(flight_callsign, departure, arrival, logon_time)
             
-            # Calculate time window: from flight start to current time
+            # Calculate time window: from flight start to completion time (or now for active flights)
             flight_start = logon_time
-            current_time = datetime.now(timezone.utc)
-            
-            # For completed flights, use completion time instead of current time
-            completion_time = await self._get_flight_completion_time(flight_callsign, departure, arrival, logon_time)
-            if completion_time:
-                atc_end = completion_time
-            else:
-                atc_end = current_time
+            atc_end = context.window_end
             
             self.logger.info(f"Loading ATC transceivers for flight {flight_callsign}: {flight_start} to {atc_end}")
             
@@ -241,6 +549,58 @@ class ATCDetectionService:
             self.logger.error(f"Error getting ATC transceivers for flight {flight_callsign}: {e}")
             return []
     
+    async def _get_detection_context(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime) -> ATCDetectionContext:
+        """Get completion time and record count for a flight in one round trip, cached for completed flights."""
+        key = (flight_callsign, departure, arrival, logon_time)
+        context = self.context_cache.get(key)
+        if context is not None:
+            return context
+        
+        completion_time = None
+        total_records = 0
+        try:
+            query = """
+                SELECT
+                    (SELECT completion_time
+                     FROM flight_summaries
+                     WHERE callsign = :callsign
+                     AND departure = :departure
+                     AND arrival = :arrival
+                     AND logon_time = :logon_time
+                     AND completion_time IS NOT NULL
+                     ORDER BY created_at DESC
+                     LIMIT 1) AS completion_time,
+                    (SELECT COUNT(*)
+                     FROM flights
+                     WHERE callsign = :callsign
+                     AND departure = :departure
+                     AND arrival = :arrival
+                     AND logon_time = :logon_time) AS record_count
+            """
+            
+            async with get_database_session() as session:
+                result = await session.execute(text(query), {
+                    "callsign": flight_callsign,
+                    "departure": departure,
+                    "arrival": arrival,
+                    "logon_time": logon_time
+                })
+                
+                row = result.fetchone()
+                if row:
+                    completion_time = row.completion_time
+                    total_records = row.record_count or 0
+                
+        except Exception as e:
+            self.logger.warning(f"Could not load detection context for flight {flight_callsign}: {e}")
+        
+        context = ATCDetectionContext(flight_callsign, departure, arrival, logon_time, completion_time, total_records)
+        
+        # Active flights keep growing, only completed flights are safe to reuse
+        if completion_time is not None:
+            self.context_cache.set(key, context)
+        return context
+    
     async def _get_flight_completion_time(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime) -> Optional[datetime]:
         """Get completion time for completed flights from flight_summaries table."""
         try:
@@ -272,149 +632,28 @@ class ATCDetectionService:
             return None
     
     async def _find_frequency_matches(self, flight_transceivers: List[Dict], atc_transceivers: List[Dict], departure: str, arrival: str, logon_time: datetime) -> List[Dict[str, Any]]:
-        """Find frequency matches using controller-specific proximity ranges."""
+        """Find frequency matches in-process using controller-specific proximity ranges."""
         try:
-            # 1. Group ATC transceivers by controller callsign
-            atc_by_callsign = self._group_atc_by_callsign(atc_transceivers)
-            
-            # 2. Process each controller with its specific proximity range
-            all_matches = []
-            for controller_callsign, controllers in atc_by_callsign.items():
-                # Get controller type and proximity range
-                controller_info = self.controller_type_detector.get_controller_info(controller_callsign)
-                proximity_range = controller_info["proximity_threshold"]
-                
-                self.logger.debug(f"Processing controller {controller_callsign} as {controller_info['type']} with {proximity_range}nm proximity")
-                
-                # 3. Run proximity query for this specific controller
-                controller_matches = await self._find_matches_for_controller(
-                    flight_transceivers, controllers, proximity_range, departure, arrival, logon_time
-                )
-                all_matches.extend(controller_matches)
+            # Sort/sweep join over the already loaded transceivers - no extra queries per controller
+            matches = find_frequency_matches(
+                flight_transceivers,
+                atc_transceivers,
+                self.time_window_seconds,
+                self._get_proximity_threshold
+            )
             
-            self.logger.info(f"Controller-specific proximity processing completed: {len(all_matches)} total matches found")
-            return all_matches
+            self.logger.info(f"Controller-specific proximity processing completed: {len(matches)} total matches found")
+            return matches
             
         except Exception as e:
             self.logger.error(f"Error in controller-specific frequency matching: {e}")
             return []
     
-    def _group_atc_by_callsign(self, atc_transceivers: List[Dict]) -> Dict[str, List[Dict]]:
-        """Group ATC transceivers by controller callsign."""
-        grouped = {}
-        for transceiver in atc_transceivers:
-            callsign = transceiver["callsign"]
-            if callsign not in grouped:
-                grouped[callsign] = []
-            grouped[callsign].append(transceiver)
-        return grouped
-    
-    async def _find_matches_for_controller(self, flight_transceivers: List[Dict], controller_transceivers: List[Dict], proximity_threshold_nm: float, departure: str, arrival: str, logon_time: datetime) -> List[Dict[str, Any]]:
-        """Find frequency matches for a specific controller with its proximity range."""
-        try:
-            # OPTIMIZED: Pre-filter by time window before expensive JOINs
-            query = """
-                WITH time_filtered_flights AS (
-                    SELECT t.callsign, t.frequency/1000000.0 as frequency_mhz, t.timestamp, t.position_lat, t.position_lon 
-                    FROM transceivers t 
-                    WHERE t.entity_type = 'flight' 
-                    AND t.callsign = :flight_callsign
-                    AND t.timestamp >= :flight_start_time  -- Pre-filter by time
-                    AND t.timestamp <= :flight_end_time
-                    AND EXISTS (
-                        SELECT 1 FROM flights f 
-                        WHERE f.callsign = t.callsign 
-                        AND f.departure = :departure 
-                        AND f.arrival = :arrival 
-                        AND f.logon_time = :logon_time
-                    )
-                ),
-                time_filtered_atc AS (
-                    SELECT t.callsign, t.frequency/1000000.0 as frequency_mhz, t.timestamp, t.position_lat, t.position_lon 
-                    FROM transceivers t 
-                    WHERE t.entity_type = 'atc' 
-                    AND t.callsign = :controller_callsign
-                    AND t.timestamp >= :atc_start_time  -- Pre-filter by time
-                    AND t.timestamp <= :atc_end_time
-                ),
-                frequency_matches AS (
-                    SELECT ft.callsign as flight_callsign, ft.frequency_mhz, ft.timestamp as flight_time,
-                           at.callsign as atc_callsign, at.timestamp as atc_time,
-                           at.position_lat as atc_lat, at.position_lon as atc_lon,
-                           ft.position_lat as flight_lat, ft.position_lon as flight_lon
-                    FROM time_filtered_flights ft 
-                    JOIN time_filtered_atc at
-                      ON ABS(ft.frequency_mhz - at.frequency_mhz) <= 0.005  -- ~5 kHz tolerance
-                    WHERE ABS(EXTRACT(EPOCH FROM (ft.timestamp - at.timestamp))) <= :time_window
-                    AND (
-                        -- Haversine formula with controller-specific proximity
-                        (3440.065 * ACOS(
-                            LEAST(1, GREATEST(-1, 
-                                SIN(RADIANS(ft.position_lat)) * SIN(RADIANS(at.position_lat)) +
-                                COS(RADIANS(ft.position_lat)) * COS(RADIANS(at.position_lat)) * 
-                                COS(RADIANS(ft.position_lon - at.position_lon))
-                            ))
-                        )) <= :proximity_threshold_nm
-                    )
-                )
-                SELECT 
-                    flight_callsign,
-                    atc_callsign,
-                    frequency_mhz,
-                    flight_time,
-                    atc_time,
-                    flight_lat,
-                    flight_lon,
-                    atc_lat,
-                    atc_lon,
-                    ABS(EXTRACT(EPOCH FROM (flight_time - atc_time))) as time_diff_seconds
-                FROM frequency_matches
-                ORDER BY flight_time, atc_time
-            """
-            
-            # Execute with controller-specific proximity and time window pre-filtering
-            async with get_database_session() as session:
-                # Calculate time windows for pre-filtering (much more efficient than JOIN filtering)
-                flight_start_time = logon_time - timedelta(seconds=self.time_window_seconds)
-                flight_end_time = logon_time + timedelta(seconds=self.time_window_seconds)
-                atc_start_time = flight_start_time - timedelta(seconds=self.time_window_seconds)
-                atc_end_time = flight_end_time + timedelta(seconds=self.time_window_seconds)
-                
-                result = await session.execute(text(query), {
-                    "flight_callsign": flight_transceivers[0]["callsign"] if flight_transceivers else "",
-                    "departure": departure,
-                    "arrival": arrival,
-                    "logon_time": logon_time,
-                    "controller_callsign": controller_transceivers[0]["callsign"] if controller_transceivers else "",
-                    "time_window": self.time_window_seconds,
-                    "proximity_threshold_nm": proximity_threshold_nm,  # ✅ Dynamic per controller
-                    "flight_start_time": flight_start_time,  # ✅ Pre-filter flights
-                    "flight_end_time": flight_end_time,     # ✅ Pre-filter flights
-                    "atc_start_time": atc_start_time,       # ✅ Pre-filter ATC
-                    "atc_end_time": atc_end_time           # ✅ Pre-filter ATC
-                })
-                
-                matches = []
-                for row in result.fetchall():
-                    matches.append({
-                        "flight_callsign": row.flight_callsign,
-                        "atc_callsign": row.atc_callsign,
-                        "frequency_mhz": row.frequency_mhz,
-                        "flight_time": row.flight_time,
-                        "atc_time": row.atc_time,
-                        "time_diff_seconds": row.time_diff_seconds,
-                        "flight_lat": row.flight_lat,
-                        "flight_lon": row.flight_lon,
-                        "atc_lat": row.atc_lat,
-                        "atc_lon": row.atc_lon
-                    })
-                
-                self.logger.debug(f"Controller {controller_transceivers[0]['callsign'] if controller_transceivers else 'unknown'} query completed: {len(matches)} matches found with {proximity_threshold_nm}nm proximity")
-                return matches
-                
-        except Exception as e:
-            self.logger.error(f"Error in controller-specific query: {e}")
-            return []
+    def _get_proximity_threshold(self, controller_callsign: str) -> float:
+        """Get the proximity range (nm) for a controller from its callsign type."""
+        controller_info = self.controller_type_detector.get_controller_info(controller_callsign)
+        self.logger.debug(f"Processing controller {controller_callsign} as {controller_info['type']} with {controller_info['proximity_threshold']}nm proximity")
+        return controller_info["proximity_threshold"]
     
     async def _calculate_atc_metrics(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime, frequency_matches: List[Dict]) -> Dict[str, Any]:
         """Calculate ATC interaction metrics for a flight."""
@@ -424,7 +663,16 @@ class ATCDetectionService:
             
             # Get total flight records for percentage calculation
             total_records = await self._get_flight_record_count(flight_callsign, departure, arrival, logon_time)
-            if total_records == 0:
+            return self._build_atc_metrics(frequency_matches, total_records)
+            
+        except Exception as e:
+            self.logger.error(f"Error calculating ATC metrics: {e}")
+            return self._create_empty_atc_data()
+    
+    def _build_atc_metrics(self, frequency_matches: List[Dict], total_records: int) -> Dict[str, Any]:
+        """Build ATC interaction metrics from frequency matches and the flight's record count."""
+        try:
+            if not frequency_matches or total_records == 0:
                 return self._create_empty_atc_data()
             
             # Group matches by ATC callsign and calculate timing
@@ -451,29 +699,104 @@ class ATCDetectionService:
                 # Convert polling interval from seconds to minutes for accurate time calculation
                 controller["time_minutes"] = controller["contact_count"] * (self.vatsim_polling_interval_seconds / 60.0)
             
-            # Calculate total controller time percentage
-            total_controller_time = sum(ctrl["time_minutes"] for ctrl in controller_data.values())
+            return self._summarise_controller_data(controller_data, total_records, len(frequency_matches))
             
-            # Calculate percentage based on actual time, not record count
-            # This represents the percentage of flight time that had ATC contact
-            controller_time_percentage = min(100.0, (total_controller_time / total_records) * 100) if total_records > 0 else 0.0
+        except Exception as e:
+            self.logger.error(f"Error calculating ATC metrics: {e}")
+            return self._create_empty_atc_data()
+    
+    def _build_interval_atc_metrics(self, contacts: List[Dict], total_records: int) -> Dict[str, Any]:
+        """Build ATC interaction metrics from frequency interval contacts and the flight's record count."""
+        try:
+            if not contacts or total_records == 0:
+                return self._create_empty_atc_data()
+            
+            # A contact spans the polls between its start and end, inclusive
+            polling_seconds = self.vatsim_polling_interval_seconds
+            controller_data = {}
+            for contact in contacts:
+                atc_callsign = contact["atc_callsign"]
+                polls = int((contact["contact_end"] - contact["contact_start"]).total_seconds() // polling_seconds) + 1
+                
+                if atc_callsign not in controller_data:
+                    controller_data[atc_callsign] = {
+                        "callsign": atc_callsign,
+                        "type": self._detect_controller_type(atc_callsign),
+                        "time_minutes": 0,
+                        "first_contact": contact["contact_start"],
+                        "last_contact": contact["contact_end"],
+                        "contact_count": 0
+                    }
+                
+                controller = controller_data[atc_callsign]
+                controller["first_contact"] = min(controller["first_contact"], contact["contact_start"])
+                controller["last_contact"] = max(controller["last_contact"], contact["contact_end"])
+                controller["contact_count"] += polls
             
-            # Calculate airborne controller time percentage (same as total for now, can be enhanced later)
-            # This represents the percentage of airborne time that had ATC contact
-            airborne_controller_time_percentage = controller_time_percentage
+            for controller in controller_data.values():
+                controller["time_minutes"] = controller["contact_count"] * (polling_seconds / 60.0)
+                controller["first_contact"] = controller["first_contact"].isoformat()
+                controller["last_contact"] = controller["last_contact"].isoformat()
             
-            return {
-                "controller_callsigns": controller_data,
-                "controller_time_percentage": round(controller_time_percentage, 1),
-                "airborne_controller_time_percentage": round(airborne_controller_time_percentage, 1),
-                "total_controller_time_minutes": total_controller_time,
-                "total_flight_records": total_records,
-                "interactions_detected": len(frequency_matches)
-            }
+            return self._summarise_controller_data(controller_data, total_records, len(contacts))
             
         except Exception as e:
-            self.logger.error(f"Error calculating ATC metrics: {e}")
+            self.logger.error(f"Error calculating interval ATC metrics: {e}")
+            return self._create_empty_atc_data()
+    
+    def build_contact_metrics(self, contacts: Dict[str, Dict[str, Any]], total_records: int) -> Dict[str, Any]:
+        """
+        Build ATC interaction metrics from per-controller contacts accumulated at ingest.
+
+        Args:
+            contacts: atc_callsign -> contact_count (polls in contact), first_contact, last_contact
+            total_records: Number of records of the flight
+        """
+        try:
+            if not contacts or total_records == 0:
+                return self._create_empty_atc_data()
+
+            controller_data = {
+                atc_callsign: {
+                    "callsign": atc_callsign,
+                    "type": self._detect_controller_type(atc_callsign),
+                    "time_minutes": contact["contact_count"] * (self.vatsim_polling_interval_seconds / 60.0),
+                    "first_contact": contact["first_contact"].isoformat(),
+                    "last_contact": contact["last_contact"].isoformat(),
+                    "contact_count": contact["contact_count"]
+                }
+                for atc_callsign, contact in contacts.items()
+            }
+
+            return self._summarise_controller_data(
+                controller_data, total_records, sum(contact["contact_count"] for contact in contacts.values())
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error calculating accumulated ATC metrics: {e}")
             return self._create_empty_atc_data()
+
+    def _summarise_controller_data(self, controller_data: Dict[str, Dict], total_records: int, interactions: int) -> Dict[str, Any]:
+        """Turn per-controller contact data into the flight's ATC interaction metrics."""
+        # Calculate total controller time percentage
+        total_controller_time = sum(ctrl["time_minutes"] for ctrl in controller_data.values())
+        
+        # Calculate percentage based on actual time, not record count
+        # This represents the percentage of flight time that had ATC contact
+        controller_time_percentage = min(100.0, (total_controller_time / total_records) * 100) if total_records > 0 else 0.0
+        
+        # Calculate airborne controller time percentage (same as total for now, can be enhanced later)
+        # This represents the percentage of airborne time that had ATC contact
+        airborne_controller_time_percentage = controller_time_percentage
+        
+        return {
+            "controller_callsigns": controller_data,
+            "controller_time_percentage": round(controller_time_percentage, 1),
+            "airborne_controller_time_percentage": round(airborne_controller_time_percentage, 1),
+            "total_controller_time_minutes": total_controller_time,
+            "total_flight_records": total_records,
+            "interactions_detected": interactions
+        }
     
     async def _get_flight_record_count(self, flight_callsign: str, departure: str, arrival: str, logon_time: datetime) -> int:
         """Get total record count for a flight."""
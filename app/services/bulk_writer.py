@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Bulk Writer for VATSIM Data Collection System
+
+This module writes the rows produced by each VATSIM poll (flights, controllers,
+transceivers) to PostgreSQL using the asyncpg COPY protocol, with the original
+ORM ``session.add_all`` path kept as a switchable fallback.
+
+INPUTS:
+- An open SQLAlchemy AsyncSession (asyncpg driver)
+- A SQLAlchemy model class identifying the target table
+- A list of rows sharing the same keys: entity records (app.records) or dictionaries
+
+OUTPUTS:
+- Rows written inside the caller's transaction
+- Write statistics (rows, seconds, mode used)
+
+CONFIGURATION:
+- INGEST_WRITE_MODE: "copy" (default) streams rows with copy_records_to_table,
+  "orm" uses session.add_all. COPY failures fall back to the ORM path.
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_config
+from app.records import EntityRecord
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.bulk_writer")
+
+WRITE_MODES = ("copy", "orm")
+
+
+class BulkWriter:
+    """Writes per-poll entity rows using COPY with an ORM fallback."""
+
+    def __init__(self, mode: Optional[str] = None):
+        """
+        Initialize the bulk writer.
+
+        Args:
+            mode: "copy" or "orm"; defaults to INGEST_WRITE_MODE
+        """
+        self.logger = logger
+        self.mode = (mode or get_config().ingest.write_mode).lower()
+        if self.mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported bulk write mode: {self.mode}")
+
+        self.stats = {
+            "copy_writes": 0,
+            "orm_writes": 0,
+            "copy_fallbacks": 0,
+            "rows_written": 0,
+            "last_rows_per_second": 0.0
+        }
+
+    async def write_rows(self, session: AsyncSession, model: Type, rows: List[Dict[str, Any]]) -> int:
+        """
+        Write rows for a single table inside the caller's transaction.
+
+        The caller owns the transaction; nothing is committed here.
+
+        Args:
+            session: Open database session
+            model: SQLAlchemy model class for the target table
+            rows: Entity records or row dictionaries; every row must have the same keys
+
+        Returns:
+            int: Number of rows written
+        """
+        if not rows:
+            return 0
+
+        start_time = time.time()
+
+        if self.mode == "copy":
+            try:
+                await self._copy_rows(session, model, rows)
+                self.stats["copy_writes"] += 1
+            except Exception as e:
+                # The savepoint has been rolled back, the outer transaction is intact
+                self.logger.warning(f"COPY into {model.__tablename__} failed, falling back to ORM insert: {e}")
+                self.stats["copy_fallbacks"] += 1
+                await self._orm_rows(session, model, rows)
+                self.stats["orm_writes"] += 1
+        else:
+            await self._orm_rows(session, model, rows)
+            self.stats["orm_writes"] += 1
+
+        elapsed = time.time() - start_time
+        self.stats["rows_written"] += len(rows)
+        self.stats["last_rows_per_second"] = len(rows) / elapsed if elapsed > 0 else 0.0
+        self.logger.debug(f"Wrote {len(rows)} rows to {model.__tablename__} via {self.mode} in {elapsed:.3f}s")
+
+        return len(rows)
+
+    async def _copy_rows(self, session: AsyncSession, model: Type, rows: List[Dict[str, Any]]) -> None:
+        """Stream rows with asyncpg copy_records_to_table inside a savepoint."""
+        columns = list(rows[0].keys())
+        if isinstance(rows[0], EntityRecord):
+            # Slot records yield their column values directly, in keys() order
+            records = [row.as_tuple() for row in rows]
+        else:
+            records = [tuple(row.get(column) for column in columns) for row in rows]
+
+        # The SAVEPOINT also starts the asyncpg transaction, so COPY joins it
+        async with session.begin_nested():
+            driver_connection = await self._get_driver_connection(session)
+            await driver_connection.copy_records_to_table(
+                model.__tablename__,
+                records=records,
+                columns=columns
+            )
+
+    async def _orm_rows(self, session: AsyncSession, model: Type, rows: List[Dict[str, Any]]) -> None:
+        """Original ORM path: build model instances and flush them."""
+        session.add_all([model(**row) for row in rows])
+        await session.flush()
+
+    async def _get_driver_connection(self, session: AsyncSession):
+        """Return the raw asyncpg connection behind the session."""
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bulk writer statistics."""
+        return {"mode": self.mode, **self.stats}
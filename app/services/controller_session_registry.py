@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Controller Session Registry for VATSIM Data Collection System
+
+Assigns every controller row a controller_session_id at ingest, applying the
+reconnection rule as the rows arrive: a new logon of the same (callsign, cid)
+within CONTROLLER_RECONNECTION_THRESHOLD_MINUTES of the session's last update
+keeps the session's id, anything else opens a new session.
+
+Open sessions are kept in memory and persisted in controller_sessions. A poll
+runs at most two statements: one INSERT ... SELECT FROM unnest(...) RETURNING
+for new sessions and one UPDATE ... FROM unnest(...) moving last_seen of the
+sessions still online. Session-end detection reads controller_sessions, and
+summaries, archiving and deletion look controller rows up by the id.
+
+INPUTS:
+- Prepared controller rows of one poll (ControllerRecord or dictionaries)
+
+OUTPUTS:
+- controller_session_id set on every row
+- Registry statistics
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.controller_session_registry")
+
+# Controller identity: reconnections are merged per (callsign, cid)
+ControllerIdentity = Tuple[str, Optional[int]]
+
+
+@dataclass(slots=True)
+class OpenControllerSession:
+    """In-memory state of a controller session that has not been summarised."""
+    controller_session_id: int
+    logon_time: Optional[datetime]
+    last_seen: datetime
+
+
+class ControllerSessionRegistry:
+    """In-memory map of controllers to their open session, backed by controller_sessions."""
+
+    def __init__(self, reconnection_threshold_minutes: int = 5):
+        self.logger = logger
+        self.reconnection_threshold = timedelta(minutes=reconnection_threshold_minutes)
+        self._open: Dict[ControllerIdentity, OpenControllerSession] = {}
+        self._loaded = False  # Seeded from controller_sessions on first poll
+        self.stats = {
+            "assigned": 0,
+            "registered": 0,
+            "merged": 0
+        }
+
+    async def assign(self, bulk_controllers: List[Mapping[str, Any]], session: AsyncSession) -> int:
+        """
+        Set controller_session_id on every controller row, opening sessions as needed (no commit).
+
+        Args:
+            bulk_controllers: Rows from DataService._prepare_controller_rows
+            session: Database session owning the poll's transaction
+
+        Returns:
+            int: Number of new sessions opened
+        """
+        if not bulk_controllers:
+            return 0
+
+        if not self._loaded:
+            await self._load(session)
+
+        new_sessions: Dict[ControllerIdentity, Tuple[Optional[datetime], datetime]] = {}
+        for controller_data in bulk_controllers:
+            identity = (controller_data.get("callsign"), controller_data.get("cid"))
+            logon_time = controller_data.get("logon_time")
+            last_seen = controller_data.get("last_updated") or logon_time or datetime.now(timezone.utc)
+
+            state = self._open.get(identity)
+            if state is not None and self._continues(state, logon_time):
+                if logon_time != state.logon_time:
+                    state.logon_time = logon_time
+                    self.stats["merged"] += 1
+                state.last_seen = max(state.last_seen, last_seen)
+            elif identity not in new_sessions:
+                new_sessions[identity] = (logon_time, last_seen)
+
+        if new_sessions:
+            await self._register(new_sessions, session)
+        await self._touch(bulk_controllers, new_sessions, session)
+
+        for controller_data in bulk_controllers:
+            state = self._open.get((controller_data.get("callsign"), controller_data.get("cid")))
+            controller_data["controller_session_id"] = state.controller_session_id if state else None
+
+        self.stats["assigned"] += len(bulk_controllers)
+        return len(new_sessions)
+
+    def _continues(self, state: OpenControllerSession, logon_time: Optional[datetime]) -> bool:
+        """Same connection, or a reconnection within the threshold of the session's last update."""
+        if logon_time is None or logon_time == state.logon_time:
+            return True
+        if state.logon_time is not None and logon_time < state.logon_time:
+            return False
+        return logon_time <= state.last_seen + self.reconnection_threshold
+
+    async def _load(self, session: AsyncSession) -> None:
+        """Seed the open sessions from controller_sessions after a restart or invalidate()."""
+        result = await session.execute(text("""
+            SELECT DISTINCT ON (callsign, cid)
+                controller_session_id, callsign, cid, last_logon_time, last_seen
+            FROM controller_sessions
+            WHERE summarised_at IS NULL
+            ORDER BY callsign, cid, last_seen DESC
+        """))
+        self._open = {
+            (row.callsign, row.cid): OpenControllerSession(row.controller_session_id, row.last_logon_time, row.last_seen)
+            for row in result.fetchall()
+        }
+        self._loaded = True
+        self.logger.debug(f"Loaded {len(self._open)} open controller sessions")
+
+    async def _register(self, new_sessions: Dict[ControllerIdentity, Tuple[Optional[datetime], datetime]],
+                        session: AsyncSession) -> None:
+        """Open the new sessions with one statement and cache their ids."""
+        identities = list(new_sessions)
+        # DO UPDATE (not DO NOTHING) so RETURNING also yields the id of a session opened before a restart
+        result = await session.execute(text("""
+            INSERT INTO controller_sessions (callsign, cid, session_start_time, last_logon_time, last_seen)
+            SELECT k.callsign, k.cid, k.logon_time, k.logon_time, k.last_seen
+            FROM unnest(
+                CAST(:callsigns AS VARCHAR[]),
+                CAST(:cids AS INTEGER[]),
+                CAST(:logon_times AS TIMESTAMPTZ[]),
+                CAST(:last_seens AS TIMESTAMPTZ[])
+            ) AS k(callsign, cid, logon_time, last_seen)
+            ON CONFLICT (callsign, cid, session_start_time)
+            DO UPDATE SET last_seen = GREATEST(controller_sessions.last_seen, EXCLUDED.last_seen)
+            RETURNING controller_session_id, callsign, cid, last_logon_time, last_seen
+        """), {
+            "callsigns": [identity[0] for identity in identities],
+            "cids": [identity[1] for identity in identities],
+            "logon_times": [new_sessions[identity][0] for identity in identities],
+            "last_seens": [new_sessions[identity][1] for identity in identities]
+        })
+
+        registered = 0
+        for row in result.fetchall():
+            self._open[(row.callsign, row.cid)] = OpenControllerSession(
+                row.controller_session_id, row.last_logon_time, row.last_seen
+            )
+            registered += 1
+
+        self.stats["registered"] += registered
+        self.logger.debug(f"Opened {registered} controller sessions ({len(self._open)} open)")
+
+    async def _touch(self, bulk_controllers: List[Mapping[str, Any]],
+                     new_sessions: Dict[ControllerIdentity, Any], session: AsyncSession) -> None:
+        """Persist last_seen and the latest logon of the continuing sessions with one UPDATE."""
+        continuing = {}
+        for controller_data in bulk_controllers:
+            identity = (controller_data.get("callsign"), controller_data.get("cid"))
+            if identity not in new_sessions and identity in self._open:
+                continuing[identity] = self._open[identity]
+        if not continuing:
+            return
+
+        states = list(continuing.values())
+        await session.execute(text("""
+            UPDATE controller_sessions s
+            SET last_logon_time = u.last_logon_time, last_seen = u.last_seen
+            FROM unnest(
+                CAST(:controller_session_ids AS INTEGER[]),
+                CAST(:last_logon_times AS TIMESTAMPTZ[]),
+                CAST(:last_seens AS TIMESTAMPTZ[])
+            ) AS u(controller_session_id, last_logon_time, last_seen)
+            WHERE s.controller_session_id = u.controller_session_id
+        """), {
+            "controller_session_ids": [state.controller_session_id for state in states],
+            "last_logon_times": [state.logon_time for state in states],
+            "last_seens": [state.last_seen for state in states]
+        })
+
+    def discard(self, controller_session_ids: Iterable[int]) -> None:
+        """Forget summarised sessions so the in-memory map only holds open ones."""
+        summarised = set(controller_session_ids)
+        if summarised:
+            self._open = {identity: state for identity, state in self._open.items()
+                          if state.controller_session_id not in summarised}
+
+    def invalidate(self) -> None:
+        """Drop the in-memory state after a rolled-back write; the next poll reloads it."""
+        self._open.clear()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        return {"open_sessions": len(self._open), **self.stats}
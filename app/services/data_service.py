@@ -20,7 +20,7 @@ OUTPUTS:
 import os
 import time
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Mapping, Optional
 from datetime import datetime, timezone, timedelta, date
 import json
 
@@ -33,15 +33,30 @@ from app.filters.controller_callsign_filter import ControllerCallsignFilter
 from app.filters.frequency_pattern_filter import FrequencyPatternFilter
 from app.database import get_database_session
 from app.models import Flight, Controller, Transceiver
+from app.records import ControllerRecord, FlightRecord, TransceiverRecord
 from app.config import get_config, AppConfig
 from app.services.atc_detection_service import ATCDetectionService
 from app.services.flight_detection_service import FlightDetectionService
+from app.services.bulk_writer import BulkWriter
+from app.services.flight_session_registry import FlightSessionRegistry
+from app.services.controller_session_registry import ControllerSessionRegistry
+from app.services.frequency_interval_tracker import FrequencyIntervalTracker
+from app.services.snapshot_diff import SnapshotDiffEngine
+from app.services.flight_summary_accumulator import (
+    FINALIZATION_EVENT_TYPES, FLIGHT_SUMMARY_FIRST_RECORD_COLUMNS, FlightSummaryAccumulator
+)
+from app.services.partition_manager import PartitionManager
+from app.services.live_state import get_live_state_cache
 from app.utils.sector_loader import SectorLoader
+from app.utils.flight_completion_tracker import FlightCompletionTracker
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger_for_module("services.data_service")
 
+# Marks a sector that still has to be looked up for a single flight
+_SECTOR_NOT_RESOLVED = object()
+
 
 class DataService:
     """Main data service for VATSIM data collection and processing."""
@@ -68,11 +83,43 @@ class DataService:
         # Initialize Flight detection service for controller summaries
         self.flight_detection_service = FlightDetectionService()
         
+        # Bulk writer for per-poll inserts (COPY with ORM fallback)
+        self.bulk_writer = BulkWriter()
+        
+        # Daily partition maintenance for time-partitioned tables
+        self.partition_manager = PartitionManager()
+        
+        # Live-state snapshot published after every poll for the read endpoints
+        self.live_state = get_live_state_cache()
+        
         # NEW: Initialize sector tracking
         self.sector_tracking_enabled = self.config.sector_tracking.enabled
         self.sector_update_interval = self.config.sector_tracking.update_interval
         self.sector_loader = None  # Will be initialized in initialize() method
         self.flight_sector_states = {}  # Track current sector for each flight
+        self.open_sector_entries: Dict[str, str] = {}  # Authoritative open sector per callsign
+        self.flight_last_positions: Dict[str, Dict[str, Any]] = {}  # Last known position per callsign
+        self.pending_sector_exits: Dict[str, Optional[Dict[str, Any]]] = {}  # Exits queued for the next flush
+        self.pending_sector_entries: Dict[str, Dict[str, Any]] = {}  # Entries queued for the next flush
+        self._sector_state_loaded = False  # Seeded from flight_sector_occupancy on first poll
+        self.flight_completion_tracker = FlightCompletionTracker()  # Last-seen time per active flight session
+        self.flight_session_registry = FlightSessionRegistry()  # flight_session_id per flight identity
+        self.controller_session_registry = ControllerSessionRegistry(
+            self.config.controller_summary.reconnection_threshold_minutes
+        )  # controller_session_id per controller, reconnections merged
+        self.frequency_intervals_enabled = self.config.frequency_intervals.enabled
+        self.frequency_interval_tracker = FrequencyIntervalTracker(
+            self.config.frequency_intervals.max_gap_seconds
+        )  # Open (callsign, frequency) intervals folded from transceivers
+        self.snapshot_diff = SnapshotDiffEngine(self.config.events.enabled)  # Poll-to-poll change events
+        self.flight_finalization_enabled = self.config.flight_summary.finalization_enabled
+        self.flight_summary_accumulator = FlightSummaryAccumulator(
+            self.config.flight_summary.finalization_grace_minutes,
+            self.atc_detection_service._get_proximity_threshold,
+            self.atc_detection_service.time_window_seconds
+        )  # Summary state per flight session, finalized on disconnect events
+        if self.flight_finalization_enabled:
+            self.snapshot_diff.subscribe(self.flight_summary_accumulator.on_events, FINALIZATION_EVENT_TYPES)
         
         # Debug logging for sector tracking configuration
         self.logger.info(f"Sector tracking config: enabled={self.sector_tracking_enabled}, update_interval={self.sector_update_interval}")
@@ -91,6 +138,7 @@ class DataService:
         self.controller_summary_task: Optional[asyncio.Task] = None
         self.atc_detection_task: Optional[asyncio.Task] = None
         self.flight_detection_task: Optional[asyncio.Task] = None
+        self.partition_maintenance_task: Optional[asyncio.Task] = None
     
     async def initialize(self) -> bool:
         """Initialize data service with dependencies."""
@@ -132,6 +180,9 @@ class DataService:
                 await self.start_scheduled_atc_detection_processing()
                 await self.start_scheduled_flight_detection_processing()
             
+            # Start partition maintenance: future partitions are always created, since ingest cannot insert without them
+            await self.start_scheduled_partition_maintenance()
+            
             return True
             
         except Exception as e:
@@ -169,16 +220,76 @@ class DataService:
         try:
             # Fetch current VATSIM data
             self.logger.info("Fetching current VATSIM data")
+            fetch_start = time.time()
             vatsim_data = await self.vatsim_service.get_current_data()
+            fetch_parse_time = time.time() - fetch_start
+            api_timings = vatsim_data.get("timings") or {}
+            
+            # Snapshot already processed (304 or same update_timestamp): skip filtering, writes and cleanup
+            if vatsim_data.get("unchanged"):
+                self.stats["last_run"] = datetime.now(timezone.utc)
+                self.logger.info(f"VATSIM snapshot {vatsim_data.get('update_timestamp')} unchanged ({vatsim_data.get('reason')}) - skipping processing")
+                return {
+                    "status": "unchanged",
+                    "flights_processed": 0,
+                    "controllers_processed": 0,
+                    "transceivers_processed": 0,
+                    "processing_time": time.time() - start_time,
+                    "stage_timings": {"fetch": api_timings.get("fetch", fetch_parse_time)},
+                    "transfer": vatsim_data.get("transfer", {}),
+                    "feeds": vatsim_data.get("feeds", {}),
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }
+            
+            # Filter and build rows for each entity set
+            filter_start = time.time()
+            feed_flights = vatsim_data.get("flights", [])
+            bulk_flights = self._prepare_flight_rows(feed_flights)
+            bulk_controllers = self._prepare_controller_rows(vatsim_data.get("controllers", []))
+            bulk_transceivers = self._prepare_transceiver_rows(vatsim_data.get("transceivers", []))
+            filter_time = time.time() - filter_start
+            
+            # Write all entity sets, atomically unless single-transaction ingest is disabled
+            write_start = time.time()
+            if self.config.ingest.single_transaction:
+                flights_processed, controllers_processed, transceivers_processed = await self._write_poll_single_transaction(
+                    bulk_flights, bulk_controllers, bulk_transceivers, feed_flights
+                )
+            else:
+                flights_processed = await self._write_rows_in_own_session(bulk_flights, "flights")
+                self._link_flight_transceivers(bulk_flights, bulk_transceivers)
+                controllers_processed = await self._write_rows_in_own_session(bulk_controllers, "controllers")
+                transceivers_processed = await self._write_rows_in_own_session(bulk_transceivers, "transceivers")
+                await self._write_snapshot_events_in_own_session(bulk_flights, bulk_controllers, bulk_transceivers, feed_flights)
+            write_time = time.time() - write_start
+            self._record_flight_activity(bulk_flights)
+            self._accumulate_flight_summaries(bulk_flights, bulk_controllers, bulk_transceivers)
+            
+            # Hand the committed poll's changes to subscribers; a failing subscriber does not fail the poll
+            events = self.snapshot_diff.commit()
+            try:
+                await self.snapshot_diff.publish(events)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Failed to publish snapshot events: {e}")
             
-            # Process flights with geographic boundary filtering
-            flights_processed = await self._process_flights(vatsim_data.get("flights", []))
+            # Write summaries of flights that disconnected more than the grace period ago; retried next poll on failure
+            try:
+                await self._finalize_flight_summaries()
+            except Exception as e:
+                self.logger.warning(f"⚠️ Failed to finalize flight summaries: {e}")
             
-            # Process controllers
-            controllers_processed = await self._process_controllers(vatsim_data.get("controllers", []))
+            # Publish the committed poll for the read endpoints; a failure only means they use the database
+            try:
+                self.live_state.publish(bulk_flights, bulk_controllers, bulk_transceivers)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Failed to publish live state snapshot: {e}")
             
-            # Process transceivers
-            transceivers_processed = await self._process_transceivers(vatsim_data.get("transceivers", []))
+            stage_timings = {
+                "fetch": api_timings.get("fetch", fetch_parse_time),
+                "parse": api_timings.get("parse", 0.0),
+                "filter": filter_time,
+                "write": write_time
+            }
             
             # Update VATSIM status
             # await self._update_vatsim_status(vatsim_data) # This line is removed
@@ -198,10 +309,14 @@ class DataService:
             if hasattr(self, 'sector_tracking_enabled') and self.sector_tracking_enabled:
                 await self._cleanup_sector_states()
             
+            # Warn when a poll cycle overruns the polling interval
+            if processing_time > self.config.vatsim.polling_interval:
+                self.logger.warning(f"VATSIM poll took {processing_time:.2f}s, longer than polling interval of {self.config.vatsim.polling_interval}s")
+            
             # Log summary only when there's significant activity or filtering
             total_processed = flights_processed + controllers_processed + transceivers_processed
             if total_processed > 0:
-                self.logger.info(f"VATSIM data processed: {flights_processed} flights, {controllers_processed} controllers, {transceivers_processed} transceivers in {processing_time:.2f}s")
+                self.logger.info(f"VATSIM data processed: {flights_processed} flights, {controllers_processed} controllers, {transceivers_processed} transceivers in {processing_time:.2f}s (fetch {stage_timings['fetch']:.2f}s, parse {stage_timings['parse']:.2f}s, filter {stage_timings['filter']:.2f}s, write {stage_timings['write']:.2f}s)")
             else:
                 self.logger.debug(f"VATSIM data processed: {flights_processed} flights, {controllers_processed} controllers, {transceivers_processed} transceivers in {processing_time:.2f}s")
             
@@ -211,11 +326,17 @@ class DataService:
                 "controllers_processed": controllers_processed,
                 "transceivers_processed": transceivers_processed,
                 "processing_time": processing_time,
+                "stage_timings": stage_timings,
+                "transfer": vatsim_data.get("transfer", {}),
+                "feeds": vatsim_data.get("feeds", {}),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
         except Exception as e:
             self.logger.error(f"Error processing VATSIM data: {e}")
+            # Make the next poll fetch and process this snapshot again instead of skipping it as unchanged
+            if hasattr(self.vatsim_service, "forget_snapshot"):
+                self.vatsim_service.forget_snapshot()
             raise
     
     async def _process_flights(self, flights_data: List[Dict[str, Any]]) -> int:
@@ -235,7 +356,24 @@ class DataService:
         if not flights_data:
             return 0
         
-        processed_count = 0
+        bulk_flights = self._prepare_flight_rows(flights_data)
+        return await self._write_rows_in_own_session(bulk_flights, "flights")
+
+    def _prepare_flight_rows(self, flights_data: List[Mapping[str, Any]]) -> List[FlightRecord]:
+        """
+        Filter parsed flights into the rows for bulk insert.
+        
+        FlightRecords from VATSIMService are already shaped as rows and are
+        passed through as-is; plain dictionaries are converted.
+        
+        Args:
+            flights_data: Parsed flights (FlightRecord or dictionaries)
+            
+        Returns:
+            List[FlightRecord]: Flight rows ready to be written
+        """
+        if not flights_data:
+            return []
         
         # Apply geographic boundary filtering (if enabled)
         if self.geographic_boundary_filter.config.enabled:
@@ -247,83 +385,135 @@ class DataService:
         if len(flights_data) != len(filtered_flights):
             self.logger.info(f"Flights: {len(flights_data)} → {len(filtered_flights)} (geographically filtered)")
         
-        # Get database session
-        async with get_database_session() as session:
-            if filtered_flights:
-                try:
-                    # Prepare bulk data
-                    bulk_flights = []
-                    incomplete_flights_count = 0
-                    
-                    for flight_dict in filtered_flights:
-                        try:
-                            # NEW: Filter incomplete flights before processing
-                            departure = flight_dict.get("departure", "")
-                            arrival = flight_dict.get("arrival", "")
-                            
-                            # Skip flights without complete flight plan data
-                            if not departure or not arrival:
-                                incomplete_flights_count += 1
-                                self.logger.debug(f"Skipping incomplete flight {flight_dict.get('callsign', 'unknown')}: departure='{departure}', arrival='{arrival}'")
-                                continue
-                            
-                            # Create data dictionary for bulk insert
-                            flight_data = {
-                                "callsign": flight_dict.get("callsign", ""),
-                                "name": flight_dict.get("name", ""),
-                                "aircraft_type": flight_dict.get("aircraft_type", ""),
-                                "departure": departure,  # Already validated above
-                                "arrival": arrival,      # Already validated above
-                                "route": flight_dict.get("route", ""),
-                                "altitude": flight_dict.get("altitude", 0),
-                                "latitude": flight_dict.get("latitude"),
-                                "longitude": flight_dict.get("longitude"),
-                                "groundspeed": flight_dict.get("groundspeed"),
-                                "heading": flight_dict.get("heading"),
-                                "cid": flight_dict.get("cid"),
-                                "server": flight_dict.get("server", ""),
-                                "pilot_rating": flight_dict.get("pilot_rating"),
-                                "military_rating": flight_dict.get("military_rating"),
-                                "transponder": flight_dict.get("transponder", ""),
-                                "logon_time": flight_dict.get("logon_time"),
-                                "last_updated_api": flight_dict.get("last_updated"),
-                                "flight_rules": flight_dict.get("flight_rules", ""),
-                                "aircraft_faa": flight_dict.get("aircraft_faa", ""),
-                                "alternate": flight_dict.get("alternate", ""),
-                                "cruise_tas": flight_dict.get("cruise_tas", ""),
-                                "planned_altitude": flight_dict.get("planned_altitude", ""),
-                                "deptime": flight_dict.get("deptime", ""),
-                                "enroute_time": flight_dict.get("enroute_time", ""),
-                                "fuel_time": flight_dict.get("fuel_time", ""),
-                                "remarks": flight_dict.get("remarks", "")
-                            }
-                            bulk_flights.append(flight_data)
-                            
-                            # NEW: Track sector occupancy for this flight
-                            await self._track_sector_occupancy(flight_dict, session)
-                            
-                        except Exception as e:
-                            self.logger.warning(f"Failed to prepare flight data for {flight_dict.get('callsign', 'unknown')}: {e}")
-                            continue
-                    
-                    # Log incomplete flight filtering results
-                    if incomplete_flights_count > 0:
-                        self.logger.info(f"Flights: {len(filtered_flights)} → {len(bulk_flights)} (incomplete flights filtered: {incomplete_flights_count})")
-                    
-                    # Bulk insert all flights
-                    if bulk_flights:
-                        session.add_all([Flight(**flight_data) for flight_data in bulk_flights])
-                        await session.commit()
-                        processed_count = len(bulk_flights)
-                        self.logger.debug(f"Bulk inserted {processed_count} flights")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to bulk insert flights: {e}")
-                    await session.rollback()
-                    raise
+        # Prepare bulk data
+        bulk_flights = []
+        incomplete_flights_count = 0
+        
+        for flight_dict in filtered_flights:
+            try:
+                # NEW: Filter incomplete flights before processing
+                departure = flight_dict.get("departure", "")
+                arrival = flight_dict.get("arrival", "")
+                
+                # Skip flights without complete flight plan data
+                if not departure or not arrival:
+                    incomplete_flights_count += 1
+                    self.logger.debug(f"Skipping incomplete flight {flight_dict.get('callsign', 'unknown')}: departure='{departure}', arrival='{arrival}'")
+                    continue
+                
+                # Parsed records already are rows; only dictionaries need converting
+                if not isinstance(flight_dict, FlightRecord):
+                    flight_dict = FlightRecord.from_mapping(flight_dict)
+                bulk_flights.append(flight_dict)
+                
+            except Exception as e:
+                self.logger.warning(f"Failed to prepare flight data for {flight_dict.get('callsign', 'unknown')}: {e}")
+                continue
+        
+        # Log incomplete flight filtering results
+        if incomplete_flights_count > 0:
+            self.logger.info(f"Flights: {len(filtered_flights)} → {len(bulk_flights)} (incomplete flights filtered: {incomplete_flights_count})")
+        
+        return bulk_flights
+
+    async def _write_flight_rows(self, bulk_flights: List[Dict[str, Any]], session: AsyncSession) -> int:
+        """
+        Track sector occupancy and bulk insert prepared flight rows (no commit).
         
+        Args:
+            bulk_flights: Rows from _prepare_flight_rows
+            session: Database session owning the transaction
+            
+        Returns:
+            int: Number of flights written
+        """
+        if not bulk_flights:
+            return 0
+        
+        # Every row gets its flight_session_id before sector tracking and the insert use it
+        await self.flight_session_registry.assign(bulk_flights, session)
+        
+        # Seed open sector state from the database on the first poll
+        if self.sector_tracking_enabled and not self._sector_state_loaded:
+            await self._load_open_sector_state(session)
+        
+        # Resolve every flight's sector in one vectorized lookup
+        geographic_sectors = [_SECTOR_NOT_RESOLVED] * len(bulk_flights)
+        if self.sector_tracking_enabled and hasattr(self.sector_loader, 'get_sectors_for_points'):
+            geographic_sectors = self.sector_loader.get_sectors_for_points(
+                [flight_data.get("latitude") for flight_data in bulk_flights],
+                [flight_data.get("longitude") for flight_data in bulk_flights]
+            )
+        
+        # NEW: Track sector occupancy for each flight
+        for flight_data, geographic_sector in zip(bulk_flights, geographic_sectors):
+            try:
+                await self._track_sector_occupancy(flight_data, session, geographic_sector)
+            except Exception as e:
+                self.logger.warning(f"Failed to track sectors for {flight_data.get('callsign', 'unknown')}: {e}")
+        
+        # Write every sector entry/exit of this poll in one batch
+        await self._flush_sector_changes(session)
+        
+        # Bulk insert all flights
+        processed_count = await self.bulk_writer.write_rows(session, Flight, bulk_flights)
+        self.logger.debug(f"Bulk inserted {processed_count} flights")
+
+        # Keep the one-row-per-callsign latest position table in step with the history
+        await self._upsert_latest_flights(bulk_flights, session)
         return processed_count
 
+    # Columns of flights_latest written on ingest, with their array types for unnest
+    _FLIGHTS_LATEST_COLUMNS = (
+        ("callsign", "VARCHAR"), ("cid", "INTEGER"), ("name", "VARCHAR"), ("server", "VARCHAR"),
+        ("pilot_rating", "INTEGER"), ("latitude", "DOUBLE PRECISION"), ("longitude", "DOUBLE PRECISION"),
+        ("altitude", "INTEGER"), ("groundspeed", "INTEGER"), ("heading", "INTEGER"),
+        ("transponder", "VARCHAR"), ("departure", "VARCHAR"), ("arrival", "VARCHAR"),
+        ("aircraft_type", "VARCHAR"), ("flight_rules", "VARCHAR"), ("planned_altitude", "VARCHAR"),
+        ("logon_time", "TIMESTAMPTZ")
+    )
+
+    # Callsigns not seen for this long (and with no open sector) are pruned from flights_latest
+    _FLIGHTS_LATEST_RETENTION = timedelta(hours=24)
+
+    async def _upsert_latest_flights(self, bulk_flights: List[Dict[str, Any]], session: AsyncSession) -> int:
+        """
+        Upsert the latest position of every callsign in this poll into flights_latest (no commit).
+
+        One INSERT ... SELECT FROM unnest(...) ON CONFLICT (callsign) DO UPDATE for
+        the whole poll. last_updated is NOW(), the same transaction timestamp the
+        flights rows get, so both tables agree on when a callsign was last seen.
+
+        Args:
+            bulk_flights: Rows from _prepare_flight_rows
+            session: Database session owning the transaction
+
+        Returns:
+            int: Number of callsigns upserted
+        """
+        # ON CONFLICT cannot touch the same row twice in one statement, last row per callsign wins
+        latest = {flight_data["callsign"]: flight_data for flight_data in bulk_flights if flight_data.get("callsign")}
+        if not latest:
+            return 0
+
+        columns = [column for column, _ in self._FLIGHTS_LATEST_COLUMNS]
+        arrays = ",\n                ".join(
+            f"CAST(:{column} AS {array_type}[])" for column, array_type in self._FLIGHTS_LATEST_COLUMNS
+        )
+        await session.execute(text(f"""
+            INSERT INTO flights_latest ({", ".join(columns)}, last_updated)
+            SELECT {", ".join(f"r.{column}" for column in columns)}, NOW()
+            FROM unnest(
+                {arrays}
+            ) AS r({", ".join(columns)})
+            ON CONFLICT (callsign) DO UPDATE SET
+                {", ".join(f"{column} = EXCLUDED.{column}" for column in columns[1:])},
+                last_updated = EXCLUDED.last_updated
+        """), {column: [flight_data.get(column) for flight_data in latest.values()] for column in columns})
+
+        self.logger.debug(f"Upserted {len(latest)} callsigns into flights_latest")
+        return len(latest)
+
 
     
     @fail_fast_on_critical_errors
@@ -340,7 +530,24 @@ class DataService:
         if not controllers_data:
             return 0
         
-        processed_count = 0
+        bulk_controllers = self._prepare_controller_rows(controllers_data)
+        return await self._write_rows_in_own_session(bulk_controllers, "controllers")
+
+    def _prepare_controller_rows(self, controllers_data: List[Mapping[str, Any]]) -> List[ControllerRecord]:
+        """
+        Filter parsed controllers into the rows for bulk insert.
+        
+        ControllerRecords are normalized in place (text_atis, timestamps);
+        plain dictionaries are converted first.
+        
+        Args:
+            controllers_data: Parsed controllers (ControllerRecord or dictionaries)
+            
+        Returns:
+            List[ControllerRecord]: Controller rows ready to be written
+        """
+        if not controllers_data:
+            return []
         
         # Apply controller callsign filtering (controllers don't have geographic data)
         if self.controller_callsign_filter.config.enabled:
@@ -354,48 +561,23 @@ class DataService:
         else:
             self.logger.debug(f"Controllers: {len(controllers_data)} → {len(filtered_controllers)}")
         
-        # Get database session
-        async with get_database_session() as session:
-            if filtered_controllers:
-                try:
-                    # Prepare bulk data
-                    bulk_controllers = []
-                    
-                    for controller_dict in filtered_controllers:
-                        try:
-                            # Create data dictionary for bulk insert
-                            controller_data = {
-                                "callsign": controller_dict.get("callsign", ""),
-                                "frequency": controller_dict.get("frequency", ""),
-                                "cid": controller_dict.get("cid"),
-                                "name": controller_dict.get("name", ""),
-                                "rating": controller_dict.get("rating"),
-                                "facility": controller_dict.get("facility"),
-                                "visual_range": controller_dict.get("visual_range"),
-                                "text_atis": self._convert_text_atis(controller_dict.get("text_atis")),
-                                "server": controller_dict.get("server", ""),
-                                "last_updated": self._parse_timestamp(controller_dict.get("last_updated")),
-                                "logon_time": self._parse_timestamp(controller_dict.get("logon_time"))
-                            }
-                            bulk_controllers.append(controller_data)
-                            
-                        except Exception as e:
-                            self.logger.warning(f"Failed to prepare controller data for {controller_dict.get('callsign', 'unknown')}: {e}")
-                            continue
-                    
-                    # Bulk insert all controllers
-                    if bulk_controllers:
-                        session.add_all([Controller(**controller_data) for controller_data in bulk_controllers])
-                        await session.commit()
-                        processed_count = len(bulk_controllers)
-                        self.logger.debug(f"Bulk inserted {processed_count} controllers")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to bulk insert controllers: {e}")
-                    await session.rollback()
-                    raise
+        # Prepare bulk data
+        bulk_controllers = []
         
-        return processed_count
+        for controller_dict in filtered_controllers:
+            try:
+                if not isinstance(controller_dict, ControllerRecord):
+                    controller_dict = ControllerRecord.from_mapping(controller_dict)
+                controller_dict.text_atis = self._convert_text_atis(controller_dict.text_atis)
+                controller_dict.last_updated = self._parse_timestamp(controller_dict.last_updated)
+                controller_dict.logon_time = self._parse_timestamp(controller_dict.logon_time)
+                bulk_controllers.append(controller_dict)
+                
+            except Exception as e:
+                self.logger.warning(f"Failed to prepare controller data for {controller_dict.get('callsign', 'unknown')}: {e}")
+                continue
+        
+        return bulk_controllers
     
     def _convert_text_atis(self, text_atis_data: Any) -> Optional[str]:
         """Convert text_atis data to string format - simplified"""
@@ -435,7 +617,24 @@ class DataService:
         if not transceivers_data:
             return 0
         
-        processed_count = 0
+        bulk_transceivers = self._prepare_transceiver_rows(transceivers_data)
+        return await self._write_rows_in_own_session(bulk_transceivers, "transceivers")
+
+    def _prepare_transceiver_rows(self, transceivers_data: List[Mapping[str, Any]]) -> List[TransceiverRecord]:
+        """
+        Filter parsed transceivers into the rows for bulk insert.
+        
+        TransceiverRecords are stamped with the poll time in place; plain
+        dictionaries are converted first.
+        
+        Args:
+            transceivers_data: Parsed transceivers (TransceiverRecord or dictionaries)
+            
+        Returns:
+            List[TransceiverRecord]: Transceiver rows ready to be written
+        """
+        if not transceivers_data:
+            return []
         
         # Apply geographic boundary filtering
         if self.geographic_boundary_filter.config.enabled:
@@ -452,53 +651,214 @@ class DataService:
         else:
             self.logger.debug(f"Transceivers: {len(transceivers_data)} → {len(filtered_transceivers)}")
         
-        # Get database session
+        # Prepare bulk data
+        bulk_transceivers = []
+        timestamp = datetime.now(timezone.utc)
+        
+        for transceiver_dict in filtered_transceivers:
+            try:
+                if not isinstance(transceiver_dict, TransceiverRecord):
+                    transceiver_dict = TransceiverRecord.from_mapping(transceiver_dict)
+                transceiver_dict.timestamp = timestamp
+                bulk_transceivers.append(transceiver_dict)
+                
+            except Exception as e:
+                self.logger.warning(f"Failed to prepare transceiver data for {transceiver_dict.get('callsign', 'unknown')}: {e}")
+                continue
+        
+        return bulk_transceivers
+
+    async def _write_rows_in_own_session(self, rows: List[Dict[str, Any]], entity: str) -> int:
+        """
+        Write one prepared entity set in its own session and transaction.
+        
+        Args:
+            rows: Prepared rows for the entity set
+            entity: "flights", "controllers" or "transceivers"
+            
+        Returns:
+            int: Number of rows written
+        """
+        if not rows:
+            return 0
+        
         async with get_database_session() as session:
-            if filtered_transceivers:
-                try:
-                    # Prepare bulk data
-                    bulk_transceivers = []
-                    
-                    for transceiver_dict in filtered_transceivers:
-                        try:
-                            # Create data dictionary for bulk insert
-                            transceiver_data = {
-                                "callsign": transceiver_dict.get("callsign", ""),
-                                "transceiver_id": transceiver_dict.get("transceiver_id", 0),
-                                "frequency": transceiver_dict.get("frequency", 0),
-                                "position_lat": transceiver_dict.get("position_lat"),
-                                "position_lon": transceiver_dict.get("position_lon"),
-                                "height_msl": transceiver_dict.get("height_msl"),
-                                "height_agl": transceiver_dict.get("height_agl"),
-                                "entity_type": transceiver_dict.get("entity_type", "flight"),
-                                "entity_id": transceiver_dict.get("entity_id"),
-                                "timestamp": datetime.now(timezone.utc)
-                            }
-                            bulk_transceivers.append(transceiver_data)
-                            
-                        except Exception as e:
-                            self.logger.warning(f"Failed to prepare transceiver data for {transceiver_dict.get('callsign', 'unknown')}: {e}")
-                            continue
-                    
-                    # Bulk insert all transceivers
-                    if bulk_transceivers:
-                        session.add_all([Transceiver(**transceiver_data) for transceiver_data in bulk_transceivers])
-                        await session.commit()
-                        processed_count = len(bulk_transceivers)
-                        self.logger.debug(f"Bulk inserted {processed_count} transceivers")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to bulk insert transceivers: {e}")
-                    await session.rollback()
-                    raise
+            try:
+                if entity == "flights":
+                    processed_count = await self._write_flight_rows(rows, session)
+                elif entity == "controllers":
+                    processed_count = await self._write_controller_rows(rows, session)
+                else:
+                    processed_count = await self._write_transceiver_rows(rows, session)
+                await session.commit()
+                self.logger.debug(f"Bulk inserted {processed_count} {entity}")
+                return processed_count
+            except Exception as e:
+                self.logger.error(f"Failed to bulk insert {entity}: {e}")
+                await session.rollback()
+                if entity == "flights":
+                    self._invalidate_sector_state()
+                    self.flight_session_registry.invalidate()
+                elif entity == "controllers":
+                    self.controller_session_registry.invalidate()
+                else:
+                    self.frequency_interval_tracker.invalidate()
+                raise
+
+    async def _write_poll_single_transaction(
+        self, bulk_flights: List[Dict[str, Any]], 
+        bulk_controllers: List[Dict[str, Any]], 
+        bulk_transceivers: List[Dict[str, Any]],
+        feed_flights: Optional[List[Mapping[str, Any]]] = None
+    ) -> tuple:
+        """
+        Write all entity sets of one poll in a single transaction.
+        
+        Sector tracking, flights, controllers and transceivers share one
+        connection checkout and one commit, so a poll is stored atomically.
+        feed_flights (the unfiltered flights) are only used by the snapshot diff.
+        
+        Returns:
+            tuple: (flights_processed, controllers_processed, transceivers_processed)
+        """
+        async with get_database_session() as session:
+            try:
+                flights_processed = await self._write_flight_rows(bulk_flights, session)
+                self._link_flight_transceivers(bulk_flights, bulk_transceivers)
+                controllers_processed = await self._write_controller_rows(bulk_controllers, session)
+                transceivers_processed = await self._write_transceiver_rows(bulk_transceivers, session)
+                await self._write_snapshot_events(bulk_flights, bulk_controllers, bulk_transceivers, session, feed_flights)
+                await session.commit()
+            except Exception as e:
+                self.logger.error(f"Failed to write VATSIM poll in single transaction: {e}")
+                await session.rollback()
+                self._invalidate_sector_state()
+                self.flight_session_registry.invalidate()
+                self.controller_session_registry.invalidate()
+                self.frequency_interval_tracker.invalidate()
+                raise
+        
+        self.logger.debug(f"Poll committed: {flights_processed} flights, {controllers_processed} controllers, {transceivers_processed} transceivers")
+        return flights_processed, controllers_processed, transceivers_processed
+
+    async def _write_controller_rows(self, bulk_controllers: List[Dict[str, Any]], session: AsyncSession) -> int:
+        """
+        Assign controller sessions and bulk insert the controller rows (no commit).
+        
+        Args:
+            bulk_controllers: Rows from _prepare_controller_rows
+            session: Database session owning the write's transaction
+            
+        Returns:
+            int: Number of controller rows written
+        """
+        if not bulk_controllers:
+            return 0
+        
+        await self.controller_session_registry.assign(bulk_controllers, session)
+        return await self.bulk_writer.write_rows(session, Controller, bulk_controllers)
+
+    async def _write_transceiver_rows(self, bulk_transceivers: List[Dict[str, Any]], session: AsyncSession) -> int:
+        """
+        Bulk insert the transceiver rows and fold them into frequency intervals (no commit).
+        
+        Args:
+            bulk_transceivers: Rows from _prepare_transceiver_rows, entity_id linked
+            session: Database session owning the write's transaction
+            
+        Returns:
+            int: Number of transceiver rows written
+        """
+        if not bulk_transceivers:
+            return 0
         
+        processed_count = await self.bulk_writer.write_rows(session, Transceiver, bulk_transceivers)
+        if self.frequency_intervals_enabled:
+            await self.frequency_interval_tracker.fold(bulk_transceivers, session)
         return processed_count
+
+    async def _write_snapshot_events(
+        self, bulk_flights: List[Dict[str, Any]], bulk_controllers: List[Dict[str, Any]],
+        bulk_transceivers: List[Dict[str, Any]], session: AsyncSession,
+        feed_flights: Optional[List[Mapping[str, Any]]] = None
+    ) -> int:
+        """
+        Diff the poll against the previous one and store its events (no commit).
+        
+        Runs after the rows are written so events carry flight_session_id and
+        controller_session_id. The poll only becomes the previous snapshot
+        when process_vatsim_data commits it to the diff engine. feed_flights,
+        the flights before filtering, tell disconnects from filter exits.
+        
+        Returns:
+            int: Number of events of the poll
+        """
+        if not self.snapshot_diff.enabled:
+            return 0
+        
+        events = self.snapshot_diff.diff(bulk_flights, bulk_controllers, bulk_transceivers, feed_flights=feed_flights)
+        if self.config.events.persist:
+            await self.snapshot_diff.persist(events, session)
+        return len(events)
+
+    async def _write_snapshot_events_in_own_session(
+        self, bulk_flights: List[Dict[str, Any]], bulk_controllers: List[Dict[str, Any]],
+        bulk_transceivers: List[Dict[str, Any]], feed_flights: Optional[List[Mapping[str, Any]]] = None
+    ) -> int:
+        """
+        Diff the poll and store its events in their own session, opened only when there are events to store.
+        
+        Returns:
+            int: Number of events of the poll
+        """
+        if not self.snapshot_diff.enabled:
+            return 0
+        
+        events = self.snapshot_diff.diff(bulk_flights, bulk_controllers, bulk_transceivers, feed_flights=feed_flights)
+        if events and self.config.events.persist:
+            async with get_database_session() as session:
+                await self.snapshot_diff.persist(events, session)
+                await session.commit()
+        return len(events)
+
+    def _link_flight_transceivers(
+        self, bulk_flights: List[Dict[str, Any]], bulk_transceivers: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Store the flight_session_id of each flight in entity_id of its transceivers.
+        
+        Args:
+            bulk_flights: Flight rows with flight_session_id assigned
+            bulk_transceivers: Transceiver rows of the same poll
+            
+        Returns:
+            int: Number of transceivers linked
+        """
+        session_ids = {
+            flight_data.get("callsign"): flight_data.get("flight_session_id")
+            for flight_data in bulk_flights if flight_data.get("flight_session_id") is not None
+        }
+        if not session_ids:
+            return 0
+        
+        linked = 0
+        for transceiver in bulk_transceivers:
+            if transceiver.get("entity_type", "flight") != "flight":
+                continue
+            flight_session_id = session_ids.get(transceiver.get("callsign"))
+            if flight_session_id is not None:
+                transceiver["entity_id"] = flight_session_id
+                linked += 1
+        return linked
     
     # ============================================================================
     # SECTOR TRACKING METHODS
     # ============================================================================
     
-    async def _track_sector_occupancy(self, flight_dict: Dict[str, Any], session: AsyncSession) -> None:
+    async def _track_sector_occupancy(
+        self, flight_dict: Dict[str, Any], session: AsyncSession, 
+        geographic_sector: Any = _SECTOR_NOT_RESOLVED
+    ) -> None:
         """
         Track sector occupancy for a flight with speed-based entry/exit criteria.
         
@@ -508,6 +868,7 @@ class DataService:
         Args:
             flight_dict: Flight data dictionary from VATSIM API
             session: Database session for recording sector data
+            geographic_sector: Sector already resolved by a batch lookup (optional)
         """
         if not hasattr(self, 'sector_loader') or not hasattr(self, 'sector_tracking_enabled'):
             # Sector tracking not initialized, skip
@@ -533,8 +894,9 @@ class DataService:
         if not hasattr(self, 'flight_sector_states'):
             self.flight_sector_states = {}
         
-        # Get current geographic sector
-        geographic_sector = self.sector_loader.get_sector_for_point(lat, lon)
+        # Get current geographic sector unless the batch lookup already did
+        if geographic_sector is _SECTOR_NOT_RESOLVED:
+            geographic_sector = self.sector_loader.get_sector_for_point(lat, lon)
         
 
         
@@ -570,7 +932,8 @@ class DataService:
         if current_sector != previous_sector or should_exit:
             await self._handle_sector_transition(
                 callsign, previous_sector, current_sector, 
-                lat, lon, altitude, session, should_exit
+                lat, lon, altitude, session, should_exit,
+                flight_session_id=flight_dict.get("flight_session_id")
             )
             
             # Update state with combined structure
@@ -596,15 +959,27 @@ class DataService:
                 "exit_counter": exit_counter,
                 "last_speed": groundspeed
             }
+        
+        # Remember this poll's position; it becomes the exit position if the flight leaves later
+        self.flight_last_positions[callsign] = {
+            "latitude": lat,
+            "longitude": lon,
+            "altitude": altitude,
+            "timestamp": datetime.now(timezone.utc)
+        }
 
     async def _handle_sector_transition(
         self, callsign: str, previous_sector: Optional[str], 
         current_sector: Optional[str], lat: float, lon: float, 
-        altitude: int, session: AsyncSession, should_exit: bool = False
+        altitude: int, session: AsyncSession, should_exit: bool = False,
+        flight_session_id: Optional[int] = None
     ) -> None:
         """
         Handle sector entry/exit transitions with speed-based criteria.
         
+        Transitions are only queued in memory; _flush_sector_changes writes
+        them for the whole poll in one batch.
+        
         Args:
             callsign: Flight callsign
             previous_sector: Sector the flight was previously in (None if none)
@@ -612,28 +987,44 @@ class DataService:
             lat: Current latitude
             lon: Current longitude
             altitude: Current altitude in feet
-            session: Database session
+            session: Database session (unused, kept for call compatibility)
             should_exit: Whether to force exit due to speed criteria
+            flight_session_id: Flight session of the flight (stored on new entries)
         """
         timestamp = datetime.now(timezone.utc)
         
-        # CRITICAL FIX: Close ALL open sectors for this flight before entering a new one
-        # This prevents multiple open sectors when memory state gets corrupted
+        # Close ALL open sectors for this flight before entering a new one
         if current_sector != previous_sector or should_exit:
-            await self._close_all_open_sectors_for_flight(callsign, session)
+            self._queue_sector_exit(callsign)
         
         # Enter new sector (only if different from previous)
         if current_sector and current_sector != previous_sector:
-            await self._record_sector_entry(
-                callsign, current_sector, lat, lon, altitude, timestamp, session
-            )
+            self._queue_sector_entry(callsign, current_sector, lat, lon, altitude, timestamp, flight_session_id)
+
+    def _queue_sector_exit(self, callsign: str) -> None:
+        """
+        Queue closing every open sector of a flight at its last known position.
+        
+        Args:
+            callsign: Flight callsign
+        """
+        # Entry queued earlier in this poll and never written - just drop it
+        if self.pending_sector_entries.pop(callsign, None) is not None:
+            self.open_sector_entries.pop(callsign, None)
+            return
+        
+        if self.open_sector_entries.pop(callsign, None) is None:
+            return  # No open sectors to close
+        
+        # None means the position is resolved from the flights table at flush time
+        self.pending_sector_exits[callsign] = self.flight_last_positions.get(callsign)
 
-    async def _record_sector_entry(
+    def _queue_sector_entry(
         self, callsign: str, sector_name: str, lat: float, lon: float, 
-        altitude: int, timestamp: datetime, session: AsyncSession
+        altitude: int, timestamp: datetime, flight_session_id: Optional[int] = None
     ) -> None:
         """
-        Record when a flight enters a sector.
+        Queue a sector entry record for a flight.
         
         Args:
             callsign: Flight callsign
@@ -642,163 +1033,147 @@ class DataService:
             lon: Entry longitude
             altitude: Entry altitude in feet
             timestamp: Entry timestamp
-            session: Database session
+            flight_session_id: Flight session of the flight
         """
-        try:
-            # Check if there's an open entry record for this flight/sector combination
-            existing_entry = await session.execute(text("""
-                SELECT id FROM flight_sector_occupancy 
-                WHERE callsign = :callsign 
-                AND sector_name = :sector_name 
-                AND exit_timestamp IS NULL
-            """), {"callsign": callsign, "sector_name": sector_name})
-            
-            if not existing_entry.fetchone():
-                # Insert the entry record immediately with exit fields as NULL
-                await session.execute(text("""
-                    INSERT INTO flight_sector_occupancy (
-                        callsign, sector_name, entry_timestamp, exit_timestamp,
-                        duration_seconds, entry_lat, entry_lon, exit_lat, exit_lon,
-                        entry_altitude, exit_altitude
-                    ) VALUES (
-                        :callsign, :sector_name, :timestamp, NULL, 0,
-                        :lat, :lon, NULL, NULL, :altitude, NULL
-                    )
-                """), {
-                    "callsign": callsign, "sector_name": sector_name,
-                    "timestamp": timestamp, "lat": lat, "lon": lon, "altitude": altitude
-                })
-                
-                self.logger.debug(f"Flight {callsign} entered sector {sector_name}")
-    
-        except Exception as e:
-            self.logger.error(f"Failed to record sector entry for {callsign}: {e}")
+        self.open_sector_entries[callsign] = sector_name
+        self.pending_sector_entries[callsign] = {
+            "callsign": callsign,
+            "sector_name": sector_name,
+            "timestamp": timestamp,
+            "lat": lat,
+            "lon": lon,
+            "altitude": altitude,
+            "flight_session_id": flight_session_id
+        }
+        self.logger.debug(f"Flight {callsign} entered sector {sector_name}")
 
-    async def _close_all_open_sectors_for_flight(
-        self, callsign: str, session: AsyncSession
-    ) -> None:
+    async def _load_open_sector_state(self, session: AsyncSession) -> None:
         """
-        Close ALL open sectors for a flight to prevent multiple open sectors.
+        Seed the in-memory open sector state from flight_sector_occupancy.
         
-        This is a critical fix that ensures only one sector is open per flight
-        by closing any existing open sectors before entering a new one.
+        Runs on the first poll and again after any failed write, so memory
+        always matches what is committed.
         
         Args:
-            callsign: Flight callsign
             session: Database session
         """
-        try:
-            # Find all open sectors for this flight
-            result = await session.execute(text("""
-                SELECT sector_name, entry_timestamp
-                FROM flight_sector_occupancy 
-                WHERE callsign = :callsign 
-                AND exit_timestamp IS NULL
-            """), {"callsign": callsign})
-            
-            open_sectors = result.fetchall()
-            
-            if not open_sectors:
-                return  # No open sectors to close
-            
-            # Get the last known flight record for this callsign
-            flight_result = await session.execute(text("""
-                SELECT latitude, longitude, altitude, last_updated
-                FROM flights 
-                WHERE callsign = :callsign 
-                ORDER BY last_updated DESC 
-                LIMIT 1
-            """), {"callsign": callsign})
-            
-            last_flight = flight_result.fetchone()
-            if not last_flight:
-                self.logger.warning(f"No flight record found for {callsign}")
-                return
-            
-            self.logger.debug(f"Closing {len(open_sectors)} open sectors for flight {callsign}")
-            
-            # Close each open sector
-            for sector in open_sectors:
-                sector_name = sector.sector_name
-                entry_timestamp = sector.entry_timestamp
-                
-                # Calculate duration using last flight record timestamp
-                duration_seconds = int((last_flight.last_updated - entry_timestamp).total_seconds())
-                
-                # Update the sector exit
-                await session.execute(text("""
-                    UPDATE flight_sector_occupancy 
-                    SET exit_timestamp = :exit_timestamp,
-                        exit_lat = :exit_lat,
-                        exit_lon = :exit_lon,
-                        exit_altitude = :exit_altitude,
-                        duration_seconds = :duration_seconds
-                    WHERE callsign = :callsign 
-                    AND sector_name = :sector_name
-                    AND exit_timestamp IS NULL
-                """), {
-                    "exit_timestamp": last_flight.last_updated,  # Use last flight record timestamp
-                    "exit_lat": last_flight.latitude,           # Use last known position
-                    "exit_lon": last_flight.longitude,          # Use last known position
-                    "exit_altitude": last_flight.altitude,      # Use last known altitude
-                    "duration_seconds": duration_seconds,
-                    "callsign": callsign,
-                    "sector_name": sector_name
-                })
-                
-                self.logger.debug(f"Closed sector {sector_name} for flight {callsign} (duration: {duration_seconds}s)")
-            
-            if len(open_sectors) > 1:
-                self.logger.warning(f"Flight {callsign} had {len(open_sectors)} open sectors - all closed to prevent data corruption")
-    
-        except Exception as e:
-            self.logger.error(f"Failed to close open sectors for flight {callsign}: {e}")
+        result = await session.execute(text("""
+            SELECT callsign, sector_name
+            FROM flight_sector_occupancy 
+            WHERE exit_timestamp IS NULL
+            ORDER BY entry_timestamp
+        """))
+        
+        # Latest open entry wins; older duplicates are closed with it on exit
+        self.open_sector_entries = {row.callsign: row.sector_name for row in result.fetchall()}
+        self.pending_sector_exits = {}
+        self.pending_sector_entries = {}
+        
+        # Align the speed state machine with what is actually open
+        for callsign, state in self.flight_sector_states.items():
+            if isinstance(state, dict):
+                state["current_sector"] = self.open_sector_entries.get(callsign)
+        for callsign, sector_name in self.open_sector_entries.items():
+            if callsign not in self.flight_sector_states:
+                self.flight_sector_states[callsign] = {
+                    "current_sector": sector_name,
+                    "exit_counter": 0,
+                    "last_speed": None
+                }
+        
+        self._sector_state_loaded = True
+        self.logger.info(f"Loaded {len(self.open_sector_entries)} open sector entries into memory")
 
-    async def _record_sector_exit(
-        self, callsign: str, sector_name: str, lat: float, lon: float, 
-        altitude: int, timestamp: datetime, session: AsyncSession
-    ) -> None:
+    def _invalidate_sector_state(self) -> None:
+        """Force a reload of sector state after a rolled-back write."""
+        self._sector_state_loaded = False
+        self.pending_sector_exits = {}
+        self.pending_sector_entries = {}
+
+    async def _flush_sector_changes(self, session: AsyncSession) -> Dict[str, int]:
         """
-        Record when a flight exits a sector.
+        Write all sector exits and entries queued during this poll.
+        
+        Exits run first as one batched UPDATE so an exit and a re-entry of
+        the same flight in one poll keep their order; entries follow as one
+        batched INSERT. No commit is done here.
         
         Args:
-            callsign: Flight callsign
-            sector_name: Name of the sector being exited
-            lat: Exit latitude
-            lon: Exit longitude
-            altitude: Exit altitude in feet
-            timestamp: Exit timestamp
-            session: Database session
+            session: Database session owning the transaction
+            
+        Returns:
+            Dict[str, int]: Number of exits and entries written
         """
-        try:
-            # Find and update the open entry record
+        exits = self.pending_sector_exits
+        entries = self.pending_sector_entries
+        self.pending_sector_exits = {}
+        self.pending_sector_entries = {}
+        
+        if not exits and not entries:
+            return {"exits": 0, "entries": 0}
+        
+        # Flights seeded from the database have no position in memory yet
+        missing_positions = [callsign for callsign, position in exits.items() if position is None]
+        if missing_positions:
             result = await session.execute(text("""
+                SELECT DISTINCT ON (callsign) callsign, latitude, longitude, altitude, last_updated
+                FROM flights 
+                WHERE callsign = ANY(:callsigns)
+                ORDER BY callsign, last_updated DESC
+            """), {"callsigns": missing_positions})
+            
+            for row in result.fetchall():
+                exits[row.callsign] = {
+                    "latitude": row.latitude,
+                    "longitude": row.longitude,
+                    "altitude": row.altitude,
+                    "timestamp": row.last_updated
+                }
+        
+        exit_params = []
+        for callsign, position in exits.items():
+            if position is None:
+                self.logger.warning(f"No flight record found for {callsign}")
+                continue
+            exit_params.append({
+                "callsign": callsign,
+                "exit_timestamp": position["timestamp"],
+                "exit_lat": position["latitude"],
+                "exit_lon": position["longitude"],
+                "exit_altitude": position["altitude"]
+            })
+        
+        if exit_params:
+            await session.execute(text("""
                 UPDATE flight_sector_occupancy 
-                SET exit_timestamp = :timestamp,
-                    exit_lat = :lat,
-                    exit_lon = :lon,
-                    exit_altitude = :altitude,
-                    duration_seconds = EXTRACT(EPOCH FROM (:timestamp - entry_timestamp))::INTEGER
+                SET exit_timestamp = CAST(:exit_timestamp AS TIMESTAMPTZ),
+                    exit_lat = :exit_lat,
+                    exit_lon = :exit_lon,
+                    exit_altitude = :exit_altitude,
+                    duration_seconds = EXTRACT(EPOCH FROM (CAST(:exit_timestamp AS TIMESTAMPTZ) - entry_timestamp))::INTEGER
                 WHERE callsign = :callsign 
-                AND sector_name = :sector_name 
                 AND exit_timestamp IS NULL
-                RETURNING id
-            """), {
-                "callsign": callsign, "sector_name": sector_name,
-                "timestamp": timestamp, "lat": lat, "lon": lon, "altitude": altitude
-            })
-            
-            if result.fetchone():
-                self.logger.debug(f"Flight {callsign} exited sector {sector_name}")
-            else:
-                self.logger.warning(f"No open sector entry found for {callsign} in {sector_name}")
-    
-        except Exception as e:
-            self.logger.error(f"Failed to record sector exit for {callsign}: {e}")
+            """), exit_params)
+        
+        if entries:
+            await session.execute(text("""
+                INSERT INTO flight_sector_occupancy (
+                    callsign, sector_name, entry_timestamp, exit_timestamp,
+                    duration_seconds, entry_lat, entry_lon, exit_lat, exit_lon,
+                    entry_altitude, exit_altitude, flight_session_id
+                ) VALUES (
+                    :callsign, :sector_name, :timestamp, NULL, 0,
+                    :lat, :lon, NULL, NULL, :altitude, NULL, :flight_session_id
+                )
+            """), list(entries.values()))
+        
+        self.logger.debug(f"Flushed sector changes: {len(exit_params)} exits, {len(entries)} entries")
+        return {"exits": len(exit_params), "entries": len(entries)}
 
     async def _calculate_sector_breakdown(
         self, callsign: str, session: AsyncSession, 
-        logon_time: datetime = None, completion_time: datetime = None
+        logon_time: datetime = None, completion_time: datetime = None,
+        flight_session_id: Optional[int] = None
     ) -> Dict[str, int]:
         """
         Calculate time spent in each sector for a completed flight.
@@ -808,6 +1183,7 @@ class DataService:
             session: Database session
             logon_time: Flight logon time to filter sector data
             completion_time: Flight completion time to filter sector data
+            flight_session_id: Flight session to read, instead of the callsign within the time window
             
         Returns:
             Dict mapping sector names to minutes spent in each sector
@@ -818,19 +1194,24 @@ class DataService:
                 SELECT sector_name, 
                        SUM(duration_seconds) / 60 as minutes
                 FROM flight_sector_occupancy 
-                WHERE callsign = :callsign 
-                AND exit_timestamp IS NOT NULL
+                WHERE exit_timestamp IS NOT NULL
             """
             
-            params = {"callsign": callsign}
+            params = {}
             
-            # Add flight session boundary filtering if timestamps are provided
-            if logon_time and completion_time:
-                query += " AND entry_timestamp BETWEEN :logon_time AND :completion_time"
+            # The session id already isolates this flight from other flights with the same callsign
+            if flight_session_id is not None:
+                query += " AND flight_session_id = :flight_session_id"
+                params["flight_session_id"] = flight_session_id
+            elif logon_time and completion_time:
+                query += " AND callsign = :callsign AND entry_timestamp BETWEEN :logon_time AND :completion_time"
+                params["callsign"] = callsign
                 params["logon_time"] = logon_time
                 params["completion_time"] = completion_time
                 self.logger.debug(f"Filtering sector data for {callsign} between {logon_time} and {completion_time}")
             else:
+                query += " AND callsign = :callsign"
+                params["callsign"] = callsign
                 self.logger.warning(f"No flight session boundaries provided for {callsign} - using all sector data (may cause callsign collision issues)")
             
             query += " GROUP BY sector_name ORDER BY minutes DESC"
@@ -869,107 +1250,44 @@ class DataService:
         """
         Clean up sector states for flights that are no longer active.
         
-        This method removes inactive flights from the sector state tracking
-        and closes any open sector entries to prevent data inconsistencies.
+        A flight is inactive when it has not been seen for 5 minutes. Its open
+        sector entries are closed at its last known position in one batched
+        flush and its in-memory state is dropped.
         """
         if not hasattr(self, 'sector_tracking_enabled') or not self.sector_tracking_enabled:
             return
         
         try:
-            # Get current active flights from database (flights updated in last 5 minutes)
-            async with get_database_session() as session:
-                result = await session.execute(text("""
-                    SELECT DISTINCT callsign FROM flights 
-                    WHERE last_updated > NOW() - INTERVAL '5 minutes'
-                """))
-                
-                active_callsigns = {row.callsign for row in result.fetchall()}
-                
-                # Remove inactive flights from sector states
-                if hasattr(self, 'flight_sector_states'):
-                    inactive_callsigns = set(self.flight_sector_states.keys()) - active_callsigns
-                    
-                    for callsign in inactive_callsigns:
-                        # Close any open sector entries
-                        await self._close_open_sector_entries(callsign, session)
-                        del self.flight_sector_states[callsign]
-                        
-                    if inactive_callsigns:
-                        self.logger.debug(f"Cleaned up sector states for {len(inactive_callsigns)} inactive flights")
-        
-        except Exception as e:
-            self.logger.error(f"Failed to cleanup sector states: {e}")
-
-    async def _close_open_sector_entries(self, callsign: str, session: AsyncSession) -> None:
-        """
-        Close any open sector entries for a flight.
-        
-        This is called when a flight becomes inactive to ensure all sector
-        entries have proper exit timestamps and duration calculations.
-        
-        Args:
-            callsign: Flight callsign
-            session: Database session
-        """
-        try:
-            # Get the last known flight record for this callsign
-            flight_result = await session.execute(text("""
-                SELECT latitude, longitude, altitude, last_updated
-                FROM flights
-                WHERE callsign = :callsign
-                ORDER BY last_updated DESC
-                LIMIT 1
-            """), {"callsign": callsign})
-
-            last_flight = flight_result.fetchone()
-            if not last_flight:
-                self.logger.warning(f"No flight record found for {callsign}")
+            cutoff = datetime.now(timezone.utc) - timedelta(minutes=5)
+            inactive_callsigns = [
+                callsign for callsign in self.flight_sector_states
+                if self.flight_last_positions.get(callsign, {}).get("timestamp", cutoff) <= cutoff
+            ]
+            
+            if not inactive_callsigns:
                 return
-
-            # Get all open sector entries for this callsign to get their entry timestamps
-            sector_result = await session.execute(text("""
-                SELECT sector_name, entry_timestamp
-                FROM flight_sector_occupancy
-                WHERE callsign = :callsign
-                AND exit_timestamp IS NULL
-            """), {"callsign": callsign})
-
-            open_sectors = sector_result.fetchall()
-            if not open_sectors:
-                return  # No open sectors to close
-
-            # Close each open sector entry with last known position and last flight record timestamp
-            for sector in open_sectors:
-                sector_name = sector.sector_name
-                entry_timestamp = sector.entry_timestamp
-                
-                # Calculate duration using the last flight record timestamp
-                duration_seconds = int((last_flight.last_updated - entry_timestamp).total_seconds())
-                
-                await session.execute(text("""
-                    UPDATE flight_sector_occupancy 
-                    SET exit_timestamp = :exit_timestamp,
-                        exit_lat = :exit_lat,
-                        exit_lon = :exit_lon,
-                        exit_altitude = :exit_altitude,
-                        duration_seconds = :duration_seconds
-                    WHERE callsign = :callsign 
-                    AND sector_name = :sector_name
-                    AND exit_timestamp IS NULL
-                """), {
-                    "exit_timestamp": last_flight.last_updated,  # Use last flight record timestamp
-                    "exit_lat": last_flight.latitude,           # Use last known position
-                    "exit_lon": last_flight.longitude,          # Use last known position
-                    "exit_altitude": last_flight.altitude,      # Use last known altitude
-                    "duration_seconds": duration_seconds,
-                    "callsign": callsign,
-                    "sector_name": sector_name
-                })
-                
-                self.logger.debug(f"Closed sector {sector_name} for flight {callsign} (duration: {duration_seconds}s)")
+            
+            for callsign in inactive_callsigns:
+                self._queue_sector_exit(callsign)
+            
+            if self.pending_sector_exits:
+                async with get_database_session() as session:
+                    try:
+                        await self._flush_sector_changes(session)
+                        await session.commit()
+                    except Exception:
+                        await session.rollback()
+                        self._invalidate_sector_state()
+                        raise
+            
+            for callsign in inactive_callsigns:
+                self.flight_sector_states.pop(callsign, None)
+                self.flight_last_positions.pop(callsign, None)
+            
+            self.logger.debug(f"Cleaned up sector states for {len(inactive_callsigns)} inactive flights")
         
         except Exception as e:
-            self.logger.error(f"Failed to close open sector entries for {callsign}: {e}")
+            self.logger.error(f"Failed to cleanup sector states: {e}")
 
     def get_sector_tracking_status(self) -> Dict[str, Any]:
         """
@@ -1001,6 +1319,7 @@ class DataService:
             "sectors_loaded": self.sector_loader.get_sector_count(),
             "sectors_with_boundaries": self.sector_loader.get_sectors_with_boundaries_count(),
             "active_flights": len(getattr(self, 'flight_sector_states', {})),
+            "open_sector_entries": len(getattr(self, 'open_sector_entries', {})),
             "update_interval": getattr(self, 'sector_update_interval', 60)
         }
 
@@ -1022,17 +1341,12 @@ class DataService:
             
             async with get_database_session() as session:
                 # Find flights with open sectors that haven't been updated recently
-                # Use subquery to get the most recent flight record for each callsign
+                # flights_latest holds the most recent flight record of each callsign
                 result = await session.execute(text("""
                     SELECT DISTINCT fso.callsign, fso.sector_name, fso.entry_timestamp,
                            latest_flight.latitude, latest_flight.longitude, latest_flight.altitude, latest_flight.last_updated
                     FROM flight_sector_occupancy fso
-                    JOIN (
-                        SELECT DISTINCT ON (callsign) 
-                            callsign, latitude, longitude, altitude, last_updated
-                        FROM flights 
-                        ORDER BY callsign, last_updated DESC
-                    ) latest_flight ON fso.callsign = latest_flight.callsign
+                    JOIN flights_latest latest_flight ON fso.callsign = latest_flight.callsign
                     WHERE fso.exit_timestamp IS NULL
                     AND latest_flight.last_updated < :stale_cutoff
                 """), {"stale_cutoff": stale_cutoff})
@@ -1074,10 +1388,28 @@ class DataService:
                     
                     sectors_closed += 1
                     self.logger.info(f"Closed stale sector {sector_name} for flight {callsign} (duration: {duration_seconds}s, exit at: {last_updated})")
+                    
+                    # Keep the in-memory open sector state in line with the database
+                    self.open_sector_entries.pop(callsign, None)
+                    state = self.flight_sector_states.get(callsign)
+                    if isinstance(state, dict):
+                        state["current_sector"] = None
                 
                 if sectors_closed > 0:
                     self.logger.info(f"Cleanup completed: {sectors_closed} stale sectors closed")
-                
+
+                # Forget callsigns that have been gone for a day and have no open sector
+                pruned = await session.execute(text("""
+                    DELETE FROM flights_latest fl
+                    WHERE fl.last_updated < :prune_cutoff
+                    AND NOT EXISTS (
+                        SELECT 1 FROM flight_sector_occupancy fso
+                        WHERE fso.callsign = fl.callsign AND fso.exit_timestamp IS NULL
+                    )
+                """), {"prune_cutoff": datetime.now(timezone.utc) - self._FLIGHTS_LATEST_RETENTION})
+                if pruned.rowcount:
+                    self.logger.debug(f"Pruned {pruned.rowcount} callsigns from flights_latest")
+
                 return {
                     "sectors_closed": sectors_closed,
                     "stale_cutoff": stale_cutoff.isoformat(),
@@ -1096,60 +1428,151 @@ class DataService:
     # FLIGHT SUMMARY PROCESSING METHODS
     # ============================================================================
 
-    async def _identify_completed_flights(self, completion_hours: int) -> List[dict]:
+    def _record_flight_activity(self, bulk_flights: List[Dict[str, Any]]) -> None:
+        """Mark the flight sessions written by this poll as seen for incremental completion tracking."""
+        if not bulk_flights or not self.config.flight_summary.incremental_completion:
+            return
+        self.flight_completion_tracker.record(
+            (flight_data.get("flight_session_id") for flight_data in bulk_flights
+             if flight_data.get("flight_session_id") is not None),
+            datetime.now(timezone.utc)
+        )
+
+    async def _identify_completed_flights(self, completion_hours: int) -> List[int]:
         """Identify flights that have been completed for the specified number of hours."""
         try:
             completion_threshold = datetime.now(timezone.utc) - timedelta(hours=completion_hours)
             
-            query = """
-                SELECT DISTINCT callsign, departure, arrival, cid, deptime
-                FROM flights 
-                WHERE last_updated < :completion_threshold
-                AND callsign NOT IN (
-                    SELECT DISTINCT callsign FROM flight_summaries
-                )
-            """
+            if self.config.flight_summary.incremental_completion:
+                completed_flights = await self._identify_completed_flights_incremental(completion_threshold)
+            else:
+                completed_flights = await self._identify_completed_flights_full_scan(completion_threshold)
             
-            async with get_database_session() as session:
-                result = await session.execute(text(query), {"completion_threshold": completion_threshold})
-                completed_flights = result.fetchall()
-                
-                self.logger.debug(f"Identified {len(completed_flights)} completed flights older than {completion_hours} hours")
-                return completed_flights
+            self.logger.debug(f"Identified {len(completed_flights)} completed flights older than {completion_hours} hours")
+            return completed_flights
             
         except Exception as e:
             self.logger.error(f"Error identifying completed flights: {e}")
             raise
 
-    async def _create_flight_summaries(self, completed_flights: List[dict]) -> int:
-        """Create summary records for completed flights."""
-        processed_count = 0
+    async def _identify_completed_flights_full_scan(self, completion_threshold: datetime) -> List[int]:
+        """Scan the flights table for stale flight sessions that have no summary yet."""
+        query = """
+            SELECT DISTINCT f.flight_session_id
+            FROM flights f
+            WHERE f.last_updated < :completion_threshold
+            AND f.flight_session_id IS NOT NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM flight_summaries s
+                WHERE s.flight_session_id = f.flight_session_id
+            )
+        """
+        
         async with get_database_session() as session:
-            for flight_key in completed_flights:
-                callsign, departure, arrival, cid, deptime = flight_key
+            result = await session.execute(text(query), {"completion_threshold": completion_threshold})
+            return [row.flight_session_id for row in result.fetchall()]
+
+    async def _identify_completed_flights_incremental(self, completion_threshold: datetime) -> List[int]:
+        """
+        Identify completed flights from the in-memory last-seen map.
+        
+        Only flights not seen since the threshold are checked against the
+        database, so the cost follows recent activity rather than the size of
+        flight_summaries. Each candidate is confirmed to be stale in flights and
+        not yet summarised before it is returned.
+        """
+        tracker = self.flight_completion_tracker
+        
+        async with get_database_session() as session:
+            # Seed last-seen times from the flights table on first use (e.g. after a restart)
+            if not tracker.loaded:
+                result = await session.execute(text("""
+                    SELECT flight_session_id, MAX(last_updated) AS last_updated
+                    FROM flights
+                    WHERE flight_session_id IS NOT NULL
+                    GROUP BY flight_session_id
+                """))
+                tracker.seed((row.flight_session_id, row.last_updated) for row in result.fetchall())
+                self.logger.info(f"📊 Flight completion tracker seeded with {len(tracker)} active flights")
+            
+            candidates = tracker.stale_keys(completion_threshold)
+            if not candidates:
+                return []
+            
+            completed_flights = []
+            gone = []
+            for params in self._completed_flight_key_chunks(candidates):
+                result = await session.execute(text(f"""
+                    SELECT 
+                        k.flight_session_id,
+                        (
+                            SELECT MAX(f.last_updated) FROM flights f
+                            WHERE f.flight_session_id = k.flight_session_id
+                        ) AS last_updated,
+                        EXISTS (
+                            SELECT 1 FROM flight_summaries s
+                            WHERE s.flight_session_id = k.flight_session_id
+                        ) AS summarised
+                    FROM {self._COMPLETED_FLIGHT_KEYS_SQL}
+                    ORDER BY k.ord
+                """), params)
                 
+                for row in result.fetchall():
+                    flight_session_id = row.flight_session_id
+                    if row.last_updated is None or row.summarised:
+                        gone.append(flight_session_id)
+                    elif row.last_updated >= completion_threshold:
+                        # Written since we last saw it (e.g. by another process)
+                        tracker.record([flight_session_id], row.last_updated)
+                    else:
+                        completed_flights.append(flight_session_id)
+        
+        tracker.discard(gone)
+        self.logger.debug(f"Flight completion tracker: {len(tracker)} tracked, {len(candidates)} stale candidates, {len(completed_flights)} completed")
+        return completed_flights
+
+    async def _create_flight_summaries(self, completed_flights: List[int]) -> int:
+        """Create summary records for completed flight sessions."""
+        processed_count = 0
+        async with get_database_session() as session:
+            # Step 2: Get all records of the completed sessions, one indexed lookup per chunk
+            records_by_session: Dict[int, list] = {}
+            for params in self._completed_flight_key_chunks(completed_flights):
                 try:
-                    # Step 2: Get all records for this flight
                     flight_records = await session.execute(text("""
                         SELECT * FROM flights 
-                        WHERE callsign = :callsign 
-                        AND departure = :departure 
-                        AND arrival = :arrival 
-                        AND cid = :cid
-                        AND deptime = :deptime
-                        ORDER BY last_updated
-                    """), {
-                        "callsign": callsign,
-                        "departure": departure,
-                        "arrival": arrival,
-                        "cid": cid,
-                        "deptime": deptime
-                    })
+                        WHERE flight_session_id = ANY(:flight_session_ids)
+                        ORDER BY flight_session_id, last_updated
+                    """), params)
                     
-                    records = flight_records.fetchall()
-                    if not records:
-                        continue
+                    for record in flight_records.fetchall():
+                        records_by_session.setdefault(record.flight_session_id, []).append(record)
                     
+                except Exception as e:
+                    self.logger.error(f"Failed to load records for {len(params['flight_session_ids'])} flight sessions: {e}")
+                    continue
+            
+            flights_with_records = [
+                (flight_session_id, records_by_session[flight_session_id])
+                for flight_session_id in completed_flights if records_by_session.get(flight_session_id)
+            ]
+            
+            # Detect ATC interactions for all flights in one batch
+            atc_results = await self.atc_detection_service.detect_many([
+                {
+                    "flight_session_id": flight_session_id,
+                    "callsign": records[0].callsign,
+                    "departure": records[0].departure,
+                    "arrival": records[0].arrival,
+                    "logon_time": records[0].logon_time
+                }
+                for flight_session_id, records in flights_with_records
+            ])
+            
+            for (flight_session_id, records), atc_data in zip(flights_with_records, atc_results):
+                callsign = records[0].callsign
+                
+                try:
                     # Step 3: Create summary record
                     first_record = records[0]
                     last_record = records[-1]
@@ -1161,49 +1584,20 @@ class DataService:
                         time_diff = last_record.last_updated - first_record.last_updated
                         total_minutes = int(time_diff.total_seconds() / 60)
                     
-                    # Detect ATC interactions for this flight with timeout protection
-                    atc_data = await self.atc_detection_service.detect_flight_atc_interactions_with_timeout(
-                        callsign, departure, arrival, first_record.logon_time, timeout_seconds=30.0
-                    )
-                    
                     # NEW: Calculate sector breakdown for this completed flight with flight session boundaries
                     sector_breakdown = await self._calculate_sector_breakdown(
                         callsign, session, 
                         logon_time=first_record.logon_time, 
-                        completion_time=last_record.last_updated
+                        completion_time=last_record.last_updated,
+                        flight_session_id=flight_session_id
                     )
-                    primary_sector = self._get_primary_sector(sector_breakdown)
-                    total_sectors = len(sector_breakdown)
-                    total_enroute_time = sum(sector_breakdown.values())
                     
                     # Create summary data
-                    summary_data = {
-                        "callsign": callsign,
-                        "aircraft_type": first_record.aircraft_type,
-                        "departure": departure,
-                        "arrival": arrival,
-                        "deptime": deptime,
-                        "logon_time": first_record.logon_time,
-                        "route": first_record.route,
-                        "flight_rules": first_record.flight_rules,
-                        "aircraft_faa": first_record.aircraft_faa,
-                        "planned_altitude": first_record.planned_altitude,
-                        "aircraft_short": first_record.aircraft_type,
-                        "cid": first_record.cid,
-                        "name": first_record.name,
-                        "server": first_record.server,
-                        "pilot_rating": first_record.pilot_rating,
-                        "military_rating": first_record.military_rating,
-                        "controller_callsigns": json.dumps(self._convert_for_json(atc_data["controller_callsigns"])),
-                        "controller_time_percentage": atc_data["controller_time_percentage"],
-                        "airborne_controller_time_percentage": atc_data["airborne_controller_time_percentage"],
-                        "time_online_minutes": total_minutes,
-                        "primary_enroute_sector": primary_sector,
-                        "total_enroute_sectors": total_sectors,
-                        "total_enroute_time_minutes": total_enroute_time,
-                        "sector_breakdown": json.dumps(self._convert_for_json(sector_breakdown)),
-                        "completion_time": last_record.last_updated
-                    }
+                    summary_data = self._flight_summary_row(
+                        flight_session_id,
+                        {column: getattr(first_record, column) for column in FLIGHT_SUMMARY_FIRST_RECORD_COLUMNS},
+                        atc_data, total_minutes, sector_breakdown, last_record.last_updated
+                    )
                     
                     # Insert summary
                     await session.execute(text("""
@@ -1213,27 +1607,227 @@ class DataService:
                             cid, name, server, pilot_rating, military_rating,
                             controller_callsigns, controller_time_percentage, airborne_controller_time_percentage, time_online_minutes,
                             primary_enroute_sector, total_enroute_sectors, total_enroute_time_minutes, sector_breakdown,
-                            completion_time
-                        ) VALUES (
-                            :callsign, :aircraft_type, :departure, :arrival, :deptime, :logon_time,
-                            :route, :flight_rules, :aircraft_faa, :planned_altitude, :aircraft_short,
-                            :cid, :name, :server, :pilot_rating, :military_rating,
-                            :controller_callsigns, :controller_time_percentage, :airborne_controller_time_percentage, :time_online_minutes,
-                            :primary_enroute_sector, :total_enroute_sectors, :total_enroute_time_minutes, :sector_breakdown,
-                            :completion_time
+                            completion_time, flight_session_id
+                        ) VALUES (
+                            :callsign, :aircraft_type, :departure, :arrival, :deptime, :logon_time,
+                            :route, :flight_rules, :aircraft_faa, :planned_altitude, :aircraft_short,
+                            :cid, :name, :server, :pilot_rating, :military_rating,
+                            :controller_callsigns, :controller_time_percentage, :airborne_controller_time_percentage, :time_online_minutes,
+                            :primary_enroute_sector, :total_enroute_sectors, :total_enroute_time_minutes, :sector_breakdown,
+                            :completion_time, :flight_session_id
+                        )
+                    """), summary_data)
+                    
+                    processed_count += 1
+                    
+                except Exception as e:
+                    self.logger.error(f"Failed to process flight {callsign}: {e}")
+                    continue
+            
+            # Commit all changes
+            await session.commit()
+            
+            return processed_count
+
+    def _flight_summary_row(
+        self, flight_session_id: int, first_record: Mapping[str, Any], atc_data: Dict[str, Any],
+        time_online_minutes: int, sector_breakdown: Dict[str, int], completion_time: datetime
+    ) -> Dict[str, Any]:
+        """
+        Build the flight_summaries parameters of one flight session.
+        
+        Args:
+            flight_session_id: Flight session being summarised
+            first_record: FLIGHT_SUMMARY_FIRST_RECORD_COLUMNS of the session's first record
+            atc_data: ATC interaction metrics of the flight
+            time_online_minutes: Minutes between the first and last record
+            sector_breakdown: Minutes per sector
+            completion_time: Time of the last record
+            
+        Returns:
+            Dict[str, Any]: Parameters for the flight_summaries INSERT
+        """
+        return {
+            **{column: first_record.get(column) for column in FLIGHT_SUMMARY_FIRST_RECORD_COLUMNS},
+            "flight_session_id": flight_session_id,
+            "aircraft_short": first_record.get("aircraft_type"),
+            "controller_callsigns": json.dumps(self._convert_for_json(atc_data["controller_callsigns"])),
+            "controller_time_percentage": atc_data["controller_time_percentage"],
+            "airborne_controller_time_percentage": atc_data["airborne_controller_time_percentage"],
+            "time_online_minutes": time_online_minutes,
+            "primary_enroute_sector": self._get_primary_sector(sector_breakdown),
+            "total_enroute_sectors": len(sector_breakdown),
+            "total_enroute_time_minutes": sum(sector_breakdown.values()),
+            "sector_breakdown": json.dumps(self._convert_for_json(sector_breakdown)),
+            "completion_time": completion_time
+        }
+
+    def _accumulate_flight_summaries(
+        self, bulk_flights: List[Dict[str, Any]], bulk_controllers: List[Dict[str, Any]],
+        bulk_transceivers: List[Dict[str, Any]]
+    ) -> None:
+        """Fold the committed poll into the per-session summary state used for finalization on disconnect."""
+        if not self.flight_finalization_enabled:
+            return
+        open_sectors = self.open_sector_entries if self.sector_tracking_enabled else {}
+        self.flight_summary_accumulator.observe(bulk_flights, bulk_controllers, bulk_transceivers, open_sectors)
+
+    async def _finalize_flight_summaries(self, now: Optional[datetime] = None) -> int:
+        """
+        Write summaries of flights that disconnected more than the grace period ago.
+        
+        Summaries are built from the state accumulated at ingest, so no flights,
+        sector or transceiver rows are read: all due sessions are inserted with
+        one statement. They are marked archive_pending so the batch job still
+        archives and deletes their flights rows after FLIGHT_COMPLETION_HOURS.
+        Sessions first seen since the last call are looked up among the
+        archive_pending summaries beforehand, so a session that reconnected
+        after its summary was written - also before a restart - has that early
+        summary withdrawn in the same transaction as the inserts, and the batch
+        job summarises it instead.
+        
+        Args:
+            now: Time the grace periods are measured against (default: now)
+        
+        Returns:
+            int: Number of summaries written
+        """
+        if not self.flight_finalization_enabled:
+            return 0
+        
+        accumulator = self.flight_summary_accumulator
+        await self._detect_reopened_flight_summaries()
+        due = accumulator.due(now)
+        reopened = accumulator.reopened()
+        if not due and not reopened:
+            return 0
+        
+        rows = [
+            self._flight_summary_row(
+                flight_session_id, state.first_record,
+                self.atc_detection_service.build_contact_metrics(state.contacts, state.records),
+                int((state.last_seen - state.first_seen).total_seconds() / 60),
+                state.sector_breakdown(), state.last_seen
+            )
+            for flight_session_id, state in due
+        ]
+        
+        inserted = set()
+        async with get_database_session() as session:
+            try:
+                if reopened:
+                    await session.execute(text("""
+                        DELETE FROM flight_summaries
+                        WHERE archive_pending
+                        AND flight_session_id = ANY(:flight_session_ids)
+                    """), {"flight_session_ids": reopened})
+                if rows:
+                    # Sessions the batch job already summarised are skipped
+                    result = await session.execute(text("""
+                        INSERT INTO flight_summaries (
+                            callsign, aircraft_type, departure, arrival, deptime, logon_time,
+                            route, flight_rules, aircraft_faa, planned_altitude, aircraft_short,
+                            cid, name, server, pilot_rating, military_rating,
+                            controller_callsigns, controller_time_percentage, airborne_controller_time_percentage, time_online_minutes,
+                            primary_enroute_sector, total_enroute_sectors, total_enroute_time_minutes, sector_breakdown,
+                            completion_time, flight_session_id, archive_pending
+                        )
+                        SELECT
+                            s.callsign, s.aircraft_type, s.departure, s.arrival, s.deptime, s.logon_time,
+                            s.route, s.flight_rules, s.aircraft_faa, s.planned_altitude, s.aircraft_short,
+                            s.cid, s.name, s.server, s.pilot_rating, s.military_rating,
+                            CAST(s.controller_callsigns AS JSONB), s.controller_time_percentage,
+                            s.airborne_controller_time_percentage, s.time_online_minutes,
+                            s.primary_enroute_sector, s.total_enroute_sectors, s.total_enroute_time_minutes,
+                            CAST(s.sector_breakdown AS JSONB), s.completion_time, s.flight_session_id, TRUE
+                        FROM unnest(
+                            CAST(:callsign AS VARCHAR[]), CAST(:aircraft_type AS VARCHAR[]),
+                            CAST(:departure AS VARCHAR[]), CAST(:arrival AS VARCHAR[]),
+                            CAST(:deptime AS VARCHAR[]), CAST(:logon_time AS TIMESTAMPTZ[]),
+                            CAST(:route AS TEXT[]), CAST(:flight_rules AS VARCHAR[]),
+                            CAST(:aircraft_faa AS VARCHAR[]), CAST(:planned_altitude AS VARCHAR[]),
+                            CAST(:aircraft_short AS VARCHAR[]), CAST(:cid AS INTEGER[]),
+                            CAST(:name AS VARCHAR[]), CAST(:server AS VARCHAR[]),
+                            CAST(:pilot_rating AS INTEGER[]), CAST(:military_rating AS INTEGER[]),
+                            CAST(:controller_callsigns AS TEXT[]), CAST(:controller_time_percentage AS DOUBLE PRECISION[]),
+                            CAST(:airborne_controller_time_percentage AS DOUBLE PRECISION[]), CAST(:time_online_minutes AS INTEGER[]),
+                            CAST(:primary_enroute_sector AS VARCHAR[]), CAST(:total_enroute_sectors AS INTEGER[]),
+                            CAST(:total_enroute_time_minutes AS INTEGER[]), CAST(:sector_breakdown AS TEXT[]),
+                            CAST(:completion_time AS TIMESTAMPTZ[]), CAST(:flight_session_id AS INTEGER[])
+                        ) AS s(
+                            callsign, aircraft_type, departure, arrival, deptime, logon_time,
+                            route, flight_rules, aircraft_faa, planned_altitude, aircraft_short,
+                            cid, name, server, pilot_rating, military_rating,
+                            controller_callsigns, controller_time_percentage, airborne_controller_time_percentage, time_online_minutes,
+                            primary_enroute_sector, total_enroute_sectors, total_enroute_time_minutes, sector_breakdown,
+                            completion_time, flight_session_id
                         )
-                    """), summary_data)
-                    
-                    processed_count += 1
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to process flight {callsign}: {e}")
-                    continue
-            
-            # Commit all changes
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM flight_summaries f
+                            WHERE f.flight_session_id = s.flight_session_id
+                        )
+                        RETURNING flight_session_id
+                    """), {column: [row[column] for row in rows] for column in rows[0]})
+                    inserted = {row.flight_session_id for row in result.fetchall()}
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        
+        finalized_ids = [flight_session_id for flight_session_id, _ in due if flight_session_id in inserted]
+        skipped_ids = [flight_session_id for flight_session_id, _ in due if flight_session_id not in inserted]
+        accumulator.finish(finalized_ids, reopened, skipped_ids)
+        # Summarised now; archiving follows from archive_pending, and ingest records the session again if it returns
+        self.flight_completion_tracker.discard(finalized_ids)
+        if skipped_ids:
+            self.logger.info(f"🔄 Left {len(skipped_ids)} due flight sessions to the batch job, already summarised: {skipped_ids}")
+        if finalized_ids or reopened:
+            self.logger.info(f"✅ Finalized {len(finalized_ids)} flight summaries on disconnect ({len(reopened)} reopened summaries withdrawn)")
+        return len(finalized_ids)
+
+    async def _detect_reopened_flight_summaries(self) -> List[int]:
+        """Mark first-observed sessions that already have an archive_pending summary as reopened."""
+        accumulator = self.flight_summary_accumulator
+        unchecked = accumulator.unchecked()
+        if not unchecked:
+            return []
+        async with get_database_session() as session:
+            result = await session.execute(text("""
+                SELECT flight_session_id
+                FROM flight_summaries
+                WHERE archive_pending
+                AND flight_session_id = ANY(:flight_session_ids)
+            """), {"flight_session_ids": unchecked})
+            reopened = [row.flight_session_id for row in result.fetchall()]
+        accumulator.reopen(reopened, unchecked)
+        return reopened
+
+    async def _identify_finalized_flights(self, completion_hours: int) -> List[int]:
+        """Flight sessions finalized on disconnect whose flights rows are due for archiving."""
+        completion_threshold = datetime.now(timezone.utc) - timedelta(hours=completion_hours)
+        async with get_database_session() as session:
+            result = await session.execute(text("""
+                SELECT flight_session_id
+                FROM flight_summaries
+                WHERE archive_pending
+                AND completion_time < :completion_threshold
+                ORDER BY completion_time
+            """), {"completion_threshold": completion_threshold})
+            return [row.flight_session_id for row in result.fetchall()]
+
+    async def _clear_archive_pending(self, finalized_flights: List[int]) -> int:
+        """Mark summaries finalized on disconnect as archived."""
+        if not finalized_flights:
+            return 0
+        async with get_database_session() as session:
+            result = await session.execute(text("""
+                UPDATE flight_summaries
+                SET archive_pending = FALSE
+                WHERE archive_pending
+                AND flight_session_id = ANY(:flight_session_ids)
+            """), {"flight_session_ids": finalized_flights})
             await session.commit()
-            
-            return processed_count
+            return result.rowcount or 0
 
     async def process_completed_flights(self) -> Dict[str, Any]:
         """
@@ -1243,7 +1837,11 @@ class DataService:
         1. Identifies completed flights (older than completion threshold)
         2. Creates flight summaries with sector breakdown data
         3. Archives detailed flight records
-        4. Cleans up old data based on retention policy
+        4. Deletes the archived records from flights
+        
+        Flights already summarised on disconnect are only archived and deleted
+        here, once they are older than the completion threshold. flights_archive
+        retention (FLIGHT_RETENTION_HOURS) is applied by partition maintenance.
         
         Returns:
             Dict containing processing results and statistics
@@ -1253,12 +1851,12 @@ class DataService:
             
             # Get configuration values
             completion_hours = getattr(self.config.flight_summary, 'completion_hours', 14)
-            retention_hours = getattr(self.config.flight_summary, 'retention_hours', 168)
             
             # Step 1: Identify completed flights
             completed_flights = await self._identify_completed_flights(completion_hours)
+            finalized_flights = await self._identify_finalized_flights(completion_hours)
             
-            if not completed_flights:
+            if not completed_flights and not finalized_flights:
                 self.logger.info("📭 No completed flights found to process")
                 return {
                     "status": "success",
@@ -1268,20 +1866,26 @@ class DataService:
                     "status": "no_work"
                 }
             
-            self.logger.info(f"📊 Found {len(completed_flights)} completed flights to process")
+            self.logger.info(f"📊 Found {len(completed_flights)} completed flights to process and {len(finalized_flights)} finalized flights to archive")
             
             # Step 2: Create summaries
-            summaries_created = await self._create_flight_summaries(completed_flights)
+            summaries_created = await self._create_flight_summaries(completed_flights) if completed_flights else 0
             
             # Step 3: Archive completed records
-            records_archived = await self._archive_completed_flights(completed_flights)
+            archived_flights = completed_flights + finalized_flights
+            records_archived = await self._archive_completed_flights(archived_flights)
             
             # Step 4: Delete completed records
-            records_deleted = await self._delete_completed_flights(completed_flights)
+            records_deleted = await self._delete_completed_flights(archived_flights)
+            await self._clear_archive_pending(finalized_flights)
+            self.flight_completion_tracker.discard(archived_flights)
+            self.flight_session_registry.discard(archived_flights)
+            self.flight_summary_accumulator.discard(archived_flights)
             
             result = {
                 "status": "success",
                 "summaries_created": summaries_created,
+                "finalized_flights_archived": len(finalized_flights),
                 "records_archived": records_archived,
                 "records_deleted": records_deleted
             }
@@ -1320,32 +1924,50 @@ class DataService:
             
             self.logger.info(f"📊 Found {len(completed_controllers)} completed controllers to process")
             
-            # Step 2: Create summaries
-            self.logger.info("Creating controller summaries...")
-            summaries_created_result = await self._create_controller_summaries(completed_controllers)
-            self.logger.info(f"Create summaries result: {summaries_created_result}")
-            summaries_created = summaries_created_result["processed_count"]
-            failed_count = summaries_created_result["failed_count"]
-            successful_controllers = summaries_created_result["successful_controllers"]
-            
-            # CRITICAL: Validate summaries were created before proceeding
-            if summaries_created == 0:
-                self.logger.error("❌ No summaries were created - aborting archiving to prevent data loss")
-                return {
-                    "summaries_created": 0,
-                    "records_archived": 0,
-                    "records_deleted": 0,
-                    "status": "failed_no_summaries",
-                    "error": "No summaries created - archiving aborted to prevent data loss"
-                }
-            
-            self.logger.info(f"✅ Successfully created {summaries_created} summaries - proceeding with archiving")
+            # Steps 2-4 run in one transaction: summaries, archive and delete commit together or not at all
+            stage_rates = {}
+            async with get_database_session() as session:
+                # Step 2: Create summaries
+                self.logger.info("Creating controller summaries...")
+                stage_start = time.perf_counter()
+                summaries_created_result = await self._create_controller_summaries(completed_controllers, session=session)
+                self.logger.info(f"Create summaries result: {summaries_created_result}")
+                summaries_created = summaries_created_result["processed_count"]
+                failed_count = summaries_created_result["failed_count"]
+                successful_controllers = summaries_created_result["successful_controllers"]
+                stage_rates["summaries"] = self._rows_per_second(summaries_created, stage_start)
+                
+                # CRITICAL: Validate summaries were created before proceeding
+                if summaries_created == 0:
+                    self.logger.error("❌ No summaries were created - aborting archiving to prevent data loss")
+                    return {
+                        "summaries_created": 0,
+                        "records_archived": 0,
+                        "records_deleted": 0,
+                        "status": "failed_no_summaries",
+                        "error": "No summaries created - archiving aborted to prevent data loss"
+                    }
+                
+                self.logger.info(f"✅ Successfully created {summaries_created} summaries - proceeding with archiving")
+                
+                # Step 3: Archive completed records (only if summaries were created)
+                stage_start = time.perf_counter()
+                records_archived = await self._archive_completed_controllers(successful_controllers, session=session)
+                stage_rates["archive"] = self._rows_per_second(records_archived, stage_start)
+                
+                # Step 4: Delete completed records (only if summaries were created)
+                stage_start = time.perf_counter()
+                records_deleted = await self._delete_completed_controllers(successful_controllers, session=session)
+                stage_rates["delete"] = self._rows_per_second(records_deleted, stage_start)
+                
+                await session.commit()
             
-            # Step 3: Archive completed records (only if summaries were created)
-            records_archived = await self._archive_completed_controllers(successful_controllers)
+            self.controller_session_registry.discard(controller_key[4] for controller_key in successful_controllers)
             
-            # Step 4: Delete completed records (only if summaries were created)
-            records_deleted = await self._delete_completed_controllers(successful_controllers)
+            self.logger.info(
+                f"📊 Controller lifecycle rows/sec: summaries={stage_rates['summaries']:.0f}, "
+                f"archive={stage_rates['archive']:.0f}, delete={stage_rates['delete']:.0f}"
+            )
             
             # Log the results clearly
             self.logger.debug("Summary Processing Results")
@@ -1363,6 +1985,7 @@ class DataService:
                 "failed_count": failed_count,
                 "records_archived": records_archived,
                 "records_deleted": records_deleted,
+                "rows_per_second": stage_rates,
                 "status": "completed"
             }
             
@@ -1374,23 +1997,23 @@ class DataService:
             raise
 
     async def _identify_completed_controllers(self, completion_minutes: int) -> List[tuple]:
-        """Identify controllers that have been inactive for the specified time."""
+        """
+        Identify controller sessions that have been inactive for the specified time.
+        
+        Sessions come from controller_sessions, where ingest already merged
+        reconnections, so no controller rows are grouped here. Each key is
+        (callsign, cid, session_start_time, session_end_time, controller_session_id).
+        """
         try:
             completion_threshold = datetime.now(timezone.utc) - timedelta(minutes=completion_minutes)
             self.logger.debug(f"Identify completed controllers: completion_minutes={completion_minutes}, threshold_utc={completion_threshold}")
             
             query = """
-                SELECT DISTINCT c.callsign, c.cid, c.logon_time, MAX(c.last_updated) as session_end_time
-                FROM controllers c
-                WHERE NOT EXISTS (
-                    SELECT 1
-                    FROM controller_summaries cs
-                    WHERE cs.callsign = c.callsign
-                      AND cs.cid IS NOT DISTINCT FROM c.cid
-                      AND cs.session_start_time = c.logon_time
-                )
-                GROUP BY c.callsign, c.cid, c.logon_time
-                HAVING MAX(c.last_updated) < :completion_threshold
+                SELECT callsign, cid, session_start_time AS logon_time, last_seen AS session_end_time, controller_session_id
+                FROM controller_sessions
+                WHERE summarised_at IS NULL
+                AND last_seen < :completion_threshold
+                ORDER BY last_seen
             """
             
             async with get_database_session() as session:
@@ -1402,14 +2025,16 @@ class DataService:
                 if count:
                     for idx, row in enumerate(completed_controllers[:3], 1):
                         try:
-                            callsign, cid, logon_time, session_end_time = row
+                            callsign, cid, logon_time, session_end_time, controller_session_id = row
                         except Exception:
                             callsign = getattr(row, 'callsign', None)
                             cid = getattr(row, 'cid', None)
                             logon_time = getattr(row, 'logon_time', None)
                             session_end_time = getattr(row, 'session_end_time', None)
+                            controller_session_id = getattr(row, 'controller_session_id', None)
                         self.logger.debug(
-                            f"Candidate[{idx}]: callsign={callsign}, cid={cid}, logon_time={logon_time}, session_end_time={session_end_time}"
+                            f"Candidate[{idx}]: controller_session_id={controller_session_id}, callsign={callsign}, cid={cid}, "
+                            f"logon_time={logon_time}, session_end_time={session_end_time}"
                         )
                 return completed_controllers
             
@@ -1435,166 +2060,215 @@ class DataService:
         else:
             return obj
 
-    async def _create_controller_summaries(self, completed_controllers: List[tuple]) -> Dict[str, Any]:
-        """Create summary records for completed controllers with session merging."""
-        processed_count = 0
-        failed_count = 0
-        successful_controllers = []  # Track which controllers got summaries
+    async def _create_controller_summaries(self, completed_controllers: List[tuple], session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """
+        Create summary records for completed controller sessions.
         
-        # Configuration for session merging - configurable threshold for reconnections
-        reconnection_threshold_minutes = int(os.getenv("CONTROLLER_RECONNECTION_THRESHOLD_MINUTES", "5"))
+        Reconnections were merged into the sessions at ingest. When a session
+        is given the summaries are written in it without committing, so the
+        caller can archive and delete in the same transaction.
+        """
+        # Bounded worker pool: each worker holds at most one pooled connection at a time
+        worker_count = self._get_controller_summary_worker_count()
+        semaphore = asyncio.Semaphore(worker_count)
         
-        self.logger.debug(f"_create_controller_summaries: received {len(completed_controllers)} completed controllers")
-        async with get_database_session() as session:
-            for controller_key in completed_controllers:
-                callsign, cid, logon_time, session_end_time = controller_key
-                
-                try:
-                    self.logger.debug(
-                        f"Processing controller candidate callsign={callsign}, cid={cid}, logon_time={logon_time}, session_end_time={session_end_time}"
-                    )
-                    # Get all records for this controller including potential reconnections within 5 minutes
-                    # The reconnection logic now properly measures the gap between session end and next session start
-                    # Calculate the reconnection window in Python to avoid SQL interval arithmetic issues
-                    reconnection_window = session_end_time + timedelta(minutes=reconnection_threshold_minutes)
-                    
-                    controller_records = await session.execute(text("""
-                        SELECT * FROM controllers 
-                        WHERE callsign = :callsign 
-                        AND cid = :cid
-                        AND (
-                            logon_time = :logon_time  -- Original session
-                            OR (
-                                logon_time > :logon_time
-                                AND logon_time <= :reconnection_window
-                            )
-                        )
-                        ORDER BY created_at
-                    """), {
-                        "callsign": callsign,
-                        "cid": cid,
-                        "logon_time": logon_time,
-                        "reconnection_window": reconnection_window
-                    })
-                    
-                    records = controller_records.fetchall()
-                    self.logger.debug(f"Fetched {len(records)} controller records for {callsign} in merged window")
-                    if not records:
-                        self.logger.warning(f"No records found for controller {callsign} with logon_time {logon_time}")
-                        failed_count += 1
-                        continue
-                    
-                    # Get first and last records across merged sessions
-                    first_record = records[0]
-                    last_record = records[-1]
-                    
-                    # Calculate total session duration including reconnections
-                    session_duration_minutes = int((last_record.last_updated - first_record.logon_time).total_seconds() / 60)
-                    self.logger.debug(
-                        f"{callsign} session window: start={first_record.logon_time}, end={last_record.last_updated}, duration_min={session_duration_minutes}"
-                    )
+        self.logger.debug(f"_create_controller_summaries: received {len(completed_controllers)} completed controllers, {worker_count} workers")
+        
+        async def build(controller_key):
+            async with semaphore:
+                return await self._build_controller_summary(controller_key)
+        
+        summaries = await asyncio.gather(*(build(controller_key) for controller_key in completed_controllers))
+        
+        built = [
+            (controller_key, summary_data)
+            for controller_key, summary_data in zip(completed_controllers, summaries)
+            if summary_data is not None
+        ]
+        failed_count = len(completed_controllers) - len(built)
+        
+        successful_controllers = []
+        if built and session is not None:
+            successful_controllers = await self._insert_controller_summaries(session, built)
+        elif built:
+            async with get_database_session() as own_session:
+                successful_controllers = await self._insert_controller_summaries(own_session, built)
+                await own_session.commit()
+        
+        failed_count += len(built) - len(successful_controllers)
+        if failed_count > 0:
+            self.logger.warning(f"⚠️ Summary creation completed with {failed_count} failures out of {len(completed_controllers)} controllers")
+        
+        return {
+            "processed_count": len(successful_controllers),
+            "failed_count": failed_count,
+            "successful_controllers": successful_controllers
+        }
 
-                    # Handle 0-minute sessions by adjusting them to 1-minute minimum
-                    # This prevents constraint violations while maintaining data integrity
-                    if session_duration_minutes == 0:
-                        session_duration_minutes = 1
-                        # Adjust the end time slightly to satisfy database constraint
-                        adjusted_end_time = first_record.logon_time + timedelta(minutes=1)
-                        self.logger.debug(f"🔄 Adjusted 0-minute session for {callsign} to 1 minute")
-                    else:
-                        adjusted_end_time = last_record.last_updated
+    def _get_controller_summary_worker_count(self) -> int:
+        """Number of parallel controller summary workers, capped to half the database pool."""
+        configured = self.config.controller_summary.max_concurrency
+        return max(1, min(configured, self.config.database.pool_size // 2))
 
-                    # Get all frequencies used across merged sessions
-                    frequencies_used = await self._get_session_frequencies(callsign, logon_time, session_end_time, session)
-                    self.logger.debug(f"{callsign} frequencies_used count={len(frequencies_used) if frequencies_used else 0}")
-                    
-                    # Get aircraft interaction data across merged sessions
-                    aircraft_data = await self._get_aircraft_interactions(callsign, logon_time, session_end_time, session)
-                    self.logger.debug(
-                        f"{callsign} aircraft_interactions total={aircraft_data.get('total_aircraft', 0)}, peak={aircraft_data.get('peak_count', 0)}"
-                    )
-                    
-                    # Create merged summary data
-                    summary_data = {
-                        "callsign": callsign,
-                        "cid": first_record.cid,
-                        "name": first_record.name,
-                        "session_start_time": first_record.logon_time,
-                        "session_end_time": adjusted_end_time,
-                        "session_duration_minutes": session_duration_minutes,
-                        "rating": first_record.rating,
-                        "facility": first_record.facility,
-                        "server": first_record.server,
-                        "total_aircraft_handled": aircraft_data["total_aircraft"],
-                        "peak_aircraft_count": aircraft_data["peak_count"],
-                        "hourly_aircraft_breakdown": json.dumps(self._convert_for_json(aircraft_data["hourly_breakdown"])),
-                        "frequencies_used": json.dumps(self._convert_for_json(frequencies_used)),
-                        "aircraft_details": json.dumps(self._convert_for_json(aircraft_data["details"]))
-                    }
-                    
-                    # Insert merged summary
-                    await session.execute(text("""
-                        INSERT INTO controller_summaries (
-                            callsign, cid, name, session_start_time, session_end_time,
-                            session_duration_minutes, rating, facility, server,
-                            total_aircraft_handled, peak_aircraft_count,
-                            hourly_aircraft_breakdown, frequencies_used, aircraft_details
-                        ) VALUES (
-                            :callsign, :cid, :name, :session_start_time, :session_end_time,
-                            :session_duration_minutes, :rating, :facility, :server,
-                            :total_aircraft_handled, :peak_aircraft_count,
-                            :hourly_aircraft_breakdown, :frequencies_used, :aircraft_details
-                        )
-                    """), summary_data)
-                    
-                    processed_count += 1
-                    successful_controllers.append(controller_key)  # Track successful summary creation
-                    
-                    # Log whether sessions were merged
-                    if len(records) > 1:
-                        self.logger.debug(f"✅ Created merged summary for controller {callsign} (duration: {session_duration_minutes} min, {len(records)} sessions merged)")
-                    else:
-                        self.logger.debug(f"✅ Created summary for controller {callsign} (duration: {session_duration_minutes} min)")
-                    
-                except Exception as e:
-                    self.logger.error(f"❌ Failed to process controller {callsign} (cid={cid}, logon_time={logon_time}): {e}")
-                    failed_count += 1
-                    continue
+    async def _build_controller_summary(self, controller_key: tuple) -> Optional[Dict[str, Any]]:
+        """Build the summary row for one completed controller session, or None if it cannot be summarised."""
+        callsign, cid, logon_time, session_end_time, controller_session_id = controller_key
+        
+        try:
+            self.logger.debug(
+                f"Processing controller session {controller_session_id}: callsign={callsign}, cid={cid}, "
+                f"logon_time={logon_time}, session_end_time={session_end_time}"
+            )
+            # All records of the session, reconnections included: ingest merged them under one id
+            async with get_database_session() as session:
+                controller_records = await session.execute(text("""
+                    SELECT * FROM controllers 
+                    WHERE controller_session_id = :controller_session_id
+                    ORDER BY created_at
+                """), {"controller_session_id": controller_session_id})
+                
+                records = controller_records.fetchall()
+                self.logger.debug(f"Fetched {len(records)} controller records for {callsign} session {controller_session_id}")
+                if not records:
+                    self.logger.warning(f"No records found for controller {callsign} session {controller_session_id}")
+                    return None
+                
+                # Get all frequencies used across the session's connections
+                frequencies_used = await self._get_session_frequencies(controller_session_id, session)
+                self.logger.debug(f"{callsign} frequencies_used count={len(frequencies_used) if frequencies_used else 0}")
+            
+            # Get first and last records across merged sessions
+            first_record = records[0]
+            last_record = records[-1]
+            
+            # Calculate total session duration including reconnections
+            session_duration_minutes = int((last_record.last_updated - first_record.logon_time).total_seconds() / 60)
+            self.logger.debug(
+                f"{callsign} session window: start={first_record.logon_time}, end={last_record.last_updated}, duration_min={session_duration_minutes}"
+            )
+
+            # Handle 0-minute sessions by adjusting them to 1-minute minimum
+            # This prevents constraint violations while maintaining data integrity
+            if session_duration_minutes == 0:
+                session_duration_minutes = 1
+                # Adjust the end time slightly to satisfy database constraint
+                adjusted_end_time = first_record.logon_time + timedelta(minutes=1)
+                self.logger.debug(f"🔄 Adjusted 0-minute session for {callsign} to 1 minute")
+            else:
+                adjusted_end_time = last_record.last_updated
             
-            # Commit all changes
-            await session.commit()
+            # Get aircraft interaction data across merged sessions (the detection service uses its own connections)
+            aircraft_data = await self._get_aircraft_interactions(callsign, logon_time, session_end_time, None)
+            self.logger.debug(
+                f"{callsign} aircraft_interactions total={aircraft_data.get('total_aircraft', 0)}, peak={aircraft_data.get('peak_count', 0)}"
+            )
             
-            if failed_count > 0:
-                self.logger.warning(f"⚠️ Summary creation completed with {failed_count} failures out of {len(completed_controllers)} controllers")
+            # Log whether reconnections were merged
+            connections = len({record.logon_time for record in records})
+            if connections > 1:
+                self.logger.debug(f"✅ Built merged summary for controller {callsign} (duration: {session_duration_minutes} min, {connections} connections merged)")
+            else:
+                self.logger.debug(f"✅ Built summary for controller {callsign} (duration: {session_duration_minutes} min)")
             
+            # Create merged summary data
             return {
-                "processed_count": processed_count,
-                "failed_count": failed_count,
-                "successful_controllers": successful_controllers
+                "callsign": callsign,
+                "cid": first_record.cid,
+                "name": first_record.name,
+                "controller_session_id": controller_session_id,
+                "session_start_time": first_record.logon_time,
+                "session_end_time": adjusted_end_time,
+                "session_duration_minutes": session_duration_minutes,
+                "rating": first_record.rating,
+                "facility": first_record.facility,
+                "server": first_record.server,
+                "total_aircraft_handled": aircraft_data["total_aircraft"],
+                "peak_aircraft_count": aircraft_data["peak_count"],
+                "hourly_aircraft_breakdown": json.dumps(self._convert_for_json(aircraft_data["hourly_breakdown"])),
+                "frequencies_used": json.dumps(self._convert_for_json(frequencies_used)),
+                "aircraft_details": json.dumps(self._convert_for_json(aircraft_data["details"]))
             }
+            
+        except Exception as e:
+            self.logger.error(f"❌ Failed to process controller {callsign} (cid={cid}, session {controller_session_id}): {e}")
+            return None
 
-    async def _get_session_frequencies(self, callsign: str, logon_time: datetime, session_end_time: datetime, session) -> List[str]:
+    async def _insert_controller_summaries(self, session: AsyncSession, built: List[tuple], chunk_size: int = 500) -> List[tuple]:
+        """
+        Insert built controller summaries with multi-row INSERTs.
+        
+        The same statement marks the summarised controller_sessions rows, so a
+        session is summarised exactly when its summary row exists.
+        
+        Returns the controller keys whose summaries were written. If a chunk
+        fails, its rows are retried one by one so a single bad row does not
+        block the rest.
+        """
+        columns = [
+            "callsign", "cid", "name", "controller_session_id", "session_start_time", "session_end_time",
+            "session_duration_minutes", "rating", "facility", "server",
+            "total_aircraft_handled", "peak_aircraft_count",
+            "hourly_aircraft_breakdown", "frequencies_used", "aircraft_details"
+        ]
+        
+        def insert_statement(row_count: int):
+            values = ", ".join(
+                "(" + ", ".join(f":{column}_{index}" for column in columns) + ")"
+                for index in range(row_count)
+            )
+            return text(f"""
+                WITH summarised AS (
+                    INSERT INTO controller_summaries ({', '.join(columns)}) VALUES {values}
+                    RETURNING controller_session_id
+                )
+                UPDATE controller_sessions s SET summarised_at = NOW()
+                FROM summarised
+                WHERE s.controller_session_id = summarised.controller_session_id
+            """)
+        
+        def parameters(chunk: List[tuple]) -> Dict[str, Any]:
+            return {
+                f"{column}_{index}": summary_data[column]
+                for index, (_, summary_data) in enumerate(chunk)
+                for column in columns
+            }
+        
+        written = []
+        for offset in range(0, len(built), chunk_size):
+            chunk = built[offset:offset + chunk_size]
+            try:
+                async with session.begin_nested():
+                    await session.execute(insert_statement(len(chunk)), parameters(chunk))
+                written.extend(controller_key for controller_key, _ in chunk)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Multi-row controller summary insert failed ({len(chunk)} rows), retrying row by row: {e}")
+                for controller_key, summary_data in chunk:
+                    try:
+                        async with session.begin_nested():
+                            await session.execute(insert_statement(1), parameters([(controller_key, summary_data)]))
+                        written.append(controller_key)
+                    except Exception as row_error:
+                        self.logger.error(f"❌ Failed to insert summary for controller {controller_key[0]}: {row_error}")
+        
+        self.logger.debug(f"Inserted {len(written)} controller summaries")
+        return written
+
+    async def _get_session_frequencies(self, controller_session_id: int, session) -> List[str]:
         """Get all frequencies used during a controller session including reconnections."""
         try:
             result = await session.execute(text("""
                 SELECT DISTINCT frequency 
                 FROM controllers 
-                WHERE callsign = :callsign 
-                AND logon_time >= :logon_time
-                AND logon_time <= :session_end_time
+                WHERE controller_session_id = :controller_session_id
                 AND frequency IS NOT NULL
                 ORDER BY frequency
-            """), {
-                "callsign": callsign,
-                "logon_time": logon_time,
-                "session_end_time": session_end_time
-            })
+            """), {"controller_session_id": controller_session_id})
             
             frequencies = [str(row.frequency) for row in result.fetchall()]
             return frequencies
             
         except Exception as e:
-            self.logger.error(f"Error getting frequencies for {callsign}: {e}")
+            self.logger.error(f"Error getting frequencies for controller session {controller_session_id}: {e}")
             return []
 
     async def _get_aircraft_interactions(self, callsign: str, session_start: datetime, session_end: datetime, session) -> Dict[str, Any]:
@@ -1637,218 +2311,137 @@ class DataService:
             "details": []
         }
 
-    async def _archive_completed_controllers(self, completed_controllers: List[tuple]) -> int:
-        """Archive completed controller records."""
-        archived_count = 0
-        async with get_database_session() as session:
-            for controller_key in completed_controllers:
-                callsign, cid, logon_time, session_end_time = controller_key
-                
-                try:
-                    # Archive all records for this session
-                    result = await session.execute(text("""
-                        INSERT INTO controllers_archive (
-                            id, callsign, frequency, cid, name, rating, facility,
-                            visual_range, text_atis, server, last_updated, logon_time,
-                            created_at, updated_at
-                        )
-                        SELECT 
-                            id, callsign, frequency, cid, name, rating, facility,
-                            visual_range, text_atis, server, last_updated, logon_time,
-                            created_at, updated_at
-                        FROM controllers
-                        WHERE callsign = :callsign AND logon_time = :logon_time
-                    """), {
-                        "callsign": callsign,
-                        "logon_time": logon_time
-                    })
-                    
-                    archived_count += result.rowcount
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to archive controller {callsign}: {e}")
-                    continue
-            
-            await session.commit()
-            return archived_count
+    # Completed controller sessions as a set, joined on the single controller_session_id column
+    _COMPLETED_CONTROLLER_KEYS_SQL = """
+        unnest(CAST(:controller_session_ids AS INTEGER[])) AS k(controller_session_id)
+    """
 
-    async def _delete_completed_controllers(self, completed_controllers: List[tuple]) -> int:
-        """Delete completed controller records from main table."""
-        deleted_count = 0
-        async with get_database_session() as session:
-            for controller_key in completed_controllers:
-                callsign, cid, logon_time, session_end_time = controller_key
-                
-                try:
-                    result = await session.execute(text("""
-                        DELETE FROM controllers
-                        WHERE callsign = :callsign AND logon_time = :logon_time
-                    """), {
-                        "callsign": callsign,
-                        "logon_time": logon_time
-                    })
-                    
-                    deleted_count += result.rowcount
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to delete controller {callsign}: {e}")
-                    continue
-            
-            await session.commit()
-            return deleted_count
+    def _completed_controller_key_params(self, completed_controllers: List[tuple]) -> Dict[str, List]:
+        """Array parameters for the completed controller keys (callsign, cid, logon_time, session_end_time, controller_session_id)."""
+        return {
+            "controller_session_ids": [controller_key[4] for controller_key in completed_controllers]
+        }
+
+    async def _execute_completed_controller_statement(self, query, completed_controllers: List[tuple], session: Optional[AsyncSession]) -> int:
+        """Run a statement over the completed controller keys, in the caller's session or a committed one of its own."""
+        if session is not None:
+            result = await session.execute(query, self._completed_controller_key_params(completed_controllers))
+            return result.rowcount
+        
+        async with get_database_session() as own_session:
+            result = await own_session.execute(query, self._completed_controller_key_params(completed_controllers))
+            await own_session.commit()
+            return result.rowcount
+
+    def _rows_per_second(self, rows: int, stage_start: float) -> float:
+        """Throughput of a lifecycle stage that started at stage_start (perf_counter)."""
+        elapsed = time.perf_counter() - stage_start
+        return rows / elapsed if elapsed > 0 else 0.0
+
+    async def _archive_completed_controllers(self, completed_controllers: List[tuple], session: Optional[AsyncSession] = None) -> int:
+        """Archive completed controller records with one INSERT ... SELECT for the whole batch."""
+        if not completed_controllers:
+            return 0
+        
+        query = text(f"""
+            INSERT INTO controllers_archive (
+                id, callsign, frequency, cid, name, rating, facility,
+                visual_range, text_atis, server, last_updated, logon_time,
+                controller_session_id, created_at, updated_at
+            )
+            SELECT 
+                c.id, c.callsign, c.frequency, c.cid, c.name, c.rating, c.facility,
+                c.visual_range, c.text_atis, c.server, c.last_updated, c.logon_time,
+                c.controller_session_id, c.created_at, c.updated_at
+            FROM controllers c
+            JOIN {self._COMPLETED_CONTROLLER_KEYS_SQL}
+              ON c.controller_session_id = k.controller_session_id
+        """)
+        return await self._execute_completed_controller_statement(query, completed_controllers, session)
+
+    async def _delete_completed_controllers(self, completed_controllers: List[tuple], session: Optional[AsyncSession] = None) -> int:
+        """Delete completed controller records from main table with one DELETE ... USING for the whole batch."""
+        if not completed_controllers:
+            return 0
+        
+        query = text(f"""
+            DELETE FROM controllers c
+            USING {self._COMPLETED_CONTROLLER_KEYS_SQL}
+            WHERE c.controller_session_id = k.controller_session_id
+        """)
+        return await self._execute_completed_controller_statement(query, completed_controllers, session)
+
+    # Completed flight sessions as a set, joined on the single flight_session_id column
+    _COMPLETED_FLIGHT_KEYS_SQL = """
+        unnest(CAST(:flight_session_ids AS INTEGER[])) WITH ORDINALITY AS k(flight_session_id, ord)
+    """
+
+    def _completed_flight_key_chunks(self, completed_flights: List[int]):
+        """Yield array parameters for the completed flight sessions, chunked by FLIGHT_ARCHIVE_BATCH_SIZE."""
+        chunk_size = self.config.flight_summary.archive_batch_size
+        for offset in range(0, len(completed_flights), chunk_size):
+            yield {"flight_session_ids": list(completed_flights[offset:offset + chunk_size])}
 
-    async def _archive_completed_flights(self, completed_flights: List[dict]) -> int:
-        """Archive detailed records for completed flights."""
+    async def _archive_completed_flights(self, completed_flights: List[int]) -> int:
+        """Archive detailed records for completed flights with one INSERT ... SELECT per chunk of keys."""
+        if not completed_flights:
+            return 0
+        
         processed_count = 0
+        start_time = time.perf_counter()
         async with get_database_session() as session:
-            for flight_key in completed_flights:
-                callsign, departure, arrival, cid, deptime = flight_key
-                
-                try:
-                    # Get all records for this flight
-                    flight_records = await session.execute(text("""
-                        SELECT * FROM flights 
-                        WHERE callsign = :callsign 
-                        AND departure = :departure 
-                        AND arrival = :arrival 
-                        AND cid = :cid
-                        AND deptime = :deptime
-                        ORDER BY last_updated
-                    """), {
-                        "callsign": callsign,
-                        "departure": departure,
-                        "arrival": arrival,
-                        "cid": cid,
-                        "deptime": deptime
-                    })
-                    
-                    records = flight_records.fetchall()
-                    if not records:
-                        continue
-                    
-                    # Archive each record
-                    for record in records:
-                        await session.execute(text("""
-                            INSERT INTO flights_archive (
-                                callsign, aircraft_type, departure, arrival, logon_time,
-                                route, flight_rules, aircraft_faa, planned_altitude, aircraft_short,
-                                cid, name, server, pilot_rating, military_rating,
-                                latitude, longitude, altitude, groundspeed, heading,
-                                last_updated, deptime, controller_callsigns, controller_time_percentage,
-                                time_online_minutes, primary_enroute_sector, total_enroute_sectors,
-                                total_enroute_time_minutes, sector_breakdown, completion_time
-                            ) VALUES (
-                                :callsign, :aircraft_type, :departure, :arrival, :logon_time,
-                                :route, :flight_rules, :aircraft_faa, :planned_altitude, :aircraft_short,
-                                :cid, :name, :server, :pilot_rating, :military_rating,
-                                :latitude, :longitude, :altitude, :groundspeed, :heading,
-                                :last_updated, :deptime, :controller_callsigns, :controller_time_percentage,
-                                :time_online_minutes, :primary_enroute_sector, :total_enroute_sectors,
-                                :total_enroute_time_minutes, :sector_breakdown, :completion_time
-                            )
-                        """), {
-                            "callsign": record.callsign,
-                            "aircraft_type": record.aircraft_type,
-                            "departure": record.departure,
-                            "arrival": record.arrival,
-                            "logon_time": record.logon_time,
-                            "route": record.route,
-                            "flight_rules": record.flight_rules,
-                            "aircraft_faa": record.aircraft_faa,
-                            "planned_altitude": record.planned_altitude,
-                            "aircraft_short": record.aircraft_type,
-                            "cid": record.cid,
-                            "name": record.name,
-                            "server": record.server,
-                            "pilot_rating": record.pilot_rating,
-                            "military_rating": record.military_rating,
-                            "latitude": record.latitude,
-                            "longitude": record.longitude,
-                            "altitude": record.altitude,
-                            "groundspeed": record.groundspeed,
-                            "heading": record.heading,
-                            "last_updated": record.last_updated,
-                            "deptime": getattr(record, 'deptime', None),
-                            "controller_callsigns": getattr(record, 'controller_callsigns', None),
-                            "controller_time_percentage": getattr(record, 'controller_time_percentage', None),
-                            "time_online_minutes": getattr(record, 'time_online_minutes', None),
-                            "primary_enroute_sector": getattr(record, 'primary_enroute_sector', None),
-                            "total_enroute_sectors": getattr(record, 'total_enroute_sectors', None),
-                            "total_enroute_time_minutes": getattr(record, 'total_enroute_time_minutes', None),
-                            "sector_breakdown": getattr(record, 'sector_breakdown', None),
-                            "completion_time": getattr(record, 'completion_time', None)
-                        })
-                    
-                    processed_count += len(records)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to archive flight {callsign}: {e}")
-                    continue
+            for key_params in self._completed_flight_key_chunks(completed_flights):
+                # Summary columns stay NULL here - populate_flights_archive_summary_fields fills them
+                result = await session.execute(text(f"""
+                    INSERT INTO flights_archive (
+                        callsign, aircraft_type, departure, arrival, logon_time,
+                        route, flight_rules, aircraft_faa, planned_altitude, aircraft_short,
+                        cid, name, server, pilot_rating, military_rating,
+                        latitude, longitude, altitude, groundspeed, heading,
+                        last_updated, deptime, flight_session_id
+                    )
+                    SELECT
+                        f.callsign, f.aircraft_type, f.departure, f.arrival, f.logon_time,
+                        f.route, f.flight_rules, f.aircraft_faa, f.planned_altitude, f.aircraft_type,
+                        f.cid, f.name, f.server, f.pilot_rating, f.military_rating,
+                        f.latitude, f.longitude, f.altitude, f.groundspeed, f.heading,
+                        f.last_updated, f.deptime, f.flight_session_id
+                    FROM flights f
+                    JOIN {self._COMPLETED_FLIGHT_KEYS_SQL}
+                      ON f.flight_session_id = k.flight_session_id
+                    ORDER BY k.ord, f.last_updated
+                """), key_params)
+                processed_count += result.rowcount
             
             # Commit all changes
             await session.commit()
-            
-            return processed_count
+        
+        elapsed = time.perf_counter() - start_time
+        self.logger.info(f"📦 Archived {processed_count} records for {len(completed_flights)} completed flights in {elapsed:.2f}s")
+        return processed_count
 
-    async def _delete_completed_flights(self, completed_flights: List[dict]) -> int:
-        """Delete completed flights from the main flights table."""
+    async def _delete_completed_flights(self, completed_flights: List[int]) -> int:
+        """Delete completed flights from the main flights table with one DELETE ... USING per chunk of keys."""
+        if not completed_flights:
+            return 0
+        
         processed_count = 0
+        start_time = time.perf_counter()
         async with get_database_session() as session:
-            for flight_key in completed_flights:
-                callsign, departure, arrival, cid, deptime = flight_key
-                
-                try:
-                    # Delete all records for this flight
-                    result = await session.execute(text("""
-                        DELETE FROM flights 
-                        WHERE callsign = :callsign 
-                        AND departure = :departure 
-                        AND arrival = :arrival 
-                        AND cid = :cid
-                        AND deptime = :deptime
-                    """), {
-                        "callsign": callsign,
-                        "departure": departure,
-                        "arrival": arrival,
-                        "cid": cid,
-                        "deptime": deptime
-                    })
-                    
-                    processed_count += result.rowcount
-                    self.logger.debug(f"Deleted {processed_count} completed flights from main table")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to delete completed flight {callsign}: {e}")
-                    continue
+            for key_params in self._completed_flight_key_chunks(completed_flights):
+                result = await session.execute(text(f"""
+                    DELETE FROM flights f
+                    USING {self._COMPLETED_FLIGHT_KEYS_SQL}
+                    WHERE f.flight_session_id = k.flight_session_id
+                """), key_params)
+                processed_count += result.rowcount
             
             # Commit changes
             await session.commit()
-            
-            return processed_count
-
-    async def _cleanup_old_archived_records(self, retention_hours: int) -> int:
-        """Delete old archived records beyond the retention period."""
-        try:
-            retention_threshold = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
-            
-            async with get_database_session() as session:
-                # Delete from flights_archive
-                result = await session.execute(text("""
-                    DELETE FROM flights_archive 
-                    WHERE last_updated < :retention_threshold
-                """), {"retention_threshold": retention_threshold})
-                
-                processed_count = result.rowcount
-                self.logger.debug(f"Deleted {processed_count} old archived records from flights_archive")
-                
-                # Commit changes
-                await session.commit()
-                
-                return processed_count
-                
-        except Exception as e:
-            self.logger.error(f"Failed to delete old archived records from flights_archive: {e}")
-            raise
+        
+        elapsed = time.perf_counter() - start_time
+        self.logger.info(f"🗑️ Deleted {processed_count} records for {len(completed_flights)} completed flights in {elapsed:.2f}s")
+        return processed_count
 
     async def populate_flights_archive_summary_fields(self) -> int:
         """Populate summary fields in flights_archive from flight_summaries table."""
@@ -1870,11 +2463,7 @@ class DataService:
                         completion_time = fs.completion_time,
                         updated_at = NOW()
                     FROM flight_summaries fs
-                    WHERE flights_archive.callsign = fs.callsign
-                    AND flights_archive.departure = fs.departure
-                    AND flights_archive.arrival = fs.arrival
-                    AND flights_archive.cid = fs.cid
-                    AND flights_archive.deptime = fs.deptime
+                    WHERE flights_archive.flight_session_id = fs.flight_session_id
                     AND (
                         flights_archive.controller_callsigns IS NULL
                         OR flights_archive.controller_time_percentage IS NULL
@@ -2132,6 +2721,7 @@ class DataService:
                 "last_processing_time": getattr(self, '_last_processing_time', None),
                 "processing_errors": getattr(self, '_processing_errors', 0),
                 "successful_processing_count": getattr(self, '_successful_processing_count', 0),
+                "bulk_writer": self.bulk_writer.get_stats() if hasattr(self, 'bulk_writer') else None,
                 "flight_summary_task_status": {
                     "running": self.flight_summary_task is not None and not self.flight_summary_task.done(),
                     "done": self.flight_summary_task is not None and self.flight_summary_task.done(),
@@ -2155,7 +2745,17 @@ class DataService:
                     "done": self.flight_detection_task is not None and self.flight_detection_task.done(),
                     "cancelled": self.flight_detection_task is not None and self.flight_detection_task.cancelled(),
                     "exception": str(self.flight_detection_task.exception()) if self.flight_detection_task and self.flight_detection_task.done() and self.flight_detection_task.exception() else None
-                }
+                },
+                "partition_maintenance_task_status": {
+                    "running": self.partition_maintenance_task is not None and not self.partition_maintenance_task.done(),
+                    "done": self.partition_maintenance_task is not None and self.partition_maintenance_task.done()
+                },
+                "live_state": self.live_state.get_stats(),
+                "flight_sessions": self.flight_session_registry.get_stats(),
+                "controller_sessions": self.controller_session_registry.get_stats(),
+                "frequency_intervals": self.frequency_interval_tracker.get_stats(),
+                "snapshot_events": self.snapshot_diff.get_stats(),
+                "flight_finalization": self.flight_summary_accumulator.get_stats()
             }
             return stats
         except Exception as e:
@@ -2284,6 +2884,64 @@ class DataService:
                 # Wait a bit before retrying, but don't wait the full interval
                 await asyncio.sleep(60)  # Wait 1 minute before retry
 
+    async def start_scheduled_partition_maintenance(self):
+        """Start the scheduled partition maintenance task."""
+        try:
+            interval_seconds = self.config.partitioning.maintenance_interval_minutes * 60
+            self.logger.info(f"🚀 Starting scheduled partition maintenance - interval: {interval_seconds} seconds")
+            self.partition_maintenance_task = asyncio.create_task(self._scheduled_partition_maintenance_loop(interval_seconds))
+        except Exception as e:
+            self.logger.error(f"Failed to start scheduled partition maintenance: {e}")
+
+    async def _scheduled_partition_maintenance_loop(self, interval_seconds: int):
+        """
+        Background loop for partition maintenance. Runs once at startup so today's partitions exist.
+        
+        Future partitions are created on every run; PARTITION_MAINTENANCE_ENABLED
+        only controls whether expired partitions are detached or dropped.
+        Frequency interval and event retention have their own settings and
+        run regardless.
+        """
+        while True:
+            try:
+                result = await self.partition_manager.run_maintenance(expire=self.config.partitioning.enabled)
+                self.logger.debug(f"Partition maintenance completed: {result}")
+                await self._expire_frequency_intervals()
+                await self._expire_events()
+                await asyncio.sleep(interval_seconds)
+            except asyncio.CancelledError:
+                self.logger.info("Scheduled partition maintenance task was cancelled")
+                break
+            except Exception as e:
+                self.logger.error(f"❌ Error in scheduled partition maintenance: {e}")
+                await asyncio.sleep(60)  # Wait 1 minute before retry
+
+    async def _expire_frequency_intervals(self) -> int:
+        """Delete closed frequency intervals older than FREQUENCY_INTERVAL_RETENTION_DAYS."""
+        retention_days = self.config.frequency_intervals.retention_days
+        if not self.frequency_intervals_enabled or retention_days <= 0:
+            return 0
+        
+        async with get_database_session() as session:
+            deleted = await self.frequency_interval_tracker.expire(session, retention_days)
+            await session.commit()
+        if deleted:
+            self.logger.info(f"🧹 Deleted {deleted} frequency intervals older than {retention_days} days")
+        return deleted
+
+    async def _expire_events(self) -> int:
+        """Delete snapshot events older than EVENT_RETENTION_DAYS."""
+        retention_days = self.config.events.retention_days
+        if not self.config.events.persist or retention_days <= 0:
+            return 0
+        
+        async with get_database_session() as session:
+            deleted = await self.snapshot_diff.expire(session, retention_days)
+            await session.commit()
+        if deleted:
+            self.logger.info(f"🧹 Deleted {deleted} snapshot events older than {retention_days} days")
+        return deleted
+
     def _on_atc_detection_task_done(self, task):
         """Callback when ATC detection task completes or fails."""
         try:
@@ -2358,18 +3016,17 @@ class DataService:
             
             self.logger.info(f"Processing {len(flights)} active flights and {len(controllers)} active controllers")
             
-            # Process each flight for ATC interactions
-            total_interactions = 0
-            for flight in flights:
-                try:
-                    result = await self.atc_detection_service.detect_flight_atc_interactions_with_timeout(
-                        flight.callsign, flight.departure, flight.arrival, flight.logon_time, timeout_seconds=10.0
-                    )
-                    if result.get("interactions_detected", 0) > 0:
-                        total_interactions += result["interactions_detected"]
-                except Exception as e:
-                    self.logger.debug(f"Failed to process flight {flight.callsign} for ATC detection: {e}")
-                    continue
+            # Process all flights for ATC interactions in one batch
+            results = await self.atc_detection_service.detect_many([
+                {
+                    "callsign": flight.callsign,
+                    "departure": flight.departure,
+                    "arrival": flight.arrival,
+                    "logon_time": flight.logon_time
+                }
+                for flight in flights
+            ])
+            total_interactions = sum(result.get("interactions_detected", 0) for result in results)
             
             self.logger.info(f"✅ Real-time ATC detection completed: {total_interactions} interactions detected")
             return {"interactions_detected": total_interactions, "flights_processed": len(flights)}
@@ -14,34 +14,50 @@ each controller actually handled during their session.
 
 import logging
 import json
-from datetime import datetime
-from typing import Dict, List, Any
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Any, Optional
 from sqlalchemy import text
 
 from app.database import get_database_session
 from app.services.controller_type_detector import ControllerTypeDetector
+from app.utils.atc_matching import FREQUENCY_TOLERANCE_HZ, filter_interval_contacts, find_frequency_matches
 
 
 class FlightDetectionService:
     """Service for detecting flight interactions with controllers."""
     
-    def __init__(self, time_window_seconds: int = None):
+    def __init__(self, time_window_seconds: int = None, interval_detection: Optional[bool] = None):
         """
         Initialize Flight Detection Service.
         
         Args:
             time_window_seconds: Time window for frequency matching (default: from environment or 180s)
+            interval_detection: Join frequency_intervals instead of transceivers
+                (default: from FREQUENCY_INTERVAL_DETECTION or True)
         """
         import os
         
         # Load from environment variables with defaults
         self.time_window_seconds = time_window_seconds or int(os.getenv("FLIGHT_DETECTION_TIME_WINDOW_SECONDS", "180"))
         
+        # Streaming mode walks the session in time slices over a server-side cursor
+        self.streaming_enabled = os.getenv("FLIGHT_DETECTION_STREAMING", "true").lower() == "true"
+        self.slice_seconds = int(os.getenv("FLIGHT_DETECTION_SLICE_SECONDS", "900"))
+        self.stream_batch_size = int(os.getenv("FLIGHT_DETECTION_STREAM_BATCH_SIZE", "2000"))
+        
+        # Frequency intervals folded at ingest replace raw transceiver rows
+        if interval_detection is None:
+            interval_detection = os.getenv("FREQUENCY_INTERVAL_DETECTION", "true").lower() == "true"
+        self.interval_detection = interval_detection
+        self.vatsim_polling_interval_seconds = int(os.getenv("VATSIM_POLLING_INTERVAL", "60"))
+        
         # Initialize controller type detector for dynamic proximity ranges
         self.controller_type_detector = ControllerTypeDetector()
         
         self.logger = logging.getLogger(__name__)
-        self.logger.info(f"Flight Detection Service initialized: time_window={self.time_window_seconds}s, dynamic proximity ranges enabled")
+        self.logger.info(f"Flight Detection Service initialized: time_window={self.time_window_seconds}s, streaming={self.streaming_enabled} (slice={self.slice_seconds}s), dynamic proximity ranges enabled")
         
     async def detect_controller_flight_interactions(self, controller_callsign: str, session_start: datetime, session_end: datetime) -> Dict[str, Any]:
         """
@@ -64,20 +80,34 @@ class FlightDetectionService:
             
             self.logger.debug(f"Controller {controller_callsign} detected as {controller_info['type']} with {proximity_threshold_nm}nm proximity range")
             
+            if self.interval_detection:
+                # One overlap join of the controller's and the flights' frequency intervals
+                aircraft_data = await self._get_interval_aircraft_data(controller_callsign, session_start, session_end, proximity_threshold_nm)
+                flight_data = self._summarise_aircraft_data(aircraft_data, session_start, session_end)
+                self.logger.debug(f"Flight detection completed for {controller_callsign}: {len(flight_data.get('aircraft_callsigns', {}))} aircraft")
+                return flight_data
+            
             # Get controller transceivers
             controller_transceivers = await self._get_controller_transceivers(controller_callsign, session_start, session_end)
             if not controller_transceivers:
                 self.logger.debug(f"No transceiver data found for controller {controller_callsign}")
                 return self._create_empty_flight_data()
             
-            # Get flight transceivers
-            flight_transceivers = await self._get_flight_transceivers(session_start, session_end)
-            if not flight_transceivers:
-                self.logger.debug(f"No flight transceiver data found")
-                return self._create_empty_flight_data()
-            
-            # Find frequency matches with proximity and time constraints using SQL JOIN
-            frequency_matches = await self._find_frequency_matches(controller_transceivers, flight_transceivers, controller_callsign, session_start, session_end, proximity_threshold_nm)
+            if self.streaming_enabled:
+                # Stream flight transceivers slice by slice - bounded memory, no row cap
+                frequency_matches = []
+                async for slice_matches in self._stream_frequency_matches(controller_transceivers, session_start, session_end, proximity_threshold_nm):
+                    frequency_matches.extend(slice_matches)
+                frequency_matches.sort(key=lambda match: (match["flight_time"], match["controller_time"]))
+            else:
+                # Get flight transceivers
+                flight_transceivers = await self._get_flight_transceivers(session_start, session_end)
+                if not flight_transceivers:
+                    self.logger.debug(f"No flight transceiver data found")
+                    return self._create_empty_flight_data()
+                
+                # Find frequency matches with proximity and time constraints using SQL JOIN
+                frequency_matches = await self._find_frequency_matches(controller_transceivers, flight_transceivers, controller_callsign, session_start, session_end, proximity_threshold_nm)
             
             # Calculate flight interaction metrics
             flight_data = await self._calculate_flight_metrics(controller_callsign, session_start, session_end, frequency_matches)
@@ -189,6 +219,106 @@ class FlightDetectionService:
             self.logger.error(f"Error getting flight transceivers: {e}")
             return []
     
+    async def _stream_flight_transceivers(self, session_start: datetime, session_end: datetime) -> AsyncIterator[Dict[str, Any]]:
+        """Yield flight transceivers for the controller session in timestamp order through a server-side cursor."""
+        query = """
+            SELECT t.callsign, t.frequency, t.timestamp, t.position_lat, t.position_lon
+            FROM transceivers t
+            WHERE t.entity_type = 'flight' 
+            AND t.timestamp BETWEEN :session_start AND :session_end
+            ORDER BY t.timestamp
+        """
+        
+        async with get_database_session() as session:
+            result = await session.stream(
+                text(query),
+                {"session_start": session_start, "session_end": session_end},
+                execution_options={"yield_per": self.stream_batch_size}
+            )
+            async for row in result:
+                yield {
+                    "callsign": row.callsign,
+                    "frequency": row.frequency,
+                    "frequency_mhz": row.frequency / 1000000.0,  # Convert Hz to MHz
+                    "timestamp": row.timestamp,
+                    "position_lat": row.position_lat,
+                    "position_lon": row.position_lon
+                }
+    
+    async def _stream_frequency_matches(self, controller_transceivers: List[Dict], session_start: datetime, session_end: datetime, proximity_threshold_nm: float) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk the controller session in fixed time slices and yield each slice's matches.
+        
+        Only flight transceivers within time_window_seconds of the current
+        controller slice are held in memory; older ones are dropped as the
+        cursor advances.
+        """
+        window = timedelta(seconds=self.time_window_seconds)
+        slice_length = timedelta(seconds=self.slice_seconds)
+        controller_times = [transceiver["timestamp"] for transceiver in controller_transceivers]
+        
+        flight_stream = self._stream_flight_transceivers(session_start, session_end)
+        buffer = deque()
+        next_flight = None
+        exhausted = False
+        streamed = 0
+        peak_buffer = 0
+        
+        try:
+            slice_start = session_start
+            while slice_start <= session_end:
+                slice_end = slice_start + slice_length
+                controller_slice = controller_transceivers[bisect_left(controller_times, slice_start):bisect_left(controller_times, slice_end)]
+                if not controller_slice:
+                    slice_start = slice_end
+                    continue
+                
+                # Drop flight records that can no longer match this or any later slice
+                earliest = slice_start - window
+                while buffer and buffer[0]["timestamp"] < earliest:
+                    buffer.popleft()
+                
+                # Read ahead until the cursor passes the end of this slice's window
+                horizon = slice_end + window
+                while not exhausted:
+                    if next_flight is None:
+                        try:
+                            next_flight = await anext(flight_stream)
+                        except StopAsyncIteration:
+                            exhausted = True
+                            break
+                        streamed += 1
+                    if next_flight["timestamp"] > horizon:
+                        break
+                    if next_flight["timestamp"] >= earliest:
+                        buffer.append(next_flight)
+                    next_flight = None
+                peak_buffer = max(peak_buffer, len(buffer))
+                
+                slice_matches = find_frequency_matches(list(buffer), controller_slice, self.time_window_seconds, lambda _: proximity_threshold_nm)
+                if slice_matches:
+                    yield [
+                        {
+                            "controller_callsign": match["atc_callsign"],
+                            "flight_callsign": match["flight_callsign"],
+                            "frequency_mhz": match["atc_frequency_mhz"],
+                            "controller_time": match["atc_time"],
+                            "flight_time": match["flight_time"],
+                            "time_diff_seconds": match["time_diff_seconds"],
+                            "controller_lat": match["atc_lat"],
+                            "controller_lon": match["atc_lon"],
+                            "flight_lat": match["flight_lat"],
+                            "flight_lon": match["flight_lon"]
+                        }
+                        for match in slice_matches
+                    ]
+                
+                slice_start = slice_end
+        finally:
+            await flight_stream.aclose()
+        
+        self.logger.info(f"Streamed {streamed} flight transceiver records in {self.slice_seconds}s slices (peak buffer {peak_buffer})")
+    
     async def _find_frequency_matches(self, controller_transceivers: List[Dict], flight_transceivers: List[Dict], controller_callsign: str, session_start: datetime, session_end: datetime, proximity_threshold_nm: float) -> List[Dict[str, Any]]:
         """Find frequency matches between controller and flight transceivers using the planned CTE query."""
         try:
@@ -273,6 +403,68 @@ class FlightDetectionService:
             self.logger.error(f"Error in flight detection CTE query: {e}")
             return []
     
+    async def _get_interval_aircraft_data(self, controller_callsign: str, session_start: datetime, session_end: datetime, proximity_threshold_nm: float) -> Dict[str, Dict[str, Any]]:
+        """Group the flights whose frequency intervals overlap the controller's, per aircraft callsign."""
+        # Flight intervals widened by the time window on both sides, so an overlap means some pair of
+        # observations was within the window; the contact is the overlap clipped to that widening
+        async with get_database_session() as session:
+            result = await session.execute(text("""
+                SELECT f.callsign AS flight_callsign, a.callsign AS atc_callsign, f.frequency,
+                       GREATEST(f.interval_start, a.interval_start - make_interval(secs => :time_window)) AS contact_start,
+                       LEAST(f.interval_end, a.interval_end + make_interval(secs => :time_window)) AS contact_end,
+                       f.position_lat AS flight_lat, f.position_lon AS flight_lon,
+                       a.position_lat AS atc_lat, a.position_lon AS atc_lon
+                FROM frequency_intervals a
+                JOIN frequency_intervals f
+                  ON f.entity_type = 'flight'
+                 AND f.frequency BETWEEN a.frequency - :tolerance AND a.frequency + :tolerance
+                 AND f.active_during && tstzrange(
+                        a.interval_start - make_interval(secs => :time_window),
+                        a.interval_end + make_interval(secs => :time_window), '[]')
+                WHERE a.entity_type = 'atc'
+                AND a.callsign = :controller_callsign
+                AND a.active_during && tstzrange(:session_start, :session_end, '[]')
+                ORDER BY contact_start
+            """), {
+                "controller_callsign": controller_callsign,
+                "session_start": session_start,
+                "session_end": session_end,
+                "time_window": float(self.time_window_seconds),
+                "tolerance": FREQUENCY_TOLERANCE_HZ
+            })
+            rows = result.fetchall()
+        
+        contacts = []
+        for row in rows:
+            contact_start = max(row.contact_start, session_start)
+            contact_end = min(row.contact_end, session_end)
+            if contact_start <= contact_end:
+                contacts.append({**row._mapping, "contact_start": contact_start, "contact_end": contact_end})
+        contacts = filter_interval_contacts(contacts, lambda _: proximity_threshold_nm)
+        
+        aircraft_data = {}
+        for contact in contacts:
+            flight_callsign = contact["flight_callsign"]
+            if flight_callsign not in aircraft_data:
+                aircraft_data[flight_callsign] = {
+                    "callsign": flight_callsign,
+                    "frequency_mhz": int(contact["frequency"]) / 1000000.0,
+                    "first_seen": contact["contact_start"],
+                    "last_seen": contact["contact_end"],
+                    "updates_count": 0,
+                    "total_time_on_frequency": 0,
+                    "controller_contacts": []
+                }
+            
+            aircraft = aircraft_data[flight_callsign]
+            aircraft["first_seen"] = min(aircraft["first_seen"], contact["contact_start"])
+            aircraft["last_seen"] = max(aircraft["last_seen"], contact["contact_end"])
+            # A contact spans the polls between its start and end, inclusive
+            aircraft["updates_count"] += int((contact["contact_end"] - contact["contact_start"]).total_seconds() // self.vatsim_polling_interval_seconds) + 1
+        
+        self.logger.debug(f"Interval flight detection for {controller_callsign}: {len(rows)} interval contacts, {len(aircraft_data)} aircraft")
+        return aircraft_data
+    
     async def _calculate_flight_metrics(self, controller_callsign: str, session_start: datetime, session_end: datetime, frequency_matches: List[Dict]) -> Dict[str, Any]:
         """Calculate flight interaction metrics for a controller session."""
         try:
@@ -310,6 +502,18 @@ class FlightDetectionService:
                     "time_diff_seconds": match["time_diff_seconds"]
                 })
             
+            return self._summarise_aircraft_data(aircraft_data, session_start, session_end)
+            
+        except Exception as e:
+            self.logger.error(f"Error calculating flight metrics: {e}")
+            return self._create_empty_flight_data()
+    
+    def _summarise_aircraft_data(self, aircraft_data: Dict[str, Dict[str, Any]], session_start: datetime, session_end: datetime) -> Dict[str, Any]:
+        """Calculate flight interaction metrics from per-aircraft contact data."""
+        try:
+            if not aircraft_data:
+                return self._create_empty_flight_data()
+            
             # Calculate time on frequency for each aircraft
             for aircraft in aircraft_data.values():
                 time_diff = aircraft["last_seen"] - aircraft["first_seen"]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Flight Session Registry for VATSIM Data Collection System
+
+Assigns every flight identity (callsign, departure, arrival, cid, deptime) a
+compact integer flight_session_id at ingest. Ids live in the flight_sessions
+table and are cached in memory, so a poll only goes to the database for
+flights it has not seen before: one INSERT ... SELECT FROM unnest(...)
+ON CONFLICT ... RETURNING for all of them.
+
+The id is written to flights, transceivers.entity_id, flight_sector_occupancy,
+flights_archive and flight_summaries, and summaries, archiving and ATC
+detection look flights up by it instead of matching the five key columns.
+
+INPUTS:
+- Prepared flight rows of one poll (FlightRecord or dictionaries)
+
+OUTPUTS:
+- flight_session_id set on every row
+- Registry statistics
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.flight_session_registry")
+
+# Full flight identity, in flight_sessions unique key order
+FLIGHT_SESSION_KEY_COLUMNS = ("callsign", "departure", "arrival", "cid", "deptime")
+
+FlightSessionKey = Tuple[Any, ...]
+
+
+def flight_session_key(flight_data: Mapping[str, Any]) -> FlightSessionKey:
+    """Identity of a flight row as registered in flight_sessions."""
+    return tuple(flight_data.get(column) for column in FLIGHT_SESSION_KEY_COLUMNS)
+
+
+class FlightSessionRegistry:
+    """In-memory map of flight identities to flight_session_id, backed by flight_sessions."""
+
+    def __init__(self):
+        self.logger = logger
+        self._ids: Dict[FlightSessionKey, int] = {}
+        self.stats = {
+            "assigned": 0,
+            "registered": 0,
+            "lookups": 0
+        }
+
+    async def assign(self, bulk_flights: List[Mapping[str, Any]], session: AsyncSession) -> int:
+        """
+        Set flight_session_id on every flight row, registering unknown flights (no commit).
+
+        Args:
+            bulk_flights: Rows from DataService._prepare_flight_rows
+            session: Database session owning the poll's transaction
+
+        Returns:
+            int: Number of flights that were not in memory and were looked up
+        """
+        if not bulk_flights:
+            return 0
+
+        keys = [flight_session_key(flight_data) for flight_data in bulk_flights]
+        # ON CONFLICT cannot touch the same row twice in one statement, so unknown keys are deduplicated
+        unknown = list(dict.fromkeys(key for key in keys if key not in self._ids))
+        if unknown:
+            logon_times = {}
+            for key, flight_data in zip(keys, bulk_flights):
+                logon_times.setdefault(key, flight_data.get("logon_time"))
+            await self._register(unknown, [logon_times[key] for key in unknown], session)
+
+        for key, flight_data in zip(keys, bulk_flights):
+            flight_data["flight_session_id"] = self._ids.get(key)
+
+        self.stats["assigned"] += len(bulk_flights)
+        return len(unknown)
+
+    async def _register(self, keys: List[FlightSessionKey], logon_times: List[Any], session: AsyncSession) -> None:
+        """Insert or look up the ids of keys with one statement and cache them."""
+        # DO UPDATE (not DO NOTHING) so RETURNING also yields the ids of existing sessions
+        result = await session.execute(text("""
+            INSERT INTO flight_sessions (callsign, departure, arrival, cid, deptime, logon_time)
+            SELECT k.callsign, k.departure, k.arrival, k.cid, k.deptime, k.logon_time
+            FROM unnest(
+                CAST(:callsigns AS VARCHAR[]),
+                CAST(:departures AS VARCHAR[]),
+                CAST(:arrivals AS VARCHAR[]),
+                CAST(:cids AS INTEGER[]),
+                CAST(:deptimes AS VARCHAR[]),
+                CAST(:logon_times AS TIMESTAMPTZ[])
+            ) AS k(callsign, departure, arrival, cid, deptime, logon_time)
+            ON CONFLICT (callsign, departure, arrival, cid, deptime)
+            DO UPDATE SET callsign = EXCLUDED.callsign
+            RETURNING flight_session_id, callsign, departure, arrival, cid, deptime
+        """), {
+            "callsigns": [key[0] for key in keys],
+            "departures": [key[1] for key in keys],
+            "arrivals": [key[2] for key in keys],
+            "cids": [key[3] for key in keys],
+            "deptimes": [key[4] for key in keys],
+            "logon_times": logon_times
+        })
+
+        registered = 0
+        for row in result.fetchall():
+            self._ids[tuple(row[1:6])] = row.flight_session_id
+            registered += 1
+
+        self.stats["lookups"] += 1
+        self.stats["registered"] += registered
+        self.logger.debug(f"Registered {registered} flight sessions ({len(self._ids)} in memory)")
+
+    def discard(self, flight_session_ids: Iterable[int]) -> None:
+        """Forget completed flights so the in-memory map only holds active sessions."""
+        completed = set(flight_session_ids)
+        if completed:
+            self._ids = {key: flight_session_id for key, flight_session_id in self._ids.items()
+                         if flight_session_id not in completed}
+
+    def invalidate(self) -> None:
+        """Drop the in-memory map after a rolled-back write, whose new ids no longer exist."""
+        self._ids.clear()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        return {"active_sessions": len(self._ids), **self.stats}
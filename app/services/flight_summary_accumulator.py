@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Flight Summary Accumulator for VATSIM Data Collection System
+
+Builds flight summaries while flights are being ingested, so a summary can be
+written minutes after a flight disconnects instead of after
+FLIGHT_COMPLETION_HOURS, without re-reading the flight's history from the
+flights table.
+
+Every poll is folded into per-flight_session_id state:
+- the first record's flight plan and pilot columns, first and last poll time
+  and the number of records written (the batch's total_records)
+- seconds spent in each sector, credited for every poll interval the flight
+  kept the same open sector (the durations flight_sector_occupancy records)
+- ATC contact counts per controller: polls in which a flight transceiver was
+  on the frequency of a controller (facility != 0) within that controller's
+  proximity range, with the first and last contact
+
+Finalization is driven by the snapshot event stream: pilot_disconnected,
+pilot_filtered_out (the stored rows end there, as they do for the batch job)
+and flight_plan_changed to a new flight session schedule the session for
+disconnect time + FLIGHT_FINALIZATION_GRACE_MINUTES, and seeing the session
+again cancels it. Only sessions whose whole history was observed are
+finalized here - a session must have started with a pilot_connected,
+pilot_filtered_in or flight_plan_changed event of this process; flights
+already connected at startup are left to the batch job, which stays the
+safety net. Sessions seen
+for the first time are handed to the caller, which looks them up among the
+archive_pending summaries in one query per poll: a session that reconnected
+after it was finalized - by this process or before a restart - is reported as
+reopened so its early summary is replaced by the batch.
+
+INPUTS:
+- Prepared flight, controller and transceiver rows of one committed poll
+- Open sector per callsign from sector tracking
+- Snapshot events of the poll
+
+OUTPUTS:
+- Flight sessions due for finalization with their accumulated state
+- Accumulator statistics
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from app.services.snapshot_diff import (
+    FLIGHT_PLAN_CHANGED, PILOT_CONNECTED, PILOT_DISCONNECTED, PILOT_FILTERED_IN, PILOT_FILTERED_OUT, SnapshotEvent
+)
+from app.utils.atc_matching import find_frequency_matches
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.flight_summary_accumulator")
+
+# flight_summaries columns taken from the first record of a flight session
+FLIGHT_SUMMARY_FIRST_RECORD_COLUMNS = (
+    "callsign", "aircraft_type", "departure", "arrival", "deptime", "logon_time",
+    "route", "flight_rules", "aircraft_faa", "planned_altitude",
+    "cid", "name", "server", "pilot_rating", "military_rating"
+)
+
+# Event types the accumulator subscribes to
+FINALIZATION_EVENT_TYPES = (PILOT_CONNECTED, PILOT_DISCONNECTED, PILOT_FILTERED_IN, PILOT_FILTERED_OUT, FLIGHT_PLAN_CHANGED)
+
+
+@dataclass(slots=True)
+class AccumulatedFlight:
+    """Summary state of one flight session, folded from every poll that saw it."""
+    first_record: Dict[str, Any]
+    first_seen: datetime
+    last_seen: datetime
+    records: int = 1
+    complete: bool = False  # True once the session is known to have started while this process was ingesting
+    sector: Optional[str] = None  # Sector open at the last observation
+    sector_seconds: Dict[str, float] = field(default_factory=dict)
+    contacts: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # atc_callsign -> contact_count, first/last_contact
+
+    def sector_breakdown(self) -> Dict[str, int]:
+        """Whole minutes per sector, most time first, like DataService._calculate_sector_breakdown."""
+        minutes = {sector: int(seconds // 60) for sector, seconds in self.sector_seconds.items()}
+        return dict(sorted(((sector, value) for sector, value in minutes.items() if value > 0),
+                           key=lambda item: item[1], reverse=True))
+
+
+class FlightSummaryAccumulator:
+    """In-memory summary state per flight session, finalized on disconnect events."""
+
+    def __init__(self, grace_minutes: int = 10,
+                 proximity_for_callsign: Optional[Callable[[str], float]] = None,
+                 time_window_seconds: float = 180):
+        self.logger = logger
+        self.grace = timedelta(minutes=grace_minutes)
+        self.proximity_for_callsign = proximity_for_callsign or (lambda callsign: 0.0)
+        self.time_window_seconds = time_window_seconds
+        self._flights: Dict[int, AccumulatedFlight] = {}
+        self._deadlines: Dict[int, datetime] = {}  # Scheduled finalization per flight session
+        self._unchecked: Set[int] = set()  # Sessions first observed, not yet checked for an earlier summary
+        self._reopened: Set[int] = set()  # Finalized sessions seen again, summaries to withdraw
+        self.stats = {
+            "observed": 0,
+            "contacts": 0,
+            "scheduled": 0,
+            "cancelled": 0,
+            "finalized": 0,
+            "left_to_batch": 0,
+            "reopened": 0
+        }
+
+    def observe(self, bulk_flights: List[Mapping[str, Any]], bulk_controllers: List[Mapping[str, Any]],
+                bulk_transceivers: List[Mapping[str, Any]], open_sectors: Mapping[str, str],
+                observed_at: Optional[datetime] = None) -> int:
+        """
+        Fold one committed poll into the flight session states.
+
+        Args:
+            bulk_flights: Flight rows with flight_session_id assigned
+            bulk_controllers: Controller rows of the same poll
+            bulk_transceivers: Transceiver rows of the same poll, flight entity_id linked
+            open_sectors: Open sector per callsign after the poll's sector changes
+            observed_at: Time of the poll (default: now, whole seconds like flights.last_updated)
+
+        Returns:
+            int: Number of flight sessions observed
+        """
+        if not bulk_flights:
+            return 0
+
+        observed_at = observed_at or datetime.now(timezone.utc).replace(microsecond=0)
+        observed = 0
+        for flight_data in bulk_flights:
+            flight_session_id = flight_data.get("flight_session_id")
+            if flight_session_id is None:
+                continue
+            sector = open_sectors.get(flight_data.get("callsign"))
+            state = self._flights.get(flight_session_id)
+            if state is None:
+                self._flights[flight_session_id] = AccumulatedFlight(
+                    first_record={column: flight_data.get(column) for column in FLIGHT_SUMMARY_FIRST_RECORD_COLUMNS},
+                    first_seen=observed_at, last_seen=observed_at, sector=sector
+                )
+                self._unchecked.add(flight_session_id)
+            elif observed_at > state.last_seen:
+                # The poll interval counts for the sector that was open at both ends of it
+                if sector is not None and sector == state.sector:
+                    state.sector_seconds[sector] = (
+                        state.sector_seconds.get(sector, 0.0) + (observed_at - state.last_seen).total_seconds()
+                    )
+                state.sector = sector
+                state.last_seen = observed_at
+                state.records += 1
+            else:
+                state.records += 1
+            if self._deadlines.pop(flight_session_id, None) is not None:
+                self.stats["cancelled"] += 1
+            observed += 1
+
+        self._observe_contacts(bulk_flights, bulk_controllers, bulk_transceivers, observed_at)
+        self.stats["observed"] += observed
+        return observed
+
+    def _observe_contacts(self, bulk_flights: List[Mapping[str, Any]], bulk_controllers: List[Mapping[str, Any]],
+                          bulk_transceivers: List[Mapping[str, Any]], observed_at: datetime) -> None:
+        """Count one contact per (flight session, controller) matched on frequency and range in this poll."""
+        controllers = {
+            controller.get("callsign") for controller in bulk_controllers
+            if controller.get("facility") != 0
+        }
+        if not controllers or not bulk_transceivers:
+            return
+
+        flight_transceivers = []
+        atc_transceivers = []
+        for transceiver in bulk_transceivers:
+            if not transceiver.get("frequency") or transceiver.get("timestamp") is None:
+                continue
+            if transceiver.get("entity_type", "flight") == "atc":
+                if transceiver.get("callsign") in controllers:
+                    atc_transceivers.append(transceiver)
+            elif transceiver.get("entity_id") is not None:
+                flight_transceivers.append(transceiver)
+
+        session_ids = {transceiver.get("callsign"): transceiver.get("entity_id") for transceiver in flight_transceivers}
+        matched: Set[Tuple[int, str]] = set()
+        for match in find_frequency_matches(
+            flight_transceivers, atc_transceivers, self.time_window_seconds, self.proximity_for_callsign
+        ):
+            matched.add((session_ids[match["flight_callsign"]], match["atc_callsign"]))
+
+        for flight_session_id, atc_callsign in matched:
+            state = self._flights.get(flight_session_id)
+            if state is None:
+                continue
+            contact = state.contacts.get(atc_callsign)
+            if contact is None:
+                state.contacts[atc_callsign] = {"contact_count": 1, "first_contact": observed_at, "last_contact": observed_at}
+            else:
+                contact["contact_count"] += 1
+                contact["last_contact"] = observed_at
+        self.stats["contacts"] += len(matched)
+
+    def on_events(self, events: List[SnapshotEvent]) -> None:
+        """Snapshot event subscriber: mark new sessions complete and schedule disconnected ones."""
+        for event in events:
+            if event.entity_id is None:
+                continue
+            if event.event_type in (PILOT_DISCONNECTED, PILOT_FILTERED_OUT):
+                self._schedule(event.entity_id, event.occurred_at)
+                continue
+            if event.event_type == FLIGHT_PLAN_CHANGED:
+                previous_flight_session_id = event.details.get("previous_flight_session_id")
+                if previous_flight_session_id is None:
+                    continue
+                self._schedule(previous_flight_session_id, event.occurred_at)
+            # The session started in this poll, so its whole history is in memory
+            state = self._flights.get(event.entity_id)
+            if state is not None and state.records == 1 and event.entity_id not in self._reopened:
+                state.complete = True
+
+    def _schedule(self, flight_session_id: int, disconnected_at: datetime) -> None:
+        """Finalize a flight session once it has stayed away for the grace period."""
+        if flight_session_id not in self._flights or flight_session_id in self._deadlines:
+            return  # A filtered out pilot logging off later does not postpone its finalization
+        self._deadlines[flight_session_id] = disconnected_at + self.grace
+        self.stats["scheduled"] += 1
+
+    def due(self, now: Optional[datetime] = None) -> List[Tuple[int, AccumulatedFlight]]:
+        """
+        Flight sessions whose grace period has passed, oldest deadline first.
+
+        Sessions whose history started before this process saw them are
+        dropped here and left to the batch job. The others stay in memory
+        until finish() confirms their summaries were written.
+        """
+        now = now or datetime.now(timezone.utc)
+        ready = []
+        for flight_session_id, deadline in sorted(self._deadlines.items(), key=lambda item: item[1]):
+            if deadline > now:
+                break
+            state = self._flights[flight_session_id]
+            if not state.complete:
+                del self._deadlines[flight_session_id]
+                del self._flights[flight_session_id]
+                self.stats["left_to_batch"] += 1
+                continue
+            ready.append((flight_session_id, state))
+        return ready
+
+    def unchecked(self) -> List[int]:
+        """Sessions first observed since the last check for an earlier summary."""
+        return sorted(self._unchecked)
+
+    def reopen(self, flight_session_ids: Iterable[int], checked: Iterable[int]) -> None:
+        """
+        Record the result of checking first-observed sessions for an earlier summary.
+
+        Args:
+            flight_session_ids: Checked sessions that already have an archive_pending summary
+            checked: Sessions that were checked
+        """
+        self._unchecked.difference_update(checked)
+        for flight_session_id in flight_session_ids:
+            state = self._flights.get(flight_session_id)
+            if state is None or flight_session_id in self._reopened:
+                continue
+            # Reconnected after its summary was written: the batch re-summarises the full history
+            state.complete = False
+            self._reopened.add(flight_session_id)
+            self.stats["reopened"] += 1
+
+    def reopened(self) -> List[int]:
+        """Finalized sessions seen again, whose early summaries should be withdrawn."""
+        return sorted(self._reopened)
+
+    def finish(self, finalized: Iterable[int], withdrawn: Iterable[int] = (), skipped: Iterable[int] = ()) -> None:
+        """
+        Forget sessions whose summaries were written and reopened sessions whose summaries were withdrawn.
+
+        Skipped sessions were due but already had a summary, so they are
+        dropped and left to the batch job like incomplete ones.
+        """
+        for flight_session_id in finalized:
+            self._deadlines.pop(flight_session_id, None)
+            if self._flights.pop(flight_session_id, None) is not None:
+                self.stats["finalized"] += 1
+        for flight_session_id in skipped:
+            self._deadlines.pop(flight_session_id, None)
+            if self._flights.pop(flight_session_id, None) is not None:
+                self.stats["left_to_batch"] += 1
+        self._reopened.difference_update(withdrawn)
+
+    def discard(self, flight_session_ids: Iterable[int]) -> None:
+        """Stop tracking sessions summarised and archived by the batch job."""
+        for flight_session_id in flight_session_ids:
+            self._flights.pop(flight_session_id, None)
+            self._deadlines.pop(flight_session_id, None)
+            self._unchecked.discard(flight_session_id)
+            self._reopened.discard(flight_session_id)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get accumulator statistics."""
+        return {
+            "tracked_sessions": len(self._flights),
+            "pending_finalization": len(self._deadlines),
+            **self.stats
+        }
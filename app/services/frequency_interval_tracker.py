@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Frequency Interval Tracker for VATSIM Data Collection System
+
+Folds the transceivers of every poll into frequency intervals: consecutive
+observations of the same (entity_type, callsign, frequency) extend one open
+interval (start, end, last position) instead of adding a row per poll. An
+interval is closed when the callsign stops transmitting on the frequency
+(frequency change or disconnect), when a flight's transceivers move to a new
+flight_session_id, or when the next observation arrives more than
+FREQUENCY_INTERVAL_MAX_GAP_SECONDS after the previous one.
+
+Open intervals are kept in memory and persisted in frequency_intervals. A poll
+runs at most two statements: one INSERT ... SELECT FROM unnest(...) RETURNING
+for intervals opened this poll and one UPDATE ... FROM unnest(...) extending
+or closing the others. ATC and flight detection join intervals on frequency
+and overlapping time ranges (GiST index on frequency, active_during) instead
+of raw per-poll transceiver rows.
+
+INPUTS:
+- Prepared transceiver rows of one poll (TransceiverRecord or dictionaries)
+
+OUTPUTS:
+- Rows in frequency_intervals
+- Tracker statistics
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.frequency_interval_tracker")
+
+# Interval identity: one open interval per (entity_type, callsign, frequency)
+IntervalKey = Tuple[str, str, int]
+
+
+@dataclass(slots=True)
+class OpenFrequencyInterval:
+    """In-memory state of an interval that is still being extended."""
+    interval_id: int
+    entity_id: Optional[int]
+    interval_end: datetime
+    position_lat: Optional[float]
+    position_lon: Optional[float]
+    observations: int
+
+
+class FrequencyIntervalTracker:
+    """In-memory map of open frequency intervals, backed by frequency_intervals."""
+
+    def __init__(self, max_gap_seconds: int = 180):
+        self.logger = logger
+        self.max_gap = timedelta(seconds=max_gap_seconds)
+        self._open: Dict[IntervalKey, OpenFrequencyInterval] = {}
+        self._loaded = False  # Seeded from frequency_intervals on first poll
+        self.stats = {
+            "observations": 0,
+            "opened": 0,
+            "extended": 0,
+            "closed": 0
+        }
+
+    async def fold(self, bulk_transceivers: List[Mapping[str, Any]], session: AsyncSession) -> int:
+        """
+        Fold one poll's transceivers into open intervals (no commit).
+
+        Args:
+            bulk_transceivers: Rows from DataService._prepare_transceiver_rows, entity_id linked
+            session: Database session owning the poll's transaction
+
+        Returns:
+            int: Number of intervals opened
+        """
+        if not bulk_transceivers:
+            # A poll without transceivers (feed unavailable) is not a disconnect; the gap rule closes stale intervals
+            return 0
+
+        if not self._loaded:
+            await self._load(session)
+
+        # Several transceivers of one callsign can share a frequency; the last one's position wins
+        observed: Dict[IntervalKey, Mapping[str, Any]] = {}
+        for transceiver in bulk_transceivers:
+            frequency = transceiver.get("frequency")
+            if not frequency or transceiver.get("timestamp") is None:
+                continue
+            observed[(transceiver.get("entity_type", "flight"), transceiver.get("callsign"), int(frequency))] = transceiver
+
+        extended: List[OpenFrequencyInterval] = []
+        closed: List[OpenFrequencyInterval] = []
+        opened: Dict[IntervalKey, Mapping[str, Any]] = {}
+        for key, transceiver in observed.items():
+            state = self._open.get(key)
+            if state is not None and self._continues(state, transceiver):
+                state.interval_end = max(state.interval_end, transceiver["timestamp"])
+                state.position_lat = transceiver.get("position_lat")
+                state.position_lon = transceiver.get("position_lon")
+                state.observations += 1
+                extended.append(state)
+                continue
+            if state is not None:
+                closed.append(self._open.pop(key))
+            opened[key] = transceiver
+
+        for key in [key for key in self._open if key not in observed]:
+            closed.append(self._open.pop(key))
+
+        await self._update(extended, closed, session)
+        if opened:
+            await self._insert(opened, session)
+
+        self.stats["observations"] += len(observed)
+        self.stats["extended"] += len(extended)
+        self.stats["closed"] += len(closed)
+        return len(opened)
+
+    def _continues(self, state: OpenFrequencyInterval, transceiver: Mapping[str, Any]) -> bool:
+        """Same flight session, observed again within the maximum gap."""
+        if state.entity_id != transceiver.get("entity_id"):
+            return False
+        return transceiver["timestamp"] - state.interval_end <= self.max_gap
+
+    async def _load(self, session: AsyncSession) -> None:
+        """Seed the open intervals from frequency_intervals after a restart or invalidate()."""
+        result = await session.execute(text("""
+            SELECT id, entity_type, callsign, frequency, entity_id,
+                   interval_end, position_lat, position_lon, observations
+            FROM frequency_intervals
+            WHERE is_open
+        """))
+        self._open = {
+            (row.entity_type, row.callsign, row.frequency): OpenFrequencyInterval(
+                row.id, row.entity_id, row.interval_end, row.position_lat, row.position_lon, row.observations
+            )
+            for row in result.fetchall()
+        }
+        self._loaded = True
+        self.logger.debug(f"Loaded {len(self._open)} open frequency intervals")
+
+    async def _insert(self, opened: Dict[IntervalKey, Mapping[str, Any]], session: AsyncSession) -> None:
+        """Open the new intervals with one statement and cache their ids."""
+        keys = list(opened)
+        result = await session.execute(text("""
+            INSERT INTO frequency_intervals (
+                entity_type, callsign, entity_id, frequency, interval_start, interval_end,
+                position_lat, position_lon, observations, is_open
+            )
+            SELECT k.entity_type, k.callsign, k.entity_id, k.frequency, k.observed_at, k.observed_at,
+                   k.position_lat, k.position_lon, 1, TRUE
+            FROM unnest(
+                CAST(:entity_types AS VARCHAR[]),
+                CAST(:callsigns AS VARCHAR[]),
+                CAST(:entity_ids AS INTEGER[]),
+                CAST(:frequencies AS BIGINT[]),
+                CAST(:observed_ats AS TIMESTAMPTZ[]),
+                CAST(:position_lats AS DOUBLE PRECISION[]),
+                CAST(:position_lons AS DOUBLE PRECISION[])
+            ) AS k(entity_type, callsign, entity_id, frequency, observed_at, position_lat, position_lon)
+            RETURNING id, entity_type, callsign, frequency, entity_id, interval_end, position_lat, position_lon
+        """), {
+            "entity_types": [key[0] for key in keys],
+            "callsigns": [key[1] for key in keys],
+            "entity_ids": [opened[key].get("entity_id") for key in keys],
+            "frequencies": [key[2] for key in keys],
+            "observed_ats": [opened[key]["timestamp"] for key in keys],
+            "position_lats": [opened[key].get("position_lat") for key in keys],
+            "position_lons": [opened[key].get("position_lon") for key in keys]
+        })
+
+        inserted = 0
+        for row in result.fetchall():
+            self._open[(row.entity_type, row.callsign, row.frequency)] = OpenFrequencyInterval(
+                row.id, row.entity_id, row.interval_end, row.position_lat, row.position_lon, 1
+            )
+            inserted += 1
+
+        self.stats["opened"] += inserted
+        self.logger.debug(f"Opened {inserted} frequency intervals ({len(self._open)} open)")
+
+    async def _update(self, extended: List[OpenFrequencyInterval], closed: List[OpenFrequencyInterval],
+                      session: AsyncSession) -> None:
+        """Persist extended and closed intervals with one UPDATE."""
+        states = extended + closed
+        if not states:
+            return
+
+        await session.execute(text("""
+            UPDATE frequency_intervals f
+            SET interval_end = u.interval_end,
+                position_lat = u.position_lat,
+                position_lon = u.position_lon,
+                observations = u.observations,
+                is_open = u.is_open
+            FROM unnest(
+                CAST(:ids AS BIGINT[]),
+                CAST(:interval_ends AS TIMESTAMPTZ[]),
+                CAST(:position_lats AS DOUBLE PRECISION[]),
+                CAST(:position_lons AS DOUBLE PRECISION[]),
+                CAST(:observations AS INTEGER[]),
+                CAST(:is_open AS BOOLEAN[])
+            ) AS u(id, interval_end, position_lat, position_lon, observations, is_open)
+            WHERE f.id = u.id
+        """), {
+            "ids": [state.interval_id for state in states],
+            "interval_ends": [state.interval_end for state in states],
+            "position_lats": [state.position_lat for state in states],
+            "position_lons": [state.position_lon for state in states],
+            "observations": [state.observations for state in states],
+            "is_open": [True] * len(extended) + [False] * len(closed)
+        })
+
+    async def expire(self, session: AsyncSession, retention_days: int) -> int:
+        """
+        Delete closed intervals that ended more than retention_days ago (no commit).
+
+        Args:
+            session: Database session
+            retention_days: Age in days after which closed intervals are deleted
+
+        Returns:
+            int: Number of intervals deleted
+        """
+        result = await session.execute(text("""
+            DELETE FROM frequency_intervals
+            WHERE NOT is_open
+            AND interval_end < NOW() - make_interval(days => :retention_days)
+        """), {"retention_days": retention_days})
+        return result.rowcount or 0
+
+    def invalidate(self) -> None:
+        """Drop the in-memory state after a rolled-back write; the next poll reloads it."""
+        self._open.clear()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracker statistics."""
+        return {"open_intervals": len(self._open), **self.stats}
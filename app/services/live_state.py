@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Live State Snapshot for VATSIM Data Collection System
+
+After every successful poll, process_vatsim_data publishes an immutable,
+versioned snapshot of the live network state (flights, controllers,
+transceivers). Each resource is serialized to JSON once at publish time and
+given an ETag, so read endpoints return the stored bytes (or 304 Not Modified)
+without touching the database. Endpoints fall back to the database when there
+is no snapshot or it is older than the maximum age. A poll without
+transceivers (transceivers feed unavailable) publishes no transceivers
+resource, so that endpoint keeps reading recent rows from the database
+instead of serving an empty list.
+
+INPUTS:
+- Prepared flight, controller and transceiver rows of one poll
+
+OUTPUTS:
+- LiveStateSnapshot with per-resource JSON bytes, ETag and row count
+- Publish / serve statistics
+
+CONFIGURATION:
+- LIVE_STATE_CACHE_ENABLED: Publish snapshots and serve read endpoints from them (default: true)
+- LIVE_STATE_MAX_AGE: Seconds a snapshot is served for, 0 means twice VATSIM_POLLING_INTERVAL (default: 0)
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+from app.config import get_config
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.live_state")
+
+RESOURCES = ("flights", "controllers", "transceivers")
+
+
+@dataclass(frozen=True)
+class LiveResource:
+    """One pre-serialized resource of a snapshot."""
+    body: bytes
+    etag: str
+    count: int
+
+
+@dataclass(frozen=True)
+class LiveStateSnapshot:
+    """Immutable live network state of one poll."""
+    version: int
+    polled_at: datetime
+    published_monotonic: float
+    resources: Mapping[str, LiveResource]
+
+    def age_seconds(self) -> float:
+        """Seconds since the snapshot was published."""
+        return time.monotonic() - self.published_monotonic
+
+
+def _iso(value: Any) -> Optional[str]:
+    """ISO 8601 string of a datetime, None stays None."""
+    return value.isoformat() if value else None
+
+
+def _flights_payload(flights: List[Dict[str, Any]], polled_at: datetime) -> Dict[str, Any]:
+    """Same shape as GET /api/flights."""
+    return {
+        "flights": [{
+            "callsign": flight.get("callsign"),
+            "cid": flight.get("cid"),
+            "name": flight.get("name"),
+            "server": flight.get("server"),
+            "pilot_rating": flight.get("pilot_rating"),
+            "latitude": flight.get("latitude"),
+            "longitude": flight.get("longitude"),
+            "altitude": flight.get("altitude"),
+            "groundspeed": flight.get("groundspeed"),
+            "heading": flight.get("heading"),
+            "transponder": flight.get("transponder"),
+            "departure": flight.get("departure"),
+            "arrival": flight.get("arrival"),
+            "aircraft_type": flight.get("aircraft_type"),
+            "flight_rules": flight.get("flight_rules"),
+            "planned_altitude": flight.get("planned_altitude"),
+            "last_updated": polled_at.isoformat()
+        } for flight in sorted(flights, key=lambda flight: flight.get("callsign") or "")],
+        "total_count": len(flights),
+        "timestamp": polled_at.isoformat()
+    }
+
+
+def _controllers_payload(controllers: List[Dict[str, Any]], polled_at: datetime) -> Dict[str, Any]:
+    """Same shape as GET /api/controllers and /api/atc-positions."""
+    return {
+        "controllers": [{
+            "callsign": controller.get("callsign"),
+            "cid": controller.get("cid"),
+            "name": controller.get("name"),
+            "facility": controller.get("facility"),
+            "rating": controller.get("rating"),
+            "server": controller.get("server"),
+            "visual_range": controller.get("visual_range"),
+            "text_atis": controller.get("text_atis"),
+            "logon_time": _iso(controller.get("logon_time")),
+            "last_updated": _iso(controller.get("last_updated"))
+        } for controller in sorted(controllers, key=lambda controller: controller.get("callsign") or "")],
+        "total_count": len(controllers),
+        "timestamp": polled_at.isoformat()
+    }
+
+
+def _transceivers_payload(transceivers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Same shape as GET /api/transceivers: one transceiver per callsign."""
+    first_per_callsign = {}
+    for transceiver in transceivers:
+        first_per_callsign.setdefault(transceiver.get("callsign"), transceiver)
+
+    items = [{
+        "id": None,  # Database row ids are not known before the rows are written
+        "callsign": transceiver.get("callsign"),
+        "frequency": transceiver.get("frequency"),
+        "position_lat": transceiver.get("position_lat"),
+        "position_lng": transceiver.get("position_lon"),
+        "height_msl": transceiver.get("height_msl"),
+        "timestamp": _iso(transceiver.get("timestamp"))
+    } for _, transceiver in sorted(first_per_callsign.items(), key=lambda item: item[0] or "")]
+    return {"transceivers": items, "total_count": len(items)}
+
+
+def _serialize(payload: Dict[str, Any]) -> LiveResource:
+    """Encode a payload once and derive its ETag from the bytes."""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return LiveResource(body=body, etag=etag, count=payload["total_count"])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class LiveStateCache:
+    """Holds the latest published snapshot; publishing swaps it atomically."""
+
+    def __init__(self, enabled: Optional[bool] = None, max_age_seconds: Optional[float] = None):
+        """
+        Initialize the live-state cache.
+
+        Args:
+            enabled: Defaults to LIVE_STATE_CACHE_ENABLED
+            max_age_seconds: Defaults to LIVE_STATE_MAX_AGE (0 means twice the polling interval)
+        """
+        self.logger = logger
+        app_config = get_config()
+        config = app_config.live_state
+        self.enabled = config.enabled if enabled is None else enabled
+        if max_age_seconds is None:
+            max_age_seconds = config.max_age_seconds or 2 * app_config.vatsim.polling_interval
+        self.max_age_seconds = max_age_seconds
+
+        self._snapshot: Optional[LiveStateSnapshot] = None
+        self._version = 0
+        self.stats = {
+            "publishes": 0,
+            "served": 0,
+            "fallbacks": 0,
+            "last_publish_seconds": 0.0
+        }
+
+    def publish(
+        self, flights: List[Dict[str, Any]], controllers: List[Dict[str, Any]],
+        transceivers: List[Dict[str, Any]], polled_at: Optional[datetime] = None
+    ) -> Optional[LiveStateSnapshot]:
+        """
+        Serialize one poll's rows and make them the current snapshot.
+
+        Returns:
+            LiveStateSnapshot: The published snapshot, or None when disabled
+        """
+        if not self.enabled:
+            return None
+
+        start_time = time.perf_counter()
+        polled_at = polled_at or datetime.now(timezone.utc)
+        resources = {
+            "flights": _serialize(_flights_payload(flights, polled_at)),
+            "controllers": _serialize(_controllers_payload(controllers, polled_at))
+        }
+        # An empty transceivers poll means the feed was unavailable, not that nobody is transmitting
+        if transceivers:
+            resources["transceivers"] = _serialize(_transceivers_payload(transceivers))
+
+        self._version += 1
+        self._snapshot = LiveStateSnapshot(
+            version=self._version,
+            polled_at=polled_at,
+            published_monotonic=time.monotonic(),
+            resources=MappingProxyType(resources)
+        )
+
+        self.stats["publishes"] += 1
+        self.stats["last_publish_seconds"] = time.perf_counter() - start_time
+        self.logger.debug(f"Published live state v{self._version} in {self.stats['last_publish_seconds']:.3f}s")
+        return self._snapshot
+
+    def get_fresh(self) -> Optional[LiveStateSnapshot]:
+        """The current snapshot, or None if disabled, never published or older than max_age_seconds."""
+        snapshot = self._snapshot
+        if not self.enabled or snapshot is None or snapshot.age_seconds() > self.max_age_seconds:
+            self.stats["fallbacks"] += 1
+            return None
+        self.stats["served"] += 1
+        return snapshot
+
+    def clear(self) -> None:
+        """Drop the current snapshot; readers fall back to the database."""
+        self._snapshot = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get live-state statistics."""
+        snapshot = self._snapshot
+        return {
+            "enabled": self.enabled,
+            "version": snapshot.version if snapshot else None,
+            "age_seconds": round(snapshot.age_seconds(), 3) if snapshot else None,
+            "max_age_seconds": self.max_age_seconds,
+            "counts": {name: resource.count for name, resource in snapshot.resources.items()} if snapshot else {},
+            **self.stats
+        }
+
+
+# Global live-state cache shared by the ingest loop and the read endpoints
+_live_state_cache: Optional[LiveStateCache] = None
+
+
+def get_live_state_cache() -> LiveStateCache:
+    """Get the global live-state cache instance."""
+    global _live_state_cache
+    if _live_state_cache is None:
+        _live_state_cache = LiveStateCache()
+    return _live_state_cache
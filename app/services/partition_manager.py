@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Partition Manager for VATSIM Data Collection System
+
+This module maintains the daily range partitions of time-partitioned tables.
+Each run pre-creates the partitions for the next few days and detaches (or
+drops) partitions older than the retention period, so expired data leaves the
+table as whole partitions instead of row-by-row DELETEs.
+
+INPUTS:
+- Partition specs (parent table, premake days, retention period, optional LIST
+  sub-partitioning column)
+
+OUTPUTS:
+- Daily partitions named <table>_pYYYYMMDD (sub-partitions <table>_pYYYYMMDD_<value>)
+- Maintenance results (partitions created and expired per table)
+
+CONFIGURATION:
+- PARTITION_MAINTENANCE_ENABLED: Expire old partitions (default: true); future
+  partitions are always created because ingest cannot insert without them
+- PARTITION_MAINTENANCE_INTERVAL: Minutes between runs (default: 60)
+- PARTITION_PREMAKE_DAYS: Future daily partitions created ahead of time (default: 3)
+- TRANSCEIVER_RETENTION_DAYS: Days of transceiver partitions kept, 0 keeps all (default: 30)
+- FLIGHT_RETENTION_HOURS: Age after which flights_archive partitions expire (flights
+  partitions are never expired: rows leave flights through the summary job's
+  archive/delete once the flight is summarised)
+- PARTITION_EXPIRY_ACTION: "detach" (default) or "drop" expired partitions
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_config
+from app.database import get_database_session
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.partition_manager")
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """Daily range partitioning of one parent table."""
+    table: str
+    premake_days: int
+    retention: Optional[timedelta] = None  # A day expires once it ended more than retention ago; None keeps all
+    list_column: Optional[str] = None  # Optional LIST sub-partitioning of each day
+    list_values: Tuple[str, ...] = ()
+
+
+class PartitionManager:
+    """Creates future daily partitions and expires old ones."""
+
+    def __init__(self, specs: Optional[List[PartitionSpec]] = None, expiry_action: Optional[str] = None):
+        """
+        Initialize the partition manager.
+
+        Args:
+            specs: Tables to maintain; defaults to transceivers, flights and flights_archive
+            expiry_action: "detach" or "drop"; defaults to PARTITION_EXPIRY_ACTION
+        """
+        self.logger = logger
+        app_config = get_config()
+        config = app_config.partitioning
+        self.expiry_action = (expiry_action or config.expiry_action).lower()
+        if self.expiry_action not in ("detach", "drop"):
+            raise ValueError(f"Unsupported partition expiry action: {self.expiry_action}")
+
+        transceiver_retention = timedelta(days=config.transceiver_retention_days) if config.transceiver_retention_days > 0 else None
+        flight_retention = timedelta(hours=app_config.flight_summary.retention_hours)
+        self.specs = specs if specs is not None else [
+            PartitionSpec(
+                table="transceivers",
+                premake_days=config.premake_days,
+                retention=transceiver_retention,
+                list_column="entity_type",
+                list_values=("flight", "atc")
+            ),
+            # No retention: a day of flights can still hold flights that are not summarised yet
+            PartitionSpec(table="flights", premake_days=config.premake_days),
+            PartitionSpec(table="flights_archive", premake_days=config.premake_days, retention=flight_retention)
+        ]
+
+    def get_spec(self, table: str) -> Optional[PartitionSpec]:
+        """The maintained spec for table, if any."""
+        return next((spec for spec in self.specs if spec.table == table), None)
+
+    @staticmethod
+    def partition_name(table: str, day: date) -> str:
+        """Name of the daily partition of table for day."""
+        return f"{table}_p{day:%Y%m%d}"
+
+    @staticmethod
+    def _day_bound(day: date) -> str:
+        """UTC midnight of day as a timestamptz literal."""
+        return datetime.combine(day, time.min, tzinfo=timezone.utc).isoformat()
+
+    async def is_partitioned(self, session: AsyncSession, table: str) -> bool:
+        """True if table exists and is a partitioned table."""
+        result = await session.execute(text("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table
+                WHERE partrelid = to_regclass(:table)
+            )
+        """), {"table": table})
+        return bool(result.scalar())
+
+    async def list_partitions(self, session: AsyncSession, table: str) -> Dict[date, str]:
+        """Attached daily partitions of table keyed by day (the default partition is ignored)."""
+        result = await session.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(:table)
+        """), {"table": table})
+        pattern = re.compile(rf"^{re.escape(table)}_p(\d{{8}})$")
+        partitions = {}
+        for (relname,) in result.fetchall():
+            match = pattern.match(relname)
+            if match:
+                partitions[datetime.strptime(match.group(1), "%Y%m%d").date()] = relname
+        return partitions
+
+    async def ensure_partitions(self, session: AsyncSession, spec: PartitionSpec, today: date) -> List[str]:
+        """Create the partitions for today and the next premake_days days. Returns the partitions created."""
+        existing = await self.list_partitions(session, spec.table)
+        created = []
+        for offset in range(spec.premake_days + 1):
+            day = today + timedelta(days=offset)
+            if day in existing:
+                continue
+
+            name = self.partition_name(spec.table, day)
+            sub_partitioning = f" PARTITION BY LIST ({spec.list_column})" if spec.list_column else ""
+            await session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {spec.table} "
+                f"FOR VALUES FROM ('{self._day_bound(day)}') TO ('{self._day_bound(day + timedelta(days=1))}')"
+                f"{sub_partitioning}"
+            ))
+            for value in spec.list_values:
+                await session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name}_{value} PARTITION OF {name} FOR VALUES IN ('{value}')"
+                ))
+            created.append(name)
+        return created
+
+    async def expire_partitions(self, session: AsyncSession, spec: PartitionSpec, now: datetime) -> List[str]:
+        """Detach or drop partitions whose whole day ended more than retention ago. Returns the partitions expired."""
+        if spec.retention is None:
+            return []
+        try:
+            cutoff = now - spec.retention
+        except OverflowError:
+            return []  # Retention longer than the calendar (e.g. FLIGHT_RETENTION_HOURS=168000000) keeps everything
+
+        expired = []
+        for day, name in sorted((await self.list_partitions(session, spec.table)).items()):
+            day_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            if day_end > cutoff:
+                break
+            if self.expiry_action == "drop":
+                await session.execute(text(f"DROP TABLE {name}"))
+            else:
+                await session.execute(text(f"ALTER TABLE {spec.table} DETACH PARTITION {name}"))
+            expired.append(name)
+        return expired
+
+    async def run_maintenance(self, now: Optional[datetime] = None, tables: Optional[List[str]] = None,
+                              expire: bool = True) -> Dict[str, Any]:
+        """
+        Pre-create and expire partitions for every spec (or only tables), one transaction per table.
+
+        Tables that are not partitioned (e.g. databases created before
+        partitioning and not yet migrated) are skipped. With expire=False
+        partitions are only created.
+        """
+        now = now or datetime.now(timezone.utc)
+        results = {}
+        for spec in self.specs:
+            if tables is not None and spec.table not in tables:
+                continue
+            async with get_database_session() as session:
+                if not await self.is_partitioned(session, spec.table):
+                    self.logger.warning(f"⚠️ Table {spec.table} is not partitioned - skipping partition maintenance")
+                    results[spec.table] = {"status": "not_partitioned", "created": [], "expired": []}
+                    continue
+
+                created = await self.ensure_partitions(session, spec, now.date())
+                expired = await self.expire_partitions(session, spec, now) if expire else []
+                await session.commit()
+
+            if created or expired:
+                expiry_verb = "dropped" if self.expiry_action == "drop" else "detached"
+                self.logger.info(f"🗂️ {spec.table} partitions: created {created or 'none'}, {expiry_verb} {expired or 'none'}")
+            results[spec.table] = {"status": "success", "created": created, "expired": expired}
+        return results
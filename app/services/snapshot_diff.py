@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Snapshot Diff Engine for VATSIM Data Collection System
+
+Compares every poll with the previous one and turns the differences into
+typed events, so downstream logic can react to what changed instead of
+rediscovering it by scanning history:
+
+- pilot_connected / pilot_disconnected (the callsign joined or left the feed)
+- pilot_filtered_in / pilot_filtered_out (a connected pilot entered or left
+  the geographic boundary or flight plan filter)
+- flight_plan_changed (flight plan columns of a connected pilot)
+- controller_connected / controller_disconnected
+- controller_frequency_changed
+- transceiver_retuned (a transceiver of a connected callsign changed frequency)
+
+The diff runs on the prepared rows the ingest loop stores (after the
+geographic and flight plan filters), once the rows carry their
+flight_session_id and controller_session_id. Whether a pilot connected or
+disconnected is decided against the callsigns of the unfiltered feed, so a
+flight leaving the stored rows while still online is only filtered out. Its
+last flight_session_id is kept while it stays in the feed, so logging off
+later is still reported as pilot_disconnected.
+Events are written to the events table in the poll's transaction and handed
+to in-process subscribers after the poll is committed. The first poll after
+a restart only seeds the previous snapshot and emits nothing. A poll that
+fails to commit leaves the previous snapshot in place, so its changes are
+reported by the next poll.
+
+INPUTS:
+- Prepared flight, controller and transceiver rows of one poll
+- Unfiltered flights of the feed
+
+OUTPUTS:
+- SnapshotEvent list per poll, rows in events
+- Subscriber callbacks, engine statistics
+
+CONFIGURATION:
+- SNAPSHOT_EVENTS_ENABLED: Diff polls and emit events (default: true)
+- SNAPSHOT_EVENTS_PERSIST: Store events in the events table (default: true)
+- EVENT_RETENTION_DAYS: Days of events kept by partition maintenance (default: 30, 0 keeps all)
+"""
+
+import inspect
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.logging import get_logger_for_module
+
+logger = get_logger_for_module("services.snapshot_diff")
+
+PILOT_CONNECTED = "pilot_connected"
+PILOT_DISCONNECTED = "pilot_disconnected"
+PILOT_FILTERED_IN = "pilot_filtered_in"
+PILOT_FILTERED_OUT = "pilot_filtered_out"
+FLIGHT_PLAN_CHANGED = "flight_plan_changed"
+CONTROLLER_CONNECTED = "controller_connected"
+CONTROLLER_DISCONNECTED = "controller_disconnected"
+CONTROLLER_FREQUENCY_CHANGED = "controller_frequency_changed"
+TRANSCEIVER_RETUNED = "transceiver_retuned"
+
+EVENT_TYPES = (
+    PILOT_CONNECTED, PILOT_DISCONNECTED, PILOT_FILTERED_IN, PILOT_FILTERED_OUT, FLIGHT_PLAN_CHANGED,
+    CONTROLLER_CONNECTED, CONTROLLER_DISCONNECTED, CONTROLLER_FREQUENCY_CHANGED,
+    TRANSCEIVER_RETUNED
+)
+
+# Flight plan columns compared between polls for flight_plan_changed
+FLIGHT_PLAN_COLUMNS = (
+    "departure", "arrival", "alternate", "route", "aircraft_type",
+    "flight_rules", "planned_altitude", "deptime"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotEvent:
+    """One change between two consecutive polls."""
+    event_type: str
+    entity_type: str  # 'flight' or 'atc'
+    callsign: str
+    occurred_at: datetime
+    entity_id: Optional[int] = None  # flight_session_id or controller_session_id
+    details: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _FlightState:
+    cid: Optional[int]
+    flight_session_id: Optional[int]
+    plan: Tuple[Any, ...]
+    last_updated: Optional[datetime]
+
+
+@dataclass(slots=True)
+class _FeedState:
+    cid: Optional[int]
+    flight_session_id: Optional[int]  # Last stored flight session, kept while the callsign is filtered out
+    last_updated: Optional[datetime]
+
+
+@dataclass(slots=True)
+class _ControllerState:
+    cid: Optional[int]
+    controller_session_id: Optional[int]
+    frequency: Optional[str]
+
+
+@dataclass(slots=True)
+class _Snapshot:
+    flights: Dict[str, _FlightState]
+    controllers: Dict[str, _ControllerState]
+    transceivers: Dict[Tuple[str, str, Any], Tuple[Optional[int], Optional[int]]]
+    feed: Dict[str, _FeedState]  # Every flight in the feed, filtered or not
+
+
+EventCallback = Callable[[List[SnapshotEvent]], Union[None, Awaitable[None]]]
+
+
+@dataclass(slots=True)
+class _Subscription:
+    callback: EventCallback
+    event_types: Optional[frozenset]
+
+
+class SnapshotDiffEngine:
+    """Diffs consecutive polls into events and dispatches them to subscribers."""
+
+    def __init__(self, enabled: bool = True):
+        self.logger = logger
+        self.enabled = enabled
+        self._previous: Optional[_Snapshot] = None
+        self._pending: Optional[Tuple[_Snapshot, List[SnapshotEvent]]] = None
+        self._subscriptions: List[_Subscription] = []
+        self.stats = {
+            "polls": 0,
+            "events": 0,
+            "persisted": 0,
+            "dispatched": 0,
+            "subscriber_errors": 0,
+            **{event_type: 0 for event_type in EVENT_TYPES}
+        }
+
+    # ------------------------------------------------------------------
+    # Diff
+    # ------------------------------------------------------------------
+
+    def diff(self, flights: List[Mapping[str, Any]], controllers: List[Mapping[str, Any]],
+             transceivers: List[Mapping[str, Any]], polled_at: Optional[datetime] = None,
+             feed_flights: Optional[Iterable[Mapping[str, Any]]] = None) -> List[SnapshotEvent]:
+        """
+        Compare one poll with the last committed poll.
+
+        The poll becomes the previous snapshot only when commit() is called,
+        after its rows (and events) are stored.
+
+        Args:
+            flights: Prepared flight rows with flight_session_id
+            controllers: Prepared controller rows with controller_session_id
+            transceivers: Prepared transceiver rows
+            polled_at: Time of the poll (default: now)
+            feed_flights: Flights of the feed before filtering (default: flights)
+
+        Returns:
+            List[SnapshotEvent]: Events of the poll, empty for the first poll
+        """
+        polled_at = polled_at or datetime.now(timezone.utc)
+        feed_flights = flights if feed_flights is None else feed_flights
+        flight_states = {
+            flight.get("callsign"): _FlightState(
+                flight.get("cid"), flight.get("flight_session_id"),
+                tuple(flight.get(column) for column in FLIGHT_PLAN_COLUMNS),
+                flight.get("last_updated")
+            )
+            for flight in flights
+        }
+        current = _Snapshot(
+            flights=flight_states,
+            controllers={
+                controller.get("callsign"): _ControllerState(
+                    controller.get("cid"), controller.get("controller_session_id"), controller.get("frequency")
+                )
+                for controller in controllers
+            },
+            transceivers={
+                (transceiver.get("entity_type", "flight"), transceiver.get("callsign"), transceiver.get("transceiver_id")):
+                    (transceiver.get("frequency"), transceiver.get("entity_id"))
+                for transceiver in transceivers
+            },
+            feed=self._feed_states(feed_flights, flight_states)
+        )
+
+        events: List[SnapshotEvent] = []
+        if self._previous is not None:
+            self._diff_flights(self._previous, current, polled_at, events)
+            self._diff_controllers(self._previous.controllers, current.controllers, polled_at, events)
+            self._diff_transceivers(self._previous.transceivers, current.transceivers, current, polled_at, events)
+
+        self._pending = (current, events)
+        return events
+
+    def _feed_states(self, feed_flights: Iterable[Mapping[str, Any]],
+                     flight_states: Dict[str, _FlightState]) -> Dict[str, _FeedState]:
+        """Feed callsigns with the flight session last stored for them (carried over while filtered out)."""
+        previous_feed = self._previous.feed if self._previous is not None else {}
+        feed = {}
+        for flight in feed_flights:
+            callsign, cid = flight.get("callsign"), flight.get("cid")
+            state = flight_states.get(callsign)
+            before = previous_feed.get(callsign)
+            if state is not None:
+                feed[callsign] = _FeedState(state.cid, state.flight_session_id, state.last_updated)
+            elif before is not None and before.cid == cid:
+                feed[callsign] = before
+            else:
+                feed[callsign] = _FeedState(cid, None, None)
+        return feed
+
+    def _diff_flights(self, previous_snapshot: _Snapshot, current_snapshot: _Snapshot,
+                      polled_at: datetime, events: List[SnapshotEvent]) -> None:
+        previous, current = previous_snapshot.flights, current_snapshot.flights
+        for callsign, before in previous.items():
+            after = current.get(callsign)
+            if after is not None and after.cid == before.cid:
+                continue
+            # Still in the feed with the same pilot: only the boundary or flight plan filter dropped it
+            still_online = callsign in current_snapshot.feed and current_snapshot.feed[callsign].cid == before.cid
+            events.append(SnapshotEvent(
+                PILOT_FILTERED_OUT if still_online else PILOT_DISCONNECTED, "flight", callsign, polled_at,
+                before.flight_session_id,
+                {"cid": before.cid, "last_seen": before.last_updated.isoformat() if before.last_updated else None}
+            ))
+
+        # Pilots filtered out earlier that have now left the feed
+        for callsign, before in previous_snapshot.feed.items():
+            if callsign in previous or before.flight_session_id is None:
+                continue  # Stored last poll (handled above) or never stored at all
+            after = current_snapshot.feed.get(callsign)
+            if after is None or after.cid != before.cid:
+                events.append(SnapshotEvent(
+                    PILOT_DISCONNECTED, "flight", callsign, polled_at, before.flight_session_id,
+                    {"cid": before.cid, "last_seen": before.last_updated.isoformat() if before.last_updated else None}
+                ))
+
+        for callsign, after in current.items():
+            before = previous.get(callsign)
+            if before is None or before.cid != after.cid:
+                was_online = callsign in previous_snapshot.feed and previous_snapshot.feed[callsign].cid == after.cid
+                events.append(SnapshotEvent(
+                    PILOT_FILTERED_IN if was_online else PILOT_CONNECTED, "flight", callsign, polled_at,
+                    after.flight_session_id, {"cid": after.cid}
+                ))
+            elif before.plan != after.plan:
+                changed = {
+                    column: [old, new]
+                    for column, old, new in zip(FLIGHT_PLAN_COLUMNS, before.plan, after.plan) if old != new
+                }
+                details: Dict[str, Any] = {"changed": changed}
+                if before.flight_session_id != after.flight_session_id:
+                    # Departure, arrival and deptime are part of the flight identity
+                    details["previous_flight_session_id"] = before.flight_session_id
+                events.append(SnapshotEvent(
+                    FLIGHT_PLAN_CHANGED, "flight", callsign, polled_at, after.flight_session_id, details
+                ))
+
+    def _diff_controllers(self, previous: Dict[str, _ControllerState], current: Dict[str, _ControllerState],
+                          polled_at: datetime, events: List[SnapshotEvent]) -> None:
+        for callsign, before in previous.items():
+            after = current.get(callsign)
+            if after is None or after.cid != before.cid:
+                events.append(SnapshotEvent(
+                    CONTROLLER_DISCONNECTED, "atc", callsign, polled_at, before.controller_session_id, {"cid": before.cid}
+                ))
+
+        for callsign, after in current.items():
+            before = previous.get(callsign)
+            if before is None or before.cid != after.cid:
+                events.append(SnapshotEvent(
+                    CONTROLLER_CONNECTED, "atc", callsign, polled_at, after.controller_session_id,
+                    {"cid": after.cid, "frequency": after.frequency}
+                ))
+            elif before.frequency != after.frequency:
+                events.append(SnapshotEvent(
+                    CONTROLLER_FREQUENCY_CHANGED, "atc", callsign, polled_at, after.controller_session_id,
+                    {"from": before.frequency, "to": after.frequency}
+                ))
+
+    def _diff_transceivers(self, previous: Dict[Tuple, Tuple], current: Dict[Tuple, Tuple], snapshot: _Snapshot,
+                           polled_at: datetime, events: List[SnapshotEvent]) -> None:
+        for key, (frequency, entity_id) in current.items():
+            before = previous.get(key)
+            if before is None or before[0] == frequency:
+                continue
+            entity_type, callsign, transceiver_id = key
+            if entity_type == "atc":
+                controller = snapshot.controllers.get(callsign)
+                entity_id = controller.controller_session_id if controller else None
+            events.append(SnapshotEvent(
+                TRANSCEIVER_RETUNED, entity_type, callsign, polled_at, entity_id,
+                {"transceiver_id": transceiver_id, "from": before[0], "to": frequency}
+            ))
+
+    def commit(self) -> List[SnapshotEvent]:
+        """Make the last diffed poll the previous snapshot once it is stored; returns its events."""
+        if self._pending is None:
+            return []
+        self._previous, events = self._pending
+        self._pending = None
+
+        self.stats["polls"] += 1
+        self.stats["events"] += len(events)
+        for event in events:
+            self.stats[event.event_type] += 1
+        return events
+
+    def reset(self) -> None:
+        """Forget the previous snapshot; the next poll seeds it again without events."""
+        self._previous = None
+        self._pending = None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    async def persist(self, events: List[SnapshotEvent], session: AsyncSession) -> int:
+        """
+        Insert events into the events table with one statement (no commit).
+
+        Returns:
+            int: Number of events inserted
+        """
+        if not events:
+            return 0
+
+        await session.execute(text("""
+            INSERT INTO events (event_type, entity_type, callsign, entity_id, occurred_at, details)
+            SELECT e.event_type, e.entity_type, e.callsign, e.entity_id, e.occurred_at, CAST(e.details AS JSONB)
+            FROM unnest(
+                CAST(:event_types AS VARCHAR[]),
+                CAST(:entity_types AS VARCHAR[]),
+                CAST(:callsigns AS VARCHAR[]),
+                CAST(:entity_ids AS INTEGER[]),
+                CAST(:occurred_ats AS TIMESTAMPTZ[]),
+                CAST(:details AS TEXT[])
+            ) AS e(event_type, entity_type, callsign, entity_id, occurred_at, details)
+        """), {
+            "event_types": [event.event_type for event in events],
+            "entity_types": [event.entity_type for event in events],
+            "callsigns": [event.callsign for event in events],
+            "entity_ids": [event.entity_id for event in events],
+            "occurred_ats": [event.occurred_at for event in events],
+            "details": [json.dumps(dict(event.details), default=str) for event in events]
+        })
+        self.stats["persisted"] += len(events)
+        return len(events)
+
+    async def expire(self, session: AsyncSession, retention_days: int) -> int:
+        """Delete events older than retention_days (no commit)."""
+        result = await session.execute(text("""
+            DELETE FROM events
+            WHERE occurred_at < NOW() - make_interval(days => :retention_days)
+        """), {"retention_days": retention_days})
+        return result.rowcount or 0
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: EventCallback, event_types: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """
+        Register a callback for the events of every committed poll.
+
+        The callback receives the poll's events (only those of event_types when
+        given) as one list and may be a coroutine function. It is not called
+        for polls without matching events. Exceptions are logged and do not
+        affect ingest or other subscribers.
+
+        Args:
+            callback: Called with a list of SnapshotEvent
+            event_types: Event types to deliver (default: all)
+
+        Returns:
+            Callable: Removes the subscription
+        """
+        if event_types is not None:
+            unknown = set(event_types) - set(EVENT_TYPES)
+            if unknown:
+                raise ValueError(f"Unknown event types: {sorted(unknown)}")
+            event_types = frozenset(event_types)
+
+        subscription = _Subscription(callback, event_types)
+        self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    async def publish(self, events: List[SnapshotEvent]) -> int:
+        """
+        Deliver committed events to subscribers.
+
+        Returns:
+            int: Number of subscriber calls made
+        """
+        if not events:
+            return 0
+
+        calls = 0
+        for subscription in list(self._subscriptions):
+            delivered = events if subscription.event_types is None else [
+                event for event in events if event.event_type in subscription.event_types
+            ]
+            if not delivered:
+                continue
+            try:
+                result = subscription.callback(delivered)
+                if inspect.isawaitable(result):
+                    await result
+                calls += 1
+            except Exception as e:
+                self.stats["subscriber_errors"] += 1
+                self.logger.warning(f"⚠️ Snapshot event subscriber {getattr(subscription.callback, '__name__', subscription.callback)} failed: {e}")
+
+        self.stats["dispatched"] += calls
+        return calls
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine statistics."""
+        return {
+            "enabled": self.enabled,
+            "subscribers": len(self._subscriptions),
+            "seeded": self._previous is not None,
+            **self.stats
+        }
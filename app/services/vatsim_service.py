@@ -3,21 +3,84 @@
 VATSIM Service - Simplified
 
 Fetches and processes VATSIM network data from API v3.
-Handles flights, controllers, and transceivers data.
+Handles flights, controllers, and transceivers data, parsed into one slot
+record per entity (app.records) that is used through to the database write.
+
+Requests are conditional (If-None-Match / If-Modified-Since) and a snapshot
+whose general.update_timestamp has already been seen is reported as unchanged
+without being decoded. Response bytes are decoded with orjson or msgspec when
+installed (VATSIM_JSON_DECODER), falling back to the standard json module.
+
+The data and transceivers feeds are requested concurrently on one shared,
+keep-alive client (HTTP/2 when h2 is installed), and the latency of each feed
+plus the skew between the two responses is recorded for every poll.
 """
 
 import httpx
 import asyncio
+import json
+import re
+import time
 import logging
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, List, Callable, Tuple, Union
 from datetime import datetime, timezone, timedelta
 
 from app.config import get_config
+from app.records import ControllerRecord, FlightRecord, TransceiverRecord
 from app.utils.logging import get_logger_for_module
 from app.utils.error_handling import handle_service_errors, log_operation
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # Optional fast decoder
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional fast decoder
+    msgspec = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:  # Optional, installed with httpx[http2]
+    HTTP2_AVAILABLE = False
+
+# general.update_timestamp sits at the start of the data feed, so it can be read without decoding the document
+_UPDATE_TIMESTAMP_PATTERN = re.compile(rb'"update_timestamp"\s*:\s*"([^"]+)"')
+_UPDATE_TIMESTAMP_PEEK_BYTES = 4096
+
+
+def resolve_json_decoder(name: str) -> Tuple[str, Callable[[bytes], Any]]:
+    """Pick the decoder for raw response bytes; "auto" prefers orjson, then msgspec, then json."""
+    if name in ("auto", "orjson") and orjson is not None:
+        return "orjson", orjson.loads
+    if name in ("auto", "msgspec") and msgspec is not None:
+        return "msgspec", msgspec.json.decode
+    if name not in ("auto", "json"):
+        logger.warning(f"JSON decoder {name} is not installed - using json")
+    return "json", json.loads
+
+
+@dataclass
+class FeedFetch:
+    """A feed response with its latency and when it was complete."""
+    response: httpx.Response
+    latency: float
+    received_at: float  # time.perf_counter() once the body was read
+
+
+def _last_modified(response: httpx.Response) -> Optional[datetime]:
+    """Last-Modified header of a response as a datetime, or None if missing or invalid."""
+    try:
+        return parsedate_to_datetime(response.headers["last-modified"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
 
 class VATSIMAPIError(Exception):
     """Exception raised when VATSIM API operations fail."""
@@ -39,6 +102,30 @@ class VATSIMService:
         self._initialized = False
         
         self.client: Optional[httpx.AsyncClient] = None
+        self.http2 = False
+        
+        self.decoder_name, self._decode_json = resolve_json_decoder(self.config.vatsim.json_decoder)
+        
+        # Conditional fetch state: validators of the last 200 response per URL and the last snapshot seen
+        self._validators: Dict[str, Dict[str, Optional[str]]] = {}
+        self._last_update_timestamp: Optional[str] = None
+        self._last_transceivers_raw: List[Dict[str, Any]] = []
+        self._poll_transfer: Dict[str, Any] = {}
+        
+        self.stats = {
+            "polls": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "bytes_total": 0,
+            "bytes_downloaded_total": 0,
+            "last_bytes": 0,
+            "last_bytes_downloaded": 0,
+            "last_decode_seconds": 0.0,
+            "last_data_latency": None,
+            "last_transceivers_latency": None,
+            "last_feed_skew_seconds": None,
+            "max_feed_skew_seconds": 0.0
+        }
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -74,11 +161,20 @@ class VATSIMService:
     async def _create_client(self) -> None:
         """Create HTTP client for API requests."""
         if self.client is None:
+            self.http2 = self.config.vatsim.http2 and HTTP2_AVAILABLE
+            if self.config.vatsim.http2 and not HTTP2_AVAILABLE:
+                self.logger.warning("⚠️ VATSIM_HTTP2 is enabled but h2 is not installed - using HTTP/1.1 keep-alive")
             self.client = httpx.AsyncClient(
                 timeout=self.config.vatsim.timeout,
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+                http2=self.http2,
+                # Keep idle connections across polls so both feeds reuse them instead of reconnecting
+                limits=httpx.Limits(
+                    max_keepalive_connections=5,
+                    max_connections=10,
+                    keepalive_expiry=2 * self.config.vatsim.polling_interval
+                )
             )
-            self.logger.debug("Created HTTP client for VATSIM API")
+            self.logger.debug(f"Created HTTP client for VATSIM API ({'HTTP/2' if self.http2 else 'HTTP/1.1'})")
     
     async def _close_client(self) -> None:
         """Close HTTP client."""
@@ -93,6 +189,11 @@ class VATSIMService:
         """
         Fetch current VATSIM network data.
         
+        Both feeds are requested concurrently. When the data feed answers 304
+        Not Modified, or its general.update_timestamp has already been seen,
+        nothing is decoded and the result only holds "unchanged": True with
+        the timings, transfer and feed figures.
+        
         Returns:
             Dict[str, Any]: Parsed VATSIM network data as dictionary
             
@@ -107,7 +208,25 @@ class VATSIMService:
                 "timeout": self.config.vatsim.timeout
             })
             
-            response = await self.client.get(self.config.vatsim.api_url)
+            self.stats["polls"] += 1
+            self._poll_transfer = {"bytes": 0, "bytes_downloaded": 0, "decode": 0.0}
+            
+            start_time = time.perf_counter()
+            # Request both feeds at once on the shared client so they describe the same moment
+            data_fetch, transceivers_fetch = await asyncio.gather(
+                self._timed_get(self.config.vatsim.api_url),
+                self._timed_get(self.config.vatsim.transceivers_api_url),
+                return_exceptions=True
+            )
+            fetch_time = time.perf_counter() - start_time
+            if isinstance(data_fetch, BaseException):
+                raise data_fetch
+            feeds = self._record_feeds(data_fetch, transceivers_fetch)
+            response = data_fetch.response
+            
+            if response.status_code == 304:
+                self.stats["not_modified"] += 1
+                return self._unchanged_result("not_modified", fetch_time, feeds)
             
             if response.status_code != 200:
                 raise VATSIMAPIError(
@@ -115,7 +234,24 @@ class VATSIMService:
                     status_code=response.status_code
                 )
             
-            raw_data = response.json()
+            body = response.content
+            self._poll_transfer["bytes"] += len(body)
+            
+            # Skip decoding and processing when this snapshot has already been seen
+            raw_data = None
+            update_timestamp = self._peek_update_timestamp(body)
+            if update_timestamp is None:
+                raw_data = self._decode_body(body)
+                general = raw_data.get("general") if isinstance(raw_data, dict) else None
+                update_timestamp = general.get("update_timestamp") if isinstance(general, dict) else None
+            if self.config.vatsim.conditional_fetch and update_timestamp and update_timestamp == self._last_update_timestamp:
+                self.stats["unchanged"] += 1
+                self._remember_validators(self.config.vatsim.api_url, response)
+                return self._unchanged_result("same_update_timestamp", fetch_time, feeds)
+            if raw_data is None:
+                raw_data = self._decode_body(body)
+            self._last_update_timestamp = update_timestamp
+            self._remember_validators(self.config.vatsim.api_url, response)
             
             # Ensure data is a dictionary and handle None
             if not isinstance(raw_data, dict) or raw_data is None:
@@ -130,9 +266,9 @@ class VATSIMService:
             # Parse all flights - no filtering applied here
             flights = self._parse_flights(parsed_data.get("pilots", []))
             
-            # Fetch transceivers data
+            # Transceivers data fetched alongside the data feed
             try:
-                transceivers_raw = await self._fetch_transceivers_data()
+                transceivers_raw = self._read_transceivers_data(transceivers_fetch)
                 transceivers = self._parse_transceivers(transceivers_raw)
                 # Link transceivers to flights and controllers
                 transceivers = self._link_transceivers_to_entities(transceivers, flights, controllers)
@@ -150,13 +286,23 @@ class VATSIMService:
                 "total_controllers": len(controllers),
                 "total_flights": len(flights),
                 "total_sectors": len(sectors),
-                "total_transceivers": len(transceivers)
+                "total_transceivers": len(transceivers),
+                "update_timestamp": update_timestamp,
+                "timings": {
+                    "fetch": fetch_time,
+                    "fetch_data": feeds["vatsim_data"]["latency"],
+                    "fetch_transceivers": feeds["transceivers"]["latency"],
+                    "decode": self._poll_transfer["decode"],
+                    "parse": (time.perf_counter() - start_time) - fetch_time
+                },
+                "transfer": self._record_transfer(),
+                "feeds": feeds
             }
             
             # Log only when there's significant data or changes
             total_entities = len(controllers) + len(flights) + len(transceivers)
             if total_entities > 0:
-                self.logger.debug(f"VATSIM data fetched: {len(controllers)} controllers, {len(flights)} flights, {len(transceivers)} transceivers")
+                self.logger.debug(f"VATSIM data fetched: {len(controllers)} controllers, {len(flights)} flights, {len(transceivers)} transceivers ({vatsim_data['transfer']['bytes']} bytes, {vatsim_data['transfer']['bytes_downloaded']} downloaded, {self.decoder_name} decode {self._poll_transfer['decode']:.3f}s)")
             else:
                 self.logger.warning("No VATSIM data received from API")
             
@@ -174,7 +320,129 @@ class VATSIMService:
             self.logger.error(f"Unexpected error: {e}")
             raise VATSIMAPIError(f"Unexpected error: {e}")
     
-    def _parse_controllers(self, controllers_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _timed_get(self, url: str) -> FeedFetch:
+        """Conditional GET of url, timed from request to complete body."""
+        request_start = time.perf_counter()
+        response = await self._conditional_get(url)
+        received_at = time.perf_counter()
+        return FeedFetch(response=response, latency=received_at - request_start, received_at=received_at)
+    
+    def _record_feeds(
+        self, data_fetch: FeedFetch, transceivers_fetch: Union[FeedFetch, BaseException]
+    ) -> Dict[str, Any]:
+        """
+        Per-feed latency and the skew between the two snapshots of one poll.
+        
+        skew_seconds is the gap between the two responses arriving; source_skew_seconds
+        is the gap between their Last-Modified headers when both feeds send one.
+        """
+        feeds = {
+            "vatsim_data": {"latency": data_fetch.latency, "status_code": data_fetch.response.status_code},
+            "transceivers": {"latency": None, "status_code": None},
+            "skew_seconds": None,
+            "source_skew_seconds": None
+        }
+        if isinstance(transceivers_fetch, FeedFetch):
+            feeds["transceivers"] = {
+                "latency": transceivers_fetch.latency,
+                "status_code": transceivers_fetch.response.status_code
+            }
+            feeds["skew_seconds"] = abs(data_fetch.received_at - transceivers_fetch.received_at)
+            data_modified = _last_modified(data_fetch.response)
+            transceivers_modified = _last_modified(transceivers_fetch.response)
+            if data_modified and transceivers_modified:
+                feeds["source_skew_seconds"] = abs((data_modified - transceivers_modified).total_seconds())
+        
+        self.stats["last_data_latency"] = feeds["vatsim_data"]["latency"]
+        self.stats["last_transceivers_latency"] = feeds["transceivers"]["latency"]
+        self.stats["last_feed_skew_seconds"] = feeds["skew_seconds"]
+        if feeds["skew_seconds"] is not None:
+            self.stats["max_feed_skew_seconds"] = max(self.stats["max_feed_skew_seconds"], feeds["skew_seconds"])
+        return feeds
+    
+    async def _conditional_get(self, url: str) -> httpx.Response:
+        """
+        GET url, sending the validators of its last used 200 response when conditional fetch is enabled.
+        
+        Validators are stored by _remember_validators once the body has actually been used, so a
+        body that was downloaded but skipped is not answered with 304 on the next poll.
+        """
+        headers = {}
+        validators = self._validators.get(url, {}) if self.config.vatsim.conditional_fetch else {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        
+        response = await self.client.get(url, headers=headers)
+        self._poll_transfer["bytes_downloaded"] = self._poll_transfer.get("bytes_downloaded", 0) + response.num_bytes_downloaded
+        return response
+    
+    def _remember_validators(self, url: str, response: httpx.Response) -> None:
+        """Store the validators of a 200 response whose body has been used."""
+        if response.status_code == 200:
+            self._validators[url] = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified")
+            }
+    
+    def _decode_body(self, body: bytes) -> Any:
+        """Decode a JSON response body from raw bytes, timing it into the current poll."""
+        decode_start = time.perf_counter()
+        data = self._decode_json(body)
+        self._poll_transfer["decode"] = self._poll_transfer.get("decode", 0.0) + time.perf_counter() - decode_start
+        return data
+    
+    @staticmethod
+    def _peek_update_timestamp(body: bytes) -> Optional[str]:
+        """general.update_timestamp read from the start of the body, or None if not found there."""
+        match = _UPDATE_TIMESTAMP_PATTERN.search(body[:_UPDATE_TIMESTAMP_PEEK_BYTES])
+        return match.group(1).decode("utf-8") if match else None
+    
+    def _record_transfer(self) -> Dict[str, Any]:
+        """Fold the current poll's byte counts into the statistics and return them."""
+        transfer = {
+            "bytes": self._poll_transfer.get("bytes", 0),
+            "bytes_downloaded": self._poll_transfer.get("bytes_downloaded", 0),
+            "decoder": self.decoder_name,
+            "decode_seconds": self._poll_transfer.get("decode", 0.0)
+        }
+        self.stats["bytes_total"] += transfer["bytes"]
+        self.stats["bytes_downloaded_total"] += transfer["bytes_downloaded"]
+        self.stats["last_bytes"] = transfer["bytes"]
+        self.stats["last_bytes_downloaded"] = transfer["bytes_downloaded"]
+        self.stats["last_decode_seconds"] = self._poll_transfer.get("decode", 0.0)
+        return transfer
+    
+    def _unchanged_result(self, reason: str, fetch_time: float, feeds: Dict[str, Any]) -> Dict[str, Any]:
+        """Result for a poll whose snapshot was already processed; callers skip the pipeline."""
+        self.logger.debug(f"VATSIM snapshot {self._last_update_timestamp} unchanged ({reason})")
+        return {
+            "unchanged": True,
+            "reason": reason,
+            "update_timestamp": self._last_update_timestamp,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timings": {"fetch": fetch_time, "decode": 0.0, "parse": 0.0},
+            "transfer": self._record_transfer(),
+            "feeds": feeds
+        }
+    
+    def forget_snapshot(self) -> None:
+        """Forget the validators and last update timestamp so the next poll is fetched and processed in full."""
+        self._validators.clear()
+        self._last_update_timestamp = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fetch and decode statistics."""
+        return {
+            "decoder": self.decoder_name,
+            "conditional_fetch": self.config.vatsim.conditional_fetch,
+            "http2": self.http2,
+            "last_update_timestamp": self._last_update_timestamp,
+            **self.stats
+        }
+    
+    def _parse_controllers(self, controllers_data: List[Dict[str, Any]]) -> List[ControllerRecord]:
         """
         Parse controller data from VATSIM API response - EXACT field mapping.
         
@@ -182,7 +450,7 @@ class VATSIMService:
             controllers_data: Raw controller data from API
             
         Returns:
-            List[Dict[str, Any]]: Parsed controller dictionaries
+            List[ControllerRecord]: Parsed controller records
         """
         controllers = []
         
@@ -209,19 +477,19 @@ class VATSIMService:
                     except:
                         logon_time = None
                 
-                controller = {
-                    "callsign": controller_data.get("callsign", ""),
-                    "frequency": controller_data.get("frequency", ""),
-                    "cid": controller_data.get("cid"),
-                    "name": controller_data.get("name", ""),
-                    "rating": controller_data.get("rating"),
-                    "facility": controller_data.get("facility"),
-                    "visual_range": controller_data.get("visual_range"),
-                    "text_atis": controller_data.get("text_atis"),
-                    "server": controller_data.get("server", ""),
-                    "last_updated": last_updated,
-                    "logon_time": logon_time
-                }
+                controller = ControllerRecord(
+                    callsign=controller_data.get("callsign", ""),
+                    frequency=controller_data.get("frequency", ""),
+                    cid=controller_data.get("cid"),
+                    name=controller_data.get("name", ""),
+                    rating=controller_data.get("rating"),
+                    facility=controller_data.get("facility"),
+                    visual_range=controller_data.get("visual_range"),
+                    text_atis=controller_data.get("text_atis"),
+                    server=controller_data.get("server", ""),
+                    last_updated=last_updated,
+                    logon_time=logon_time
+                )
                 controllers.append(controller)
                 
             except Exception as e:
@@ -235,7 +503,7 @@ class VATSIMService:
         
         return controllers
     
-    def _parse_flights(self, flights_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _parse_flights(self, flights_data: List[Dict[str, Any]]) -> List[FlightRecord]:
         """
         Parse flight data from VATSIM API response.
         
@@ -243,20 +511,12 @@ class VATSIMService:
             flights_data: Raw flight data from API
             
         Returns:
-            List[Dict[str, Any]]: Parsed flight dictionaries
+            List[FlightRecord]: Parsed flight records
         """
         flights = []
         
         for flight_data in flights_data:
             try:
-                # Extract position data
-                position = None
-                if flight_data.get("latitude") and flight_data.get("longitude"):
-                    position = {
-                        "lat": float(flight_data["latitude"]),
-                        "lng": float(flight_data["longitude"])
-                    }
-                
                 # Extract flight plan data - handle null flight plans
                 flight_plan = flight_data.get("flight_plan")
                 if flight_plan is None:
@@ -283,44 +543,41 @@ class VATSIMService:
                     except:
                         last_updated = None
                 
-                flight = {
-                    "callsign": flight_data.get("callsign", ""),
-                    "pilot_name": flight_data.get("name", ""),
-                    "aircraft_type": flight_plan.get("aircraft_short", ""),  # Fixed: API provides aircraft type in flight_plan.aircraft_short
-                    "departure": flight_plan.get("departure", ""),
-                    "arrival": flight_plan.get("arrival", ""),
-                    "route": flight_plan.get("route", ""),
-                    "altitude": int(flight_data.get("altitude", 0)),
-                    "position": position,
+                # position and pilot_name are derived from these fields by FlightRecord
+                flight = FlightRecord(
+                    callsign=flight_data.get("callsign", ""),
+                    name=flight_data.get("name"),
+                    aircraft_type=flight_plan.get("aircraft_short", ""),  # Fixed: API provides aircraft type in flight_plan.aircraft_short
+                    departure=flight_plan.get("departure", ""),
+                    arrival=flight_plan.get("arrival", ""),
+                    route=flight_plan.get("route", ""),
+                    altitude=int(flight_data.get("altitude", 0)),
                     
                     # Missing VATSIM API fields - 1:1 mapping with API field names
-                    "cid": flight_data.get("cid"),
-                    "name": flight_data.get("name"),
-                    "server": flight_data.get("server"),
-                    "pilot_rating": flight_data.get("pilot_rating"),
-                    "military_rating": flight_data.get("military_rating"),
-                    "latitude": flight_data.get("latitude"),
-                    "longitude": flight_data.get("longitude"),
-                    "groundspeed": flight_data.get("groundspeed"),
-                    "transponder": flight_data.get("transponder"),
-                    "heading": flight_data.get("heading"),
+                    cid=flight_data.get("cid"),
+                    server=flight_data.get("server"),
+                    pilot_rating=flight_data.get("pilot_rating"),
+                    military_rating=flight_data.get("military_rating"),
+                    latitude=flight_data.get("latitude"),
+                    longitude=flight_data.get("longitude"),
+                    groundspeed=flight_data.get("groundspeed"),
+                    transponder=flight_data.get("transponder"),
+                    heading=flight_data.get("heading"),
 
-                    "logon_time": logon_time,
-                    "last_updated": last_updated,
+                    logon_time=logon_time,
+                    last_updated_api=last_updated,
                     
                     # Flight plan fields (nested object)
-                    "flight_rules": flight_plan.get("flight_rules"),
-                    "aircraft_faa": flight_plan.get("aircraft_faa"),
-                    "aircraft_short": flight_plan.get("aircraft_short"),
-                    "alternate": flight_plan.get("alternate"),
-                    "cruise_tas": flight_plan.get("cruise_tas"),
-                    "planned_altitude": flight_plan.get("altitude"),
-                    "deptime": flight_plan.get("deptime"),
-                    "enroute_time": flight_plan.get("enroute_time"),
-                    "fuel_time": flight_plan.get("fuel_time"),
-                    "remarks": flight_plan.get("remarks"),
-
-                }
+                    flight_rules=flight_plan.get("flight_rules"),
+                    aircraft_faa=flight_plan.get("aircraft_faa"),
+                    alternate=flight_plan.get("alternate"),
+                    cruise_tas=flight_plan.get("cruise_tas"),
+                    planned_altitude=flight_plan.get("altitude"),
+                    deptime=flight_plan.get("deptime"),
+                    enroute_time=flight_plan.get("enroute_time"),
+                    fuel_time=flight_plan.get("fuel_time"),
+                    remarks=flight_plan.get("remarks")
+                )
                 flights.append(flight)
                 
             except Exception as e:
@@ -334,25 +591,27 @@ class VATSIMService:
         
         return flights
     
-    async def _fetch_transceivers_data(self) -> List[Dict[str, Any]]:
+    def _read_transceivers_data(self, fetch: Union[FeedFetch, BaseException]) -> List[Dict[str, Any]]:
         """
-        Fetch transceivers data from VATSIM transceivers API.
+        Read the transceivers feed response fetched alongside the data feed.
         
+        Args:
+            fetch: The transceivers FeedFetch, or the exception its request raised
+            
         Returns:
             List[Dict[str, Any]]: Raw transceivers data
             
         Raises:
-            VATSIMAPIError: When API request fails
+            VATSIMAPIError: When the request failed or returned an error status
         """
-        await self._create_client()
-        
         try:
-            self.logger.info("Fetching transceivers data", extra={
-                "api_url": self.config.vatsim.transceivers_api_url,
-                "timeout": self.config.vatsim.timeout
-            })
+            if isinstance(fetch, BaseException):
+                raise fetch
+            response = fetch.response
             
-            response = await self.client.get(self.config.vatsim.transceivers_api_url)
+            # Not modified since the last decoded 200: reuse its entries
+            if response.status_code == 304:
+                return self._last_transceivers_raw
             
             if response.status_code != 200:
                 raise VATSIMAPIError(
@@ -360,12 +619,16 @@ class VATSIMService:
                     status_code=response.status_code
                 )
             
-            raw_data = response.json()
+            body = response.content
+            self._poll_transfer["bytes"] = self._poll_transfer.get("bytes", 0) + len(body)
+            raw_data = self._decode_body(body)
             
             # Ensure data is a list and handle None
             if not isinstance(raw_data, list) or raw_data is None:
-                return []
+                raw_data = []
             
+            self._last_transceivers_raw = raw_data
+            self._remember_validators(self.config.vatsim.transceivers_api_url, response)
             return raw_data
             
         except Exception as e:
@@ -375,7 +638,7 @@ class VATSIMService:
             })
             raise VATSIMAPIError(f"Failed to fetch transceivers data: {e}")
     
-    def _parse_transceivers(self, transceivers_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _parse_transceivers(self, transceivers_data: List[Dict[str, Any]]) -> List[TransceiverRecord]:
         """
         Parse transceivers data from VATSIM API response.
         
@@ -383,7 +646,7 @@ class VATSIMService:
             transceivers_data: Raw transceivers data from API
             
         Returns:
-            List[Dict[str, Any]]: Parsed transceivers data as dictionaries
+            List[TransceiverRecord]: Parsed transceiver records
         """
         transceivers = []
         
@@ -404,17 +667,17 @@ class VATSIMService:
                         except:
                             timestamp = None
                     
-                    transceiver = {
-                        "callsign": callsign,
-                        "transceiver_id": transceiver_data.get("id", 0),
-                        "frequency": transceiver_data.get("frequency", 0),
-                        "position_lat": transceiver_data.get("latDeg"),
-                        "position_lon": transceiver_data.get("lonDeg"),
-                        "height_msl": transceiver_data.get("heightMslM"),
-                        "height_agl": transceiver_data.get("heightAglM"),
-                        "entity_type": "flight",  # Default to flight, will be updated later
-                        "timestamp": timestamp
-                    }
+                    transceiver = TransceiverRecord(
+                        callsign=callsign,
+                        transceiver_id=transceiver_data.get("id", 0),
+                        frequency=transceiver_data.get("frequency", 0),
+                        position_lat=transceiver_data.get("latDeg"),
+                        position_lon=transceiver_data.get("lonDeg"),
+                        height_msl=transceiver_data.get("heightMslM"),
+                        height_agl=transceiver_data.get("heightAglM"),
+                        entity_type="flight",  # Default to flight, will be updated later
+                        timestamp=timestamp
+                    )
                     transceivers.append(transceiver)
                 
             except Exception as e:
@@ -428,9 +691,9 @@ class VATSIMService:
         
         return transceivers
     
-    def _link_transceivers_to_entities(self, transceivers: List[Dict[str, Any]], 
-                                      flights: List[Dict[str, Any]], 
-                                      controllers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _link_transceivers_to_entities(self, transceivers: List[TransceiverRecord], 
+                                      flights: List[FlightRecord], 
+                                      controllers: List[ControllerRecord]) -> List[TransceiverRecord]:
         """
         Link transceivers to flights and ATC positions based on callsign.
         
@@ -440,7 +703,7 @@ class VATSIMService:
             controllers: List of controllers
             
         Returns:
-            List[Dict[str, Any]]: Transceivers with entity links
+            List[TransceiverRecord]: Transceivers with entity links
         """
         # Create lookup dictionaries
         flight_lookup = {flight["callsign"]: flight for flight in flights}
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+In-process ATC frequency matching engine
+
+Matches flight transceiver records against ATC transceiver records without a
+database round trip. Both lists are sorted by (frequency, timestamp) and joined
+with a sweep over each frequency group: for every flight record the ATC records
+on a frequency within tolerance are narrowed to the time window with binary
+searches, then the candidate pairs are filtered with a vectorized haversine
+distance against the controller-specific proximity range.
+
+This reproduces the rules of the original per-controller SQL join:
+- |flight frequency - ATC frequency| <= 5 kHz
+- |flight time - ATC time| <= time window
+- great circle distance <= proximity threshold of the controller
+
+filter_interval_contacts applies the same proximity rule to contacts found by
+the frequency_intervals overlap join.
+"""
+
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Earth radius in nautical miles, same constant as the original SQL
+EARTH_RADIUS_NM = 3440.065
+
+# Frequency tolerance in Hz (0.005 MHz)
+FREQUENCY_TOLERANCE_HZ = 5000
+
+
+def haversine_nm(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Vectorized great circle distance in nautical miles (NaN for missing positions)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(values, dtype=float)) for values in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _to_epoch(timestamp: Any) -> float:
+    """Convert a datetime (or epoch number) to epoch seconds."""
+    return timestamp.timestamp() if hasattr(timestamp, "timestamp") else float(timestamp)
+
+
+def _to_float(value: Any) -> float:
+    """Convert a coordinate to float, mapping missing values to NaN."""
+    return np.nan if value is None else float(value)
+
+
+def _columns(transceivers: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Build NumPy columns for a transceiver list, sorted by (frequency, timestamp)."""
+    frequency = np.array([int(t["frequency"]) for t in transceivers], dtype=np.int64)
+    epoch = np.array([_to_epoch(t["timestamp"]) for t in transceivers], dtype=float)
+    order = np.lexsort((epoch, frequency))
+    return {
+        "order": order,
+        "frequency": frequency[order],
+        "epoch": epoch[order],
+        "lat": np.array([_to_float(t["position_lat"]) for t in transceivers], dtype=float)[order],
+        "lon": np.array([_to_float(t["position_lon"]) for t in transceivers], dtype=float)[order]
+    }
+
+
+def find_frequency_matches(
+    flight_transceivers: List[Dict[str, Any]],
+    atc_transceivers: List[Dict[str, Any]],
+    time_window_seconds: float,
+    proximity_for_callsign: Callable[[str], float]
+) -> List[Dict[str, Any]]:
+    """
+    Find every (flight record, ATC record) pair on the same frequency, within the
+    time window and within the controller's proximity range.
+
+    Args:
+        flight_transceivers: Flight transceiver dicts (callsign, frequency in Hz, timestamp, position_lat, position_lon)
+        atc_transceivers: ATC transceiver dicts with the same keys
+        time_window_seconds: Maximum time difference between the two records
+        proximity_for_callsign: Returns the proximity threshold (nm) for a controller callsign
+
+    Returns:
+        List of match dicts ordered by flight_time, atc_time (same shape as the SQL join rows)
+    """
+    if not flight_transceivers or not atc_transceivers:
+        return []
+
+    flights = _columns(flight_transceivers)
+    atc = _columns(atc_transceivers)
+
+    # Proximity threshold per ATC record, resolved once per controller callsign
+    thresholds: Dict[str, float] = {}
+    atc_callsigns = [atc_transceivers[i]["callsign"] for i in atc["order"]]
+    for callsign in atc_callsigns:
+        if callsign not in thresholds:
+            thresholds[callsign] = float(proximity_for_callsign(callsign))
+    atc_threshold = np.array([thresholds[callsign] for callsign in atc_callsigns], dtype=float)
+
+    # Frequency groups: start/end offsets of each distinct frequency in the sorted arrays
+    atc_freqs, atc_starts = np.unique(atc["frequency"], return_index=True)
+    atc_ends = np.append(atc_starts[1:], len(atc["frequency"]))
+    flight_freqs, flight_starts = np.unique(flights["frequency"], return_index=True)
+    flight_ends = np.append(flight_starts[1:], len(flights["frequency"]))
+
+    flight_index_parts = []
+    atc_index_parts = []
+    for freq, f_start, f_end in zip(flight_freqs, flight_starts, flight_ends):
+        flight_epoch = flights["epoch"][f_start:f_end]
+
+        # ATC frequency groups within tolerance of this flight frequency
+        low = np.searchsorted(atc_freqs, freq - FREQUENCY_TOLERANCE_HZ, side="left")
+        high = np.searchsorted(atc_freqs, freq + FREQUENCY_TOLERANCE_HZ, side="right")
+        for group in range(low, high):
+            a_start, a_end = atc_starts[group], atc_ends[group]
+            atc_epoch = atc["epoch"][a_start:a_end]
+
+            # Time window sweep: timestamps within a frequency group are sorted
+            window_start = np.searchsorted(atc_epoch, flight_epoch - time_window_seconds, side="left")
+            window_end = np.searchsorted(atc_epoch, flight_epoch + time_window_seconds, side="right")
+            counts = window_end - window_start
+            if not counts.any():
+                continue
+
+            # Expand (flight record, ATC record range) into explicit pairs
+            flight_idx = np.repeat(np.arange(f_start, f_end), counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            atc_idx = a_start + np.repeat(window_start, counts) + offsets
+            flight_index_parts.append(flight_idx)
+            atc_index_parts.append(atc_idx)
+
+    if not flight_index_parts:
+        return []
+
+    flight_idx = np.concatenate(flight_index_parts)
+    atc_idx = np.concatenate(atc_index_parts)
+
+    distances = haversine_nm(flights["lat"][flight_idx], flights["lon"][flight_idx], atc["lat"][atc_idx], atc["lon"][atc_idx])
+    within = distances <= atc_threshold[atc_idx]  # NaN positions never match
+    flight_idx = flight_idx[within]
+    atc_idx = atc_idx[within]
+
+    # Order by flight_time, atc_time like the original query
+    order = np.lexsort((atc["epoch"][atc_idx], flights["epoch"][flight_idx]))
+
+    matches = []
+    for i in order:
+        flight = flight_transceivers[flights["order"][flight_idx[i]]]
+        controller = atc_transceivers[atc["order"][atc_idx[i]]]
+        matches.append({
+            "flight_callsign": flight["callsign"],
+            "atc_callsign": controller["callsign"],
+            "frequency_mhz": int(flight["frequency"]) / 1000000.0,
+            "atc_frequency_mhz": int(controller["frequency"]) / 1000000.0,
+            "flight_time": flight["timestamp"],
+            "atc_time": controller["timestamp"],
+            "time_diff_seconds": float(abs(flights["epoch"][flight_idx[i]] - atc["epoch"][atc_idx[i]])),
+            "flight_lat": flight["position_lat"],
+            "flight_lon": flight["position_lon"],
+            "atc_lat": controller["position_lat"],
+            "atc_lon": controller["position_lon"]
+        })
+    return matches
+
+
+def filter_interval_contacts(
+    contacts: List[Dict[str, Any]],
+    proximity_for_callsign: Callable[[str], float]
+) -> List[Dict[str, Any]]:
+    """
+    Keep the frequency interval contacts whose last positions are within the
+    controller's proximity range.
+
+    Intervals keep only the last observed position of each side, so the distance
+    is measured between those instead of per poll.
+
+    Args:
+        contacts: Contact dicts (atc_callsign, flight_lat, flight_lon, atc_lat, atc_lon, ...)
+        proximity_for_callsign: Returns the proximity threshold (nm) for a controller callsign
+
+    Returns:
+        The contacts within range, in their original order
+    """
+    if not contacts:
+        return []
+
+    thresholds: Dict[str, float] = {}
+    for contact in contacts:
+        callsign = contact["atc_callsign"]
+        if callsign not in thresholds:
+            thresholds[callsign] = float(proximity_for_callsign(callsign))
+
+    distances = haversine_nm(
+        np.array([_to_float(contact["flight_lat"]) for contact in contacts], dtype=float),
+        np.array([_to_float(contact["flight_lon"]) for contact in contacts], dtype=float),
+        np.array([_to_float(contact["atc_lat"]) for contact in contacts], dtype=float),
+        np.array([_to_float(contact["atc_lon"]) for contact in contacts], dtype=float)
+    )
+    within = distances <= np.array([thresholds[contact["atc_callsign"]] for contact in contacts], dtype=float)
+    return [contact for contact, keep in zip(contacts, within) if keep]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Incremental completed-flight tracker
+
+Keeps the last time each flight was seen by the ingest loop, keyed on the
+flight_session_id assigned at ingest (one id per callsign, departure, arrival,
+cid and deptime). Completed-flight identification only has to look at the flights that
+went stale since they were last seen, instead of anti-joining the flights table
+against every summary ever written.
+
+The tracker is seeded from the flights table on first use (and after it is
+invalidated), so a restart does not lose flights that were already being tracked.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+FlightKey = int  # flight_session_id
+
+
+class FlightCompletionTracker:
+    """Last-seen map of active flights keyed on flight_session_id."""
+
+    def __init__(self):
+        self._last_seen: Dict[FlightKey, datetime] = {}
+        self.loaded = False
+
+    def record(self, flight_keys: Iterable[FlightKey], seen_at: datetime) -> None:
+        """Mark flights as seen at seen_at (never moves a key back in time)."""
+        for flight_key in flight_keys:
+            previous = self._last_seen.get(flight_key)
+            if previous is None or previous < seen_at:
+                self._last_seen[flight_key] = seen_at
+
+    def seed(self, rows: Iterable[Tuple[FlightKey, datetime]]) -> None:
+        """Merge (flight_key, last_updated) rows loaded from the database and mark the tracker loaded."""
+        for flight_key, last_updated in rows:
+            if last_updated is not None:
+                self.record([flight_key], last_updated)
+        self.loaded = True
+
+    def stale_keys(self, threshold: datetime) -> List[FlightKey]:
+        """Flight keys not seen since threshold, oldest first."""
+        stale = [(last_seen, flight_key) for flight_key, last_seen in self._last_seen.items() if last_seen < threshold]
+        stale.sort(key=lambda item: item[0])
+        return [flight_key for _, flight_key in stale]
+
+    def discard(self, flight_keys: Iterable[FlightKey]) -> None:
+        """Stop tracking flights (summarised, archived or no longer present)."""
+        for flight_key in flight_keys:
+            self._last_seen.pop(flight_key, None)
+
+    def invalidate(self) -> None:
+        """Drop all state so the next run reseeds from the database."""
+        self._last_seen.clear()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
@@ -12,9 +12,12 @@ Status: Sprint 1, Task 1.4 - Sector Data Loading
 
 import json
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 from pathlib import Path
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, Point
+from shapely.strtree import STRtree
 
 # Import our existing geographic utilities
 from app.utils.geographic_utils import is_point_in_polygon
@@ -36,6 +39,12 @@ class SectorLoader:
         self.sector_metadata: Dict[str, Dict] = {}
         self.loaded = False
         
+        # Spatial index (built once in load_sectors)
+        self._sector_names: List[str] = []
+        self._sector_polygons: List[Polygon] = []
+        self._sector_bounds: Optional[np.ndarray] = None
+        self._sector_tree: Optional[STRtree] = None
+        
         logger.info(f"Sector loader initialized for file: {sectors_file_path}")
     
     def load_sectors(self) -> bool:
@@ -137,6 +146,7 @@ class SectorLoader:
                     continue
             
             self.loaded = True
+            self._build_spatial_index()
             
             logger.info(f"✅ Successfully loaded {sectors_loaded} sectors from GeoJSON")
             logger.info(f"📊 Sectors with boundaries: {sectors_with_boundaries}")
@@ -153,6 +163,25 @@ class SectorLoader:
             logger.critical(f"CRITICAL: Failed to load sectors: {e}")
             raise  # Re-raise the exception to fail the app
     
+    def _build_spatial_index(self) -> None:
+        """Prepare sector polygons and build an STRtree over them.
+        
+        Sector order is kept so overlapping sectors resolve to the first
+        loaded sector, exactly as the linear scan does.
+        """
+        self._sector_names = list(self.sectors.keys())
+        self._sector_polygons = list(self.sectors.values())
+        
+        if not self._sector_polygons:
+            self._sector_bounds = None
+            self._sector_tree = None
+            return
+        
+        shapely.prepare(self._sector_polygons)
+        self._sector_bounds = shapely.bounds(self._sector_polygons)
+        self._sector_tree = STRtree(self._sector_polygons)
+        logger.info(f"Built sector spatial index over {len(self._sector_polygons)} sectors")
+    
     def get_sector_for_point(self, lat: float, lon: float) -> Optional[str]:
         """Find which sector contains the given point.
         
@@ -170,17 +199,64 @@ class SectorLoader:
         try:
             point = Point(lon, lat)  # Shapely uses (lon, lat) format
             
-            # Check each sector
-            for sector_name, polygon in self.sectors.items():
-                if polygon.contains(point):
-                    return sector_name
+            if self._sector_tree is None:
+                # No index (sectors set without load_sectors) - check each sector
+                for sector_name, polygon in self.sectors.items():
+                    if polygon.contains(point):
+                        return sector_name
+                return None
             
-            return None
+            # "within" evaluates point.within(polygon), i.e. polygon.contains(point)
+            matches = self._sector_tree.query(point, predicate="within")
+            if len(matches) == 0:
+                return None
+            
+            return self._sector_names[int(matches.min())]
             
         except Exception as e:
             logger.error(f"Error checking sector for point ({lat}, {lon}): {e}")
             return None
     
+    def get_sectors_for_points(self, lats: Sequence[float], lons: Sequence[float]) -> List[Optional[str]]:
+        """Find the containing sector for many points in one vectorized pass.
+        
+        Args:
+            lats: Latitudes in decimal degrees (None/NaN allowed)
+            lons: Longitudes in decimal degrees (None/NaN allowed)
+            
+        Returns:
+            List[Optional[str]]: Sector name per point, None if not in any sector
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        
+        if not self.loaded:
+            logger.warning("Sector data not loaded")
+            return [None] * len(lats)
+        
+        if self._sector_tree is None:
+            self._build_spatial_index()
+        
+        result = np.full(len(lats), None, dtype=object)
+        if len(lats) == 0 or not self._sector_polygons:
+            return result.tolist()
+        
+        valid = np.isfinite(lats) & np.isfinite(lons)
+        
+        # Walk sectors in reverse so the first loaded sector wins on overlap
+        for index in range(len(self._sector_polygons) - 1, -1, -1):
+            min_lon, min_lat, max_lon, max_lat = self._sector_bounds[index]
+            candidates = np.flatnonzero(
+                valid & (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+            )
+            if len(candidates) == 0:
+                continue
+            
+            inside = shapely.contains_xy(self._sector_polygons[index], lons[candidates], lats[candidates])
+            result[candidates[inside]] = self._sector_names[index]
+        
+        return result.tolist()
+    
     def get_sector_polygon(self, sector_name: str) -> Optional[Polygon]:
         """Get the polygon for a specific sector.
         
@@ -239,6 +315,7 @@ class SectorLoader:
         self.sectors.clear()
         self.sector_metadata.clear()
         self.loaded = False
+        self._build_spatial_index()
         logger.info("Cleared all sector data")
     
     def reload(self) -> bool:
@@ -22,6 +22,9 @@
 -- Enable UUID extension if needed
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- btree_gist lets frequency_intervals index a scalar frequency and a time range together
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
 -- Create or replace the update_updated_at_column function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -31,6 +34,38 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+-- Create daily RANGE partitions <parent>_pYYYYMMDD for first_day..last_day (UTC days),
+-- optionally LIST sub-partitioned as <parent>_pYYYYMMDD_<value>. Used for the initial
+-- partitions below; the app's partition maintenance task keeps them rolling afterwards.
+CREATE OR REPLACE FUNCTION create_daily_partitions(
+    parent TEXT, first_day DATE, last_day DATE,
+    list_column TEXT DEFAULT NULL, list_values TEXT[] DEFAULT NULL
+)
+RETURNS VOID AS $$
+DECLARE
+    partition_day DATE := first_day;
+    partition_name TEXT;
+    list_value TEXT;
+BEGIN
+    WHILE partition_day <= last_day LOOP
+        partition_name := parent || '_p' || to_char(partition_day, 'YYYYMMDD');
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)%s',
+            partition_name, parent,
+            partition_day::timestamp AT TIME ZONE 'UTC', (partition_day + 1)::timestamp AT TIME ZONE 'UTC',
+            CASE WHEN list_column IS NULL THEN '' ELSE format(' PARTITION BY LIST (%I)', list_column) END
+        );
+        IF list_column IS NOT NULL THEN
+            FOREACH list_value IN ARRAY list_values LOOP
+                EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES IN (%L)',
+                    partition_name || '_' || list_value, partition_name, list_value);
+            END LOOP;
+        END IF;
+        partition_day := partition_day + 1;
+    END LOOP;
+END;
+$$ language 'plpgsql';
+
 -- Controllers table with EXACT VATSIM API field mapping
 CREATE TABLE IF NOT EXISTS controllers (
     id SERIAL PRIMARY KEY,
@@ -45,13 +80,47 @@ CREATE TABLE IF NOT EXISTS controllers (
     server VARCHAR(50),             -- From API "server" - Network server
     last_updated TIMESTAMP(0) WITH TIME ZONE,  -- From API "last_updated" - UTC, no subseconds
     logon_time TIMESTAMP(0) WITH TIME ZONE,    -- From API "logon_time" - UTC, no subseconds
+    controller_session_id INTEGER,  -- Controller session from controller_sessions, assigned at ingest
     created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Controller sessions registry: one id per controller session, assigned at ingest.
+-- A logon of the same (callsign, cid) within CONTROLLER_RECONNECTION_THRESHOLD_MINUTES
+-- of the session's last_seen is a reconnection and keeps the session's id
+CREATE TABLE IF NOT EXISTS controller_sessions (
+    controller_session_id SERIAL PRIMARY KEY,
+    callsign VARCHAR(50) NOT NULL,
+    cid INTEGER,
+    session_start_time TIMESTAMP(0) WITH TIME ZONE,  -- Logon time of the first connection
+    last_logon_time TIMESTAMP(0) WITH TIME ZONE,     -- Logon time of the latest (re)connection
+    last_seen TIMESTAMP(0) WITH TIME ZONE NOT NULL,  -- Latest API last_updated of any connection
+    summarised_at TIMESTAMP(0) WITH TIME ZONE,       -- Set when the controller summary is written
+    created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_controller_sessions_start UNIQUE NULLS NOT DISTINCT (callsign, cid, session_start_time)
+);
+
+-- Flight sessions registry: one compact integer id per flight identity
+-- (callsign, departure, arrival, cid, deptime), assigned at ingest and stored on
+-- flights, transceivers (entity_id), flight_sector_occupancy, flights_archive and
+-- flight_summaries so downstream queries join on a single integer
+CREATE TABLE IF NOT EXISTS flight_sessions (
+    flight_session_id SERIAL PRIMARY KEY,
+    callsign VARCHAR(50) NOT NULL,
+    departure VARCHAR(10),
+    arrival VARCHAR(10),
+    cid INTEGER,
+    deptime VARCHAR(10),
+    logon_time TIMESTAMP(0) WITH TIME ZONE,    -- Logon time when the session was first seen
+    created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_flight_sessions_key UNIQUE NULLS NOT DISTINCT (callsign, departure, arrival, cid, deptime)
+);
+
 -- Flights table with optimized VATSIM API field mapping
+-- Range partitioned by day on last_updated (flights_pYYYYMMDD). Days are not expired:
+-- rows leave through the flight summary job's archive/delete once summarised
 CREATE TABLE IF NOT EXISTS flights (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     callsign VARCHAR(50) NOT NULL,
     aircraft_type VARCHAR(20),
     
@@ -84,7 +153,7 @@ CREATE TABLE IF NOT EXISTS flights (
     assigned_transponder VARCHAR(10), -- Assigned transponder from flight_plan.assigned_transponder
     
     -- Timestamps
-    last_updated TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),  -- UTC, no subseconds
+    last_updated TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW() NOT NULL,  -- UTC, no subseconds (partition key)
     
     -- VATSIM API fields - 1:1 mapping with API field names
     cid INTEGER,                    -- From API "cid" - VATSIM user ID
@@ -97,14 +166,45 @@ CREATE TABLE IF NOT EXISTS flights (
     qnh_mb INTEGER,                 -- QNH pressure in millibars from VATSIM API
     logon_time TIMESTAMP(0) WITH TIME ZONE,    -- From API "logon_time" - UTC, no subseconds
     last_updated_api TIMESTAMP(0) WITH TIME ZONE,  -- From API "last_updated" - UTC, no subseconds
+    flight_session_id INTEGER,      -- flight_sessions id, assigned at ingest
     
     created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
+    
+    PRIMARY KEY (id, last_updated)
+) PARTITION BY RANGE (last_updated);
+
+SELECT create_daily_partitions('flights', (NOW() AT TIME ZONE 'UTC')::date, (NOW() AT TIME ZONE 'UTC')::date + 3);
+
+-- Latest position of each callsign, upserted in bulk on every poll alongside the flights
+-- history. Serves /api/flights and stale sector cleanup without a DISTINCT ON over flights.
+CREATE TABLE IF NOT EXISTS flights_latest (
+    callsign VARCHAR(50) PRIMARY KEY,
+    cid INTEGER,
+    name VARCHAR(100),
+    server VARCHAR(50),
+    pilot_rating INTEGER,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    altitude INTEGER,
+    groundspeed INTEGER,
+    heading INTEGER,
+    transponder VARCHAR(10),
+    departure VARCHAR(10),
+    arrival VARCHAR(10),
+    aircraft_type VARCHAR(20),
+    flight_rules VARCHAR(10),
+    planned_altitude VARCHAR(10),
+    logon_time TIMESTAMP(0) WITH TIME ZONE,
+    last_updated TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW() NOT NULL  -- Poll that last saw the callsign
 );
 
 -- Transceivers table for radio frequency and position data
+-- Range partitioned by day on "timestamp" (transceivers_pYYYYMMDD), each day LIST
+-- partitioned by entity_type (transceivers_pYYYYMMDD_flight / _atc). The app's
+-- partition maintenance task pre-creates future days and detaches expired ones.
 CREATE TABLE IF NOT EXISTS transceivers (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     callsign VARCHAR(50) NOT NULL,
     transceiver_id INTEGER NOT NULL,  -- ID from VATSIM API
     frequency BIGINT NOT NULL,        -- Frequency in Hz
@@ -113,9 +213,51 @@ CREATE TABLE IF NOT EXISTS transceivers (
     height_msl DOUBLE PRECISION,      -- Height above mean sea level in meters from VATSIM API
     height_agl DOUBLE PRECISION,      -- Height above ground level in meters from VATSIM API
     entity_type VARCHAR(20) NOT NULL, -- 'flight' or 'atc'
-    entity_id INTEGER,                -- Foreign key to flights.id or controllers.id
+    entity_id INTEGER,                -- flight_sessions.flight_session_id for flight transceivers
     timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (id, "timestamp")
+) PARTITION BY RANGE ("timestamp");
+
+-- Initial daily transceiver partitions (today and the next 3 days, UTC)
+SELECT create_daily_partitions(
+    'transceivers', (NOW() AT TIME ZONE 'UTC')::date, (NOW() AT TIME ZONE 'UTC')::date + 3,
+    'entity_type', ARRAY['flight', 'atc']
+);
+
+-- Frequency intervals table: consecutive observations of one (callsign, frequency) folded
+-- into [interval_start, interval_end] at ingest by FrequencyIntervalTracker. ATC and flight
+-- detection join intervals on frequency and overlapping time ranges instead of raw transceivers.
+CREATE TABLE IF NOT EXISTS frequency_intervals (
+    id BIGSERIAL PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL,           -- 'flight' or 'atc'
+    callsign VARCHAR(50) NOT NULL,
+    entity_id INTEGER,                          -- flight_sessions.flight_session_id for flight intervals
+    frequency BIGINT NOT NULL,                  -- Frequency in Hz
+    interval_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    interval_end TIMESTAMP WITH TIME ZONE NOT NULL,
+    active_during TSTZRANGE GENERATED ALWAYS AS (tstzrange(interval_start, interval_end, '[]')) STORED,
+    position_lat DOUBLE PRECISION,              -- Last observed position
+    position_lon DOUBLE PRECISION,
+    observations INTEGER NOT NULL DEFAULT 1,    -- Polls folded into the interval
+    is_open BOOLEAN NOT NULL DEFAULT TRUE,      -- Still being extended by ingest
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT valid_interval_entity_type CHECK (entity_type IN ('flight', 'atc')),
+    CONSTRAINT valid_interval_range CHECK (interval_end >= interval_start)
+);
+
+-- Events table: typed changes between consecutive polls emitted by SnapshotDiffEngine
+-- (pilot/controller connected and disconnected, flight plan and frequency changes, retunes)
+CREATE TABLE IF NOT EXISTS events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(40) NOT NULL,
+    entity_type VARCHAR(20) NOT NULL,           -- 'flight' or 'atc'
+    callsign VARCHAR(50) NOT NULL,
+    entity_id INTEGER,                          -- flight_session_id or controller_session_id
+    occurred_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    details JSONB,                              -- Event-specific before/after values
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT valid_event_entity_type CHECK (entity_type IN ('flight', 'atc'))
 );
 
 -- Create indexes for performance (optimized for production queries)
@@ -126,6 +268,10 @@ CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_controllers_cid_rating ON controller
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_controllers_facility_server ON controllers(facility, server);
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_controllers_last_updated ON controllers(last_updated);
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_controllers_rating_last_updated ON controllers(rating, last_updated);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_controllers_controller_session_id ON controllers(controller_session_id);
+
+-- Open controller sessions by last activity, for session-end detection
+CREATE INDEX IF NOT EXISTS idx_controller_sessions_open ON controller_sessions(last_seen) WHERE summarised_at IS NULL;
 
 -- ATC Detection Performance Indexes for controllers
 -- This index was previously corrupted - now using CONCURRENTLY for safety
@@ -134,47 +280,51 @@ CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_controllers_callsign_facility ON con
 -- Additional index that exists in database but not in original init.sql
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_controllers_simple ON controllers(callsign, facility);
 
--- Flights indexes - Using CONCURRENTLY to prevent corruption during high-frequency writes
+-- Flights indexes - created on the partitioned parent and inherited by every partition
+-- (CONCURRENTLY is not supported on partitioned tables)
 -- Removed low-selectivity indexes: altitude, planned_altitude, flight_rules
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_callsign ON flights(callsign);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_callsign_status ON flights(callsign, last_updated);
+CREATE INDEX IF NOT EXISTS idx_flights_callsign ON flights(callsign);
+CREATE INDEX IF NOT EXISTS idx_flights_callsign_status ON flights(callsign, last_updated);
 
 -- Use BRIN for geographic coordinates - better for range queries and bounding boxes
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_position ON flights USING brin(latitude, longitude);
+CREATE INDEX IF NOT EXISTS idx_flights_position ON flights USING brin(latitude, longitude);
 
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_departure_arrival ON flights(departure, arrival);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_cid_server ON flights(cid, server);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_aircraft_short ON flights(aircraft_short);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_revision_id ON flights(revision_id);
+CREATE INDEX IF NOT EXISTS idx_flights_departure_arrival ON flights(departure, arrival);
+CREATE INDEX IF NOT EXISTS idx_flights_cid_server ON flights(cid, server);
+CREATE INDEX IF NOT EXISTS idx_flights_aircraft_short ON flights(aircraft_short);
+CREATE INDEX IF NOT EXISTS idx_flights_revision_id ON flights(revision_id);
 
 -- ATC Detection Performance Indexes for flights
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_callsign_departure_arrival ON flights(callsign, departure, arrival);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_callsign_logon ON flights(callsign, logon_time);
+CREATE INDEX IF NOT EXISTS idx_flights_callsign_departure_arrival ON flights(callsign, departure, arrival);
+CREATE INDEX IF NOT EXISTS idx_flights_callsign_logon ON flights(callsign, logon_time);
+CREATE INDEX IF NOT EXISTS idx_flights_flight_session_id ON flights(flight_session_id, last_updated);
 
 -- Additional indexes that exist in database but not in original init.sql
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_altitude ON flights(altitude);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_flight_rules ON flights(flight_rules);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_flights_planned_altitude ON flights(planned_altitude);
-
--- Transceivers indexes (optimized for frequency-based queries) - Using CONCURRENTLY
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_callsign ON transceivers(callsign);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_callsign_timestamp ON transceivers(callsign, "timestamp");
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_frequency ON transceivers(frequency);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_entity ON transceivers(entity_type, entity_id);
-
--- ATC Detection Performance Indexes for transceivers
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_entity_type_callsign ON transceivers(entity_type, callsign);
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_entity_type_timestamp ON transceivers(entity_type, "timestamp");
-
--- High-performance ATC detection indexes for loading ALL controllers
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_atc_simple ON transceivers(entity_type, "timestamp" DESC, callsign) WHERE entity_type = 'atc';
-
--- Performance-optimized indexes for controller flight counting queries
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_flight_frequency_callsign ON transceivers(entity_type, frequency, callsign) WHERE entity_type = 'flight';
-
--- Additional indexes that exist in database but not in original init.sql
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_atc_join ON transceivers(callsign, entity_type, "timestamp" DESC) WHERE entity_type = 'atc';
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transceivers_atc_performance ON transceivers(entity_type, callsign, "timestamp" DESC, frequency, position_lat, position_lon) WHERE entity_type = 'atc';
+CREATE INDEX IF NOT EXISTS idx_flights_altitude ON flights(altitude);
+CREATE INDEX IF NOT EXISTS idx_flights_flight_rules ON flights(flight_rules);
+CREATE INDEX IF NOT EXISTS idx_flights_planned_altitude ON flights(planned_altitude);
+
+-- Flights latest index - recent-callsign window of /api/flights and stale sector cleanup
+CREATE INDEX IF NOT EXISTS idx_flights_latest_last_updated ON flights_latest(last_updated);
+
+-- Transceivers indexes - created on the partitioned parent and inherited by every partition
+-- (CONCURRENTLY is not supported on partitioned tables). entity_type is resolved by the LIST
+-- sub-partitions and "timestamp" by the daily ranges, so the indexes no longer lead with them.
+CREATE INDEX IF NOT EXISTS idx_transceivers_callsign_timestamp ON transceivers(callsign, "timestamp");
+CREATE INDEX IF NOT EXISTS idx_transceivers_timestamp ON transceivers("timestamp");
+CREATE INDEX IF NOT EXISTS idx_transceivers_frequency_callsign ON transceivers(frequency, callsign);
+CREATE INDEX IF NOT EXISTS idx_transceivers_entity_id_timestamp ON transceivers(entity_id, "timestamp");
+
+-- Frequency intervals indexes - GiST answers "same frequency, overlapping time" in one probe
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_frequency_intervals_frequency_active ON frequency_intervals USING GIST (frequency, active_during);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_frequency_intervals_callsign_start ON frequency_intervals(entity_type, callsign, interval_start);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_frequency_intervals_entity_id ON frequency_intervals(entity_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_frequency_intervals_open ON frequency_intervals(is_open) WHERE is_open;
+
+-- Events indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_occurred_at ON events(occurred_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_type_occurred_at ON events(event_type, occurred_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_callsign_occurred_at ON events(callsign, occurred_at);
 
 -- Create triggers for updated_at columns
 CREATE TRIGGER update_controllers_updated_at 
@@ -311,6 +461,7 @@ COMMENT ON COLUMN flights.revision_id IS 'Flight plan revision from VATSIM API f
 COMMENT ON COLUMN flights.assigned_transponder IS 'Assigned transponder from VATSIM API flight_plan.assigned_transponder field';
 COMMENT ON COLUMN flights.qnh_i_hg IS 'QNH pressure in inches Hg from VATSIM API qnh_i_hg field';
 COMMENT ON COLUMN flights.qnh_mb IS 'QNH pressure in millibars from VATSIM API qnh_mb field';
+COMMENT ON COLUMN flights.flight_session_id IS 'Flight session id from flight_sessions, assigned at ingest';
 
 -- Flight Summaries table for completed flight data
 CREATE TABLE IF NOT EXISTS flight_summaries (
@@ -340,13 +491,17 @@ CREATE TABLE IF NOT EXISTS flight_summaries (
     total_enroute_time_minutes INTEGER,  -- Total time in enroute sectors
     sector_breakdown JSONB,  -- Detailed sector breakdown data
     completion_time TIMESTAMP(0) WITH TIME ZONE,  -- When flight completed
+    flight_session_id INTEGER,  -- flight_sessions id of the summarised flight
+    archive_pending BOOLEAN NOT NULL DEFAULT FALSE,  -- Finalized on disconnect, flights rows not archived yet
     created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW()
 );
 
 -- Flights Archive table for detailed historical records
+-- Range partitioned by day on last_updated (flights_archive_pYYYYMMDD); retention
+-- removes whole days instead of DELETEs (FLIGHT_RETENTION_HOURS)
 CREATE TABLE IF NOT EXISTS flights_archive (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     callsign VARCHAR(50) NOT NULL,
     aircraft_type VARCHAR(20),
     departure VARCHAR(10),
@@ -376,14 +531,20 @@ CREATE TABLE IF NOT EXISTS flights_archive (
     total_enroute_time_minutes INTEGER,  -- Total time in enroute sectors
     sector_breakdown JSONB,  -- Detailed sector breakdown data
     completion_time TIMESTAMP WITH TIME ZONE,  -- When flight completed
-    last_updated TIMESTAMP(0) WITH TIME ZONE,
+    flight_session_id INTEGER,  -- flight_sessions id of the archived flight
+    last_updated TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW() NOT NULL,  -- Partition key
     created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (id, last_updated)
+) PARTITION BY RANGE (last_updated);
+
+SELECT create_daily_partitions('flights_archive', (NOW() AT TIME ZONE 'UTC')::date, (NOW() AT TIME ZONE 'UTC')::date + 3);
 
 -- Create indexes for flight_summaries table
 CREATE INDEX IF NOT EXISTS idx_flight_summaries_callsign ON flight_summaries(callsign);
 CREATE INDEX IF NOT EXISTS idx_flight_summaries_completion_time ON flight_summaries(completion_time);
+CREATE INDEX IF NOT EXISTS idx_flight_summaries_flight_session_id ON flight_summaries(flight_session_id);
+CREATE INDEX IF NOT EXISTS idx_flight_summaries_archive_pending ON flight_summaries(completion_time) WHERE archive_pending;
 CREATE INDEX IF NOT EXISTS idx_flight_summaries_flight_rules ON flight_summaries(flight_rules);
 CREATE INDEX IF NOT EXISTS idx_flight_summaries_controller_time ON flight_summaries(controller_time_percentage);
 
@@ -400,6 +561,7 @@ CREATE INDEX IF NOT EXISTS idx_flights_archive_controller_time ON flights_archiv
 CREATE INDEX IF NOT EXISTS idx_flights_archive_primary_sector ON flights_archive(primary_enroute_sector);
 CREATE INDEX IF NOT EXISTS idx_flights_archive_sector_breakdown ON flights_archive USING GIN(sector_breakdown);
 CREATE INDEX IF NOT EXISTS idx_flights_archive_completion_time ON flights_archive(completion_time);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_flight_session_id ON flights_archive(flight_session_id);
 
 -- Create triggers for updated_at columns on new tables
 CREATE TRIGGER update_flight_summaries_updated_at 
@@ -418,6 +580,7 @@ CREATE TABLE IF NOT EXISTS controller_summaries (
     callsign VARCHAR(50) NOT NULL,
     cid INTEGER,
     name VARCHAR(100),
+    controller_session_id INTEGER,  -- Controller session from controller_sessions
     
     -- Session Summary
     session_start_time TIMESTAMP WITH TIME ZONE NOT NULL,
@@ -466,6 +629,7 @@ CREATE TABLE IF NOT EXISTS controllers_archive (
     server VARCHAR(50),
     last_updated TIMESTAMP(0) WITH TIME ZONE,
     logon_time TIMESTAMP(0) WITH TIME ZONE,
+    controller_session_id INTEGER,
     created_at TIMESTAMP(0) WITH TIME ZONE,
     updated_at TIMESTAMP(0) WITH TIME ZONE,
     archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
@@ -485,6 +649,7 @@ CREATE TABLE IF NOT EXISTS flight_sector_occupancy (
     exit_lon DECIMAL(11, 8),                    -- NULL until flight exits sector
     entry_altitude INTEGER,                      -- Altitude when entering sector (REQUIRED for sector tracking)
     exit_altitude INTEGER,                       -- Altitude when exiting sector (REQUIRED for sector tracking)
+    flight_session_id INTEGER,                   -- flight_sessions id of the flight
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -492,6 +657,7 @@ CREATE TABLE IF NOT EXISTS flight_sector_occupancy (
 CREATE INDEX IF NOT EXISTS idx_flight_sector_occupancy_callsign ON flight_sector_occupancy(callsign);
 CREATE INDEX IF NOT EXISTS idx_flight_sector_occupancy_sector_name ON flight_sector_occupancy(sector_name);
 CREATE INDEX IF NOT EXISTS idx_flight_sector_occupancy_entry_timestamp ON flight_sector_occupancy(entry_timestamp);
+CREATE INDEX IF NOT EXISTS idx_flight_sector_occupancy_flight_session_id ON flight_sector_occupancy(flight_session_id);
 
 -- Create indexes for controller_summaries table
 -- Basic lookup indexes
@@ -510,11 +676,13 @@ CREATE INDEX IF NOT EXISTS idx_controller_summaries_hourly_breakdown ON controll
 CREATE INDEX IF NOT EXISTS idx_controller_summaries_callsign_session ON controller_summaries(callsign, session_start_time);
 CREATE INDEX IF NOT EXISTS idx_controller_summaries_rating_facility ON controller_summaries(rating, facility);
 CREATE INDEX IF NOT EXISTS idx_controller_summaries_duration_aircraft ON controller_summaries(session_duration_minutes, total_aircraft_handled);
+CREATE INDEX IF NOT EXISTS idx_controller_summaries_controller_session_id ON controller_summaries(controller_session_id);
 
 -- Create indexes for controllers_archive table
 CREATE INDEX IF NOT EXISTS idx_controllers_archive_callsign ON controllers_archive(callsign);
 CREATE INDEX IF NOT EXISTS idx_controllers_archive_logon_time ON controllers_archive(logon_time);
 CREATE INDEX IF NOT EXISTS idx_controllers_archive_last_updated ON controllers_archive(last_updated);
+CREATE INDEX IF NOT EXISTS idx_controllers_archive_controller_session_id ON controllers_archive(controller_session_id);
 
 -- Create triggers for updated_at columns on controller tables
 CREATE TRIGGER update_controller_summaries_updated_at 
@@ -539,8 +707,8 @@ CREATE TRIGGER update_controller_summaries_updated_at
 -- - idx_flight_summaries_airborne_controller_time: (airborne_controller_time_percentage) - ATC contact analysis
 -- 
 -- Transceivers:
--- - idx_transceivers_atc_join: (callsign, entity_type, timestamp DESC) WHERE entity_type = 'atc'
--- - idx_transceivers_atc_performance: (entity_type, callsign, timestamp DESC, frequency, position_lat, position_lon) WHERE entity_type = 'atc'
+-- - Replaced by partitioning: daily RANGE partitions with LIST sub-partitions per entity_type
+--   and three indexes (callsign, timestamp), (timestamp), (frequency, callsign)
 -- 
 -- These indexes provide significant performance improvements for ATC detection,
 -- flight analysis, and real-time data processing operations.
@@ -0,0 +1,127 @@
+-- Migration Script: Add the controller_sessions registry and controller_session_id columns
+-- Run this script on existing databases created before controller_session_id existed
+--
+-- Every controller session gets one integer in controller_sessions, assigned by the ingest
+-- loop. A logon of the same (callsign, cid) within CONTROLLER_RECONNECTION_THRESHOLD_MINUTES
+-- of the session's last update is a reconnection and keeps the session's id. The id is
+-- stored on controllers, controllers_archive and controller_summaries, so session-end
+-- detection reads controller_sessions and summaries, archiving and deletion look controller
+-- rows up by a single integer instead of re-deriving sessions from raw rows.
+--
+-- Existing rows are backfilled with the same rule. The threshold below is 5 minutes, the
+-- default of CONTROLLER_RECONNECTION_THRESHOLD_MINUTES; change both if yours differs.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS controller_sessions (
+    controller_session_id SERIAL PRIMARY KEY,
+    callsign VARCHAR(50) NOT NULL,
+    cid INTEGER,
+    session_start_time TIMESTAMP(0) WITH TIME ZONE,
+    last_logon_time TIMESTAMP(0) WITH TIME ZONE,
+    last_seen TIMESTAMP(0) WITH TIME ZONE NOT NULL,
+    summarised_at TIMESTAMP(0) WITH TIME ZONE,
+    created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_controller_sessions_start UNIQUE NULLS NOT DISTINCT (callsign, cid, session_start_time)
+);
+
+ALTER TABLE controllers ADD COLUMN IF NOT EXISTS controller_session_id INTEGER;
+ALTER TABLE controllers_archive ADD COLUMN IF NOT EXISTS controller_session_id INTEGER;
+ALTER TABLE controller_summaries ADD COLUMN IF NOT EXISTS controller_session_id INTEGER;
+
+COMMENT ON COLUMN controllers.controller_session_id IS 'Controller session id from controller_sessions, assigned at ingest';
+
+-- One row per connection (callsign, cid, logon_time) with its last update
+CREATE TEMP TABLE controller_connections ON COMMIT DROP AS
+SELECT callsign, cid, logon_time, MAX(last_updated) AS last_seen
+FROM (
+    SELECT callsign, cid, logon_time, last_updated FROM controllers
+    UNION ALL
+    SELECT callsign, cid, logon_time, last_updated FROM controllers_archive
+) AS records
+GROUP BY callsign, cid, logon_time;
+
+-- A connection opens a new session unless it logged on within the threshold of the
+-- latest update of the connections before it
+CREATE TEMP TABLE controller_connection_sessions ON COMMIT DROP AS
+SELECT callsign, cid, logon_time, last_seen,
+       MIN(logon_time) OVER (PARTITION BY callsign, cid, session_number) AS session_start_time
+FROM (
+    SELECT callsign, cid, logon_time, last_seen,
+           SUM(new_session) OVER (PARTITION BY callsign, cid ORDER BY logon_time NULLS FIRST) AS session_number
+    FROM (
+        SELECT callsign, cid, logon_time, last_seen,
+               CASE WHEN logon_time <= MAX(last_seen) OVER (
+                        PARTITION BY callsign, cid ORDER BY logon_time NULLS FIRST
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                    ) + INTERVAL '5 minutes'
+                    THEN 0 ELSE 1 END AS new_session
+        FROM controller_connections
+    ) AS flagged
+) AS numbered;
+
+INSERT INTO controller_sessions (callsign, cid, session_start_time, last_logon_time, last_seen)
+SELECT callsign, cid, session_start_time, MAX(logon_time),
+       COALESCE(MAX(last_seen), MAX(logon_time), NOW())
+FROM controller_connection_sessions
+GROUP BY callsign, cid, session_start_time
+ORDER BY session_start_time NULLS LAST
+ON CONFLICT (callsign, cid, session_start_time) DO NOTHING;
+
+-- Backfill the controller tables by connection
+UPDATE controllers c SET controller_session_id = s.controller_session_id
+FROM controller_connection_sessions cc
+JOIN controller_sessions s
+  ON s.callsign = cc.callsign
+ AND s.cid IS NOT DISTINCT FROM cc.cid
+ AND s.session_start_time IS NOT DISTINCT FROM cc.session_start_time
+WHERE c.controller_session_id IS NULL
+AND c.callsign = cc.callsign
+AND c.cid IS NOT DISTINCT FROM cc.cid
+AND c.logon_time IS NOT DISTINCT FROM cc.logon_time;
+
+UPDATE controllers_archive a SET controller_session_id = s.controller_session_id
+FROM controller_connection_sessions cc
+JOIN controller_sessions s
+  ON s.callsign = cc.callsign
+ AND s.cid IS NOT DISTINCT FROM cc.cid
+ AND s.session_start_time IS NOT DISTINCT FROM cc.session_start_time
+WHERE a.controller_session_id IS NULL
+AND a.callsign = cc.callsign
+AND a.cid IS NOT DISTINCT FROM cc.cid
+AND a.logon_time IS NOT DISTINCT FROM cc.logon_time;
+
+-- Summaries were keyed on (callsign, cid, session_start_time)
+UPDATE controller_summaries cs SET controller_session_id = s.controller_session_id
+FROM controller_sessions s
+WHERE cs.controller_session_id IS NULL
+AND s.callsign = cs.callsign
+AND s.cid IS NOT DISTINCT FROM cs.cid
+AND s.session_start_time = cs.session_start_time;
+
+CREATE INDEX IF NOT EXISTS idx_controllers_controller_session_id ON controllers(controller_session_id);
+
+-- Sessions already summarised, or with no rows left to summarise, are closed
+UPDATE controller_sessions s SET summarised_at = cs.created_at
+FROM controller_summaries cs
+WHERE s.summarised_at IS NULL
+AND cs.controller_session_id = s.controller_session_id;
+
+UPDATE controller_sessions s SET summarised_at = NOW()
+WHERE s.summarised_at IS NULL
+AND NOT EXISTS (SELECT 1 FROM controllers c WHERE c.controller_session_id = s.controller_session_id);
+
+COMMIT;
+
+CREATE INDEX IF NOT EXISTS idx_controller_sessions_open ON controller_sessions(last_seen) WHERE summarised_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_controllers_archive_controller_session_id ON controllers_archive(controller_session_id);
+CREATE INDEX IF NOT EXISTS idx_controller_summaries_controller_session_id ON controller_summaries(controller_session_id);
+
+ANALYZE controller_sessions;
+ANALYZE controllers;
+
+-- Verify
+SELECT
+    (SELECT COUNT(*) FROM controller_sessions) AS controller_sessions,
+    (SELECT COUNT(*) FROM controller_sessions WHERE summarised_at IS NULL) AS open_sessions,
+    (SELECT COUNT(*) FROM controllers WHERE controller_session_id IS NULL) AS controllers_without_session;
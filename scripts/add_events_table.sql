@@ -0,0 +1,27 @@
+-- Migration Script: Add the events table for snapshot diff events
+-- Run this script on existing databases created before the events table existed
+--
+-- The ingest loop diffs every poll against the previous one and stores typed events
+-- (pilot_connected, pilot_disconnected, pilot_filtered_in, pilot_filtered_out,
+-- flight_plan_changed, controller_connected, controller_disconnected,
+-- controller_frequency_changed, transceiver_retuned). There is
+-- nothing to backfill: events start with the first poll after the upgrade.
+
+CREATE TABLE IF NOT EXISTS events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(40) NOT NULL,
+    entity_type VARCHAR(20) NOT NULL,
+    callsign VARCHAR(50) NOT NULL,
+    entity_id INTEGER,
+    occurred_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    details JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT valid_event_entity_type CHECK (entity_type IN ('flight', 'atc'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_occurred_at ON events(occurred_at);
+CREATE INDEX IF NOT EXISTS idx_events_type_occurred_at ON events(event_type, occurred_at);
+CREATE INDEX IF NOT EXISTS idx_events_callsign_occurred_at ON events(callsign, occurred_at);
+
+-- Verify
+SELECT COUNT(*) AS events FROM events;
@@ -0,0 +1,120 @@
+-- Migration Script: Add the flight_sessions registry and flight_session_id columns
+-- Run this script on existing databases created before flight_session_id existed
+--
+-- Every flight identity (callsign, departure, arrival, cid, deptime) gets one compact
+-- integer in flight_sessions, assigned by the ingest loop. The id is stored on flights,
+-- flights_archive, flight_summaries and flight_sector_occupancy, and in transceivers.entity_id
+-- for flight transceivers, so summaries, archiving and ATC detection look flights up by a
+-- single integer instead of matching the five key columns.
+--
+-- Existing rows are backfilled: the registry from every key already stored, the flight
+-- tables by key, and sector occupancy and transceivers by callsign within each session's
+-- first and last flight record. Large databases may want to run the transceivers UPDATE
+-- per daily partition instead.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS flight_sessions (
+    flight_session_id SERIAL PRIMARY KEY,
+    callsign VARCHAR(50) NOT NULL,
+    departure VARCHAR(10),
+    arrival VARCHAR(10),
+    cid INTEGER,
+    deptime VARCHAR(10),
+    logon_time TIMESTAMP(0) WITH TIME ZONE,
+    created_at TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_flight_sessions_key UNIQUE NULLS NOT DISTINCT (callsign, departure, arrival, cid, deptime)
+);
+
+ALTER TABLE flights ADD COLUMN IF NOT EXISTS flight_session_id INTEGER;
+ALTER TABLE flights_archive ADD COLUMN IF NOT EXISTS flight_session_id INTEGER;
+ALTER TABLE flight_summaries ADD COLUMN IF NOT EXISTS flight_session_id INTEGER;
+ALTER TABLE flight_sector_occupancy ADD COLUMN IF NOT EXISTS flight_session_id INTEGER;
+
+COMMENT ON COLUMN flights.flight_session_id IS 'Flight session id from flight_sessions, assigned at ingest';
+
+-- Register every flight identity already stored, oldest first
+INSERT INTO flight_sessions (callsign, departure, arrival, cid, deptime, logon_time)
+SELECT callsign, departure, arrival, cid, deptime, MIN(logon_time)
+FROM (
+    SELECT callsign, departure, arrival, cid, deptime, logon_time FROM flights
+    UNION ALL
+    SELECT callsign, departure, arrival, cid, deptime, logon_time FROM flights_archive
+    UNION ALL
+    SELECT callsign, departure, arrival, cid, deptime, logon_time FROM flight_summaries
+) AS existing
+GROUP BY callsign, departure, arrival, cid, deptime
+ORDER BY MIN(logon_time) NULLS LAST
+ON CONFLICT (callsign, departure, arrival, cid, deptime) DO NOTHING;
+
+-- Backfill the flight tables by key
+UPDATE flights f SET flight_session_id = s.flight_session_id
+FROM flight_sessions s
+WHERE f.flight_session_id IS NULL
+AND f.callsign = s.callsign
+AND f.departure IS NOT DISTINCT FROM s.departure
+AND f.arrival IS NOT DISTINCT FROM s.arrival
+AND f.cid IS NOT DISTINCT FROM s.cid
+AND f.deptime IS NOT DISTINCT FROM s.deptime;
+
+UPDATE flights_archive a SET flight_session_id = s.flight_session_id
+FROM flight_sessions s
+WHERE a.flight_session_id IS NULL
+AND a.callsign = s.callsign
+AND a.departure IS NOT DISTINCT FROM s.departure
+AND a.arrival IS NOT DISTINCT FROM s.arrival
+AND a.cid IS NOT DISTINCT FROM s.cid
+AND a.deptime IS NOT DISTINCT FROM s.deptime;
+
+UPDATE flight_summaries fs SET flight_session_id = s.flight_session_id
+FROM flight_sessions s
+WHERE fs.flight_session_id IS NULL
+AND fs.callsign = s.callsign
+AND fs.departure IS NOT DISTINCT FROM s.departure
+AND fs.arrival IS NOT DISTINCT FROM s.arrival
+AND fs.cid IS NOT DISTINCT FROM s.cid
+AND fs.deptime IS NOT DISTINCT FROM s.deptime;
+
+-- Time span of each session, for the tables that only carry a callsign
+CREATE TEMP TABLE flight_session_spans ON COMMIT DROP AS
+SELECT flight_session_id, callsign, MIN(last_updated) AS first_seen, MAX(last_updated) AS last_seen
+FROM (
+    SELECT flight_session_id, callsign, last_updated FROM flights WHERE flight_session_id IS NOT NULL
+    UNION ALL
+    SELECT flight_session_id, callsign, last_updated FROM flights_archive WHERE flight_session_id IS NOT NULL
+) AS records
+GROUP BY flight_session_id, callsign;
+
+CREATE INDEX ON flight_session_spans (callsign, first_seen);
+
+UPDATE flight_sector_occupancy o SET flight_session_id = sp.flight_session_id
+FROM flight_session_spans sp
+WHERE o.flight_session_id IS NULL
+AND o.callsign = sp.callsign
+AND o.entry_timestamp BETWEEN sp.first_seen AND sp.last_seen;
+
+UPDATE transceivers t SET entity_id = sp.flight_session_id
+FROM flight_session_spans sp
+WHERE t.entity_type = 'flight'
+AND t.entity_id IS NULL
+AND t.callsign = sp.callsign
+AND t."timestamp" BETWEEN sp.first_seen AND sp.last_seen;
+
+COMMIT;
+
+-- Indexes for the single-integer lookups (partitioned parents cascade to every partition)
+CREATE INDEX IF NOT EXISTS idx_flights_flight_session_id ON flights(flight_session_id, last_updated);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_flight_session_id ON flights_archive(flight_session_id);
+CREATE INDEX IF NOT EXISTS idx_flight_summaries_flight_session_id ON flight_summaries(flight_session_id);
+CREATE INDEX IF NOT EXISTS idx_flight_sector_occupancy_flight_session_id ON flight_sector_occupancy(flight_session_id);
+CREATE INDEX IF NOT EXISTS idx_transceivers_entity_id_timestamp ON transceivers(entity_id, "timestamp");
+
+ANALYZE flight_sessions;
+ANALYZE flights;
+ANALYZE flight_summaries;
+
+-- Verify
+SELECT
+    (SELECT COUNT(*) FROM flight_sessions) AS flight_sessions,
+    (SELECT COUNT(*) FROM flights WHERE flight_session_id IS NULL) AS flights_without_session,
+    (SELECT COUNT(*) FROM flight_summaries WHERE flight_session_id IS NULL) AS summaries_without_session;
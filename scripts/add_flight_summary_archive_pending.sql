@@ -0,0 +1,17 @@
+-- Migration Script: Add archive_pending to flight_summaries for finalization on disconnect
+-- Run this script on existing databases created before flight summaries were finalized at ingest
+--
+-- Flights that disconnect and stay away for FLIGHT_FINALIZATION_GRACE_MINUTES are summarised
+-- from state accumulated by the ingest loop. Those summaries are written with archive_pending
+-- set, so the hourly flight summary job still archives and deletes their flights rows once
+-- they are older than FLIGHT_COMPLETION_HOURS. Existing summaries were written by that job
+-- and are already archived, so nothing is backfilled.
+
+ALTER TABLE flight_summaries ADD COLUMN IF NOT EXISTS archive_pending BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_flight_summaries_archive_pending ON flight_summaries(completion_time) WHERE archive_pending;
+
+-- Verify
+SELECT
+    (SELECT COUNT(*) FROM flight_summaries) AS flight_summaries,
+    (SELECT COUNT(*) FROM flight_summaries WHERE archive_pending) AS archive_pending;
@@ -0,0 +1,81 @@
+-- Migration Script: Add the frequency_intervals table and backfill it from transceivers
+-- Run this script on existing databases created before frequency_intervals existed
+--
+-- The ingest loop folds each poll's transceivers into frequency intervals: consecutive
+-- observations of one (entity_type, callsign, frequency) extend a single interval with its
+-- last position. ATC and flight detection join intervals on frequency and overlapping
+-- time ranges (GiST index on frequency, active_during) instead of raw transceiver rows.
+--
+-- Existing transceivers are backfilled as gaps-and-islands: a new interval starts when the
+-- previous observation of the same callsign, frequency and flight session is more than
+-- 180 seconds earlier, the default of FREQUENCY_INTERVAL_MAX_GAP_SECONDS; change both if
+-- yours differs. Backfilled intervals are closed, so the first poll after the migration
+-- opens fresh ones.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS frequency_intervals (
+    id BIGSERIAL PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL,
+    callsign VARCHAR(50) NOT NULL,
+    entity_id INTEGER,
+    frequency BIGINT NOT NULL,
+    interval_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    interval_end TIMESTAMP WITH TIME ZONE NOT NULL,
+    active_during TSTZRANGE GENERATED ALWAYS AS (tstzrange(interval_start, interval_end, '[]')) STORED,
+    position_lat DOUBLE PRECISION,
+    position_lon DOUBLE PRECISION,
+    observations INTEGER NOT NULL DEFAULT 1,
+    is_open BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT valid_interval_entity_type CHECK (entity_type IN ('flight', 'atc')),
+    CONSTRAINT valid_interval_range CHECK (interval_end >= interval_start)
+);
+
+-- One row per observation (several transceivers of a callsign on one frequency count once)
+CREATE TEMP TABLE frequency_observations ON COMMIT DROP AS
+SELECT DISTINCT ON (entity_type, callsign, frequency, entity_id, "timestamp")
+       entity_type, callsign, frequency, entity_id, "timestamp", position_lat, position_lon
+FROM transceivers
+WHERE frequency > 0
+ORDER BY entity_type, callsign, frequency, entity_id, "timestamp", transceiver_id DESC;
+
+INSERT INTO frequency_intervals (
+    entity_type, callsign, entity_id, frequency, interval_start, interval_end,
+    position_lat, position_lon, observations, is_open
+)
+SELECT entity_type, callsign, entity_id, frequency, MIN("timestamp"), MAX("timestamp"),
+       (ARRAY_AGG(position_lat ORDER BY "timestamp" DESC))[1],
+       (ARRAY_AGG(position_lon ORDER BY "timestamp" DESC))[1],
+       COUNT(*), FALSE
+FROM (
+    SELECT *, SUM(new_interval) OVER (
+               PARTITION BY entity_type, callsign, frequency, entity_id ORDER BY "timestamp"
+           ) AS interval_number
+    FROM (
+        SELECT *,
+               CASE WHEN "timestamp" - LAG("timestamp") OVER (
+                        PARTITION BY entity_type, callsign, frequency, entity_id ORDER BY "timestamp"
+                    ) <= INTERVAL '180 seconds'
+                    THEN 0 ELSE 1 END AS new_interval
+        FROM frequency_observations
+    ) AS flagged
+) AS numbered
+GROUP BY entity_type, callsign, frequency, entity_id, interval_number;
+
+COMMIT;
+
+CREATE INDEX IF NOT EXISTS idx_frequency_intervals_frequency_active ON frequency_intervals USING GIST (frequency, active_during);
+CREATE INDEX IF NOT EXISTS idx_frequency_intervals_callsign_start ON frequency_intervals(entity_type, callsign, interval_start);
+CREATE INDEX IF NOT EXISTS idx_frequency_intervals_entity_id ON frequency_intervals(entity_id);
+CREATE INDEX IF NOT EXISTS idx_frequency_intervals_open ON frequency_intervals(is_open) WHERE is_open;
+
+ANALYZE frequency_intervals;
+
+-- Verify
+SELECT
+    (SELECT COUNT(*) FROM transceivers) AS transceiver_rows,
+    (SELECT COUNT(*) FROM frequency_intervals) AS frequency_intervals,
+    (SELECT COUNT(*) FROM frequency_intervals WHERE entity_type = 'atc') AS atc_intervals;
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Bulk Ingestion Benchmark Script
+
+Compares rows/second for the per-poll ingest writes using the asyncpg COPY
+path against the original ORM add_all path. Synthetic flights, controllers and
+transceivers are written inside a transaction that is rolled back, so the
+benchmark leaves no data behind.
+
+Usage:
+    python scripts/benchmark_bulk_ingestion.py [--flights N] [--controllers N] [--transceivers N] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+
+# Add the app directory to the Python path
+sys.path.insert(0, "/app")
+
+from app.database import get_database_session
+from app.models import Flight, Controller, Transceiver
+from app.services.bulk_writer import BulkWriter
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def build_flight_rows(count: int):
+    """Build synthetic flight rows matching DataService._process_flights."""
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return [{
+        "callsign": f"BENCH{i:05d}",
+        "name": "Benchmark Pilot",
+        "aircraft_type": "B738",
+        "departure": "YSSY",
+        "arrival": "YMML",
+        "route": "DCT",
+        "altitude": 35000,
+        "latitude": -33.9 + (i % 100) * 0.01,
+        "longitude": 151.2 - (i % 100) * 0.01,
+        "groundspeed": 450,
+        "heading": 210,
+        "cid": 9000000 + i,
+        "server": "BENCH",
+        "pilot_rating": 0,
+        "military_rating": 0,
+        "transponder": "2000",
+        "logon_time": now,
+        "last_updated_api": now,
+        "flight_rules": "I",
+        "aircraft_faa": "B738/L",
+        "alternate": "YSCB",
+        "cruise_tas": "450",
+        "planned_altitude": "35000",
+        "deptime": "0100",
+        "enroute_time": "0120",
+        "fuel_time": "0300",
+        "remarks": "BENCHMARK"
+    } for i in range(count)]
+
+
+def build_controller_rows(count: int):
+    """Build synthetic controller rows matching DataService._process_controllers."""
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return [{
+        "callsign": f"BENCH_{i:04d}_CTR",
+        "frequency": "124.550",
+        "cid": 8000000 + i,
+        "name": "Benchmark Controller",
+        "rating": 5,
+        "facility": 6,
+        "visual_range": 400,
+        "text_atis": None,
+        "server": "BENCH",
+        "last_updated": now,
+        "logon_time": now
+    } for i in range(count)]
+
+
+def build_transceiver_rows(count: int):
+    """Build synthetic transceiver rows matching DataService._process_transceivers."""
+    now = datetime.now(timezone.utc)
+    return [{
+        "callsign": f"BENCH{i:05d}",
+        "transceiver_id": 0,
+        "frequency": 124550000,
+        "position_lat": -33.9 + (i % 100) * 0.01,
+        "position_lon": 151.2 - (i % 100) * 0.01,
+        "height_msl": 10668.0,
+        "height_agl": 10600.0,
+        "entity_type": "flight",
+        "entity_id": None,
+        "timestamp": now
+    } for i in range(count)]
+
+
+async def run_round(writer: BulkWriter, datasets) -> float:
+    """Write every dataset in one rolled-back transaction and return elapsed seconds."""
+    async with get_database_session() as session:
+        start_time = time.perf_counter()
+        for model, rows in datasets:
+            await writer.write_rows(session, model, rows)
+        await session.flush()
+        elapsed = time.perf_counter() - start_time
+        await session.rollback()
+    return elapsed
+
+
+async def benchmark(flights: int, controllers: int, transceivers: int, rounds: int):
+    """Run the COPY vs ORM comparison."""
+    datasets = [
+        (Flight, build_flight_rows(flights)),
+        (Controller, build_controller_rows(controllers)),
+        (Transceiver, build_transceiver_rows(transceivers))
+    ]
+    total_rows = flights + controllers + transceivers
+
+    logger.info(f"Benchmarking {total_rows} rows per poll ({flights} flights, {controllers} controllers, {transceivers} transceivers) over {rounds} rounds")
+
+    results = {}
+    for mode in ("orm", "copy"):
+        writer = BulkWriter(mode=mode)
+        # Warm-up round so connection setup is not measured
+        await run_round(writer, datasets)
+        timings = [await run_round(writer, datasets) for _ in range(rounds)]
+        average = sum(timings) / len(timings)
+        results[mode] = average
+        logger.info(f"{mode.upper():>4}: {average:.3f}s per poll, {total_rows / average:,.0f} rows/sec")
+
+    if results["copy"] > 0:
+        logger.info(f"COPY speedup over ORM: {results['orm'] / results['copy']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark COPY vs ORM ingest writes")
+    parser.add_argument("--flights", type=int, default=2000)
+    parser.add_argument("--controllers", type=int, default=200)
+    parser.add_argument("--transceivers", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.flights, args.controllers, args.transceivers, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Entity Records Benchmark Script
+
+Compares the memory and latency of turning one VATSIM snapshot into rows ready
+for the bulk writer: the previous pipeline (a dictionary per entity from the
+parser, copied into a second row dictionary by DataService) against the slot
+records in app.records (one record per entity from parse to write).
+
+The snapshot is read from a directory holding a recorded vatsim-data.json and
+transceivers-data.json; --record downloads the current feeds into it first.
+Both pipelines start from the same decoded JSON and use the same filters, so
+only the parse and prepare stages are measured. No database is needed.
+
+Usage:
+    python scripts/benchmark_entity_records.py SNAPSHOT_DIR [--record] [--rounds N]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+# Add the app directory to the Python path
+sys.path.insert(0, "/app")
+
+from app.config import get_config
+from app.services.data_service import DataService
+from app.services.vatsim_service import VATSIMService
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "vatsim-data.json"
+TRANSCEIVERS_FILE = "transceivers-data.json"
+
+
+def _timestamp(value):
+    """Parse an API timestamp the way the parser does."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(microsecond=0)
+    except ValueError:
+        return None
+
+
+def legacy_flights(pilots):
+    """Previous pipeline: parsed flight dictionary, then a row dictionary copied from it."""
+    parsed = []
+    for pilot in pilots:
+        flight_plan = pilot.get("flight_plan") or {}
+        position = None
+        if pilot.get("latitude") and pilot.get("longitude"):
+            position = {"lat": float(pilot["latitude"]), "lng": float(pilot["longitude"])}
+        parsed.append({
+            "callsign": pilot.get("callsign", ""), "pilot_name": pilot.get("name", ""),
+            "aircraft_type": flight_plan.get("aircraft_short", ""), "departure": flight_plan.get("departure", ""),
+            "arrival": flight_plan.get("arrival", ""), "route": flight_plan.get("route", ""),
+            "altitude": int(pilot.get("altitude", 0)), "position": position, "cid": pilot.get("cid"),
+            "name": pilot.get("name"), "server": pilot.get("server"), "pilot_rating": pilot.get("pilot_rating"),
+            "military_rating": pilot.get("military_rating"), "latitude": pilot.get("latitude"),
+            "longitude": pilot.get("longitude"), "groundspeed": pilot.get("groundspeed"),
+            "transponder": pilot.get("transponder"), "heading": pilot.get("heading"),
+            "logon_time": _timestamp(pilot.get("logon_time")), "last_updated": _timestamp(pilot.get("last_updated")),
+            "flight_rules": flight_plan.get("flight_rules"), "aircraft_faa": flight_plan.get("aircraft_faa"),
+            "aircraft_short": flight_plan.get("aircraft_short"), "alternate": flight_plan.get("alternate"),
+            "cruise_tas": flight_plan.get("cruise_tas"), "planned_altitude": flight_plan.get("altitude"),
+            "deptime": flight_plan.get("deptime"), "enroute_time": flight_plan.get("enroute_time"),
+            "fuel_time": flight_plan.get("fuel_time"), "remarks": flight_plan.get("remarks")
+        })
+    columns = ("callsign", "name", "aircraft_type", "departure", "arrival", "route", "altitude", "latitude",
+               "longitude", "groundspeed", "heading", "cid", "server", "pilot_rating", "military_rating",
+               "transponder", "logon_time", "flight_rules", "aircraft_faa", "alternate", "cruise_tas",
+               "planned_altitude", "deptime", "enroute_time", "fuel_time", "remarks")
+    rows = []
+    for flight in parsed:
+        if not flight.get("departure") or not flight.get("arrival"):
+            continue
+        row = {column: flight.get(column) for column in columns}
+        row["last_updated_api"] = flight.get("last_updated")
+        rows.append(row)
+    return rows
+
+
+def legacy_controllers(controllers):
+    """Previous pipeline for controllers."""
+    columns = ("callsign", "frequency", "cid", "name", "rating", "facility", "visual_range", "text_atis", "server")
+    parsed = [{
+        **{column: controller.get(column) for column in columns},
+        "last_updated": _timestamp(controller.get("last_updated")),
+        "logon_time": _timestamp(controller.get("logon_time"))
+    } for controller in controllers]
+    return [dict(controller) for controller in parsed]
+
+
+def legacy_transceivers(entries):
+    """Previous pipeline for transceivers."""
+    parsed = [{
+        "callsign": entry.get("callsign", ""), "transceiver_id": item.get("id", 0),
+        "frequency": item.get("frequency", 0), "position_lat": item.get("latDeg"),
+        "position_lon": item.get("lonDeg"), "height_msl": item.get("heightMslM"),
+        "height_agl": item.get("heightAglM"), "entity_type": "flight", "timestamp": None
+    } for entry in entries for item in entry.get("transceivers", [])]
+    now = datetime.now(timezone.utc)
+    return [{**transceiver, "entity_id": None, "timestamp": now} for transceiver in parsed]
+
+
+def run_legacy(data_service: DataService, raw_data, raw_transceivers):
+    """Previous dictionary pipeline, with the same filters as DataService."""
+    flights = legacy_flights(raw_data.get("pilots", []))
+    if data_service.geographic_boundary_filter.config.enabled:
+        flights = data_service.geographic_boundary_filter.filter_flights_list(flights)
+    controllers = legacy_controllers(raw_data.get("controllers", []))
+    if data_service.controller_callsign_filter.config.enabled:
+        controllers = data_service.controller_callsign_filter.filter_controllers_list(controllers)
+    transceivers = legacy_transceivers(raw_transceivers)
+    if data_service.geographic_boundary_filter.config.enabled:
+        transceivers = data_service.geographic_boundary_filter.filter_transceivers_list(transceivers)
+    transceivers = data_service.frequency_pattern_filter.filter_transceivers_list(transceivers)
+    return flights, controllers, transceivers
+
+
+def run_records(vatsim_service: VATSIMService, data_service: DataService, raw_data, raw_transceivers):
+    """Current pipeline: VATSIMService parsers and DataService prepare stages."""
+    flights = vatsim_service._parse_flights(raw_data.get("pilots", []))
+    controllers = vatsim_service._parse_controllers(raw_data.get("controllers", []))
+    transceivers = vatsim_service._parse_transceivers(raw_transceivers)
+    return (
+        data_service._prepare_flight_rows(flights),
+        data_service._prepare_controller_rows(controllers),
+        data_service._prepare_transceiver_rows(transceivers)
+    )
+
+
+def measure(name, pipeline, rounds: int):
+    """Report latency over rounds, then retained and peak memory of one run."""
+    pipeline()  # Warm-up
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        pipeline()
+        timings.append(time.perf_counter() - start_time)
+
+    gc.collect()
+    tracemalloc.start()
+    result = pipeline()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rows = sum(len(rows) for rows in result)
+    average = sum(timings) / len(timings)
+    logger.info(f"{name:>8}: {average * 1000:.1f} ms per snapshot (best {min(timings) * 1000:.1f} ms), "
+                f"{retained / 1024 / 1024:.2f} MiB retained ({retained / max(rows, 1):.0f} B/row), "
+                f"{peak / 1024 / 1024:.2f} MiB peak, {rows} rows")
+    return average, retained
+
+
+def record_snapshot(snapshot_dir: Path) -> None:
+    """Download the current data and transceivers feeds into snapshot_dir."""
+    config = get_config().vatsim
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    with httpx.Client(timeout=config.timeout) as client:
+        for url, file_name in ((config.api_url, DATA_FILE), (config.transceivers_api_url, TRANSCEIVERS_FILE)):
+            response = client.get(url)
+            response.raise_for_status()
+            (snapshot_dir / file_name).write_bytes(response.content)
+            logger.info(f"Recorded {url} ({len(response.content):,} bytes)")
+
+
+def benchmark(snapshot_dir: Path, rounds: int):
+    """Run the dictionary vs record comparison."""
+    raw_data = json.loads((snapshot_dir / DATA_FILE).read_bytes())
+    raw_transceivers = json.loads((snapshot_dir / TRANSCEIVERS_FILE).read_bytes())
+    logger.info(f"Snapshot {raw_data.get('general', {}).get('update_timestamp')}: "
+                f"{len(raw_data.get('pilots', []))} pilots, {len(raw_data.get('controllers', []))} controllers, "
+                f"{sum(len(entry.get('transceivers', [])) for entry in raw_transceivers)} transceivers")
+
+    vatsim_service = VATSIMService()
+    data_service = DataService()
+    data_service.logger.setLevel(logging.WARNING)
+
+    legacy_time, legacy_memory = measure("dicts", lambda: run_legacy(data_service, raw_data, raw_transceivers), rounds)
+    records_time, records_memory = measure(
+        "records", lambda: run_records(vatsim_service, data_service, raw_data, raw_transceivers), rounds
+    )
+
+    if records_time > 0 and records_memory > 0:
+        logger.info(f"Records: {legacy_time / records_time:.2f}x faster, {legacy_memory / records_memory:.2f}x less memory retained")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark slot records vs dictionaries for parsed VATSIM entities")
+    parser.add_argument("snapshot_dir", type=Path, help=f"Directory with {DATA_FILE} and {TRANSCEIVERS_FILE}")
+    parser.add_argument("--record", action="store_true", help="Download the current feeds into snapshot_dir first")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.record:
+        record_snapshot(args.snapshot_dir)
+    benchmark(args.snapshot_dir, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
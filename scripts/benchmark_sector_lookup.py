@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Sector Lookup Benchmark Script
+
+Compares three ways of finding the sector for each flight position using the
+real australian_airspace_sectors.geojson:
+
+- linear scan: Point + polygon.contains over every sector (original behaviour)
+- indexed: SectorLoader.get_sector_for_point (STRtree + prepared polygons)
+- batch: SectorLoader.get_sectors_for_points (shapely.contains_xy over NumPy arrays)
+
+All three must agree on every point.
+
+Usage:
+    python scripts/benchmark_sector_lookup.py [--sectors-file PATH] [--points N] [--rounds N]
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import numpy as np
+from shapely.geometry import Point
+
+# Add the app directory to the Python path
+sys.path.insert(0, "/app")
+
+from app.utils.sector_loader import SectorLoader
+
+# Configure logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def linear_scan(loader: SectorLoader, lat: float, lon: float):
+    """Original lookup: test every sector polygon in order."""
+    point = Point(lon, lat)
+    for sector_name, polygon in loader.sectors.items():
+        if polygon.contains(point):
+            return sector_name
+    return None
+
+
+def time_call(func, rounds: int) -> float:
+    """Return the best wall time of several rounds."""
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sector lookup strategies")
+    parser.add_argument("--sectors-file", default="airspace_sector_data/australian_airspace_sectors.geojson")
+    parser.add_argument("--points", type=int, default=2000, help="Flight positions per poll")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    loader = SectorLoader(args.sectors_file)
+    loader.load_sectors()
+
+    # Random positions over the bounding box of all sectors
+    rng = np.random.default_rng(42)
+    min_lon, min_lat, max_lon, max_lat = np.array([polygon.bounds for polygon in loader.sectors.values()]).T
+    lats = rng.uniform(min_lat.min(), max_lat.max(), args.points)
+    lons = rng.uniform(min_lon.min(), max_lon.max(), args.points)
+
+    linear_result = [linear_scan(loader, lat, lon) for lat, lon in zip(lats, lons)]
+    indexed_result = [loader.get_sector_for_point(lat, lon) for lat, lon in zip(lats, lons)]
+    batch_result = loader.get_sectors_for_points(lats, lons)
+
+    if not (linear_result == indexed_result == batch_result):
+        print("❌ Lookup strategies disagree - aborting benchmark")
+        sys.exit(1)
+
+    linear_time = time_call(lambda: [linear_scan(loader, lat, lon) for lat, lon in zip(lats, lons)], args.rounds)
+    indexed_time = time_call(lambda: [loader.get_sector_for_point(lat, lon) for lat, lon in zip(lats, lons)], args.rounds)
+    batch_time = time_call(lambda: loader.get_sectors_for_points(lats, lons), args.rounds)
+
+    matched = sum(1 for sector in linear_result if sector is not None)
+    print(f"📊 {loader.get_sector_count()} sectors, {args.points} points ({matched} inside a sector), best of {args.rounds} rounds")
+    print(f"   Linear scan:   {linear_time * 1000:8.2f} ms  ({args.points / linear_time:,.0f} points/sec)")
+    print(f"   STRtree:       {indexed_time * 1000:8.2f} ms  ({args.points / indexed_time:,.0f} points/sec, {linear_time / indexed_time:.1f}x)")
+    print(f"   Batch (numpy): {batch_time * 1000:8.2f} ms  ({args.points / batch_time:,.0f} points/sec, {linear_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
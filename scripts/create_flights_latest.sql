@@ -0,0 +1,56 @@
+-- Migration Script: Add the flights_latest table
+-- Run this script on existing databases created before flights_latest existed
+--
+-- flights_latest holds one row per callsign (its most recent flight record) and is
+-- upserted by the ingest loop on every poll. /api/flights and stale sector cleanup
+-- read it instead of running DISTINCT ON (callsign) over the flights history.
+--
+-- The table is backfilled from the last 24 hours of flights, which is as long as
+-- the app keeps callsigns that are no longer online.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS flights_latest (
+    callsign VARCHAR(50) PRIMARY KEY,
+    cid INTEGER,
+    name VARCHAR(100),
+    server VARCHAR(50),
+    pilot_rating INTEGER,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    altitude INTEGER,
+    groundspeed INTEGER,
+    heading INTEGER,
+    transponder VARCHAR(10),
+    departure VARCHAR(10),
+    arrival VARCHAR(10),
+    aircraft_type VARCHAR(20),
+    flight_rules VARCHAR(10),
+    planned_altitude VARCHAR(10),
+    logon_time TIMESTAMP(0) WITH TIME ZONE,
+    last_updated TIMESTAMP(0) WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_flights_latest_last_updated ON flights_latest(last_updated);
+
+-- Backfill the most recent record of each callsign
+INSERT INTO flights_latest (
+    callsign, cid, name, server, pilot_rating, latitude, longitude, altitude,
+    groundspeed, heading, transponder, departure, arrival, aircraft_type,
+    flight_rules, planned_altitude, logon_time, last_updated
+)
+SELECT DISTINCT ON (callsign)
+    callsign, cid, name, server, pilot_rating, latitude, longitude, altitude,
+    groundspeed, heading, transponder, departure, arrival, aircraft_type,
+    flight_rules, planned_altitude, logon_time, last_updated
+FROM flights
+WHERE last_updated >= NOW() - INTERVAL '24 hours'
+ORDER BY callsign, last_updated DESC
+ON CONFLICT (callsign) DO NOTHING;
+
+COMMIT;
+
+ANALYZE flights_latest;
+
+-- Verify
+SELECT COUNT(*) AS callsigns, MAX(last_updated) AS latest_update FROM flights_latest;
@@ -0,0 +1,141 @@
+-- Migration Script: Convert flights and flights_archive to daily range-partitioned tables
+-- Run this script on existing databases created before flight partitioning
+--
+-- Each table is renamed to <table>_unpartitioned and a table with the same columns,
+-- defaults, CHECK constraints and compression is created, partitioned by day on
+-- last_updated (<table>_pYYYYMMDD). Partitions are created for every day that has
+-- data plus the next 3 days, all rows are copied across, and the indexes and
+-- updated_at triggers are recreated on the partitioned parents.
+--
+-- Afterwards retention removes whole flights_archive partitions (FLIGHT_RETENTION_HOURS,
+-- PARTITION_EXPIRY_ACTION) instead of DELETE + VACUUM. flights partitions are not
+-- expired; summarised flights are archived and deleted from them by the summary job.
+--
+-- Stop the application before running. The old tables are kept for verification;
+-- drop them manually once the row counts below match:
+--   DROP TABLE flights_unpartitioned;
+--   DROP TABLE flights_archive_unpartitioned;
+
+BEGIN;
+
+-- Daily partition helper (same as config/init.sql, for databases created before it existed)
+CREATE OR REPLACE FUNCTION create_daily_partitions(
+    parent TEXT, first_day DATE, last_day DATE,
+    list_column TEXT DEFAULT NULL, list_values TEXT[] DEFAULT NULL
+)
+RETURNS VOID AS $$
+DECLARE
+    partition_day DATE := first_day;
+    partition_name TEXT;
+    list_value TEXT;
+BEGIN
+    WHILE partition_day <= last_day LOOP
+        partition_name := parent || '_p' || to_char(partition_day, 'YYYYMMDD');
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)%s',
+            partition_name, parent,
+            partition_day::timestamp AT TIME ZONE 'UTC', (partition_day + 1)::timestamp AT TIME ZONE 'UTC',
+            CASE WHEN list_column IS NULL THEN '' ELSE format(' PARTITION BY LIST (%I)', list_column) END
+        );
+        IF list_column IS NOT NULL THEN
+            FOREACH list_value IN ARRAY list_values LOOP
+                EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES IN (%L)',
+                    partition_name || '_' || list_value, partition_name, list_value);
+            END LOOP;
+        END IF;
+        partition_day := partition_day + 1;
+    END LOOP;
+END;
+$$ language 'plpgsql';
+
+-- Convert one table: rename, recreate partitioned by day on last_updated, copy rows
+CREATE FUNCTION pg_temp.convert_to_daily_partitions(target TEXT)
+RETURNS VOID AS $$
+DECLARE
+    old_table TEXT := target || '_unpartitioned';
+    index_name TEXT;
+    first_day DATE;
+BEGIN
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', target, old_table);
+    EXECUTE format('ALTER TABLE %I RENAME CONSTRAINT %I TO %I', old_table, target || '_pkey', old_table || '_pkey');
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'update_' || target || '_updated_at', old_table);
+
+    -- Free the index names for the partitioned table
+    FOR index_name IN
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = 'public' AND tablename = old_table AND indexname <> old_table || '_pkey'
+    LOOP
+        EXECUTE format('DROP INDEX %I', index_name);
+    END LOOP;
+
+    -- The partition key must not be NULL
+    EXECUTE format('UPDATE %I SET last_updated = COALESCE(created_at, NOW()) WHERE last_updated IS NULL', old_table);
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMPRESSION) PARTITION BY RANGE (last_updated)',
+        target, old_table
+    );
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN last_updated SET NOT NULL', target);
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN last_updated SET DEFAULT NOW()', target);
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, last_updated)', target);
+    EXECUTE format('ALTER SEQUENCE %I OWNED BY %I.id', target || '_id_seq', target);
+
+    EXECUTE format('SELECT (MIN(last_updated) AT TIME ZONE ''UTC'')::date FROM %I', old_table) INTO first_day;
+    PERFORM create_daily_partitions(
+        target,
+        COALESCE(first_day, (NOW() AT TIME ZONE 'UTC')::date),
+        (NOW() AT TIME ZONE 'UTC')::date + 3
+    );
+
+    EXECUTE format('INSERT INTO %I SELECT * FROM %I', target, old_table);
+
+    EXECUTE format(
+        'CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()',
+        'update_' || target || '_updated_at', target
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT pg_temp.convert_to_daily_partitions('flights');
+SELECT pg_temp.convert_to_daily_partitions('flights_archive');
+
+-- Flights indexes (same as config/init.sql)
+CREATE INDEX IF NOT EXISTS idx_flights_callsign ON flights(callsign);
+CREATE INDEX IF NOT EXISTS idx_flights_callsign_status ON flights(callsign, last_updated);
+CREATE INDEX IF NOT EXISTS idx_flights_position ON flights USING brin(latitude, longitude);
+CREATE INDEX IF NOT EXISTS idx_flights_departure_arrival ON flights(departure, arrival);
+CREATE INDEX IF NOT EXISTS idx_flights_cid_server ON flights(cid, server);
+CREATE INDEX IF NOT EXISTS idx_flights_aircraft_short ON flights(aircraft_short);
+CREATE INDEX IF NOT EXISTS idx_flights_revision_id ON flights(revision_id);
+CREATE INDEX IF NOT EXISTS idx_flights_callsign_departure_arrival ON flights(callsign, departure, arrival);
+CREATE INDEX IF NOT EXISTS idx_flights_callsign_logon ON flights(callsign, logon_time);
+CREATE INDEX IF NOT EXISTS idx_flights_altitude ON flights(altitude);
+CREATE INDEX IF NOT EXISTS idx_flights_flight_rules ON flights(flight_rules);
+CREATE INDEX IF NOT EXISTS idx_flights_planned_altitude ON flights(planned_altitude);
+
+-- Flights archive indexes (same as config/init.sql)
+CREATE INDEX IF NOT EXISTS idx_flights_archive_callsign ON flights_archive(callsign);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_logon_time ON flights_archive(logon_time);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_last_updated ON flights_archive(last_updated);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_deptime ON flights_archive(deptime);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_controller_callsigns ON flights_archive USING GIN(controller_callsigns);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_controller_time ON flights_archive(controller_time_percentage);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_primary_sector ON flights_archive(primary_enroute_sector);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_sector_breakdown ON flights_archive USING GIN(sector_breakdown);
+CREATE INDEX IF NOT EXISTS idx_flights_archive_completion_time ON flights_archive(completion_time);
+
+COMMIT;
+
+ANALYZE flights;
+ANALYZE flights_archive;
+
+-- Verify the row counts match
+SELECT 'flights' AS table_name,
+    (SELECT COUNT(*) FROM flights_unpartitioned) AS unpartitioned_rows,
+    (SELECT COUNT(*) FROM flights) AS partitioned_rows,
+    (SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'flights'::regclass) AS daily_partitions
+UNION ALL
+SELECT 'flights_archive',
+    (SELECT COUNT(*) FROM flights_archive_unpartitioned),
+    (SELECT COUNT(*) FROM flights_archive),
+    (SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'flights_archive'::regclass);
@@ -0,0 +1,105 @@
+-- Migration Script: Convert transceivers to a daily range-partitioned table
+-- Run this script on existing databases created before transceiver partitioning
+--
+-- The existing table is renamed to transceivers_unpartitioned, a partitioned
+-- transceivers table is created (daily RANGE partitions on "timestamp", each LIST
+-- partitioned by entity_type), partitions are created for every day that has data
+-- plus the next 3 days, and all rows are copied across.
+--
+-- Stop the application before running. The old table is kept for verification;
+-- drop it manually once the row counts below match:
+--   DROP TABLE transceivers_unpartitioned;
+
+BEGIN;
+
+-- Move the old table (and its primary key / index names) out of the way
+ALTER TABLE transceivers RENAME TO transceivers_unpartitioned;
+ALTER TABLE transceivers_unpartitioned RENAME CONSTRAINT transceivers_pkey TO transceivers_unpartitioned_pkey;
+DROP TRIGGER IF EXISTS update_transceivers_updated_at ON transceivers_unpartitioned;
+DROP INDEX IF EXISTS idx_transceivers_callsign;
+DROP INDEX IF EXISTS idx_transceivers_callsign_timestamp;
+DROP INDEX IF EXISTS idx_transceivers_frequency;
+DROP INDEX IF EXISTS idx_transceivers_entity;
+DROP INDEX IF EXISTS idx_transceivers_entity_type_callsign;
+DROP INDEX IF EXISTS idx_transceivers_entity_type_timestamp;
+DROP INDEX IF EXISTS idx_transceivers_atc_detection;
+DROP INDEX IF EXISTS idx_transceivers_atc_simple;
+DROP INDEX IF EXISTS idx_transceivers_flight_frequency_callsign;
+DROP INDEX IF EXISTS idx_transceivers_atc_join;
+DROP INDEX IF EXISTS idx_transceivers_atc_performance;
+
+-- Partitioned table, reusing the existing id sequence
+CREATE TABLE transceivers (
+    id INTEGER NOT NULL DEFAULT nextval('transceivers_id_seq'),
+    callsign VARCHAR(50) NOT NULL,
+    transceiver_id INTEGER NOT NULL,
+    frequency BIGINT NOT NULL,
+    position_lat DOUBLE PRECISION,
+    position_lon DOUBLE PRECISION,
+    height_msl DOUBLE PRECISION,
+    height_agl DOUBLE PRECISION,
+    entity_type VARCHAR(20) NOT NULL,
+    entity_id INTEGER,
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (id, "timestamp"),
+    CONSTRAINT valid_frequency CHECK (frequency >= 0),
+    CONSTRAINT valid_entity_type CHECK (entity_type IN ('flight', 'atc'))
+) PARTITION BY RANGE ("timestamp");
+
+ALTER SEQUENCE transceivers_id_seq OWNED BY transceivers.id;
+
+-- Daily partitions from the oldest row up to 3 days ahead (UTC)
+DO $$
+DECLARE
+    first_day DATE;
+    last_day DATE;
+    partition_day DATE;
+    partition_name TEXT;
+BEGIN
+    SELECT COALESCE(MIN("timestamp" AT TIME ZONE 'UTC')::date, (NOW() AT TIME ZONE 'UTC')::date)
+    INTO first_day
+    FROM transceivers_unpartitioned;
+    last_day := (NOW() AT TIME ZONE 'UTC')::date + 3;
+
+    partition_day := first_day;
+    WHILE partition_day <= last_day LOOP
+        partition_name := 'transceivers_p' || to_char(partition_day, 'YYYYMMDD');
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF transceivers FOR VALUES FROM (%L) TO (%L) PARTITION BY LIST (entity_type)',
+            partition_name, partition_day::timestamp AT TIME ZONE 'UTC', (partition_day + 1)::timestamp AT TIME ZONE 'UTC'
+        );
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES IN (''flight'')', partition_name || '_flight', partition_name);
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES IN (''atc'')', partition_name || '_atc', partition_name);
+        partition_day := partition_day + 1;
+    END LOOP;
+END $$;
+
+-- Copy the data (rows are routed to their daily partitions)
+INSERT INTO transceivers (
+    id, callsign, transceiver_id, frequency, position_lat, position_lon,
+    height_msl, height_agl, entity_type, entity_id, "timestamp", updated_at
+)
+SELECT
+    id, callsign, transceiver_id, frequency, position_lat, position_lon,
+    height_msl, height_agl, entity_type, entity_id, "timestamp", updated_at
+FROM transceivers_unpartitioned;
+
+-- Indexes on the partitioned parent (inherited by every partition)
+CREATE INDEX IF NOT EXISTS idx_transceivers_callsign_timestamp ON transceivers(callsign, "timestamp");
+CREATE INDEX IF NOT EXISTS idx_transceivers_timestamp ON transceivers("timestamp");
+CREATE INDEX IF NOT EXISTS idx_transceivers_frequency_callsign ON transceivers(frequency, callsign);
+
+CREATE TRIGGER update_transceivers_updated_at
+    BEFORE UPDATE ON transceivers
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+COMMIT;
+
+ANALYZE transceivers;
+
+-- Verify the row counts match
+SELECT
+    (SELECT COUNT(*) FROM transceivers_unpartitioned) AS unpartitioned_rows,
+    (SELECT COUNT(*) FROM transceivers) AS partitioned_rows,
+    (SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'transceivers'::regclass) AS daily_partitions;
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ATC detection context and its TTL/LRU cache.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.atc_detection_service import ATCDetectionService
+from app.utils.ttl_cache import TTLCache
+
+LOGON = datetime(2025, 8, 1, 12, 0, tzinfo=timezone.utc)
+COMPLETION = LOGON + timedelta(hours=2)
+
+
+def _session_returning(completion_time, record_count):
+    """Create a fake get_database_session whose session answers the context query."""
+    row = MagicMock(completion_time=completion_time, record_count=record_count)
+    result = MagicMock()
+    result.fetchone.return_value = row
+    result.fetchall.return_value = []
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    return fake_session, session
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted once full."""
+        cache = TTLCache(maxsize=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expiry(self):
+        """Entries are dropped after their TTL."""
+        cache = TTLCache(maxsize=10, ttl_seconds=30)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=1000.0):
+            cache.set("a", 1)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=1029.0):
+            assert cache.get("a") == 1
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=1031.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+@pytest.mark.unit
+class TestATCDetectionContext:
+    """Test cases for the per-detection context."""
+
+    @pytest.mark.asyncio
+    async def test_detection_looks_up_context_once(self):
+        """One detection issues a single context query shared by both transceiver loads."""
+        fake_session, session = _session_returning(COMPLETION, 120)
+        service = ATCDetectionService()
+
+        with patch("app.services.atc_detection_service.get_database_session", fake_session):
+            await service._detect_flight_atc_interactions_internal("QFA1", "YSSY", "YMML", LOGON)
+
+        statements = [str(call.args[0]) for call in session.execute.await_args_list]
+        assert sum("flight_summaries" in statement for statement in statements) == 1
+        assert not any("SELECT COUNT(*) as record_count" in statement for statement in statements)
+        # Both transceiver loads use the completion time as the window end
+        window_ends = [call.args[1].get("flight_end") or call.args[1].get("atc_end") for call in session.execute.await_args_list[1:]]
+        assert window_ends and all(end == COMPLETION for end in window_ends)
+
+    @pytest.mark.asyncio
+    async def test_completed_flight_context_is_cached(self):
+        """Rerunning detection for a completed flight does not re-query its context."""
+        fake_session, session = _session_returning(COMPLETION, 120)
+        service = ATCDetectionService()
+
+        with patch("app.services.atc_detection_service.get_database_session", fake_session):
+            first = await service._get_detection_context("QFA1", "YSSY", "YMML", LOGON)
+            second = await service._get_detection_context("QFA1", "YSSY", "YMML", LOGON)
+
+        assert session.execute.await_count == 1
+        assert second is first
+        assert first.total_records == 120
+        assert first.window_end == COMPLETION
+
+    @pytest.mark.asyncio
+    async def test_active_flight_context_is_not_cached(self):
+        """Active flights are looked up every time because their window keeps growing."""
+        fake_session, session = _session_returning(None, 10)
+        service = ATCDetectionService()
+
+        with patch("app.services.atc_detection_service.get_database_session", fake_session):
+            context = await service._get_detection_context("QFA1", "YSSY", "YMML", LOGON)
+            await service._get_detection_context("QFA1", "YSSY", "YMML", LOGON)
+
+        assert session.execute.await_count == 2
+        assert len(service.context_cache) == 0
+        assert context.window_end > LOGON
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-process ATC frequency matching engine.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.atc_detection_service import ATCDetectionService
+from app.utils.atc_matching import find_frequency_matches, haversine_nm
+
+START = datetime(2025, 8, 1, 12, 0, tzinfo=timezone.utc)
+PROXIMITY = {"SY_TWR": 15, "ML_APP": 60, "ML-BIK_CTR": 400}
+
+
+def _transceiver(callsign, frequency, minutes, lat, lon):
+    return {
+        "callsign": callsign,
+        "frequency": frequency,
+        "frequency_mhz": frequency / 1000000.0,
+        "timestamp": START + timedelta(minutes=minutes),
+        "position_lat": lat,
+        "position_lon": lon
+    }
+
+
+def _reference_matches(flight_transceivers, atc_transceivers, time_window_seconds):
+    """Nested-loop version of the original SQL join conditions (exact numeric frequency compare)."""
+    matches = []
+    for flight in flight_transceivers:
+        for atc in atc_transceivers:
+            if abs(flight["frequency"] - atc["frequency"]) > 5000:
+                continue
+            time_diff = abs((flight["timestamp"] - atc["timestamp"]).total_seconds())
+            if time_diff > time_window_seconds:
+                continue
+            if flight["position_lat"] is None or atc["position_lat"] is None:
+                continue
+            lat1, lat2 = math.radians(flight["position_lat"]), math.radians(atc["position_lat"])
+            dlon = math.radians(flight["position_lon"] - atc["position_lon"])
+            cos_angle = math.sin(lat1) * math.sin(lat2) + math.cos(lat1) * math.cos(lat2) * math.cos(dlon)
+            if 3440.065 * math.acos(max(-1, min(1, cos_angle))) <= PROXIMITY[atc["callsign"]]:
+                matches.append((flight["timestamp"], atc["timestamp"], atc["callsign"]))
+    return sorted(matches)
+
+
+@pytest.mark.unit
+class TestATCMatching:
+    """Test cases for the sort/sweep matching engine."""
+
+    def test_matches_reference_join(self):
+        """The engine returns exactly the pairs of the nested-loop SQL rules."""
+        rng = random.Random(7)
+        frequencies = [118100000, 118105000, 124550000, 135700000]
+        flights = [
+            _transceiver("QFA1", rng.choice(frequencies), minute, -33.9 + rng.uniform(-3, 3), 151.2 + rng.uniform(-3, 3))
+            for minute in range(120)
+        ]
+        atc = [
+            _transceiver(callsign, rng.choice(frequencies), rng.uniform(0, 120), -33.9 + rng.uniform(-2, 2), 151.2 + rng.uniform(-2, 2))
+            for callsign in PROXIMITY for _ in range(60)
+        ]
+        flights[5]["position_lat"] = None
+
+        matches = find_frequency_matches(flights, atc, 180, PROXIMITY.get)
+
+        assert [(m["flight_time"], m["atc_time"], m["atc_callsign"]) for m in matches] == _reference_matches(flights, atc, 180)
+        assert len(matches) > 0
+
+    def test_match_fields(self):
+        """Matches carry the same fields as the SQL join rows."""
+        flights = [_transceiver("QFA1", 118100000, 0, -33.95, 151.18)]
+        atc = [_transceiver("SY_TWR", 118100000, 2, -33.94, 151.17)]
+
+        [match] = find_frequency_matches(flights, atc, 180, PROXIMITY.get)
+
+        assert match["flight_callsign"] == "QFA1"
+        assert match["atc_callsign"] == "SY_TWR"
+        assert match["frequency_mhz"] == 118.1
+        assert match["time_diff_seconds"] == 120.0
+        assert match["atc_lat"] == -33.94
+
+    def test_proximity_is_per_controller(self):
+        """A tower out of range is dropped while a centre at the same spot matches."""
+        flights = [_transceiver("QFA1", 124550000, 0, -33.9, 151.2)]
+        atc = [
+            _transceiver("SY_TWR", 124550000, 0, -35.0, 151.2),
+            _transceiver("ML-BIK_CTR", 124550000, 0, -35.0, 151.2)
+        ]
+
+        matches = find_frequency_matches(flights, atc, 180, PROXIMITY.get)
+
+        assert [m["atc_callsign"] for m in matches] == ["ML-BIK_CTR"]
+
+    def test_haversine_distance(self):
+        """Sydney to Melbourne is roughly 380nm."""
+        distance = haversine_nm([-33.9461], [151.1772], [-37.6690], [144.8410])[0]
+
+        assert 370 < distance < 395
+
+    @pytest.mark.asyncio
+    async def test_service_matching_issues_no_queries(self, monkeypatch):
+        """ATCDetectionService matches in memory without opening a database session."""
+        def fail_session():
+            raise AssertionError("matching must not query the database")
+
+        monkeypatch.setattr("app.services.atc_detection_service.get_database_session", fail_session)
+        service = ATCDetectionService(time_window_seconds=180)
+        flights = [_transceiver("QFA1", 118100000, 0, -33.95, 151.18)]
+        atc = [_transceiver("SY_TWR", 118100000, 1, -33.94, 151.17)]
+
+        matches = await service._find_frequency_matches(flights, atc, "YSSY", "YMML", START)
+
+        assert len(matches) == 1
+
+
+def _result(rows):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    return result
+
+
+def _row(**fields):
+    row = MagicMock()
+    for name, value in fields.items():
+        setattr(row, name, value)
+    return row
+
+
+def _transceiver_row(transceiver):
+    return _row(**{key: transceiver[key] for key in ("callsign", "frequency", "timestamp", "position_lat", "position_lon")})
+
+
+@pytest.mark.unit
+class TestATCDetectMany:
+    """Test cases for ATCDetectionService.detect_many."""
+
+    @pytest.mark.asyncio
+    async def test_detect_many_loads_once_and_partitions(self, monkeypatch):
+        """All flights are detected from one set of queries, each only seeing its own window and controllers."""
+        qfa = [_transceiver("QFA1", 118100000, minute, -33.95, 151.18) for minute in range(10)]
+        vozz = [_transceiver("VOZ2", 124550000, minute, -37.0, 147.0) for minute in range(30, 40)]
+        tower = [_transceiver("SY_TWR", 118100000, minute, -33.94, 151.17) for minute in range(10)]
+        centre = [_transceiver("ML-BIK_CTR", 124550000, minute, -36.0, 146.0) for minute in range(30, 40)]
+
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            _result([]),  # No completion times yet
+            _result([
+                _row(callsign="QFA1", departure="YSSY", arrival="YMML", logon_time=START, record_count=10),
+                _row(callsign="VOZ2", departure="YMML", arrival="YSSY", logon_time=START + timedelta(minutes=30), record_count=10)
+            ]),
+            _result([_transceiver_row(t) for t in qfa + vozz]),
+            _result([
+                _row(callsign="SY_TWR", last_updated=START + timedelta(minutes=10)),
+                _row(callsign="ML-BIK_CTR", last_updated=START + timedelta(minutes=40))
+            ]),
+            _result([_transceiver_row(t) for t in sorted(tower + centre, key=lambda t: t["timestamp"])])
+        ])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        monkeypatch.setattr("app.services.atc_detection_service.get_database_session", fake_session)
+        service = ATCDetectionService(time_window_seconds=180)
+
+        results = await service.detect_many([
+            {"callsign": "QFA1", "departure": "YSSY", "arrival": "YMML", "logon_time": START},
+            {"callsign": "VOZ2", "departure": "YMML", "arrival": "YSSY", "logon_time": START + timedelta(minutes=30)},
+            {"callsign": "NONE3", "departure": "YBBN", "arrival": "YSSY", "logon_time": START}
+        ])
+
+        assert session.execute.await_count == 5
+        assert list(results[0]["controller_callsigns"]) == ["SY_TWR"]
+        assert list(results[1]["controller_callsigns"]) == ["ML-BIK_CTR"]
+        assert results[0]["total_flight_records"] == 10
+        assert results[2] == service._create_empty_atc_data()
+
+    @pytest.mark.asyncio
+    async def test_detect_many_failure_returns_empty_data(self, monkeypatch):
+        """A failing batch returns empty ATC data for every flight instead of raising."""
+        def broken_session():
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr("app.services.atc_detection_service.get_database_session", broken_session)
+        service = ATCDetectionService()
+
+        results = await service.detect_many([{"callsign": "QFA1", "departure": "YSSY", "arrival": "YMML", "logon_time": START}])
+
+        assert results == [service._create_empty_atc_data()]
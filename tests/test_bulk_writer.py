@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the BulkWriter COPY ingest path and its ORM fallback.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models import Transceiver
+from app.services.bulk_writer import BulkWriter
+
+
+def _make_session(driver_connection):
+    """Create a mock session exposing a raw asyncpg-style driver connection."""
+    session = MagicMock()
+    session.flush = AsyncMock()
+
+    nested = MagicMock()
+    nested.__aenter__ = AsyncMock(return_value=nested)
+    nested.__aexit__ = AsyncMock(return_value=False)
+    session.begin_nested = MagicMock(return_value=nested)
+
+    raw_connection = MagicMock()
+    raw_connection.driver_connection = driver_connection
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=raw_connection)
+    session.connection = AsyncMock(return_value=connection)
+    return session
+
+
+ROWS = [
+    {"callsign": "QFA1", "transceiver_id": 0, "frequency": 124550000, "entity_type": "flight"},
+    {"callsign": "ML-BIK_CTR", "transceiver_id": 1, "frequency": 124550000, "entity_type": "atc"},
+]
+
+
+@pytest.mark.unit
+class TestBulkWriter:
+    """Test cases for BulkWriter."""
+
+    @pytest.mark.asyncio
+    async def test_copy_mode_streams_records(self):
+        """COPY mode sends tuples in column order to copy_records_to_table."""
+        driver = MagicMock()
+        driver.copy_records_to_table = AsyncMock()
+        session = _make_session(driver)
+
+        writer = BulkWriter(mode="copy")
+        written = await writer.write_rows(session, Transceiver, ROWS)
+
+        assert written == 2
+        driver.copy_records_to_table.assert_awaited_once_with(
+            "transceivers",
+            records=[("QFA1", 0, 124550000, "flight"), ("ML-BIK_CTR", 1, 124550000, "atc")],
+            columns=["callsign", "transceiver_id", "frequency", "entity_type"]
+        )
+        session.add_all.assert_not_called()
+        assert writer.get_stats()["copy_writes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_copy_failure_falls_back_to_orm(self):
+        """A failing COPY falls back to add_all within the same session."""
+        driver = MagicMock()
+        driver.copy_records_to_table = AsyncMock(side_effect=RuntimeError("copy unsupported"))
+        session = _make_session(driver)
+
+        writer = BulkWriter(mode="copy")
+        written = await writer.write_rows(session, Transceiver, ROWS)
+
+        assert written == 2
+        session.add_all.assert_called_once()
+        assert all(isinstance(obj, Transceiver) for obj in session.add_all.call_args[0][0])
+        assert writer.get_stats()["copy_fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_orm_mode_uses_add_all(self):
+        """ORM mode keeps the original add_all path."""
+        session = _make_session(MagicMock())
+
+        writer = BulkWriter(mode="orm")
+        written = await writer.write_rows(session, Transceiver, ROWS)
+
+        assert written == 2
+        session.add_all.assert_called_once()
+        session.begin_nested.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_rows_is_noop(self):
+        """No rows means no database work."""
+        session = _make_session(MagicMock())
+
+        assert await BulkWriter(mode="copy").write_rows(session, Transceiver, []) == 0
+        session.connection.assert_not_called()
+
+    def test_invalid_mode_rejected(self):
+        """Unknown write modes raise ValueError."""
+        with pytest.raises(ValueError):
+            BulkWriter(mode="bogus")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the set-based controller lifecycle pipeline (summaries, archive, delete).
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.data_service import DataService
+
+LOGON = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+COMPLETED_CONTROLLERS = [
+    ("SY_TWR", 1001, LOGON, LOGON + timedelta(hours=1), 11),
+    ("ML_APP", 1002, LOGON, LOGON + timedelta(hours=2), 12),
+    ("BN_CTR", 1003, LOGON + timedelta(minutes=30), LOGON + timedelta(hours=3), 13),
+]
+
+
+def _summary(controller_key):
+    return {
+        "callsign": controller_key[0], "cid": controller_key[1], "name": "Test", "controller_session_id": controller_key[4],
+        "session_start_time": controller_key[2],
+        "session_end_time": controller_key[3], "session_duration_minutes": 60, "rating": 5, "facility": 6,
+        "server": "AU", "total_aircraft_handled": 0, "peak_aircraft_count": 0,
+        "hourly_aircraft_breakdown": "{}", "frequencies_used": "[]", "aircraft_details": "[]"
+    }
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    service._identify_completed_controllers = AsyncMock(return_value=COMPLETED_CONTROLLERS)
+    service._build_controller_summary = AsyncMock(side_effect=_summary)
+    return service
+
+
+@pytest.fixture
+def lifecycle_session():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(rowcount=12))
+    session.commit = AsyncMock()
+    nested = MagicMock()
+    nested.__aenter__ = AsyncMock(return_value=nested)
+    nested.__aexit__ = AsyncMock(return_value=False)
+    session.begin_nested = MagicMock(return_value=nested)
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    with patch("app.services.data_service.get_database_session", fake_session):
+        yield session
+
+
+@pytest.mark.unit
+class TestControllerLifecycleBatch:
+    """Test cases for the single-transaction controller lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_one_statement_per_stage_and_one_commit(self, data_service, lifecycle_session):
+        """Summaries, archive and delete each run one statement and commit together."""
+        result = await data_service.process_completed_controllers()
+
+        assert result["status"] == "completed"
+        assert result["summaries_created"] == 3
+        assert result["records_archived"] == 12
+        assert result["records_deleted"] == 12
+
+        statements = [str(call.args[0]) for call in lifecycle_session.execute.await_args_list]
+        assert len(statements) == 3
+        assert "INSERT INTO controller_summaries" in statements[0]
+        assert "INSERT INTO controllers_archive" in statements[1] and "unnest" in statements[1]
+        assert "DELETE FROM controllers c" in statements[2] and "USING" in statements[2]
+        lifecycle_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_archive_and_delete_use_same_keys(self, data_service, lifecycle_session):
+        """Archive and delete are keyed on the same controller_session_id array."""
+        await data_service.process_completed_controllers()
+
+        archive_params = lifecycle_session.execute.await_args_list[1].args[1]
+        delete_params = lifecycle_session.execute.await_args_list[2].args[1]
+        assert archive_params == delete_params
+        assert archive_params == {"controller_session_ids": [11, 12, 13]}
+        assert len(data_service.controller_session_registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_reports_rows_per_second_per_stage(self, data_service, lifecycle_session):
+        """The result carries a throughput figure for every stage."""
+        result = await data_service.process_completed_controllers()
+
+        assert set(result["rows_per_second"]) == {"summaries", "archive", "delete"}
+        assert all(rate >= 0 for rate in result["rows_per_second"].values())
+
+    @pytest.mark.asyncio
+    async def test_no_summaries_skips_archive_and_commit(self, data_service, lifecycle_session):
+        """When no summary could be built nothing is archived, deleted or committed."""
+        data_service._build_controller_summary = AsyncMock(return_value=None)
+
+        result = await data_service.process_completed_controllers()
+
+        assert result["status"] == "failed_no_summaries"
+        lifecycle_session.execute.assert_not_awaited()
+        lifecycle_session.commit.assert_not_awaited()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Unit tests for controller_session_id assignment at ingest and its downstream use.
+"""
+
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.records import ControllerRecord
+from app.services.controller_session_registry import ControllerSessionRegistry
+from app.services.data_service import DataService
+
+LOGON = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+OpenedRow = namedtuple("OpenedRow", "controller_session_id callsign cid last_logon_time last_seen")
+
+
+def _controller(callsign, cid, logon_time, last_updated):
+    return ControllerRecord(callsign=callsign, cid=cid, logon_time=logon_time, last_updated=last_updated)
+
+
+def _result(rows):
+    return MagicMock(fetchall=MagicMock(return_value=rows))
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    return service
+
+
+@pytest.mark.unit
+class TestControllerSessionRegistry:
+    """Test cases for ControllerSessionRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_new_controllers_open_sessions_in_one_statement(self):
+        """The first poll loads open sessions, then opens all new ones with one INSERT."""
+        registry = ControllerSessionRegistry(reconnection_threshold_minutes=5)
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            _result([]),
+            _result([
+                OpenedRow(1, "SY_TWR", 1001, LOGON, LOGON + timedelta(minutes=1)),
+                OpenedRow(2, "ML_APP", 1002, LOGON, LOGON + timedelta(minutes=1))
+            ])
+        ])
+        controllers = [
+            _controller("SY_TWR", 1001, LOGON, LOGON + timedelta(minutes=1)),
+            _controller("ML_APP", 1002, LOGON, LOGON + timedelta(minutes=1))
+        ]
+
+        assert await registry.assign(controllers, session) == 2
+
+        load_sql = str(session.execute.await_args_list[0].args[0])
+        insert_sql, params = session.execute.await_args_list[1].args
+        assert "summarised_at IS NULL" in load_sql
+        assert "INSERT INTO controller_sessions" in str(insert_sql)
+        assert params["callsigns"] == ["SY_TWR", "ML_APP"]
+        assert [controller.controller_session_id for controller in controllers] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_reconnection_within_threshold_keeps_session(self):
+        """A new logon within the threshold of the last update is merged; a later one opens a new session."""
+        registry = ControllerSessionRegistry(reconnection_threshold_minutes=5)
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            _result([OpenedRow(1, "SY_TWR", 1001, LOGON, LOGON + timedelta(hours=1))]),
+            MagicMock(),
+            _result([OpenedRow(2, "SY_TWR", 1001, LOGON + timedelta(hours=2), LOGON + timedelta(hours=2))])
+        ])
+
+        reconnected = _controller("SY_TWR", 1001, LOGON + timedelta(hours=1, minutes=3), LOGON + timedelta(hours=1, minutes=4))
+        assert await registry.assign([reconnected], session) == 0
+        assert reconnected.controller_session_id == 1
+        update_sql, params = session.execute.await_args_list[1].args
+        assert "UPDATE controller_sessions" in str(update_sql)
+        assert params["controller_session_ids"] == [1]
+        assert params["last_logon_times"] == [LOGON + timedelta(hours=1, minutes=3)]
+        assert registry.get_stats()["merged"] == 1
+
+        later = _controller("SY_TWR", 1001, LOGON + timedelta(hours=2), LOGON + timedelta(hours=2))
+        assert await registry.assign([later], session) == 1
+        assert later.controller_session_id == 2
+        assert session.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_open_sessions(self):
+        """After a rolled-back write the next poll reloads open sessions from the database."""
+        registry = ControllerSessionRegistry()
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=_result([OpenedRow(3, "BN_CTR", 1003, LOGON, LOGON)]))
+
+        await registry.assign([_controller("BN_CTR", 1003, LOGON, LOGON)], session)
+        registry.discard([3])
+        assert len(registry) == 0
+        registry.invalidate()
+        await registry.assign([_controller("BN_CTR", 1003, LOGON, LOGON)], session)
+
+        statements = [str(call.args[0]) for call in session.execute.await_args_list]
+        assert sum("FROM controller_sessions" in statement and "SELECT DISTINCT ON" in statement
+                   for statement in statements) == 2
+        assert len(registry) == 1
+
+
+@pytest.mark.unit
+class TestControllerSessionLifecycle:
+    """Test cases for ingest and summaries keyed on controller_session_id."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_assigned_before_bulk_write(self, data_service):
+        """Controller rows reach the bulk writer with their controller_session_id set."""
+        controllers = [_controller("SY_TWR", 1001, LOGON, LOGON)]
+
+        async def assign(rows, session):
+            rows[0]["controller_session_id"] = 9
+
+        data_service.controller_session_registry.assign = AsyncMock(side_effect=assign)
+        data_service.bulk_writer.write_rows = AsyncMock(return_value=1)
+
+        assert await data_service._write_controller_rows(controllers, MagicMock()) == 1
+        written = data_service.bulk_writer.write_rows.await_args.args[2]
+        assert written[0].controller_session_id == 9
+
+    @pytest.mark.asyncio
+    async def test_summary_loads_records_by_controller_session(self, data_service):
+        """Records and frequencies are read by id and the id is stored on the summary."""
+        record = MagicMock(logon_time=LOGON, last_updated=LOGON + timedelta(hours=1), cid=1001)
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[_result([record]), _result([MagicMock(frequency="118.100")])])
+        data_service._get_aircraft_interactions = AsyncMock(return_value=data_service._empty_aircraft_data())
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch("app.services.data_service.get_database_session", fake_session):
+            summary = await data_service._build_controller_summary(
+                ("SY_TWR", 1001, LOGON, LOGON + timedelta(hours=1), 9)
+            )
+
+        for call in session.execute.await_args_list:
+            assert "controller_session_id = :controller_session_id" in str(call.args[0])
+            assert call.args[1] == {"controller_session_id": 9}
+        assert summary["controller_session_id"] == 9
+        assert summary["frequencies_used"] == '["118.100"]'
+
+    @pytest.mark.asyncio
+    async def test_summary_insert_marks_sessions_summarised(self, data_service):
+        """The summary INSERT and the controller_sessions update are one statement."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+        nested = MagicMock()
+        nested.__aenter__ = AsyncMock(return_value=nested)
+        nested.__aexit__ = AsyncMock(return_value=False)
+        session.begin_nested = MagicMock(return_value=nested)
+        controller_key = ("SY_TWR", 1001, LOGON, LOGON + timedelta(hours=1), 9)
+        summary = {column: None for column in (
+            "callsign", "cid", "name", "session_start_time", "session_end_time", "session_duration_minutes",
+            "rating", "facility", "server", "total_aircraft_handled", "peak_aircraft_count",
+            "hourly_aircraft_breakdown", "frequencies_used", "aircraft_details"
+        )}
+        summary["controller_session_id"] = 9
+
+        assert await data_service._insert_controller_summaries(session, [(controller_key, summary)]) == [controller_key]
+
+        statement, params = session.execute.await_args.args
+        assert "INSERT INTO controller_summaries" in str(statement)
+        assert "UPDATE controller_sessions s SET summarised_at" in str(statement)
+        assert params["controller_session_id_0"] == 9
@@ -258,8 +258,9 @@ class TestControllerSummaryIntegration:
              patch.object(data_service, '_delete_completed_controllers') as mock_delete:
             
             # Set up mock returns
-            mock_identify.return_value = [("TEST_CTR", datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc))]
-            mock_create.return_value = {"processed_count": 1, "failed_count": 0, "successful_controllers": [("TEST_CTR", datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc))]}
+            controller_key = ("TEST_CTR", 12345, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 11, 0, 0, tzinfo=timezone.utc), 1)
+            mock_identify.return_value = [controller_key]
+            mock_create.return_value = {"processed_count": 1, "failed_count": 0, "successful_controllers": [controller_key]}
             mock_archive.return_value = 2
             mock_delete.return_value = 0
             
@@ -305,8 +306,9 @@ class TestControllerSummaryIntegration:
              patch.object(data_service, '_delete_completed_controllers') as mock_delete:
             
             # Set up mock returns
-            mock_identify.return_value = [("TEST_CTR", datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc))]
-            mock_create.return_value = {"processed_count": 1, "failed_count": 0, "successful_controllers": [("TEST_CTR", datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc))]}
+            controller_key = ("TEST_CTR", 12345, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 11, 0, 0, tzinfo=timezone.utc), 1)
+            mock_identify.return_value = [controller_key]
+            mock_create.return_value = {"processed_count": 1, "failed_count": 0, "successful_controllers": [controller_key]}
             mock_archive.return_value = 2
             mock_delete.return_value = 0
             
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Regression tests for completed controller detection query.
-Ensures NOT EXISTS with session_start_time and NULL-safe CID check are used.
+Ensures sessions are read from controller_sessions instead of grouping controllers.
 """
 
 import pytest
@@ -21,7 +21,7 @@ from app.services.data_service import DataService
 
 
 @pytest.mark.asyncio
-async def test_identify_query_uses_not_exists_and_session_start_time():
+async def test_identify_query_reads_open_controller_sessions():
     service = DataService()
 
     mock_session = AsyncMock()
@@ -47,15 +47,14 @@ async def test_identify_query_uses_not_exists_and_session_start_time():
         await service._identify_completed_controllers(30)
 
     sql = captured_sql["text"] or ""
-    assert "WHERE NOT EXISTS" in sql
-    assert "controller_summaries cs" in sql
-    assert "cs.session_start_time = c.logon_time" in sql
-    assert "cs.cid IS NOT DISTINCT FROM c.cid" in sql
+    assert "FROM controller_sessions" in sql
+    assert "summarised_at IS NULL" in sql
+    assert "controller_session_id" in sql
     assert " NOT IN (" not in sql  # guard against regression to tuple NOT IN
 
 
 @pytest.mark.asyncio
-async def test_identify_query_null_safe_cid_present():
+async def test_identify_query_does_not_group_controller_rows():
     service = DataService()
 
     mock_session = AsyncMock()
@@ -77,6 +76,7 @@ async def test_identify_query_null_safe_cid_present():
         await service._identify_completed_controllers(30)
 
     sql = captured_sql["text"] or ""
-    assert "cs.cid IS NOT DISTINCT FROM c.cid" in sql
+    assert "FROM controllers" not in sql
+    assert "GROUP BY" not in sql
 
 
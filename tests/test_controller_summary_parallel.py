@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for parallel controller summary generation.
+"""
+
+import asyncio
+import dataclasses
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import ControllerSummaryConfig, get_config
+from app.services.data_service import DataService
+
+LOGON = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _controller(index):
+    return (f"TEST{index}_CTR", 1000 + index, LOGON, LOGON + timedelta(hours=1), index)
+
+
+def _summary(controller_key):
+    return {
+        "callsign": controller_key[0], "cid": controller_key[1], "name": "Test", "controller_session_id": controller_key[4],
+        "session_start_time": LOGON,
+        "session_end_time": controller_key[3], "session_duration_minutes": 60, "rating": 5, "facility": 6,
+        "server": "AU", "total_aircraft_handled": 0, "peak_aircraft_count": 0,
+        "hourly_aircraft_breakdown": "{}", "frequencies_used": "[]", "aircraft_details": "[]"
+    }
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    return service
+
+
+@pytest.fixture
+def insert_session():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    nested = MagicMock()
+    nested.__aenter__ = AsyncMock(return_value=nested)
+    nested.__aexit__ = AsyncMock(return_value=False)
+    session.begin_nested = MagicMock(return_value=nested)
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    with patch("app.services.data_service.get_database_session", fake_session):
+        yield session
+
+
+@pytest.mark.unit
+class TestControllerSummaryParallel:
+    """Test cases for the bounded controller summary worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_workers_run_in_parallel_within_limit(self, data_service, insert_session):
+        """Controllers are built concurrently, never above the configured worker count."""
+        data_service.config = dataclasses.replace(
+            get_config(), controller_summary=ControllerSummaryConfig(max_concurrency=3)
+        )
+        running = 0
+        peak = 0
+
+        async def fake_build(controller_key):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return _summary(controller_key)
+
+        data_service._build_controller_summary = fake_build
+        controllers = [_controller(i) for i in range(10)]
+
+        result = await data_service._create_controller_summaries(controllers)
+
+        assert peak == 3
+        assert result["processed_count"] == 10
+        assert result["successful_controllers"] == controllers
+        # One multi-row INSERT for all summaries
+        assert insert_session.execute.await_count == 1
+        statement = str(insert_session.execute.await_args.args[0])
+        assert statement.count("), (") == 9
+        insert_session.commit.assert_awaited_once()
+
+    def test_worker_count_is_capped_by_pool_size(self, data_service):
+        """The pool can never be exhausted by summary workers."""
+        config = get_config()
+        data_service.config = dataclasses.replace(
+            config,
+            controller_summary=ControllerSummaryConfig(max_concurrency=50),
+            database=dataclasses.replace(config.database, pool_size=10)
+        )
+
+        assert data_service._get_controller_summary_worker_count() == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_builds_are_not_inserted(self, data_service, insert_session):
+        """Controllers whose summary could not be built stay out of the insert and count as failures."""
+        async def fake_build(controller_key):
+            return None if controller_key[0] == "TEST1_CTR" else _summary(controller_key)
+
+        data_service._build_controller_summary = fake_build
+        controllers = [_controller(i) for i in range(3)]
+
+        result = await data_service._create_controller_summaries(controllers)
+
+        assert result["failed_count"] == 1
+        assert [key[0] for key in result["successful_controllers"]] == ["TEST0_CTR", "TEST2_CTR"]
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_retries_row_by_row(self, data_service, insert_session):
+        """A failing multi-row INSERT falls back to single-row inserts so good rows are kept."""
+        async def execute(statement, params):
+            if any(value == "TEST1_CTR" for value in params.values()):
+                raise RuntimeError("constraint violation")
+
+        insert_session.execute.side_effect = execute
+        built = [(_controller(i), _summary(_controller(i))) for i in range(3)]
+
+        written = await data_service._insert_controller_summaries(insert_session, built)
+
+        assert [key[0] for key in written] == ["TEST0_CTR", "TEST2_CTR"]
+        assert insert_session.execute.await_count == 4
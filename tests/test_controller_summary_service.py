@@ -26,6 +26,9 @@ class TestControllerSummaryFunctionality:
         config.controller_summary.completion_minutes = 30
         config.controller_summary.retention_hours = 168
         config.controller_summary.summary_interval_minutes = 60
+        config.controller_summary.reconnection_threshold_minutes = 5
+        config.frequency_intervals.max_gap_seconds = 180
+        config.flight_summary.finalization_grace_minutes = 10
         config.controller_summary.enabled = True
         return config
     
@@ -135,9 +138,7 @@ class TestControllerSummaryFunctionality:
         mock_result.fetchall.return_value = [mock_row1, mock_row2]
         mock_session.execute.return_value = mock_result
         
-        start = datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc)
-        end = datetime(2025, 8, 18, 12, 0, 0, tzinfo=timezone.utc)
-        frequencies = await data_service._get_session_frequencies("TEST_CTR", start, end, mock_session)
+        frequencies = await data_service._get_session_frequencies(1, mock_session)
         
         assert len(frequencies) == 2
         assert "122800000" in frequencies
@@ -170,8 +171,8 @@ class TestControllerSummaryFunctionality:
         mock_session.execute.return_value = _ExecResult(5)  # 5 records archived
         
         completed_controllers = [
-            ("TEST_CTR", 11111, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 12, 0, 0, tzinfo=timezone.utc)),
-            ("TEST_APP", 22222, datetime(2025, 8, 18, 11, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 13, 0, 0, tzinfo=timezone.utc))
+            ("TEST_CTR", 11111, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 12, 0, 0, tzinfo=timezone.utc), 1),
+            ("TEST_APP", 22222, datetime(2025, 8, 18, 11, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 13, 0, 0, tzinfo=timezone.utc), 2)
         ]
         
         with patch('app.services.data_service.get_database_session') as mock_get_session:
@@ -179,15 +180,16 @@ class TestControllerSummaryFunctionality:
             
             result = await data_service._archive_completed_controllers(completed_controllers)
             
-            assert result == 10  # 5 records per controller
+            assert result == 5  # One set-based statement for the whole batch
+            mock_session.execute.assert_called_once()
             mock_session.commit.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_delete_completed_controllers(self, data_service):
         """Test deletion of completed controller records"""
         completed_controllers = [
-            ("TEST_CTR", 11111, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 12, 0, 0, tzinfo=timezone.utc)),
-            ("TEST_APP", 22222, datetime(2025, 8, 18, 11, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 13, 0, 0, tzinfo=timezone.utc))
+            ("TEST_CTR", 11111, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 12, 0, 0, tzinfo=timezone.utc), 1),
+            ("TEST_APP", 22222, datetime(2025, 8, 18, 11, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 13, 0, 0, tzinfo=timezone.utc), 2)
         ]
         
         # Mock database session
@@ -208,7 +210,7 @@ class TestControllerSummaryFunctionality:
     async def test_delete_completed_controllers_retention_not_met(self, data_service):
         """Test deletion with retention period not met"""
         completed_controllers = [
-            ("TEST_CTR", 11111, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 12, 0, 0, tzinfo=timezone.utc))
+            ("TEST_CTR", 11111, datetime(2025, 8, 18, 10, 0, 0, tzinfo=timezone.utc), datetime(2025, 8, 18, 12, 0, 0, tzinfo=timezone.utc), 1)
         ]
         
         # Mock database session
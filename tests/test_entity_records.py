@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the slot records used from parse to the bulk writer.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.records import ControllerRecord, FlightRecord, TransceiverRecord
+from app.services import vatsim_service as vatsim_module  # package attribute: test_controller_summary_not_exists stubs sys.modules
+from app.services.bulk_writer import BulkWriter
+from app.services.data_service import DataService
+
+PILOT = {
+    "cid": 1000001, "name": "Pilot", "callsign": "QFA1", "server": "AUSTRALIA", "pilot_rating": 1,
+    "military_rating": 0, "latitude": -33.9, "longitude": 151.2, "altitude": 35000, "groundspeed": 450,
+    "transponder": "2000", "heading": 180, "logon_time": "2025-08-01T10:00:00.1234567Z",
+    "last_updated": "2025-08-01T12:00:00.1234567Z",
+    "flight_plan": {"flight_rules": "I", "aircraft_faa": "B738/L", "aircraft_short": "B738", "departure": "YSSY",
+                    "arrival": "YMML", "alternate": "YSCB", "cruise_tas": "450", "altitude": "35000", "deptime": "0100",
+                    "enroute_time": "0120", "fuel_time": "0300", "remarks": "RMK/TCAS", "route": "H65"}
+}
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    return service
+
+
+@pytest.mark.unit
+class TestEntityRecords:
+    """Test cases for the record types and their use in the ingest pipeline."""
+
+    def test_records_behave_like_row_mappings(self):
+        """Records have no __dict__, iterate their columns and keep the parsed aliases readable."""
+        flight = vatsim_module.VATSIMService()._parse_flights([PILOT])[0]
+
+        assert isinstance(flight, FlightRecord)
+        assert not hasattr(flight, "__dict__")
+        assert list(flight) == list(FlightRecord.COLUMNS)
+        assert flight["aircraft_type"] == "B738"
+        assert flight.get("last_updated") == datetime(2025, 8, 1, 12, 0, tzinfo=timezone.utc)
+        assert flight["position"] == {"lat": -33.9, "lng": 151.2}
+        assert flight.get("unknown", "missing") == "missing"
+        assert "pilot_name" not in dict(**flight)
+        assert flight.as_tuple() == tuple(flight.to_dict().values())
+        with pytest.raises(KeyError):
+            flight["position"] = None
+
+    def test_prepare_passes_parsed_records_through(self, data_service):
+        """The parsed objects are the written rows: no per-entity copy is made."""
+        service = vatsim_module.VATSIMService()
+        flights = service._parse_flights([PILOT, {**PILOT, "callsign": "VFR1", "flight_plan": None}])
+        controllers = service._parse_controllers([{"callsign": "SY_TWR", "text_atis": ["line 1", "line 2"],
+                                                    "logon_time": "2025-08-01T10:00:00Z"}])
+        transceivers = service._parse_transceivers([{"callsign": "QFA1", "transceivers": [
+            {"id": 0, "frequency": 120500000, "latDeg": -33.9, "lonDeg": 151.2}
+        ]}])
+        data_service.geographic_boundary_filter.config.enabled = False
+        data_service.controller_callsign_filter.config.enabled = False
+
+        bulk_flights = data_service._prepare_flight_rows(flights)
+        bulk_controllers = data_service._prepare_controller_rows(controllers)
+        bulk_transceivers = data_service._prepare_transceiver_rows(transceivers)
+
+        assert bulk_flights == [flights[0]] and bulk_flights[0] is flights[0]
+        assert bulk_controllers[0] is controllers[0]
+        assert bulk_controllers[0].text_atis == "['line 1', 'line 2']"
+        assert bulk_transceivers[0] is transceivers[0]
+        assert bulk_transceivers[0].timestamp is not None
+
+    def test_prepare_converts_dictionaries(self, data_service):
+        """Plain dictionaries still produce the same rows as before."""
+        data_service.geographic_boundary_filter.config.enabled = False
+        data_service.controller_callsign_filter.config.enabled = False
+        logon_time = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+        flight = data_service._prepare_flight_rows([{
+            "callsign": "QFA1", "departure": "YSSY", "arrival": "YMML", "last_updated": logon_time
+        }])[0]
+        controller = data_service._prepare_controller_rows([{
+            "callsign": "SY_TWR", "logon_time": "2025-08-01T10:00:00Z"
+        }])[0]
+        transceiver = data_service._prepare_transceiver_rows([{"callsign": "QFA1", "frequency": 120500000}])[0]
+
+        assert isinstance(flight, FlightRecord)
+        assert flight["last_updated_api"] == logon_time
+        assert flight["altitude"] == 0 and flight["server"] == ""
+        assert isinstance(controller, ControllerRecord)
+        assert controller["logon_time"] == logon_time
+        assert isinstance(transceiver, TransceiverRecord)
+        assert transceiver["entity_type"] == "flight"
+
+    @pytest.mark.asyncio
+    async def test_copy_writes_record_tuples(self):
+        """COPY receives each record's column tuple under its column names."""
+        writer = BulkWriter(mode="copy")
+        connection = MagicMock()
+        connection.copy_records_to_table = AsyncMock()
+        writer._get_driver_connection = AsyncMock(return_value=connection)
+        session = MagicMock()
+        session.begin_nested.return_value.__aenter__ = AsyncMock()
+        session.begin_nested.return_value.__aexit__ = AsyncMock(return_value=False)
+        rows = [TransceiverRecord(callsign="QFA1", frequency=120500000), TransceiverRecord(callsign="VOZ2")]
+
+        await writer._copy_rows(session, MagicMock(__tablename__="transceivers"), rows)
+
+        kwargs = connection.copy_records_to_table.await_args.kwargs
+        assert kwargs["columns"] == list(TransceiverRecord.COLUMNS)
+        assert kwargs["records"][0] == ("QFA1", 0, 120500000, None, None, None, None, "flight", None, None)
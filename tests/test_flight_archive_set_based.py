@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Unit tests for set-based archiving and deletion of completed flights.
+"""
+
+import dataclasses
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import FlightSummaryConfig, get_config
+from app.services.data_service import DataService
+
+COMPLETED_FLIGHTS = [101, 102, 103]  # flight_session_id of each completed flight
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    service.config = dataclasses.replace(get_config(), flight_summary=FlightSummaryConfig(archive_batch_size=2))
+    return service
+
+
+@pytest.fixture
+def mock_session():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(rowcount=150))
+    session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    with patch("app.services.data_service.get_database_session", fake_session):
+        yield session
+
+
+@pytest.mark.unit
+class TestFlightArchiveSetBased:
+    """Test cases for set-based flight archive/delete."""
+
+    @pytest.mark.asyncio
+    async def test_archive_runs_one_insert_select_per_chunk(self, data_service, mock_session):
+        """Archiving issues one INSERT ... SELECT per chunk of keys instead of one INSERT per row."""
+        archived = await data_service._archive_completed_flights(COMPLETED_FLIGHTS)
+
+        assert archived == 300
+        assert mock_session.execute.await_count == 2
+        statement = str(mock_session.execute.await_args_list[0].args[0])
+        assert "INSERT INTO flights_archive" in statement
+        assert "JOIN" in statement and "unnest" in statement
+        assert "f.flight_session_id = k.flight_session_id" in statement
+        assert mock_session.execute.await_args_list[0].args[1] == {"flight_session_ids": [101, 102]}
+        assert mock_session.execute.await_args_list[1].args[1] == {"flight_session_ids": [103]}
+        mock_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_runs_one_delete_using_per_chunk(self, data_service, mock_session):
+        """Deleting issues one DELETE ... USING per chunk of keys."""
+        deleted = await data_service._delete_completed_flights(COMPLETED_FLIGHTS)
+
+        assert deleted == 300
+        assert mock_session.execute.await_count == 2
+        statement = str(mock_session.execute.await_args_list[0].args[0])
+        assert "DELETE FROM flights f" in statement and "USING" in statement
+        assert "f.flight_session_id = k.flight_session_id" in statement
+        assert "f.deptime" not in statement
+
+    @pytest.mark.asyncio
+    async def test_no_flights_is_noop(self, data_service, mock_session):
+        """No completed flights means no database work."""
+        assert await data_service._archive_completed_flights([]) == 0
+        assert await data_service._delete_completed_flights([]) == 0
+        mock_session.execute.assert_not_awaited()
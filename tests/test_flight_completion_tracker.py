@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for incremental completed-flight detection.
+"""
+
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.data_service import DataService
+from app.utils.flight_completion_tracker import FlightCompletionTracker
+
+NOW = datetime(2025, 8, 1, 12, 0, tzinfo=timezone.utc)
+# flight_session_id of each flight
+QFA1 = 101
+VOZ2 = 102
+JST3 = 103
+
+SeedRow = namedtuple("SeedRow", "flight_session_id last_updated")
+CandidateRow = namedtuple("CandidateRow", "flight_session_id last_updated summarised")
+
+
+@pytest.mark.unit
+class TestFlightCompletionTracker:
+    """Test cases for the last-seen map."""
+
+    def test_stale_keys_oldest_first(self):
+        """Only flights not seen since the threshold are returned, oldest first."""
+        tracker = FlightCompletionTracker()
+        tracker.record([VOZ2], NOW - timedelta(hours=20))
+        tracker.record([QFA1], NOW - timedelta(hours=30))
+        tracker.record([JST3], NOW - timedelta(hours=1))
+
+        assert tracker.stale_keys(NOW - timedelta(hours=14)) == [QFA1, VOZ2]
+
+    def test_record_never_moves_back_in_time(self):
+        """Seeding older database times does not hide recent ingest activity."""
+        tracker = FlightCompletionTracker()
+        tracker.record([QFA1], NOW)
+        tracker.seed([(QFA1, NOW - timedelta(hours=30))])
+
+        assert tracker.loaded
+        assert tracker.stale_keys(NOW - timedelta(hours=14)) == []
+
+    def test_discard_and_invalidate(self):
+        """Discarded flights are no longer tracked; invalidate forces a reseed."""
+        tracker = FlightCompletionTracker()
+        tracker.seed([(QFA1, NOW), (VOZ2, NOW)])
+        tracker.discard([QFA1])
+
+        assert len(tracker) == 1
+        tracker.invalidate()
+        assert len(tracker) == 0 and not tracker.loaded
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    return service
+
+
+def _session_returning(*row_sets):
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[MagicMock(fetchall=MagicMock(return_value=rows)) for rows in row_sets])
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    return session, patch("app.services.data_service.get_database_session", fake_session)
+
+
+@pytest.mark.unit
+class TestIncrementalCompletedFlights:
+    """Test cases for DataService._identify_completed_flights with the tracker."""
+
+    @pytest.mark.asyncio
+    async def test_seeds_then_checks_only_stale_candidates(self, data_service):
+        """The first run seeds from flights and verifies only the stale flight sessions."""
+        threshold = datetime.now(timezone.utc) - timedelta(hours=14)
+        old = threshold - timedelta(hours=1)
+        session, patched = _session_returning(
+            [SeedRow(QFA1, old), SeedRow(VOZ2, old), SeedRow(JST3, datetime.now(timezone.utc))],
+            [CandidateRow(QFA1, old, False), CandidateRow(VOZ2, old, True)]
+        )
+
+        with patched:
+            completed = await data_service._identify_completed_flights(14)
+
+        assert completed == [QFA1]
+        assert session.execute.await_count == 2
+        verify_sql = str(session.execute.await_args_list[1].args[0])
+        assert "NOT IN" not in verify_sql
+        assert "s.flight_session_id = k.flight_session_id" in verify_sql
+        assert session.execute.await_args_list[1].args[1] == {"flight_session_ids": [QFA1, VOZ2]}
+        # Already summarised flights stop being tracked, active ones stay
+        assert VOZ2 not in data_service.flight_completion_tracker.stale_keys(datetime.now(timezone.utc))
+        assert len(data_service.flight_completion_tracker) == 2
+
+    @pytest.mark.asyncio
+    async def test_ingest_activity_skips_database(self, data_service):
+        """Flights seen by the ingest loop are not candidates, so no verification query runs."""
+        data_service.flight_completion_tracker.seed([])
+        data_service._record_flight_activity([
+            {"callsign": "QFA1", "departure": "YSSY", "arrival": "YMML", "cid": 1000001, "deptime": "0100",
+             "flight_session_id": QFA1}
+        ])
+        session, patched = _session_returning()
+
+        with patched:
+            completed = await data_service._identify_completed_flights(14)
+
+        assert completed == []
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rewritten_flight_is_not_completed(self, data_service):
+        """A candidate updated in the database since it was last seen is kept and refreshed."""
+        data_service.flight_completion_tracker.seed([(QFA1, NOW - timedelta(days=2))])
+        recent = datetime.now(timezone.utc)
+        session, patched = _session_returning([CandidateRow(QFA1, recent, False)])
+
+        with patched:
+            completed = await data_service._identify_completed_flights(14)
+
+        assert completed == []
+        assert data_service.flight_completion_tracker.stale_keys(recent - timedelta(seconds=1)) == []
+        assert len(data_service.flight_completion_tracker) == 1
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming, time-sliced FlightDetectionService matching.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.flight_detection_service import FlightDetectionService
+from app.utils.atc_matching import find_frequency_matches
+
+SESSION_START = datetime(2025, 8, 1, 0, 0, tzinfo=timezone.utc)
+SESSION_END = SESSION_START + timedelta(hours=10)
+
+
+def _transceiver(callsign, frequency, timestamp, lat, lon):
+    return {
+        "callsign": callsign,
+        "frequency": frequency,
+        "frequency_mhz": frequency / 1000000.0,
+        "timestamp": timestamp,
+        "position_lat": lat,
+        "position_lon": lon
+    }
+
+
+def _fss_session():
+    """A 10 hour FSS session polled every minute and 12000 flight records."""
+    rng = random.Random(3)
+    controller = [
+        _transceiver("AU-FSS", 122800000, SESSION_START + timedelta(minutes=minute), -25.0, 135.0)
+        for minute in range(600)
+    ]
+    flights = sorted((
+        _transceiver(f"QFA{i % 40}", rng.choice([122800000, 118100000]), SESSION_START + timedelta(seconds=rng.uniform(0, 36000)),
+                     -25.0 + rng.uniform(-20, 20), 135.0 + rng.uniform(-20, 20))
+        for i in range(12000)
+    ), key=lambda t: t["timestamp"])
+    return controller, flights
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = FlightDetectionService(time_window_seconds=180, interval_detection=False)
+    service.slice_seconds = 1800
+    controller, flights = _fss_session()
+
+    async def fake_stream(session_start, session_end):
+        for transceiver in flights:
+            yield transceiver
+
+    monkeypatch.setattr(service, "_stream_flight_transceivers", fake_stream)
+    return service, controller, flights
+
+
+@pytest.mark.unit
+class TestFlightDetectionStreaming:
+    """Test cases for streaming flight detection."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_matches_full_join_without_cap(self, service):
+        """Slice-by-slice matching finds every pair a full in-memory join finds, beyond 10000 records."""
+        service, controller, flights = service
+
+        streamed = []
+        async for slice_matches in service._stream_frequency_matches(controller, SESSION_START, SESSION_END, 1000):
+            streamed.extend(slice_matches)
+
+        expected = find_frequency_matches(flights, controller, 180, lambda _: 1000)
+        assert sorted((m["flight_time"], m["controller_time"], m["flight_callsign"]) for m in streamed) == \
+            sorted((m["flight_time"], m["atc_time"], m["flight_callsign"]) for m in expected)
+        assert any(m["flight_time"] > flights[10000]["timestamp"] for m in streamed)
+        assert all(m["controller_callsign"] == "AU-FSS" and m["frequency_mhz"] == 122.8 for m in streamed)
+
+    @pytest.mark.asyncio
+    async def test_streaming_buffer_is_bounded(self, service, monkeypatch):
+        """Only flight records near the current slice are kept in memory."""
+        service, controller, flights = service
+        buffer_sizes = []
+
+        def recording_match(flight_transceivers, atc_transceivers, time_window_seconds, proximity):
+            buffer_sizes.append(len(flight_transceivers))
+            return []
+
+        monkeypatch.setattr("app.services.flight_detection_service.find_frequency_matches", recording_match)
+
+        async for _ in service._stream_frequency_matches(controller, SESSION_START, SESSION_END, 1000):
+            pass
+
+        # 30 minute slices + 2 x 3 minute window out of a 10 hour session
+        assert len(buffer_sizes) == 20
+        assert max(buffer_sizes) < len(flights) / 10
+
+    @pytest.mark.asyncio
+    async def test_detection_uses_streaming_mode(self, service, monkeypatch):
+        """detect_controller_flight_interactions uses the streaming path and returns aircraft metrics."""
+        service, controller, flights = service
+
+        async def fake_controller_transceivers(callsign, session_start, session_end):
+            return controller
+
+        monkeypatch.setattr(service, "_get_controller_transceivers", fake_controller_transceivers)
+
+        async def no_sql_join(*args, **kwargs):
+            raise AssertionError("streaming mode must not run the SQL join")
+
+        monkeypatch.setattr(service, "_find_frequency_matches", no_sql_join)
+
+        result = await service.detect_controller_flight_interactions("AU-FSS", SESSION_START, SESSION_END)
+
+        assert result["flights_detected"] is True
+        assert result["total_aircraft"] == 40
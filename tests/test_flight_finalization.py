@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Unit tests for flight summaries finalized on disconnect from state accumulated
+at ingest, and the batch job archiving them.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.records import ControllerRecord, FlightRecord, TransceiverRecord
+from app.services.data_service import DataService
+from app.services.flight_summary_accumulator import FlightSummaryAccumulator
+from app.services.snapshot_diff import SnapshotEvent
+
+START = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _flight(callsign="QFA1", flight_session_id=7, lat=-33.95, lon=151.18):
+    return FlightRecord(callsign=callsign, cid=1000001, departure="YSSY", arrival="YMML", route="DCT",
+                        deptime="0100", aircraft_type="B738", logon_time=START, latitude=lat, longitude=lon,
+                        flight_session_id=flight_session_id)
+
+
+def _poll(minute, flights=None, controllers=None, transceivers=None):
+    return (flights if flights is not None else [_flight()],
+            controllers or [], transceivers or [], START + timedelta(minutes=minute))
+
+
+def _event(event_type, entity_id, minute, **details):
+    return SnapshotEvent(event_type, "flight", "QFA1", START + timedelta(minutes=minute), entity_id, details)
+
+
+def _accumulator(**kwargs):
+    return FlightSummaryAccumulator(grace_minutes=10, proximity_for_callsign=lambda callsign: 30.0, **kwargs)
+
+
+def _observe(accumulator, flights, controllers, transceivers, observed_at, open_sectors=None):
+    return accumulator.observe(flights, controllers, transceivers, open_sectors or {}, observed_at)
+
+
+@pytest.mark.unit
+class TestFlightSummaryAccumulator:
+    """Test cases for FlightSummaryAccumulator."""
+
+    def test_polls_fold_into_records_sectors_and_contacts(self):
+        """Records, sector time and per-poll ATC contacts are accumulated per flight session."""
+        accumulator = _accumulator()
+        controller = ControllerRecord(callsign="SY_APP", frequency="124.400", facility=5)
+        for minute, sector in ((0, "SY"), (1, "SY"), (2, "SY"), (3, "ML")):
+            polled_at = START + timedelta(minutes=minute)
+            transceivers = [
+                TransceiverRecord(callsign="QFA1", frequency=124400000, entity_id=7,
+                                  position_lat=-33.95, position_lon=151.18, timestamp=polled_at),
+                TransceiverRecord(callsign="QFA1", frequency=124400000, entity_id=7, transceiver_id=1,
+                                  position_lat=-33.95, position_lon=151.18, timestamp=polled_at),
+                TransceiverRecord(callsign="SY_APP", frequency=124400000, entity_type="atc",
+                                  position_lat=-33.94, position_lon=151.17, timestamp=polled_at)
+            ]
+            _observe(accumulator, [_flight()], [controller] if minute < 2 else [], transceivers, polled_at, {"QFA1": sector})
+
+        state = accumulator._flights[7]
+        assert state.records == 4
+        assert state.first_record["departure"] == "YSSY"
+        assert state.last_seen == START + timedelta(minutes=3)
+        assert state.sector_breakdown() == {"SY": 2}
+        assert state.contacts == {"SY_APP": {"contact_count": 2, "first_contact": START,
+                                             "last_contact": START + timedelta(minutes=1)}}
+
+    def test_disconnect_schedules_after_grace_and_reconnect_cancels(self):
+        """A disconnected session is due once the grace period passed, unless it is seen again."""
+        accumulator = _accumulator()
+        _observe(accumulator, *_poll(0))
+        accumulator.on_events([_event("pilot_connected", 7, 0)])
+        _observe(accumulator, *_poll(1))
+        accumulator.on_events([_event("pilot_disconnected", 7, 2)])
+
+        assert accumulator.due(START + timedelta(minutes=11)) == []
+        _observe(accumulator, *_poll(5))
+        assert accumulator.due(START + timedelta(minutes=30)) == []
+
+        accumulator.on_events([_event("pilot_disconnected", 7, 6)])
+        due = accumulator.due(START + timedelta(minutes=16))
+        assert [flight_session_id for flight_session_id, _ in due] == [7]
+        assert due[0][1].records == 3
+
+        accumulator.finish([7])
+        assert len(accumulator) == 0
+        assert accumulator.get_stats()["finalized"] == 1
+
+    def test_filter_exit_schedules_like_disconnect(self):
+        """A flight filtered out (e.g. leaving the boundary) is finalized once it stays out for the grace period, even if it logs off later."""
+        accumulator = _accumulator()
+        _observe(accumulator, *_poll(0))
+        accumulator.on_events([_event("pilot_filtered_in", 7, 0)])
+        accumulator.on_events([_event("pilot_filtered_out", 7, 1)])
+
+        accumulator.on_events([_event("pilot_disconnected", 7, 5)])
+
+        assert [flight_session_id for flight_session_id, _ in accumulator.due(START + timedelta(minutes=11))] == [7]
+
+    def test_flights_without_observed_start_are_left_to_batch(self):
+        """Flights already connected before the first poll are dropped when due, not finalized."""
+        accumulator = _accumulator()
+        _observe(accumulator, *_poll(0))
+        _observe(accumulator, *_poll(1))
+        accumulator.on_events([_event("pilot_disconnected", 7, 2)])
+
+        assert accumulator.due(START + timedelta(minutes=12)) == []
+        assert len(accumulator) == 0
+        assert accumulator.get_stats()["left_to_batch"] == 1
+
+    def test_reconnect_after_finalization_reopens_session(self):
+        """A session seen again is checked for an earlier summary and reported so it can be withdrawn."""
+        accumulator = _accumulator()
+        _observe(accumulator, *_poll(0))
+        accumulator.on_events([_event("pilot_connected", 7, 0)])
+        assert accumulator.unchecked() == [7]
+        accumulator.reopen([], [7])
+        accumulator.on_events([_event("pilot_disconnected", 7, 1)])
+        accumulator.finish([flight_session_id for flight_session_id, _ in accumulator.due(START + timedelta(minutes=11))])
+
+        _observe(accumulator, *_poll(20))
+        accumulator.on_events([_event("pilot_connected", 7, 20)])
+        assert accumulator.unchecked() == [7]
+        accumulator.reopen([7], [7])
+
+        assert accumulator.unchecked() == []
+        assert accumulator.reopened() == [7]
+        assert accumulator._flights[7].complete is False
+        accumulator.finish([], [7])
+        assert accumulator.reopened() == []
+
+    def test_flight_plan_change_to_new_session_schedules_previous(self):
+        """A new flight session of the same callsign finalizes the previous one and starts complete."""
+        accumulator = _accumulator()
+        _observe(accumulator, *_poll(0))
+        accumulator.on_events([_event("pilot_connected", 7, 0)])
+        _observe(accumulator, *_poll(1, flights=[_flight(flight_session_id=8)]))
+        accumulator.on_events([_event("flight_plan_changed", 8, 1, previous_flight_session_id=7)])
+
+        assert [flight_session_id for flight_session_id, _ in accumulator.due(START + timedelta(minutes=11))] == [7]
+        assert accumulator._flights[8].complete is True
+
+
+@asynccontextmanager
+async def _fake_session(session):
+    yield session
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    return service
+
+
+@pytest.mark.unit
+class TestFlightFinalization:
+    """Test cases for DataService finalization on disconnect and the batch safety net."""
+
+    @pytest.mark.asyncio
+    async def test_due_sessions_inserted_with_one_statement(self, data_service):
+        """Due summaries are built from memory and inserted together, marked archive_pending."""
+        accumulator = data_service.flight_summary_accumulator
+        _observe(accumulator, *_poll(0))
+        accumulator.on_events([_event("pilot_connected", 7, 0)])
+        _observe(accumulator, *_poll(45))
+        accumulator.on_events([_event("pilot_disconnected", 7, 46)])
+        accumulator.reopen([], accumulator.unchecked())
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(
+            fetchall=MagicMock(return_value=[SimpleNamespace(flight_session_id=7)])
+        ))
+        session.commit = AsyncMock()
+
+        with patch("app.services.data_service.get_database_session", lambda: _fake_session(session)):
+            assert await data_service._finalize_flight_summaries(START + timedelta(hours=2)) == 1
+
+        assert session.execute.await_count == 1
+        statement, params = session.execute.await_args.args
+        assert "INSERT INTO flight_summaries" in str(statement)
+        assert "archive_pending" in str(statement)
+        assert "RETURNING flight_session_id" in str(statement)
+        assert "FROM flights " not in str(statement)
+        assert params["flight_session_id"] == [7]
+        assert params["time_online_minutes"] == [45]
+        assert params["completion_time"] == [START + timedelta(minutes=45)]
+        assert json.loads(params["controller_callsigns"][0]) == {}
+        assert len(accumulator) == 0
+
+    @pytest.mark.asyncio
+    async def test_already_summarised_sessions_left_to_batch(self, data_service):
+        """Due sessions the INSERT skipped are not counted as finalized and stay with the batch job."""
+        accumulator = data_service.flight_summary_accumulator
+        for flight_session_id in (7, 8):
+            _observe(accumulator, *_poll(0, flights=[_flight(flight_session_id=flight_session_id)]))
+            accumulator.on_events([_event("pilot_connected", flight_session_id, 0)])
+            accumulator.on_events([_event("pilot_disconnected", flight_session_id, 1)])
+        accumulator.reopen([], accumulator.unchecked())
+        data_service.flight_completion_tracker.discard = MagicMock()
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(
+            fetchall=MagicMock(return_value=[SimpleNamespace(flight_session_id=8)])
+        ))
+        session.commit = AsyncMock()
+
+        with patch("app.services.data_service.get_database_session", lambda: _fake_session(session)):
+            assert await data_service._finalize_flight_summaries(START + timedelta(hours=2)) == 1
+
+        data_service.flight_completion_tracker.discard.assert_called_once_with([8])
+        stats = accumulator.get_stats()
+        assert stats["finalized"] == 1
+        assert stats["left_to_batch"] == 1
+        assert len(accumulator) == 0
+
+    @pytest.mark.asyncio
+    async def test_summary_finalized_before_restart_withdrawn_on_reconnect(self, data_service):
+        """A new session with an archive_pending summary in the database is reopened, not finalized again."""
+        accumulator = data_service.flight_summary_accumulator
+        _observe(accumulator, *_poll(0))
+        accumulator.on_events([_event("pilot_connected", 7, 0)])
+        _observe(accumulator, *_poll(1, flights=[_flight(callsign="VOZ2", flight_session_id=8)]))
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(
+            fetchall=MagicMock(return_value=[SimpleNamespace(flight_session_id=7)])
+        ))
+        session.commit = AsyncMock()
+
+        with patch("app.services.data_service.get_database_session", lambda: _fake_session(session)):
+            assert await data_service._finalize_flight_summaries(START + timedelta(minutes=2)) == 0
+
+        (check, check_params), (delete, delete_params) = [call.args for call in session.execute.await_args_list]
+        assert "WHERE archive_pending" in str(check)
+        assert check_params["flight_session_ids"] == [7, 8]
+        assert "DELETE FROM flight_summaries" in str(delete)
+        assert delete_params["flight_session_ids"] == [7]
+        assert accumulator._flights[7].complete is False
+        assert accumulator.unchecked() == []
+        assert accumulator.reopened() == []
+        assert accumulator.get_stats()["reopened"] == 1
+
+    @pytest.mark.asyncio
+    async def test_nothing_due_skips_database(self, data_service):
+        """Without due or reopened sessions no session is opened."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        with patch("app.services.data_service.get_database_session", lambda: _fake_session(session)):
+            assert await data_service._finalize_flight_summaries() == 0
+
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_archives_finalized_flights_without_summarising(self, data_service):
+        """The batch job archives and deletes rows of finalized summaries but creates no summary for them."""
+        data_service._identify_completed_flights = AsyncMock(return_value=[])
+        data_service._identify_finalized_flights = AsyncMock(return_value=[7])
+        data_service._create_flight_summaries = AsyncMock()
+        data_service._archive_completed_flights = AsyncMock(return_value=60)
+        data_service._delete_completed_flights = AsyncMock(return_value=60)
+        data_service._clear_archive_pending = AsyncMock(return_value=1)
+
+        result = await data_service.process_completed_flights()
+
+        data_service._create_flight_summaries.assert_not_awaited()
+        data_service._archive_completed_flights.assert_awaited_once_with([7])
+        data_service._clear_archive_pending.assert_awaited_once_with([7])
+        assert result["finalized_flights_archived"] == 1
+        assert result["records_deleted"] == 60
+
+    @pytest.mark.asyncio
+    async def test_finalized_flights_found_by_archive_pending(self, data_service):
+        """Finalized summaries due for archiving come from the archive_pending partial index."""
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(
+            fetchall=MagicMock(return_value=[SimpleNamespace(flight_session_id=7)])
+        ))
+
+        with patch("app.services.data_service.get_database_session", lambda: _fake_session(session)):
+            assert await data_service._identify_finalized_flights(14) == [7]
+
+        statement = str(session.execute.await_args.args[0])
+        assert "WHERE archive_pending" in statement
+        assert "flights f" not in statement
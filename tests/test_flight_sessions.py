@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit tests for flight_session_id assignment at ingest and its downstream use.
+"""
+
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.records import FlightRecord, TransceiverRecord
+from app.services.atc_detection_service import ATCDetectionService
+from app.services.data_service import DataService
+from app.services.flight_session_registry import FlightSessionRegistry
+
+START = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+RegisteredRow = namedtuple("RegisteredRow", "flight_session_id callsign departure arrival cid deptime")
+
+
+def _flight(callsign, cid, deptime="0100"):
+    return FlightRecord(callsign=callsign, departure="YSSY", arrival="YMML", cid=cid, deptime=deptime, logon_time=START)
+
+
+def _result(rows):
+    return MagicMock(fetchall=MagicMock(return_value=rows))
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    return service
+
+
+@pytest.mark.unit
+class TestFlightSessionRegistry:
+    """Test cases for FlightSessionRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_flights_registered_in_one_statement(self):
+        """New flights are registered once per poll; known flights need no query."""
+        registry = FlightSessionRegistry()
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=_result([
+            RegisteredRow(7, "QFA1", "YSSY", "YMML", 1000001, "0100"),
+            RegisteredRow(8, "VOZ2", "YSSY", "YMML", 1000002, "0100")
+        ]))
+        flights = [_flight("QFA1", 1000001), _flight("VOZ2", 1000002), _flight("QFA1", 1000001)]
+
+        assert await registry.assign(flights, session) == 2
+
+        statement, params = session.execute.await_args.args
+        assert "INSERT INTO flight_sessions" in str(statement)
+        assert "ON CONFLICT (callsign, departure, arrival, cid, deptime)" in str(statement)
+        assert params["callsigns"] == ["QFA1", "VOZ2"]
+        assert [flight.flight_session_id for flight in flights] == [7, 8, 7]
+
+        next_poll = [_flight("QFA1", 1000001)]
+        assert await registry.assign(next_poll, session) == 0
+        assert session.execute.await_count == 1
+        assert next_poll[0]["flight_session_id"] == 7
+
+        registry.discard([7])
+        assert len(registry) == 1
+        registry.invalidate()
+        assert len(registry) == 0
+
+
+@pytest.mark.unit
+class TestFlightSessionIngest:
+    """Test cases for storing flight_session_id with the poll's rows."""
+
+    def test_transceivers_linked_to_their_flight(self, data_service):
+        """Flight transceivers get their flight's session id in entity_id; others are left alone."""
+        flights = [FlightRecord(callsign="QFA1", flight_session_id=7)]
+        transceivers = [
+            TransceiverRecord(callsign="QFA1"),
+            TransceiverRecord(callsign="VOZ2"),
+            TransceiverRecord(callsign="QFA1", entity_type="atc")
+        ]
+
+        assert data_service._link_flight_transceivers(flights, transceivers) == 1
+        assert [transceiver.entity_id for transceiver in transceivers] == [7, None, None]
+
+    @pytest.mark.asyncio
+    async def test_sector_entry_stores_flight_session(self, data_service):
+        """A queued sector entry is inserted with the flight's session id."""
+        data_service._queue_sector_entry("QFA1", "SYA", -33.9, 151.2, 10000, START, 7)
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await data_service._flush_sector_changes(session)
+
+        statement, params = session.execute.await_args.args
+        assert ":flight_session_id" in str(statement)
+        assert params[0]["flight_session_id"] == 7
+
+
+@pytest.mark.unit
+class TestFlightSessionSummaries:
+    """Test cases for summaries and ATC detection keyed on flight_session_id."""
+
+    @pytest.mark.asyncio
+    async def test_summaries_load_records_by_flight_session(self, data_service):
+        """Records are loaded with one flight_session_id lookup and the id is stored on the summary."""
+        record = MagicMock(
+            flight_session_id=7, callsign="QFA1", departure="YSSY", arrival="YMML", deptime="0100",
+            logon_time=START, last_updated=START + timedelta(hours=1), cid=1000001
+        )
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[_result([record]), _result([]), MagicMock()])
+        session.commit = AsyncMock()
+        data_service.atc_detection_service.detect_many = AsyncMock(return_value=[{
+            "controller_callsigns": {}, "controller_time_percentage": 0.0, "airborne_controller_time_percentage": 0.0
+        }])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch("app.services.data_service.get_database_session", fake_session):
+            assert await data_service._create_flight_summaries([7]) == 1
+
+        load_sql, load_params = session.execute.await_args_list[0].args
+        assert "flight_session_id = ANY(:flight_session_ids)" in str(load_sql)
+        assert load_params == {"flight_session_ids": [7]}
+        assert data_service.atc_detection_service.detect_many.await_args.args[0][0]["flight_session_id"] == 7
+        breakdown_sql, breakdown_params = session.execute.await_args_list[1].args
+        assert breakdown_params == {"flight_session_id": 7}
+        assert session.execute.await_args_list[2].args[1]["flight_session_id"] == 7
+
+    @pytest.mark.asyncio
+    async def test_detect_many_reads_transceivers_by_entity_id(self, monkeypatch):
+        """With flight_session_id, flight transceivers are read through entity_id, not callsign."""
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            _result([]),
+            _result([MagicMock(flight_session_id=7, record_count=10)]),
+            _result([]),
+            _result([]),
+            _result([])
+        ])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        monkeypatch.setattr("app.services.atc_detection_service.get_database_session", fake_session)
+        service = ATCDetectionService(time_window_seconds=180, interval_detection=False)
+
+        results = await service.detect_many([
+            {"flight_session_id": 7, "callsign": "QFA1", "departure": "YSSY", "arrival": "YMML", "logon_time": START}
+        ])
+
+        statements = [str(call.args[0]) for call in session.execute.await_args_list]
+        assert "flight_session_id = ANY(:flight_session_ids)" in statements[0]
+        assert "t.entity_id = ANY(:flight_session_ids)" in statements[2]
+        assert "callsign = ANY(:callsigns)" not in statements[2]
+        assert results == [service._create_empty_atc_data()]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the flights_latest table maintained on ingest.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.data_service import DataService
+
+
+@pytest.fixture
+def data_service():
+    service = DataService()
+    service.logger = MagicMock()
+    service.sector_tracking_enabled = False
+    return service
+
+
+def _flight(callsign, latitude, altitude):
+    return {
+        "callsign": callsign, "cid": 1000001, "name": "Pilot", "server": "AUSTRALIA",
+        "pilot_rating": 1, "latitude": latitude, "longitude": 151.0, "altitude": altitude,
+        "groundspeed": 450, "heading": 180, "transponder": "2000", "departure": "YSSY",
+        "arrival": "YMML", "aircraft_type": "B738", "flight_rules": "I", "planned_altitude": "36000",
+        "logon_time": datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc), "route": "H65"
+    }
+
+
+@pytest.mark.unit
+class TestFlightsLatest:
+    """Test cases for the flights_latest upsert and its consumers."""
+
+    @pytest.mark.asyncio
+    async def test_one_upsert_per_poll_last_row_wins(self, data_service):
+        """The whole poll is one INSERT ... ON CONFLICT, with one row per callsign."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        upserted = await data_service._upsert_latest_flights(
+            [_flight("QFA1", -33.0, 10000), _flight("VOZ2", -27.0, 20000), _flight("QFA1", -34.0, 12000)],
+            session
+        )
+
+        assert upserted == 2
+        session.execute.assert_awaited_once()
+        statement, params = session.execute.await_args.args
+        sql = str(statement)
+        assert "INSERT INTO flights_latest" in sql
+        assert "ON CONFLICT (callsign) DO UPDATE" in sql
+        assert "CAST(:logon_time AS TIMESTAMPTZ[])" in sql
+        assert params["callsign"] == ["QFA1", "VOZ2"]
+        assert params["latitude"] == [-34.0, -27.0]
+        assert params["altitude"] == [12000, 20000]
+        assert "route" not in params
+
+    @pytest.mark.asyncio
+    async def test_written_with_flight_history(self, data_service):
+        """_write_flight_rows upserts flights_latest in the same session after the history insert."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+        data_service.bulk_writer.write_rows = AsyncMock(return_value=1)
+        data_service.flight_session_registry.assign = AsyncMock(return_value=1)
+
+        assert await data_service._write_flight_rows([_flight("QFA1", -33.0, 10000)], session) == 1
+
+        data_service.flight_session_registry.assign.assert_awaited_once()
+        data_service.bulk_writer.write_rows.assert_awaited_once()
+        assert "INSERT INTO flights_latest" in str(session.execute.await_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_stale_sector_cleanup_reads_flights_latest(self, data_service):
+        """Stale sectors are found through flights_latest, not a DISTINCT ON over flights."""
+        last_seen = datetime.now(timezone.utc) - timedelta(minutes=20)
+        stale = MagicMock(
+            callsign="QFA1", sector_name="SYA", entry_timestamp=last_seen - timedelta(minutes=30),
+            latitude=-33.0, longitude=151.0, altitude=10000, last_updated=last_seen
+        )
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            MagicMock(fetchall=MagicMock(return_value=[stale])),
+            MagicMock(),
+            MagicMock(rowcount=3)
+        ])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch("app.services.data_service.get_database_session", fake_session):
+            result = await data_service.cleanup_stale_sectors()
+
+        assert result["sectors_closed"] == 1
+        statements = [str(call.args[0]) for call in session.execute.await_args_list]
+        assert "JOIN flights_latest" in statements[0]
+        assert "DISTINCT ON" not in statements[0]
+        assert "DELETE FROM flights_latest" in statements[2]
+        assert "exit_timestamp IS NULL" in statements[2]
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Unit tests for frequency intervals folded from transceivers at ingest and the
+interval-overlap detection built on them.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.records import TransceiverRecord
+from app.services.atc_detection_service import ATCDetectionService
+from app.services.data_service import DataService
+from app.services.flight_detection_service import FlightDetectionService
+from app.services.frequency_interval_tracker import FrequencyIntervalTracker
+from app.utils.atc_matching import filter_interval_contacts
+
+START = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+
+class _Row(SimpleNamespace):
+    """Result row with attribute access and a _mapping like SQLAlchemy rows."""
+
+    @property
+    def _mapping(self):
+        return vars(self)
+
+
+def _result(rows):
+    return MagicMock(fetchall=MagicMock(return_value=rows))
+
+
+def _transceiver(callsign, frequency, timestamp, entity_type="flight", entity_id=None, lat=-33.9, lon=151.2):
+    return TransceiverRecord(
+        callsign=callsign, frequency=frequency, entity_type=entity_type, entity_id=entity_id,
+        position_lat=lat, position_lon=lon, timestamp=timestamp
+    )
+
+
+def _opened(interval_id, entity_type, callsign, frequency, entity_id, interval_end):
+    return _Row(id=interval_id, entity_type=entity_type, callsign=callsign, frequency=frequency,
+                entity_id=entity_id, interval_end=interval_end, position_lat=-33.9, position_lon=151.2, observations=1)
+
+
+@asynccontextmanager
+async def _fake_session(session):
+    yield session
+
+
+@pytest.mark.unit
+class TestFrequencyIntervalTracker:
+    """Test cases for FrequencyIntervalTracker."""
+
+    @pytest.mark.asyncio
+    async def test_consecutive_observations_extend_one_interval(self):
+        """The first poll opens intervals with one INSERT; the next poll extends them with one UPDATE."""
+        tracker = FrequencyIntervalTracker(max_gap_seconds=180)
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            _result([]),
+            _result([
+                _opened(1, "flight", "QFA1", 118100000, 7, START),
+                _opened(2, "atc", "SY_TWR", 118100000, None, START)
+            ]),
+            MagicMock()
+        ])
+
+        first_poll = [
+            _transceiver("QFA1", 118100000, START, entity_id=7),
+            _transceiver("QFA1", 118100000, START, entity_id=7),
+            _transceiver("SY_TWR", 118100000, START, entity_type="atc")
+        ]
+        assert await tracker.fold(first_poll, session) == 2
+        insert_sql, params = session.execute.await_args_list[1].args
+        assert "INSERT INTO frequency_intervals" in str(insert_sql)
+        assert params["callsigns"] == ["QFA1", "SY_TWR"]
+        assert params["entity_ids"] == [7, None]
+
+        next_poll = [
+            _transceiver("QFA1", 118100000, START + timedelta(minutes=1), entity_id=7),
+            _transceiver("SY_TWR", 118100000, START + timedelta(minutes=1), entity_type="atc")
+        ]
+        assert await tracker.fold(next_poll, session) == 0
+        update_sql, params = session.execute.await_args_list[2].args
+        assert "UPDATE frequency_intervals" in str(update_sql)
+        assert params["ids"] == [1, 2]
+        assert params["interval_ends"] == [START + timedelta(minutes=1)] * 2
+        assert params["observations"] == [2, 2]
+        assert params["is_open"] == [True, True]
+        assert session.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_frequency_change_and_disconnect_close_intervals(self):
+        """Leaving a frequency closes its interval and opens one on the new frequency; a gap does too."""
+        tracker = FrequencyIntervalTracker(max_gap_seconds=180)
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            _result([
+                _opened(1, "flight", "QFA1", 118100000, 7, START),
+                _opened(2, "flight", "VOZ2", 124400000, 8, START),
+                _opened(3, "atc", "ML_CTR", 132200000, None, START - timedelta(minutes=10))
+            ]),
+            MagicMock(),
+            _result([
+                _opened(4, "flight", "QFA1", 124400000, 7, START + timedelta(minutes=1)),
+                _opened(5, "atc", "ML_CTR", 132200000, None, START + timedelta(minutes=1))
+            ])
+        ])
+
+        poll = [
+            _transceiver("QFA1", 124400000, START + timedelta(minutes=1), entity_id=7),
+            _transceiver("ML_CTR", 132200000, START + timedelta(minutes=1), entity_type="atc")
+        ]
+        assert await tracker.fold(poll, session) == 2
+
+        update_sql, params = session.execute.await_args_list[1].args
+        assert sorted(params["ids"]) == [1, 2, 3]
+        assert params["is_open"] == [False, False, False]
+        assert tracker.get_stats()["closed"] == 3
+        assert len(tracker) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_poll_and_invalidate(self):
+        """A poll without transceivers changes nothing; invalidate() reloads open intervals next poll."""
+        tracker = FrequencyIntervalTracker()
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=_result([]))
+
+        assert await tracker.fold([], session) == 0
+        assert session.execute.await_count == 0
+
+        await tracker.fold([_transceiver("QFA1", 118100000, START, entity_id=7)], session)
+        tracker.invalidate()
+        await tracker.fold([_transceiver("QFA1", 118100000, START, entity_id=7)], session)
+
+        statements = [str(call.args[0]) for call in session.execute.await_args_list]
+        assert sum("WHERE is_open" in statement for statement in statements) == 2
+
+
+@pytest.mark.unit
+class TestFrequencyIntervalIngest:
+    """Test cases for folding transceivers in the ingest write path."""
+
+    @pytest.mark.asyncio
+    async def test_transceivers_folded_after_bulk_write(self):
+        """Transceiver rows are written, then folded in the same session; disabled skips the fold."""
+        service = DataService()
+        service.logger = MagicMock()
+        service.bulk_writer.write_rows = AsyncMock(return_value=1)
+        service.frequency_interval_tracker.fold = AsyncMock(return_value=1)
+        session = MagicMock()
+        rows = [_transceiver("QFA1", 118100000, START, entity_id=7)]
+
+        assert await service._write_transceiver_rows(rows, session) == 1
+        service.frequency_interval_tracker.fold.assert_awaited_once_with(rows, session)
+
+        service.frequency_intervals_enabled = False
+        assert await service._write_transceiver_rows(rows, session) == 1
+        assert service.frequency_interval_tracker.fold.await_count == 1
+
+
+@pytest.mark.unit
+class TestIntervalDetection:
+    """Test cases for ATC and flight detection over frequency intervals."""
+
+    def test_contacts_filtered_by_controller_proximity(self):
+        """Contacts beyond the controller's range or without a position are dropped."""
+        contacts = [
+            {"atc_callsign": "SY_TWR", "flight_lat": -33.95, "flight_lon": 151.18, "atc_lat": -33.94, "atc_lon": 151.17},
+            {"atc_callsign": "SY_TWR", "flight_lat": -37.67, "flight_lon": 144.84, "atc_lat": -33.94, "atc_lon": 151.17},
+            {"atc_callsign": "SY_TWR", "flight_lat": None, "flight_lon": None, "atc_lat": -33.94, "atc_lon": 151.17}
+        ]
+
+        assert filter_interval_contacts(contacts, lambda callsign: 15.0) == contacts[:1]
+
+    @pytest.mark.asyncio
+    async def test_detect_many_joins_frequency_intervals(self, monkeypatch):
+        """Batch ATC detection is one interval-overlap join; contact time is the overlap length."""
+        contact = _Row(
+            entity_id=7, flight_callsign="QFA1", atc_callsign="SY_TWR", frequency=118100000, atc_frequency=118100000,
+            contact_start=START + timedelta(minutes=5), contact_end=START + timedelta(minutes=14),
+            flight_lat=-33.95, flight_lon=151.18, atc_lat=-33.94, atc_lon=151.17
+        )
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[
+            _result([_Row(flight_session_id=7, completion_time=START + timedelta(hours=1))]),
+            _result([_Row(flight_session_id=7, record_count=60)]),
+            _result([_Row(callsign="SY_TWR", last_updated=START + timedelta(hours=1))]),
+            _result([contact])
+        ])
+        monkeypatch.setattr("app.services.atc_detection_service.get_database_session", lambda: _fake_session(session))
+        service = ATCDetectionService(time_window_seconds=180, interval_detection=True)
+        service.vatsim_polling_interval_seconds = 60
+
+        results = await service.detect_many([
+            {"flight_session_id": 7, "callsign": "QFA1", "departure": "YSSY", "arrival": "YMML", "logon_time": START}
+        ])
+
+        statement, params = session.execute.await_args_list[3].args
+        assert "FROM frequency_intervals f" in str(statement)
+        assert "active_during &&" in str(statement)
+        assert "transceivers" not in str(statement)
+        assert params["flight_session_ids"] == [7]
+        assert params["controller_callsigns"] == ["SY_TWR"]
+        controller = results[0]["controller_callsigns"]["SY_TWR"]
+        assert controller["contact_count"] == 10
+        assert controller["time_minutes"] == 10.0
+        assert controller["first_contact"] == (START + timedelta(minutes=5)).isoformat()
+        assert results[0]["controller_time_percentage"] == pytest.approx(16.7)
+
+    @pytest.mark.asyncio
+    async def test_controller_detection_joins_frequency_intervals(self, monkeypatch):
+        """Controller summaries find aircraft through the overlap join, clipped to the session."""
+        contact = _Row(
+            flight_callsign="QFA1", atc_callsign="SY_TWR", frequency=118100000,
+            contact_start=START - timedelta(minutes=2), contact_end=START + timedelta(minutes=4),
+            flight_lat=-33.95, flight_lon=151.18, atc_lat=-33.94, atc_lon=151.17
+        )
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=_result([contact]))
+        monkeypatch.setattr("app.services.flight_detection_service.get_database_session", lambda: _fake_session(session))
+        service = FlightDetectionService(time_window_seconds=180, interval_detection=True)
+        service.vatsim_polling_interval_seconds = 60
+
+        flight_data = await service.detect_controller_flight_interactions("SY_TWR", START, START + timedelta(hours=1))
+
+        statement, params = session.execute.await_args.args
+        assert "FROM frequency_intervals a" in str(statement)
+        assert params["controller_callsign"] == "SY_TWR"
+        assert flight_data["aircraft_callsigns"] == ["QFA1"]
+        details = flight_data["details"][0]
+        assert details["first_seen"] == START.isoformat()
+        assert details["updates_count"] == 5
+        assert details["frequency_mhz"] == 118.1
@@ -264,7 +264,35 @@ class TestGeographicBoundaryFilter:
             assert len(result) == 1
             assert self.test_transceiver_inside in result
             assert self.test_transceiver_outside not in result
-    
+
+    def test_filter_flights_list_matches_per_flight_check(self):
+        """Test the vectorized list filter agrees with the per-flight check, including bad coordinates"""
+        with patch.dict(os.environ, {
+            'ENABLE_BOUNDARY_FILTER': 'true',
+            'BOUNDARY_DATA_PATH': 'test.json'
+        }), patch('app.filters.geographic_boundary_filter.get_cached_polygon', return_value=self.test_polygon):
+            filter_instance = GeographicBoundaryFilter()
+
+            flights = [
+                self.test_flight_inside,
+                self.test_flight_outside,
+                self.test_flight_no_position,
+                {'callsign': 'TEST004', 'latitude': '-30.5', 'longitude': '140.25'},
+                {'callsign': 'TEST005', 'latitude': 'invalid', 'longitude': 135.0},
+                {'callsign': 'TEST006', 'latitude': float('nan'), 'longitude': 135.0},
+                {'callsign': 'TEST007', 'latitude': -95.0, 'longitude': 135.0},
+                {'callsign': 'TEST008', 'latitude': -25.0},
+            ]
+            expected = [flight for flight in flights if filter_instance._is_flight_in_boundary(flight)]
+
+            result = filter_instance.filter_flights_list(flights)
+
+            assert result == expected
+            stats = filter_instance.get_filter_stats()
+            assert stats['flights_included'] == 2
+            assert stats['flights_no_position'] == 3
+            assert stats['flights_excluded'] == 3
+
     def test_filter_controllers_list_enabled(self):
         """Test filtering list of controllers when filter is enabled"""
         with patch.dict(os.environ, {
@@ -194,14 +194,6 @@ class TestSystemModules:
                 import gc
                 gc.collect()
                 
-                # Try to close any open file descriptors
-                import os
-                for fd in range(10, 20):  # Check common FD range
-                    try:
-                        os.close(fd)
-                    except (OSError, ValueError):
-                        pass  # FD wasn't open
-                
                 # Clean up any remaining asyncio resources
                 import asyncio
                 try:
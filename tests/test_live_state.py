@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the live-state snapshot served by the read endpoints.
+"""
+
+import importlib
+import json
+import sys
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from starlette.requests import Request
+
+from app.services.live_state import LiveStateCache, etag_matches
+
+POLLED_AT = datetime(2025, 8, 1, 12, 0, tzinfo=timezone.utc)
+FLIGHTS = [
+    {"callsign": "VOZ2", "cid": 2, "departure": "YMML", "arrival": "YBBN", "latitude": -30.0, "longitude": 150.0, "route": "H65"},
+    {"callsign": "QFA1", "cid": 1, "departure": "YSSY", "arrival": "YMML", "latitude": -34.0, "longitude": 151.0, "route": "H65"}
+]
+CONTROLLERS = [{"callsign": "SY_TWR", "cid": 3, "facility": 4, "logon_time": POLLED_AT, "last_updated": POLLED_AT}]
+TRANSCEIVERS = [
+    {"callsign": "QFA1", "transceiver_id": 0, "frequency": 120500000, "position_lat": -34.0, "position_lon": 151.0, "timestamp": POLLED_AT},
+    {"callsign": "QFA1", "transceiver_id": 1, "frequency": 124550000, "position_lat": -34.0, "position_lon": 151.0, "timestamp": POLLED_AT}
+]
+
+
+@pytest.fixture
+def real_vatsim_service(monkeypatch):
+    """Put the real vatsim_service back while app.main is imported; test_controller_summary_not_exists leaves a stub in sys.modules."""
+    module = sys.modules.get("app.services.vatsim_service")
+    if module is not None and getattr(module, "__file__", None) is None:
+        monkeypatch.delitem(sys.modules, "app.services.vatsim_service")
+        importlib.import_module("app.services.vatsim_service")
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+@pytest.mark.unit
+class TestLiveStateCache:
+    """Test cases for LiveStateCache."""
+
+    def test_publish_serializes_endpoint_shapes(self):
+        """Each resource is stored as the JSON the endpoint returns, sorted by callsign."""
+        cache = LiveStateCache(enabled=True, max_age_seconds=120)
+        snapshot = cache.publish(FLIGHTS, CONTROLLERS, TRANSCEIVERS, polled_at=POLLED_AT)
+
+        flights = json.loads(snapshot.resources["flights"].body)
+        assert [flight["callsign"] for flight in flights["flights"]] == ["QFA1", "VOZ2"]
+        assert flights["total_count"] == 2
+        assert flights["flights"][0]["last_updated"] == POLLED_AT.isoformat()
+        assert "route" not in flights["flights"][0]
+
+        controllers = json.loads(snapshot.resources["controllers"].body)
+        assert controllers["controllers"][0]["logon_time"] == POLLED_AT.isoformat()
+
+        transceivers = json.loads(snapshot.resources["transceivers"].body)
+        assert transceivers["total_count"] == 1
+        assert transceivers["transceivers"][0]["frequency"] == 120500000
+        assert transceivers["transceivers"][0]["position_lng"] == 151.0
+
+    def test_versions_and_etags(self):
+        """Every publish is a new version; identical content keeps its ETag."""
+        cache = LiveStateCache(enabled=True, max_age_seconds=120)
+        first = cache.publish(FLIGHTS, CONTROLLERS, TRANSCEIVERS, polled_at=POLLED_AT)
+        second = cache.publish(FLIGHTS, CONTROLLERS, TRANSCEIVERS, polled_at=POLLED_AT)
+        third = cache.publish(FLIGHTS[:1], CONTROLLERS, TRANSCEIVERS, polled_at=POLLED_AT)
+
+        assert (first.version, second.version, third.version) == (1, 2, 3)
+        assert first.resources["flights"].etag == second.resources["flights"].etag
+        assert first.resources["flights"].etag != third.resources["flights"].etag
+        assert cache.get_fresh() is third
+
+    def test_stale_or_disabled_falls_back(self):
+        """Readers get nothing once the snapshot is older than max age, or when disabled."""
+        cache = LiveStateCache(enabled=True, max_age_seconds=60)
+        assert cache.get_fresh() is None
+
+        snapshot = cache.publish(FLIGHTS, CONTROLLERS, TRANSCEIVERS)
+        with patch("app.services.live_state.time.monotonic", return_value=snapshot.published_monotonic + 61):
+            assert cache.get_fresh() is None
+        assert cache.stats["fallbacks"] == 2
+
+        disabled = LiveStateCache(enabled=False, max_age_seconds=60)
+        assert disabled.publish(FLIGHTS, CONTROLLERS, TRANSCEIVERS) is None
+        assert disabled.get_fresh() is None
+
+    def test_etag_matching(self):
+        """If-None-Match lists, weak validators and * are honoured."""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('"x", W/"abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"x"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+
+@pytest.mark.unit
+class TestLiveStateEndpoints:
+    """Test cases for the read endpoints serving the snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_flights_served_from_snapshot_without_database(self, real_vatsim_service):
+        """A fresh snapshot is returned as-is with its ETag, and a matching If-None-Match gets 304."""
+        from app import main
+
+        cache = LiveStateCache(enabled=True, max_age_seconds=120)
+        snapshot = cache.publish(FLIGHTS, CONTROLLERS, TRANSCEIVERS, polled_at=POLLED_AT)
+
+        with patch("app.main.get_live_state_cache", return_value=cache), \
+             patch("app.main.get_database_session", side_effect=AssertionError("database used")):
+            response = await main.get_all_flights(_request())
+            not_modified = await main.get_atc_positions(_request(snapshot.resources["controllers"].etag))
+
+        assert response.status_code == 200
+        assert response.body == snapshot.resources["flights"].body
+        assert response.headers["etag"] == snapshot.resources["flights"].etag
+        assert response.headers["x-live-state-version"] == "1"
+        assert not_modified.status_code == 304
+        assert not_modified.body == b""
+
+    @pytest.mark.asyncio
+    async def test_empty_transceivers_poll_falls_back_to_database(self, real_vatsim_service):
+        """A poll without transceivers publishes no transceivers resource, so the endpoint reads the database."""
+        from app import main
+
+        cache = LiveStateCache(enabled=True, max_age_seconds=120)
+        snapshot = cache.publish(FLIGHTS, CONTROLLERS, [], polled_at=POLLED_AT)
+
+        assert "transceivers" not in snapshot.resources
+        assert snapshot.resources["flights"].count == 2
+        with patch("app.main.get_live_state_cache", return_value=cache):
+            assert main._serve_live_state(_request(), "transceivers") is None
+            assert main._serve_live_state(_request(), "flights").status_code == 200
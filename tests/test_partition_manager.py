@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Unit tests for daily partition maintenance.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.partition_manager import PartitionManager, PartitionSpec
+
+TODAY = date(2025, 8, 10)
+NOW = datetime(2025, 8, 10, 6, 0, tzinfo=timezone.utc)
+TRANSCEIVERS = PartitionSpec(
+    table="transceivers", premake_days=2, retention=timedelta(days=7),
+    list_column="entity_type", list_values=("flight", "atc")
+)
+
+
+def _session(partitions, partitioned=True):
+    """Mock session answering the catalog queries and recording DDL."""
+    session = MagicMock()
+    session.ddl = []
+
+    async def execute(statement, params=None):
+        sql = str(statement)
+        if "pg_partitioned_table" in sql:
+            return MagicMock(scalar=MagicMock(return_value=partitioned))
+        if "pg_inherits" in sql:
+            return MagicMock(fetchall=MagicMock(return_value=[(name,) for name in partitions]))
+        session.ddl.append(sql)
+        return MagicMock()
+
+    session.execute = AsyncMock(side_effect=execute)
+    session.commit = AsyncMock()
+    return session
+
+
+@pytest.mark.unit
+class TestPartitionManager:
+    """Test cases for PartitionManager."""
+
+    @pytest.mark.asyncio
+    async def test_creates_missing_future_days_with_sub_partitions(self):
+        """Missing days up to premake_days ahead are created with one LIST partition per entity type."""
+        manager = PartitionManager(specs=[TRANSCEIVERS], expiry_action="detach")
+        session = _session(["transceivers_p20250810"])
+
+        created = await manager.ensure_partitions(session, TRANSCEIVERS, TODAY)
+
+        assert created == ["transceivers_p20250811", "transceivers_p20250812"]
+        assert session.ddl[0] == (
+            "CREATE TABLE IF NOT EXISTS transceivers_p20250811 PARTITION OF transceivers "
+            "FOR VALUES FROM ('2025-08-11T00:00:00+00:00') TO ('2025-08-12T00:00:00+00:00') "
+            "PARTITION BY LIST (entity_type)"
+        )
+        assert "transceivers_p20250811_flight PARTITION OF transceivers_p20250811 FOR VALUES IN ('flight')" in session.ddl[1]
+        assert "transceivers_p20250811_atc PARTITION OF transceivers_p20250811 FOR VALUES IN ('atc')" in session.ddl[2]
+        assert len(session.ddl) == 6
+
+    @pytest.mark.asyncio
+    async def test_detaches_days_older_than_retention(self):
+        """Days that ended more than the retention ago are detached as whole partitions, never row DELETEs."""
+        manager = PartitionManager(specs=[TRANSCEIVERS], expiry_action="detach")
+        session = _session(["transceivers_p20250801", "transceivers_p20250802", "transceivers_p20250803", "transceivers_default"])
+
+        expired = await manager.expire_partitions(session, TRANSCEIVERS, NOW)
+
+        assert expired == ["transceivers_p20250801", "transceivers_p20250802"]
+        assert session.ddl == [
+            "ALTER TABLE transceivers DETACH PARTITION transceivers_p20250801",
+            "ALTER TABLE transceivers DETACH PARTITION transceivers_p20250802"
+        ]
+        assert not any("DELETE" in sql for sql in session.ddl)
+
+    @pytest.mark.asyncio
+    async def test_drop_action_and_zero_retention(self):
+        """The drop action drops expired partitions; no retention keeps everything."""
+        manager = PartitionManager(specs=[TRANSCEIVERS], expiry_action="drop")
+        session = _session(["transceivers_p20250801"])
+
+        assert await manager.expire_partitions(session, TRANSCEIVERS, NOW) == ["transceivers_p20250801"]
+        assert session.ddl == ["DROP TABLE transceivers_p20250801"]
+
+        keep_all = PartitionSpec(table="transceivers", premake_days=0, retention=None)
+        assert await manager.expire_partitions(_session(["transceivers_p20200101"]), keep_all, NOW) == []
+
+    @pytest.mark.asyncio
+    async def test_run_maintenance_skips_unpartitioned_table(self):
+        """An unmigrated (plain) table is left alone."""
+        manager = PartitionManager(specs=[TRANSCEIVERS], expiry_action="detach")
+        session = _session([], partitioned=False)
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch("app.services.partition_manager.get_database_session", fake_session):
+            result = await manager.run_maintenance(NOW)
+
+        assert result["transceivers"]["status"] == "not_partitioned"
+        assert session.ddl == []
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_hour_based_flight_retention(self):
+        """A day expires only once it ended more than the retention ago; overflowing retention keeps all."""
+        flights = PartitionSpec(table="flights", premake_days=0, retention=timedelta(hours=14))
+        manager = PartitionManager(specs=[flights], expiry_action="drop")
+        session = _session(["flights_p20250809", "flights_p20250810"])
+
+        # 2025-08-09 ended at 2025-08-10 00:00, which is only 6 hours before NOW
+        assert await manager.expire_partitions(session, flights, NOW) == []
+        assert await manager.expire_partitions(session, flights, NOW + timedelta(hours=8)) == ["flights_p20250809"]
+        assert session.ddl == ["DROP TABLE flights_p20250809"]
+
+        forever = PartitionSpec(table="flights", premake_days=0, retention=timedelta(hours=168000000))
+        assert await manager.expire_partitions(_session(["flights_p20200101"]), forever, NOW) == []
+
+    def test_flights_partitions_never_expire(self):
+        """Only flights_archive follows FLIGHT_RETENTION_HOURS; flights rows leave through archive and delete."""
+        manager = PartitionManager(expiry_action="detach")
+
+        assert manager.get_spec("flights").retention is None
+        assert manager.get_spec("flights_archive").retention is not None
+
+    @pytest.mark.asyncio
+    async def test_maintenance_expires_archive_days_only(self):
+        """Archived flight retention removes whole flights_archive partitions and leaves flights days alone."""
+        manager = PartitionManager(expiry_action="drop")
+        manager.specs = [manager.get_spec("flights"), manager.get_spec("flights_archive")]
+        session = _session(["flights_p20200101", "flights_archive_p20200101"])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch("app.services.partition_manager.get_database_session", fake_session):
+            result = await manager.run_maintenance(NOW)
+
+        assert result["flights"]["expired"] == []
+        assert result["flights_archive"]["expired"] == ["flights_archive_p20200101"]
+        assert "DROP TABLE flights_archive_p20200101" in session.ddl
+        assert "DROP TABLE flights_p20200101" not in session.ddl
+
+    @pytest.mark.asyncio
+    async def test_create_only_run_expires_nothing(self):
+        """With expiry switched off, missing days are still created and nothing is detached."""
+        manager = PartitionManager(specs=[TRANSCEIVERS], expiry_action="detach")
+        session = _session(["transceivers_p20250801"])
+
+        @asynccontextmanager
+        async def fake_session():
+            yield session
+
+        with patch("app.services.partition_manager.get_database_session", fake_session):
+            result = await manager.run_maintenance(NOW, expire=False)
+
+        assert result["transceivers"]["expired"] == []
+        assert len(result["transceivers"]["created"]) == 3
+        assert not any("DETACH" in sql for sql in session.ddl)
+
+    @pytest.mark.asyncio
+    async def test_disabled_flag_keeps_creating_partitions_and_other_retention(self):
+        """PARTITION_MAINTENANCE_ENABLED=false only stops partition expiry."""
+        from app.services.data_service import DataService
+
+        service = DataService()
+        service.logger = MagicMock()
+        service.partition_manager = MagicMock(run_maintenance=AsyncMock(return_value={}))
+        service._expire_frequency_intervals = AsyncMock(return_value=0)
+        service._expire_events = AsyncMock(return_value=0)
+
+        with patch.object(service.config.partitioning, "enabled", False), \
+                patch("app.services.data_service.asyncio.sleep", AsyncMock(side_effect=asyncio.CancelledError)):
+            await service._scheduled_partition_maintenance_loop(3600)
+
+        service.partition_manager.run_maintenance.assert_awaited_once_with(expire=False)
+        service._expire_frequency_intervals.assert_awaited_once()
+        service._expire_events.assert_awaited_once()
+
+    def test_rejects_unknown_expiry_action(self):
+        """Only detach and drop are supported."""
+        with pytest.raises(ValueError):
+            PartitionManager(specs=[], expiry_action="truncate")
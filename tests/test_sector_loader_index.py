@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SectorLoader spatial index and batch lookup.
+"""
+
+import json
+import math
+
+import pytest
+
+from app.utils.sector_loader import SectorLoader
+
+
+def _square(name: str, min_lon: float, min_lat: float, size: float) -> dict:
+    coords = [
+        [min_lon, min_lat], [min_lon + size, min_lat], [min_lon + size, min_lat + size],
+        [min_lon, min_lat + size], [min_lon, min_lat]
+    ]
+    return {
+        "type": "Feature",
+        "properties": {"name": name},
+        "geometry": {"type": "Polygon", "coordinates": [coords]}
+    }
+
+
+@pytest.fixture
+def sector_loader(tmp_path):
+    """Load three sectors, two of which overlap."""
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            _square("ARL", 150.0, -35.0, 2.0),
+            _square("WOL", 151.0, -34.0, 2.0),  # Overlaps ARL in the north-east corner
+            _square("BIK", 140.0, -40.0, 3.0)
+        ]
+    }
+    path = tmp_path / "sectors.geojson"
+    path.write_text(json.dumps(geojson))
+
+    loader = SectorLoader(str(path))
+    loader.load_sectors()
+    return loader
+
+
+@pytest.mark.unit
+@pytest.mark.sector_tracking
+class TestSectorLoaderIndex:
+    """Test cases for indexed sector lookups."""
+
+    def test_point_lookup_uses_first_sector_on_overlap(self, sector_loader):
+        """Overlapping sectors resolve to the first loaded sector, like the linear scan."""
+        assert sector_loader.get_sector_for_point(-33.5, 151.5) == "ARL"
+        assert sector_loader.get_sector_for_point(-32.5, 152.5) == "WOL"
+        assert sector_loader.get_sector_for_point(-38.5, 141.5) == "BIK"
+        assert sector_loader.get_sector_for_point(-20.0, 120.0) is None
+
+    def test_batch_matches_point_lookup(self, sector_loader):
+        """get_sectors_for_points agrees with get_sector_for_point for every point."""
+        lats = [-33.5, -32.5, -38.5, -20.0, -34.9, -35.0]
+        lons = [151.5, 152.5, 141.5, 120.0, 150.1, 150.5]
+
+        expected = [sector_loader.get_sector_for_point(lat, lon) for lat, lon in zip(lats, lons)]
+
+        assert sector_loader.get_sectors_for_points(lats, lons) == expected
+
+    def test_batch_handles_missing_positions(self, sector_loader):
+        """None and NaN coordinates map to no sector."""
+        result = sector_loader.get_sectors_for_points([None, math.nan, -33.5], [151.5, 151.5, None])
+
+        assert result == [None, None, None]
+
+    def test_batch_empty_input(self, sector_loader):
+        """An empty batch returns an empty list."""
+        assert sector_loader.get_sectors_for_points([], []) == []
+
+    def test_clear_resets_index(self, sector_loader):
+        """Clearing sectors drops the spatial index."""
+        sector_loader.clear()
+
+        assert sector_loader.get_sector_for_point(-33.5, 151.5) is None
+        assert sector_loader.get_sectors_for_points([-33.5], [151.5]) == [None]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-memory sector occupancy state and its batched flush.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.data_service import DataService
+
+
+class MockSectorLoader:
+    """Sector loader returning sectors by longitude band."""
+
+    def get_sector_for_point(self, lat: float, lon: float):
+        return "SYDNEY" if lon > 150 else "MELBOURNE"
+
+
+def _flight(callsign: str, lon: float, groundspeed: int = 250):
+    return {"callsign": callsign, "latitude": -34.0, "longitude": lon, "altitude": 10000, "groundspeed": groundspeed}
+
+
+@pytest.fixture
+def data_service():
+    """Create a DataService with sector tracking on and state already seeded."""
+    service = DataService()
+    service.logger = MagicMock()
+    service.sector_loader = MockSectorLoader()
+    service.sector_tracking_enabled = True
+    service._sector_state_loaded = True
+    return service
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock session recording executed statements."""
+    session = MagicMock()
+    session.execute = AsyncMock()
+    return session
+
+
+def _statements(session):
+    return [str(call.args[0]) for call in session.execute.await_args_list]
+
+
+@pytest.mark.unit
+@pytest.mark.sector_tracking
+class TestSectorStateBatching:
+    """Test cases for batched sector occupancy writes."""
+
+    @pytest.mark.asyncio
+    async def test_entries_are_flushed_in_one_insert(self, data_service, mock_session):
+        """Tracking many flights issues no queries until one batched INSERT."""
+        for i in range(5):
+            await data_service._track_sector_occupancy(_flight(f"TEST{i}", 151.0), mock_session)
+
+        mock_session.execute.assert_not_awaited()
+
+        result = await data_service._flush_sector_changes(mock_session)
+
+        assert result == {"exits": 0, "entries": 5}
+        assert mock_session.execute.await_count == 1
+        assert "INSERT INTO flight_sector_occupancy" in _statements(mock_session)[0]
+        assert len(mock_session.execute.await_args.args[1]) == 5
+        assert data_service.open_sector_entries == {f"TEST{i}": "SYDNEY" for i in range(5)}
+
+    @pytest.mark.asyncio
+    async def test_transition_updates_before_insert(self, data_service, mock_session):
+        """A sector change closes the old sector at the previous position, then enters the new one."""
+        await data_service._track_sector_occupancy(_flight("TEST1", 151.0), mock_session)
+        await data_service._flush_sector_changes(mock_session)
+        previous_position = dict(data_service.flight_last_positions["TEST1"])
+        mock_session.execute.reset_mock()
+
+        await data_service._track_sector_occupancy(_flight("TEST1", 145.0), mock_session)
+        result = await data_service._flush_sector_changes(mock_session)
+
+        assert result == {"exits": 1, "entries": 1}
+        statements = _statements(mock_session)
+        assert "UPDATE flight_sector_occupancy" in statements[0]
+        assert "INSERT INTO flight_sector_occupancy" in statements[1]
+        exit_params = mock_session.execute.await_args_list[0].args[1]
+        assert exit_params[0]["exit_lon"] == previous_position["longitude"]
+        assert exit_params[0]["exit_timestamp"] == previous_position["timestamp"]
+        assert data_service.open_sector_entries["TEST1"] == "MELBOURNE"
+
+    @pytest.mark.asyncio
+    async def test_seeded_state_prevents_duplicate_entry(self, data_service, mock_session):
+        """Open entries loaded from the database are not re-entered after a restart."""
+        open_sectors = MagicMock()
+        open_sectors.fetchall.return_value = [MagicMock(callsign="TEST1", sector_name="SYDNEY")]
+        mock_session.execute.return_value = open_sectors
+        data_service._sector_state_loaded = False
+
+        await data_service._load_open_sector_state(mock_session)
+        mock_session.execute.reset_mock()
+
+        await data_service._track_sector_occupancy(_flight("TEST1", 151.0), mock_session)
+        result = await data_service._flush_sector_changes(mock_session)
+
+        assert result == {"exits": 0, "entries": 0}
+        mock_session.execute.assert_not_awaited()
+        assert data_service.flight_sector_states["TEST1"]["current_sector"] == "SYDNEY"
+
+    @pytest.mark.asyncio
+    async def test_exit_without_memory_position_uses_one_lookup(self, data_service, mock_session):
+        """Exits of seeded flights resolve positions with a single batched query."""
+        data_service.open_sector_entries = {"TEST1": "SYDNEY", "TEST2": "MELBOURNE"}
+        data_service._queue_sector_exit("TEST1")
+        data_service._queue_sector_exit("TEST2")
+
+        last_updated = datetime.now(timezone.utc)
+        lookup = MagicMock()
+        lookup.fetchall.return_value = [
+            MagicMock(callsign="TEST1", latitude=-33.9, longitude=151.2, altitude=0, last_updated=last_updated),
+            MagicMock(callsign="TEST2", latitude=-37.7, longitude=144.8, altitude=0, last_updated=last_updated)
+        ]
+        mock_session.execute.side_effect = [lookup, MagicMock()]
+
+        result = await data_service._flush_sector_changes(mock_session)
+
+        assert result == {"exits": 2, "entries": 0}
+        statements = _statements(mock_session)
+        assert "DISTINCT ON (callsign)" in statements[0]
+        assert "UPDATE flight_sector_occupancy" in statements[1]
+        assert data_service.open_sector_entries == {}
+
+    @pytest.mark.asyncio
+    async def test_entry_and_exit_in_same_poll_cancel(self, data_service, mock_session):
+        """An entry queued and exited before flushing is never written."""
+        data_service._queue_sector_entry("TEST1", "SYDNEY", -33.9, 151.2, 1000, datetime.now(timezone.utc))
+        data_service._queue_sector_exit("TEST1")
+
+        result = await data_service._flush_sector_changes(mock_session)
+
+        assert result == {"exits": 0, "entries": 0}
+        mock_session.execute.assert_not_awaited()
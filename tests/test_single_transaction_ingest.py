@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for single-transaction poll ingestion in DataService.
+"""
+
+import dataclasses
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import IngestConfig
+from app.services.data_service import DataService
+
+
+VATSIM_DATA = {
+    "flights": [{
+        "callsign": "QFA1", "departure": "YSSY", "arrival": "YMML",
+        "latitude": -33.9, "longitude": 151.2, "groundspeed": 0, "altitude": 0
+    }],
+    "controllers": [{"callsign": "SY_TWR", "frequency": "120.500", "cid": 1}],
+    "transceivers": [{"callsign": "QFA1", "transceiver_id": 0, "frequency": 120500000}],
+    "timings": {"fetch": 0.25, "parse": 0.05}
+}
+
+
+@pytest.fixture
+def data_service():
+    """Create a DataService instance in test mode with filters disabled."""
+    service = DataService()
+    service._test_mode = True
+    service.logger = MagicMock()
+    service.sector_tracking_enabled = False
+    service.geographic_boundary_filter.config.enabled = False
+    service.controller_callsign_filter.config.enabled = False
+    service.frequency_pattern_filter.filter_transceivers_list = lambda transceivers: transceivers
+    service.vatsim_service = MagicMock()
+    service.vatsim_service.get_current_data = AsyncMock(return_value=VATSIM_DATA)
+    service.bulk_writer.write_rows = AsyncMock(side_effect=lambda session, model, rows: len(rows))
+    return service
+
+
+def _session_factory(sessions):
+    """Build a get_database_session replacement that records every session opened."""
+    @asynccontextmanager
+    async def fake_get_database_session():
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        sessions.append(session)
+        yield session
+    return fake_get_database_session
+
+
+@pytest.mark.unit
+class TestSingleTransactionIngest:
+    """Test cases for the single-transaction ingest mode."""
+
+    @pytest.mark.asyncio
+    async def test_poll_written_in_one_session(self, data_service):
+        """All three entity sets share one session and one commit."""
+        data_service.config = dataclasses.replace(data_service.config, ingest=IngestConfig(single_transaction=True))
+        sessions = []
+
+        with patch('app.services.data_service.get_database_session', _session_factory(sessions)):
+            result = await data_service.process_vatsim_data()
+
+        assert len(sessions) == 1
+        sessions[0].commit.assert_awaited_once()
+        assert result["flights_processed"] == 1
+        assert result["controllers_processed"] == 1
+        assert result["transceivers_processed"] == 1
+        assert set(result["stage_timings"]) == {"fetch", "parse", "filter", "write"}
+        assert result["stage_timings"]["fetch"] == 0.25
+
+    @pytest.mark.asyncio
+    async def test_separate_sessions_when_disabled(self, data_service):
+        """Disabling single-transaction mode keeps one session per entity set."""
+        data_service.config = dataclasses.replace(data_service.config, ingest=IngestConfig(single_transaction=False))
+        sessions = []
+
+        with patch('app.services.data_service.get_database_session', _session_factory(sessions)):
+            result = await data_service.process_vatsim_data()
+
+        assert len(sessions) == 3
+        assert result["status"] == "success"
+
+    @pytest.mark.asyncio
+    async def test_write_failure_rolls_back_whole_poll(self, data_service):
+        """A failing write rolls back the shared transaction."""
+        data_service.config = dataclasses.replace(data_service.config, ingest=IngestConfig(single_transaction=True))
+        data_service.bulk_writer.write_rows = AsyncMock(side_effect=RuntimeError("write failed"))
+        sessions = []
+
+        with patch('app.services.data_service.get_database_session', _session_factory(sessions)):
+            with pytest.raises(Exception):
+                await data_service._write_poll_single_transaction([], [{"callsign": "SY_TWR"}], [])
+
+        sessions[0].rollback.assert_awaited_once()
+        sessions[0].commit.assert_not_awaited()
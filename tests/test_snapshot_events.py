@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the snapshot diff engine and its event stream.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.records import ControllerRecord, FlightRecord, TransceiverRecord
+from app.services.data_service import DataService
+from app.services.snapshot_diff import SnapshotDiffEngine
+
+POLLED_AT = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _flight(callsign, cid, flight_session_id, arrival="YMML", route="DCT"):
+    return FlightRecord(callsign=callsign, cid=cid, departure="YSSY", arrival=arrival, route=route,
+                        deptime="0100", flight_session_id=flight_session_id)
+
+
+def _controller(callsign, cid, frequency, controller_session_id):
+    return ControllerRecord(callsign=callsign, cid=cid, frequency=frequency, controller_session_id=controller_session_id)
+
+
+def _events_by_type(events):
+    return {(event.event_type, event.callsign): event for event in events}
+
+
+@pytest.mark.unit
+class TestSnapshotDiffEngine:
+    """Test cases for SnapshotDiffEngine."""
+
+    def test_first_poll_seeds_without_events(self):
+        """The first poll after a restart has nothing to compare with."""
+        engine = SnapshotDiffEngine()
+
+        assert engine.diff([_flight("QFA1", 1001, 7)], [_controller("SY_TWR", 2001, "120.500", 3)], []) == []
+        assert engine.commit() == []
+        assert engine.get_stats()["seeded"] is True
+
+    def test_changes_between_polls_become_typed_events(self):
+        """Connects, disconnects, flight plan and frequency changes and retunes are reported once."""
+        engine = SnapshotDiffEngine()
+        engine.diff(
+            [_flight("QFA1", 1001, 7), _flight("VOZ2", 1002, 8), _flight("JST3", 1003, 9)],
+            [_controller("SY_TWR", 2001, "120.500", 3), _controller("ML_CTR", 2002, "132.200", 4)],
+            [TransceiverRecord(callsign="QFA1", transceiver_id=0, frequency=120500000, entity_id=7)]
+        )
+        engine.commit()
+
+        events = engine.diff(
+            [_flight("QFA1", 1001, 7), _flight("VOZ2", 1002, 10, arrival="YBBN"),
+             _flight("JST3", 1003, 9, route="H62"), _flight("RXA4", 1004, 11)],
+            [_controller("SY_TWR", 2001, "124.400", 3), _controller("BN_APP", 2003, "125.600", 5)],
+            [TransceiverRecord(callsign="QFA1", transceiver_id=0, frequency=124400000, entity_id=7)],
+            polled_at=POLLED_AT
+        )
+        by_type = _events_by_type(events)
+
+        assert set(by_type) == {
+            ("pilot_connected", "RXA4"),
+            ("flight_plan_changed", "VOZ2"),
+            ("flight_plan_changed", "JST3"),
+            ("controller_frequency_changed", "SY_TWR"),
+            ("controller_disconnected", "ML_CTR"),
+            ("controller_connected", "BN_APP"),
+            ("transceiver_retuned", "QFA1")
+        }
+        assert by_type[("flight_plan_changed", "VOZ2")].details == {
+            "changed": {"arrival": ["YMML", "YBBN"]}, "previous_flight_session_id": 8
+        }
+        assert by_type[("flight_plan_changed", "JST3")].details == {"changed": {"route": ["DCT", "H62"]}}
+        assert by_type[("controller_frequency_changed", "SY_TWR")].details == {"from": "120.500", "to": "124.400"}
+        assert by_type[("controller_disconnected", "ML_CTR")].entity_id == 4
+        assert by_type[("transceiver_retuned", "QFA1")].entity_id == 7
+        assert all(event.occurred_at == POLLED_AT for event in events)
+
+    def test_uncommitted_poll_is_diffed_again(self):
+        """A poll that failed to store leaves the previous snapshot, so the next poll reports its changes."""
+        engine = SnapshotDiffEngine()
+        engine.diff([_flight("QFA1", 1001, 7)], [], [])
+        engine.commit()
+
+        assert len(engine.diff([], [], [])) == 1
+        events = engine.diff([], [], [])
+        assert [(event.event_type, event.entity_id) for event in events] == [("pilot_disconnected", 7)]
+        assert engine.commit() == events
+        assert engine.get_stats()["pilot_disconnected"] == 1
+
+    def test_filter_exits_are_not_disconnects(self):
+        """Connects and disconnects are decided against the unfiltered feed; filter exits and entries get their own type."""
+        engine = SnapshotDiffEngine()
+        qfa1, voz2, jst3 = _flight("QFA1", 1001, 7), _flight("VOZ2", 1002, 8), _flight("JST3", 1003, 9)
+        engine.diff([qfa1, voz2], [], [], feed_flights=[qfa1, voz2, jst3])
+        engine.commit()
+
+        events = engine.diff([jst3], [], [], polled_at=POLLED_AT, feed_flights=[qfa1, jst3])
+
+        assert {(event.event_type, event.callsign, event.entity_id) for event in events} == {
+            ("pilot_filtered_out", "QFA1", 7),
+            ("pilot_disconnected", "VOZ2", 8),
+            ("pilot_filtered_in", "JST3", 9)
+        }
+        engine.commit()
+        assert engine.get_stats()["pilot_filtered_out"] == 1
+
+    def test_filtered_out_pilot_logging_off_is_disconnected(self):
+        """A pilot that left the filters and then the feed is reported as disconnected with its last session."""
+        engine = SnapshotDiffEngine()
+        qfa1, voz2 = _flight("QFA1", 1001, 7), _flight("VOZ2", 1002, 8)
+        engine.diff([qfa1], [], [], feed_flights=[qfa1, voz2])
+        engine.commit()
+        filtered_out = engine.diff([], [], [], feed_flights=[qfa1, voz2])
+        engine.commit()
+        still_out = engine.diff([], [], [], feed_flights=[qfa1, voz2])
+        engine.commit()
+
+        gone = engine.diff([], [], [], polled_at=POLLED_AT, feed_flights=[])
+
+        assert [(event.event_type, event.callsign) for event in filtered_out] == [("pilot_filtered_out", "QFA1")]
+        assert still_out == []
+        assert [(event.event_type, event.callsign, event.entity_id) for event in gone] == [
+            ("pilot_disconnected", "QFA1", 7)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_subscribers_receive_their_event_types(self):
+        """Subscribers get one list per poll filtered to their types; failures are contained."""
+        engine = SnapshotDiffEngine()
+        engine.diff([_flight("QFA1", 1001, 7)], [], [])
+        engine.commit()
+        engine.diff([_flight("VOZ2", 1002, 8)], [], [])
+        events = engine.commit()
+
+        received = []
+        async_subscriber = AsyncMock()
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+        engine.subscribe(received.append, ["pilot_disconnected"])
+        engine.subscribe(async_subscriber)
+        engine.subscribe(failing, ["pilot_connected"])
+        unsubscribe = engine.subscribe(MagicMock(), ["controller_connected"])
+        unsubscribe()
+
+        assert await engine.publish(events) == 2
+        assert [[event.callsign for event in batch] for batch in received] == [["QFA1"]]
+        assert len(async_subscriber.await_args.args[0]) == 2
+        assert engine.get_stats()["subscriber_errors"] == 1
+        assert engine.get_stats()["subscribers"] == 3
+
+        with pytest.raises(ValueError):
+            engine.subscribe(MagicMock(), ["pilot_teleported"])
+
+    @pytest.mark.asyncio
+    async def test_events_persisted_with_one_statement(self):
+        """Events are inserted set-based with their details as JSON."""
+        engine = SnapshotDiffEngine()
+        engine.diff([], [_controller("SY_TWR", 2001, "120.500", 3)], [])
+        engine.commit()
+        events = engine.diff([], [_controller("SY_TWR", 2001, "124.400", 3)], [])
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        assert await engine.persist(events, session) == 1
+
+        statement, params = session.execute.await_args.args
+        assert "INSERT INTO events" in str(statement)
+        assert params["event_types"] == ["controller_frequency_changed"]
+        assert params["entity_ids"] == [3]
+        assert json.loads(params["details"][0]) == {"from": "120.500", "to": "124.400"}
+
+
+@pytest.mark.unit
+class TestSnapshotEventIngest:
+    """Test cases for the diff stage in the ingest write path."""
+
+    @pytest.mark.asyncio
+    async def test_events_written_in_poll_transaction(self):
+        """The poll's events are diffed after its rows and stored in the same session."""
+        service = DataService()
+        service.logger = MagicMock()
+        service.snapshot_diff.persist = AsyncMock(return_value=0)
+        session = MagicMock()
+        flights = [_flight("QFA1", 1001, 7)]
+
+        assert await service._write_snapshot_events(flights, [], [], session) == 0
+        service.snapshot_diff.persist.assert_awaited_once_with([], session)
+        service.snapshot_diff.commit()
+
+        assert await service._write_snapshot_events([], [], [], session) == 1
+        assert service.snapshot_diff.persist.await_args.args[0][0].event_type == "pilot_disconnected"
+
+        service.snapshot_diff.enabled = False
+        assert await service._write_snapshot_events([], [], [], session) == 0
+        assert service.snapshot_diff.persist.await_count == 2
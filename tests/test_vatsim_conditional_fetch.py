@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Unit tests for conditional, concurrent fetching and raw-bytes decoding in VATSIMService.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from app.config import get_config
+from app.services import vatsim_service as vatsim_module  # package attribute: test_controller_summary_not_exists stubs sys.modules
+from app.services.data_service import DataService
+
+VATSIMService = vatsim_module.VATSIMService
+resolve_json_decoder = vatsim_module.resolve_json_decoder
+
+TRANSCEIVERS_URL = get_config().vatsim.transceivers_api_url
+
+
+def _feed(update_timestamp):
+    return json.dumps({
+        "general": {"version": 3, "update_timestamp": update_timestamp},
+        "pilots": [{"callsign": "QFA1", "cid": 1, "latitude": -33.9, "longitude": 151.2, "altitude": 100,
+                    "flight_plan": {"departure": "YSSY", "arrival": "YMML"}}],
+        "controllers": []
+    }).encode()
+
+
+def _transceivers(frequency=120500000):
+    return json.dumps([{"callsign": "QFA1", "transceivers": [{"id": 0, "frequency": frequency}]}]).encode()
+
+
+TRANSCEIVERS = _transceivers()
+
+
+class FakeVATSIM:
+    """Mock transport serving the two feeds and honouring ETags."""
+
+    def __init__(self):
+        self.update_timestamp = "2025-08-01T12:00:00.0000000Z"
+        self.etag = '"v1"'
+        self.transceivers = TRANSCEIVERS
+        self.transceivers_etag = '"t1"'
+        self.requests = []
+
+    def requests_for(self, url):
+        return [request for request in self.requests if str(request.url) == url]
+
+    def handler(self, request):
+        self.requests.append(request)
+        if str(request.url) == TRANSCEIVERS_URL:
+            if request.headers.get("if-none-match") == self.transceivers_etag:
+                return httpx.Response(304, headers={"ETag": self.transceivers_etag})
+            return httpx.Response(200, stream=httpx.ByteStream(self.transceivers), headers={"ETag": self.transceivers_etag})
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        return httpx.Response(200, stream=httpx.ByteStream(_feed(self.update_timestamp)), headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def fake_vatsim():
+    return FakeVATSIM()
+
+
+@pytest.fixture
+def vatsim_service(fake_vatsim):
+    service = VATSIMService()
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(fake_vatsim.handler))
+    return service
+
+
+@pytest.mark.unit
+class TestConditionalFetch:
+    """Test cases for ETag and update_timestamp short-circuits."""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_skips_decoding(self, vatsim_service, fake_vatsim):
+        """The second poll sends If-None-Match and a 304 is reported as unchanged."""
+        first = await vatsim_service.get_current_data()
+        second = await vatsim_service.get_current_data()
+
+        assert len(first["flights"]) == 1
+        assert first["update_timestamp"] == "2025-08-01T12:00:00.0000000Z"
+        assert first["transfer"]["bytes"] == len(_feed(fake_vatsim.update_timestamp)) + len(TRANSCEIVERS)
+        assert first["transfer"]["bytes_downloaded"] == first["transfer"]["bytes"]
+        assert fake_vatsim.requests[2].headers["if-none-match"] == '"v1"'
+        assert second["unchanged"] is True
+        assert second["reason"] == "not_modified"
+        assert "flights" not in second
+        assert vatsim_service.stats["not_modified"] == 1
+        # The transceivers feed is requested alongside but its 304 is not read
+        assert fake_vatsim.requests_for(TRANSCEIVERS_URL)[1].headers["if-none-match"] == '"t1"'
+        assert second["transfer"]["bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_same_update_timestamp_is_unchanged(self, vatsim_service, fake_vatsim):
+        """A new ETag with an already processed update_timestamp is not decoded again."""
+        await vatsim_service.get_current_data()
+        fake_vatsim.etag = '"v2"'
+        vatsim_service._decode_json = MagicMock(side_effect=AssertionError("decoded"))
+
+        result = await vatsim_service.get_current_data()
+
+        assert result["unchanged"] is True
+        assert result["reason"] == "same_update_timestamp"
+
+    @pytest.mark.asyncio
+    async def test_forget_snapshot_refetches(self, vatsim_service, fake_vatsim):
+        """After forget_snapshot the next poll is unconditional and fully processed."""
+        await vatsim_service.get_current_data()
+        vatsim_service.forget_snapshot()
+
+        result = await vatsim_service.get_current_data()
+
+        assert "if-none-match" not in fake_vatsim.requests[2].headers
+        assert len(result["flights"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_skipped_transceivers_body_is_fetched_again(self, vatsim_service, fake_vatsim):
+        """A transceivers body downloaded during an unchanged poll is not cached as seen."""
+        await vatsim_service.get_current_data()
+        fake_vatsim.transceivers = _transceivers(frequency=118100000)
+        fake_vatsim.transceivers_etag = '"t2"'
+
+        unchanged = await vatsim_service.get_current_data()
+        fake_vatsim.etag = '"v2"'
+        fake_vatsim.update_timestamp = "2025-08-01T12:00:15.0000000Z"
+        changed = await vatsim_service.get_current_data()
+
+        assert unchanged["unchanged"] is True
+        assert fake_vatsim.requests_for(TRANSCEIVERS_URL)[2].headers["if-none-match"] == '"t1"'
+        assert changed["transceivers"][0]["frequency"] == 118100000
+
+    def test_decoder_resolution(self):
+        """auto prefers an installed fast decoder; every decoder parses raw bytes."""
+        name, decode = resolve_json_decoder("json")
+        assert name == "json"
+        assert decode(b'{"a": 1}') == {"a": 1}
+
+        name, decode = resolve_json_decoder("auto")
+        assert name in ("orjson", "msgspec", "json")
+        assert decode(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+@pytest.mark.unit
+class TestUnchangedPoll:
+    """Test cases for DataService handling of unchanged snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_snapshot_skips_pipeline(self):
+        """Nothing is filtered or written for an unchanged snapshot."""
+        service = DataService()
+        service._test_mode = True
+        service.logger = MagicMock()
+        service.vatsim_service = MagicMock()
+        service.vatsim_service.get_current_data = AsyncMock(return_value={
+            "unchanged": True, "reason": "not_modified", "update_timestamp": "2025-08-01T12:00:00Z",
+            "timings": {"fetch": 0.1, "decode": 0.0, "parse": 0.0}, "transfer": {"bytes": 0, "bytes_downloaded": 120}
+        })
+        service._prepare_flight_rows = MagicMock(side_effect=AssertionError("processed"))
+
+        result = await service.process_vatsim_data()
+
+        assert result["status"] == "unchanged"
+        assert result["flights_processed"] == 0
+        assert result["transfer"]["bytes_downloaded"] == 120
+
+
+@pytest.mark.unit
+class TestConcurrentFetch:
+    """Test cases for fetching both feeds at once."""
+
+    @pytest.mark.asyncio
+    async def test_feeds_fetched_concurrently_with_latency_and_skew(self, fake_vatsim):
+        """Each feed waits until the other is in flight, so a sequential fetch would time out."""
+        in_flight = []
+        both_in_flight = asyncio.Event()
+        last_modified = {
+            TRANSCEIVERS_URL: "Fri, 01 Aug 2025 12:00:03 GMT"
+        }
+
+        async def handler(request):
+            in_flight.append(str(request.url))
+            if len(in_flight) == 2:
+                both_in_flight.set()
+            await asyncio.wait_for(both_in_flight.wait(), timeout=1)
+            response = fake_vatsim.handler(request)
+            response.headers["Last-Modified"] = last_modified.get(str(request.url), "Fri, 01 Aug 2025 12:00:00 GMT")
+            return response
+
+        service = VATSIMService()
+        service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        result = await service.get_current_data()
+
+        assert len(result["flights"]) == 1
+        assert len(result["transceivers"]) == 1
+        feeds = result["feeds"]
+        assert feeds["vatsim_data"]["status_code"] == 200
+        assert feeds["transceivers"]["latency"] >= 0
+        assert feeds["skew_seconds"] < 1
+        assert feeds["source_skew_seconds"] == 3.0
+        assert result["timings"]["fetch_data"] == feeds["vatsim_data"]["latency"]
+        assert service.get_stats()["last_feed_skew_seconds"] == feeds["skew_seconds"]
+
+    @pytest.mark.asyncio
+    async def test_transceivers_failure_keeps_data_feed(self, fake_vatsim):
+        """A failed transceivers request only empties the transceivers of the poll."""
+        def handler(request):
+            if str(request.url) == TRANSCEIVERS_URL:
+                raise httpx.ConnectError("connection refused", request=request)
+            return fake_vatsim.handler(request)
+
+        service = VATSIMService()
+        service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        result = await service.get_current_data()
+
+        assert len(result["flights"]) == 1
+        assert result["transceivers"] == []
+        assert result["feeds"]["transceivers"]["latency"] is None
+        assert result["feeds"]["skew_seconds"] is None